@@ -0,0 +1,104 @@
+"""
+Benchmark: the text vs. the binary `.robolog` format (`output_format="binary"`
+in `log.add_log_output`).
+
+Writes the same messages (methods with arguments, assigns, returns and log
+messages) in both formats and shows the bytes per message and the throughput
+to encode (write the log) and decode it (as dicts and as records).
+
+Usage (from the `log` folder):
+
+    python benchmarks/bench_binary_format.py [--iterations 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent / "src"))
+
+
+def _write(output_dir: str, iterations: int, output_format: str) -> None:
+    from robocorp.log._robo_logger import _RoboLogger
+
+    logger = _RoboLogger(
+        output_dir,
+        max_file_size="10MB",
+        max_files=10_000,
+        buffer_size="64kb",
+        output_format=output_format,  # type: ignore
+    )
+    logger.start_run("Benchmark")
+    logger.start_task("bench", "bench_mod", __file__, 0, "")
+    for i in range(iterations):
+        name = f"method_{i % 50}"
+        logger.start_element(
+            name,
+            "bench_mod",
+            __file__,
+            i % 50,
+            "METHOD",
+            "",
+            [("arg", "int", str(i)), ("other", "str", repr(f"value {i % 7}"))],
+        )
+        logger.after_assign(name, "bench_mod", __file__, i % 50, "x", "int", str(i * 2))
+        logger.log_message(
+            "INFO", f"Processed item {i}", False, name, "bench_mod", __file__, 0
+        )
+        logger.method_return(name, "bench_mod", __file__, i % 50, "int", str(i))
+        logger.end_method("METHOD", name, "bench_mod", "PASS")
+    logger.end_task("bench", "bench_mod", "PASS", "Ok")
+    logger.end_run("Benchmark", "PASS")
+    logger.close()
+
+
+def _decode(output_dir: str, as_records: bool) -> int:
+    from robocorp.log._decoder import iter_decoded_log_format_from_output_dir
+
+    count = 0
+    for _msg in iter_decoded_log_format_from_output_dir(output_dir, as_records):
+        count += 1
+    return count
+
+
+def _best_time(func, repeat: int) -> float:
+    elapsed = []
+    for _ in range(repeat):
+        initial_time = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - initial_time)
+    return min(elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+
+    for output_format in ("text", "binary"):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_time = _best_time(
+                lambda: _write(tmpdir, args.iterations, output_format), args.repeat
+            )
+            total_bytes = sum(f.stat().st_size for f in Path(tmpdir).glob("*.robolog"))
+            count = _decode(tmpdir, False)
+            dicts_time = _best_time(lambda: _decode(tmpdir, False), args.repeat)
+            records_time = _best_time(lambda: _decode(tmpdir, True), args.repeat)
+
+        print(
+            f"{output_format:<7} {total_bytes / (1024 * 1024):>7.1f} MB "
+            f"{total_bytes / count:>6.1f} bytes/msg | "
+            f"encode: {count / write_time:>9,.0f} msgs/sec | "
+            f"decode dicts: {count / dicts_time:>9,.0f} msgs/sec | "
+            f"decode records: {count / records_time:>9,.0f} msgs/sec"
+        )
+
+
+if __name__ == "__main__":
+    main()
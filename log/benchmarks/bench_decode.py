@@ -0,0 +1,140 @@
+"""
+Benchmark: throughput to decode `.robolog` files with the generic decoding of
+each field after loading all the lines (`readlines()`, the previous approach)
+vs. the streaming decoder providing dicts and records.
+
+The log is generated with a mix of methods (with arguments), assigns, returns
+and log messages and is rotated in parts of `--part-size` (all the parts are
+decoded as one stream with `iter_decoded_log_format_from_output_dir`).
+
+Usage (from the `log` folder):
+
+    python benchmarks/bench_decode.py [--size 50MB] [--part-size 10MB]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent / "src"))
+
+
+def _generate(output_dir: str, size_in_bytes: int, part_size: str) -> None:
+    from robocorp.log._robo_logger import _RoboLogger
+
+    logger = _RoboLogger(output_dir, max_file_size=part_size, max_files=10_000)
+    logger.start_run("Benchmark")
+    logger.start_task("bench", "bench_mod", __file__, 0, "")
+    i = 0
+    while True:
+        for _ in range(1000):
+            name = f"method_{i % 50}"
+            logger.start_element(
+                name,
+                "bench_mod",
+                __file__,
+                i % 50,
+                "METHOD",
+                "",
+                [("arg", "int", str(i)), ("other", "str", repr(f"value {i % 7}"))],
+            )
+            logger.after_assign(
+                name, "bench_mod", __file__, i % 50, "x", "int", str(i * 2)
+            )
+            logger.log_message(
+                "INFO", f"Processed item {i}", False, name, "bench_mod", __file__, 0
+            )
+            logger.method_return(name, "bench_mod", __file__, i % 50, "int", str(i))
+            logger.end_method("METHOD", name, "bench_mod", "PASS")
+            i += 1
+        total = sum(f.stat().st_size for f in Path(output_dir).glob("*.robolog"))
+        if total >= size_in_bytes:
+            break
+    logger.end_task("bench", "bench_mod", "PASS", "Ok")
+    logger.end_run("Benchmark", "PASS")
+    logger.close()
+
+
+def _decode_generic_readlines(output_dir: str) -> int:
+    from robocorp.log._decoder import Decoder, get_output_files
+
+    count = 0
+    for path in get_output_files(output_dir):
+        decoder = Decoder()
+        with open(path, "r", encoding="utf-8") as stream:
+            for line in stream.readlines():
+                line = line.strip()
+                if line:
+                    message_type, message = line.split(" ", 1)
+                    if decoder._decode_message_type_generic(message_type, message):
+                        count += 1
+    return count
+
+
+def _decode_dicts(output_dir: str) -> int:
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+
+    count = 0
+    for _msg in iter_decoded_log_format_from_output_dir(output_dir):
+        count += 1
+    return count
+
+
+def _decode_records(output_dir: str) -> int:
+    from robocorp.log import iter_decoded_log_records_from_output_dir
+
+    count = 0
+    for _record in iter_decoded_log_records_from_output_dir(output_dir):
+        count += 1
+    return count
+
+
+def main() -> None:
+    from robocorp.log._convert_units import _convert_to_bytes
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="50MB")
+    parser.add_argument("--part-size", default="10MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _generate(tmpdir, _convert_to_bytes(args.size), args.part_size)
+        files = list(Path(tmpdir).glob("*.robolog"))
+        total_mb = sum(f.stat().st_size for f in files) / (1024 * 1024)
+        print(f"Decoding: {total_mb:.1f} MB in {len(files)} parts")
+
+        baseline = None
+        for name, func in (
+            ("generic + readlines()", _decode_generic_readlines),
+            ("streaming dicts", _decode_dicts),
+            ("streaming records", _decode_records),
+        ):
+            elapsed = []
+            for _ in range(args.repeat):
+                initial_time = time.perf_counter()
+                count = func(tmpdir)
+                elapsed.append(time.perf_counter() - initial_time)
+            best = min(elapsed)
+            if baseline is None:
+                baseline = best
+
+            tracemalloc.start()
+            func(tmpdir)
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+            print(
+                f"{name:<22} {total_mb / best:>7.1f} MB/s {count / best:>12,.0f} msgs/sec "
+                f"({baseline / best:.2f}x) peak memory: {peak:,.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark: the time the auto-logging import hook adds to imports.
+
+Generates a project with many modules (which import each other and also
+import stdlib modules) and imports it in a new process without the hook,
+with the hook when the modules aren't cached yet (cold) and with the hook
+when the modules are already cached (warm). The stats of the hook (as
+added to the log at the end of the run) are shown for the runs with the
+hook.
+
+Also shows the time to match module names with the filters (linear fnmatch
+vs. the filter matcher used in `DefaultAutoLogConfig`).
+
+Usage (from the `log` folder):
+
+    python benchmarks/bench_import_hook.py [--modules 300]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+SRC = str(Path(__file__).absolute().parent.parent / "src")
+sys.path.insert(0, SRC)
+
+_IMPORT_SCRIPT = """
+import sys
+import time
+
+use_hook = sys.argv[1] == "hook"
+if use_hook:
+    from robocorp import log
+    from robocorp.log._auto_logging_setup import get_import_hook_stats
+
+    log.setup_auto_logging()
+
+initial_time = time.perf_counter()
+import bench_pkg
+elapsed = time.perf_counter() - initial_time
+print(f"{elapsed:.4f}")
+if use_hook:
+    print(get_import_hook_stats())
+"""
+
+
+def _create_project(root: Path, modules: int) -> None:
+    pkg = root / "bench_pkg"
+    pkg.mkdir()
+    imports = [f"from . import mod_{i}" for i in range(modules)]
+    (pkg / "__init__.py").write_text("\n".join(imports) + "\n")
+    for i in range(modules):
+        (pkg / f"mod_{i}.py").write_text(
+            f"""import os
+import json
+import collections
+
+from . import mod_{max(i - 1, 0)} as prev
+
+
+def method_{i}(a, b):
+    c = a + b
+    for j in range(3):
+        c += j
+    return c
+
+
+class Class_{i}:
+    def method(self, x):
+        return method_{i}(x, 1)
+"""
+        )
+
+
+def _run_import(root: Path, mode: str, pycache_dir: str) -> str:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([str(root), SRC])
+    env["ROBOCORP_LOG_PYC_CACHE_DIR"] = pycache_dir
+    # The pycs must be written (so that the baseline doesn't compile and the
+    # warm run uses the cache).
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    output = subprocess.check_output(
+        [sys.executable, "-c", _IMPORT_SCRIPT, mode], env=env, cwd=str(root)
+    )
+    return output.decode("utf-8").strip()
+
+
+def _bench_filter_matching() -> None:
+    from robocorp.log import DefaultAutoLogConfig, Filter, FilterKind
+
+    filters = [Filter(f"lib_{i}", FilterKind.exclude) for i in range(20)] + [
+        Filter(f"pattern_{i}.*", FilterKind.log_on_project_call) for i in range(10)
+    ]
+    config = DefaultAutoLogConfig(filters=filters)
+    module_names = [f"package_{i}.sub_{i % 10}.mod" for i in range(5_000)]
+
+    def linear(module_name: str):
+        for f in filters:
+            name = f.name
+            if "*" in name or "[" in name or "?" in name:
+                if fnmatch(module_name, name):
+                    return f.kind
+            elif name == module_name or module_name.startswith(name + "."):
+                return f.kind
+        return None
+
+    initial_time = time.perf_counter()
+    for module_name in module_names:
+        linear(module_name)
+    linear_time = time.perf_counter() - initial_time
+
+    matcher = config._filter_matcher  # type: ignore
+    initial_time = time.perf_counter()
+    for module_name in module_names:
+        matcher.get_filter_kind(module_name)
+    matcher_time = time.perf_counter() - initial_time
+
+    print(
+        f"Filter matching ({len(filters)} filters, {len(module_names)} names): "
+        f"linear fnmatch: {linear_time * 1000:.1f} ms | "
+        f"filter matcher: {matcher_time * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "project"
+        root.mkdir()
+        pycache_dir = str(Path(tmpdir) / "log-pyc")
+        _create_project(root, args.modules)
+
+        # Warm the regular pycs.
+        _run_import(root, "no-hook", pycache_dir)
+
+        for label, mode in (
+            ("no hook", "no-hook"),
+            ("hook (cold)", "hook"),
+            ("hook (warm)", "hook"),
+        ):
+            output = _run_import(root, mode, pycache_dir)
+            elapsed, *stats = output.splitlines()
+            print(f"{label:<12} import {args.modules} modules: {float(elapsed):.3f}s")
+            for line in stats:
+                print(f"    {line}")
+
+    _bench_filter_matching()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: the memory used by a log output in a long run which logs many
+different messages.
+
+Logs the given number of (different) messages in a new process with the
+default (unbounded) memos and with bounded memos (`memo_max_size`) and shows
+the RSS of the process as the messages are logged.
+
+Usage (from the `log` folder):
+
+    python benchmarks/bench_memo_memory.py [--messages 1000000] [--memo-max-size 8mb]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = str(Path(__file__).absolute().parent.parent / "src")
+
+_LOG_SCRIPT = """
+import sys
+import time
+
+import psutil
+
+from robocorp import log
+
+output_dir, messages, memo_max_size = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+checkpoints = 5
+process = psutil.Process()
+
+initial_time = time.perf_counter()
+with log.add_log_output(
+    output_dir, max_file_size="10mb", max_files=2, memo_max_size=memo_max_size
+):
+    log.start_run("Root Suite")
+    log.start_task("my_task", "task_mod", "task_mod.py", 0)
+    print(f"0 {process.memory_info().rss}", flush=True)
+    step = messages // checkpoints
+    for i in range(1, messages + 1):
+        log.info(f"Message {i}")
+        if i % step == 0:
+            print(f"{i} {process.memory_info().rss}", flush=True)
+    log.end_task("my_task", "task_mod", "PASS", "Ok")
+    log.end_run("Root Suite", "PASS")
+print(f"time {time.perf_counter() - initial_time}")
+"""
+
+
+def _run(messages: int, memo_max_size: str) -> None:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = SRC
+
+    label = f"memo_max_size={memo_max_size}" if memo_max_size != "0" else "unbounded"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        process = subprocess.Popen(
+            [sys.executable, "-c", _LOG_SCRIPT, tmpdir, str(messages), memo_max_size],
+            env=env,
+            stdout=subprocess.PIPE,
+        )
+        assert process.stdout is not None
+        initial_rss = None
+        for line in process.stdout:
+            key, value = line.decode("utf-8").split()
+            if key == "time":
+                print(f"{label:<22} elapsed: {float(value):.1f}s")
+                continue
+            rss = int(value)
+            if initial_rss is None:
+                initial_rss = rss
+            print(
+                f"{label:<22} {int(key):>10} messages: "
+                f"RSS: {rss / (1024 * 1024):7.1f} MB "
+                f"(+{(rss - initial_rss) / (1024 * 1024):.1f} MB)"
+            )
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--memo-max-size", default="8mb")
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+    _run(args.messages, "0")
+    _run(args.messages, args.memo_max_size)
+
+
+if __name__ == "__main__":
+    main()
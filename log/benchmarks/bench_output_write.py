@@ -0,0 +1,72 @@
+"""
+Benchmark: messages/sec written to a `.robolog` output when flushing each
+message (default) vs. buffering the writes (`add_log_output(buffer_size=...)`)
+and vs. writing in a separate thread (`add_log_output(write_in_thread=True)`).
+
+Note: for `write_in_thread` the time measured is the time the caller is
+blocked (the time to drain the queue is not included).
+
+Usage (from the `log` folder):
+
+    python benchmarks/bench_output_write.py [--messages 200000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent / "src"))
+
+
+def _run(messages: int, **kwargs) -> float:
+    from robocorp import log
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with log.add_log_output(tmpdir, max_file_size="20MB", max_files=1000, **kwargs):
+            log.start_run("Benchmark")
+            log.start_task("bench", "bench_mod", __file__, 0)
+
+            initial_time = time.perf_counter()
+            for i in range(messages):
+                log.info("Message", i % 100)
+            elapsed = time.perf_counter() - initial_time
+
+            log.end_task("bench", "bench_mod", "PASS", "Ok")
+            log.end_run("Benchmark", "PASS")
+
+        # Sanity check: everything must be in the disk after the output is closed.
+        total_bytes = sum(f.stat().st_size for f in Path(tmpdir).glob("*.robolog"))
+        assert total_bytes > messages, f"Unexpected output size: {total_bytes}"
+
+    return messages / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+    print(f"Messages: {args.messages}")
+
+    results = [
+        ("flush per message", _run(args.messages)),
+        ("buffer_size=64kb", _run(args.messages, buffer_size="64kb")),
+        ("buffer_size=1mb", _run(args.messages, buffer_size="1mb")),
+        (
+            "write_in_thread",
+            _run(args.messages, write_in_thread=True, max_queue_size=args.messages),
+        ),
+    ]
+    baseline = results[0][1]
+    for name, msgs_per_sec in results:
+        print(
+            f"{name:<22} {msgs_per_sec:>12,.0f} msgs/sec ({msgs_per_sec / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
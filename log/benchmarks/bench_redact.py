@@ -0,0 +1,123 @@
+"""
+Benchmark: time to redact repr-like payloads with 10/100/10k hidden strings
+using a single regular expression with an alternation of all the hidden
+strings (the previous approach) vs. the `MultiPatternMatcher` used by the
+`LogRedacter`.
+
+Also measures the time to add the hidden strings one by one (redacting after
+each addition, which is what happens when `log.hide_from_output` is called
+during the run).
+
+Usage (from the `log` folder):
+
+    python benchmarks/bench_redact.py [--payloads 200]
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent / "src"))
+
+
+def _random_secret(rnd: random.Random) -> str:
+    return "".join(
+        rnd.choice(string.ascii_letters + string.digits)
+        for _ in range(rnd.randint(8, 32))
+    )
+
+
+def _create_payloads(rnd: random.Random, secrets, count: int):
+    payloads = []
+    for i in range(count):
+        data = {
+            f"key_{j}": rnd.choice(
+                [
+                    f"value {j} of payload {i}",
+                    j * 1.5,
+                    [j, j + 1, None, True],
+                    rnd.choice(secrets),
+                ]
+            )
+            for j in range(rnd.randint(5, 50))
+        }
+        payloads.append(repr(data))
+    return payloads
+
+
+def _time_it(func, payloads) -> float:
+    initial_time = time.perf_counter()
+    for payload in payloads:
+        func(payload)
+    return time.perf_counter() - initial_time
+
+
+def _bench(hidden_count: int, payloads_count: int) -> None:
+    from robocorp.log._log_redacter import LogRedacter
+    from robocorp.log._multi_pattern_matcher import MultiPatternMatcher
+
+    rnd = random.Random(hidden_count)
+    secrets = [_random_secret(rnd) for _ in range(hidden_count)]
+    payloads = _create_payloads(rnd, secrets, payloads_count)
+    total_kb = sum(len(p) for p in payloads) / 1024
+
+    initial_time = time.perf_counter()
+    regexp = re.compile("|".join(re.escape(s) for s in secrets))
+    regexp_build = time.perf_counter() - initial_time
+
+    initial_time = time.perf_counter()
+    matcher = MultiPatternMatcher(secrets)
+    matcher_build = time.perf_counter() - initial_time
+
+    for payload in payloads:
+        assert regexp.sub("", payload) == matcher.sub("", payload)
+
+    regexp_scan = _time_it(lambda s: regexp.sub("<redacted>", s), payloads)
+    matcher_scan = _time_it(lambda s: matcher.sub("<redacted>", s), payloads)
+
+    print(f"\nHidden strings: {hidden_count} (payloads: {total_kb:,.0f} KB)")
+    print(f"  {'':<20} {'build':>10} {'redact':>10}")
+    print(f"  {'regexp':<20} {regexp_build:>9.3f}s {regexp_scan:>9.3f}s")
+    print(f"  {'MultiPatternMatcher':<20} {matcher_build:>9.3f}s {matcher_scan:>9.3f}s")
+
+    # Incremental: add secrets one by one, redacting a payload after each one.
+    if hidden_count <= 1000:
+        initial_time = time.perf_counter()
+        for i in range(hidden_count):
+            re.compile("|".join(re.escape(s) for s in secrets[: i + 1])).sub(
+                "<redacted>", payloads[i % payloads_count]
+            )
+        regexp_incremental = f"{time.perf_counter() - initial_time:.3f}s"
+    else:
+        regexp_incremental = "(skipped)"
+
+    log_redacter = LogRedacter()
+    initial_time = time.perf_counter()
+    for i, secret in enumerate(secrets):
+        log_redacter.hide_from_output(secret)
+        log_redacter.redact(payloads[i % payloads_count])
+    redacter_incremental = time.perf_counter() - initial_time
+
+    print(
+        f"  Add one by one + redact: regexp: {regexp_incremental}, "
+        f"LogRedacter: {redacter_incremental:.3f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payloads", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+    for hidden_count in (10, 100, 10_000):
+        _bench(hidden_count, args.payloads)
+
+
+if __name__ == "__main__":
+    main()
@@ -123,3 +123,50 @@ test('TreeBuilder can read method.', async () => {
   expect(treeBuilder.flattened.entries.length).toBe(5);
   expect(treeBuilder.flattened.stack.length).toBe(0);
 });
+
+const START_THREAD_ELEMENT = `
+M h:"screenshot"
+M i:"robocorp_log_tests._help_screenshot"
+M j:"/path/to/_help_screenshot.py"
+P g:h|i|j|f|2
+M k:"METHOD"
+M t:"Thread-1"
+TH 1|t
+SE g|k|0.013
+`;
+
+const END_THREAD_ELEMENT = `
+TH 1|t
+EE k|r|0.018
+`;
+
+test('TreeBuilder shows threads in lanes.', async () => {
+  const opts = createOpts();
+  const treeBuilder = new TreeBuilder(opts);
+
+  opts.initialContents = CREATE_RUN_AND_TEST + START_THREAD_ELEMENT;
+  await treeBuilder.addInitialContents();
+  expect(treeBuilder.mainFlattened.entries.length).toBe(1);
+  expect(treeBuilder.flattened.entries.length).toBe(1);
+  expect(treeBuilder.flattened.rootId).toBe('thread1');
+
+  // Back to the main thread: the element is added to the task.
+  opts.appendedContents.push('TH 0|t\n' + START_ELEMENT + END_ELEMENT);
+  await treeBuilder.onAppendedContents();
+  expect(treeBuilder.mainFlattened.entries.length).toBe(2);
+  expect(treeBuilder.mainFlattened.stack.length).toBe(1);
+
+  opts.appendedContents.push(END_THREAD_ELEMENT);
+  await treeBuilder.onAppendedContents();
+
+  const [entries, idToEntry] = treeBuilder.getAllEntries();
+  expect(entries.map((entry) => entry.id)).toEqual(['root0', 'root0-0', 'thread1', 'thread1-0']);
+  entries.forEach((entry, i) => expect(entry.entryIndexAll).toBe(i));
+
+  const threadEntry: EntryTask = <EntryTask>idToEntry.get('thread1');
+  expect(threadEntry.name).toBe('Thread: Thread-1');
+
+  const threadElement: EntryMethod = <EntryMethod>idToEntry.get('thread1-0');
+  expect(threadElement.name).toBe('screenshot');
+  expect(threadElement.endDeltaInSeconds).toBe(0.018);
+});
@@ -1,6 +1,7 @@
 import { Drawer, Box } from '@robocorp/components';
 import { formatTimeInSeconds, useLogContext } from '~/lib';
 import { PreBox } from './components/Common';
+import { ResourceSamplesComponent } from './components/ResourceSamplesComponent';
 import { useCallback } from 'react';
 
 export const InformationDetails = () => {
@@ -34,6 +35,11 @@ export const InformationDetails = () => {
       <Box p="$16" margin="$8">
         <PreBox>{msgs.join('\n')}</PreBox>
       </Box>
+      {runInfo.resourceSamples.length > 0 && (
+        <Box p="$16" margin="$8">
+          <ResourceSamplesComponent samples={runInfo.resourceSamples} />
+        </Box>
+      )}
     </Drawer>
   );
 };
@@ -0,0 +1,88 @@
+import { Box } from '@robocorp/components';
+import { FC } from 'react';
+import { ResourceSample, formatTimeInSeconds } from '~/lib';
+import { Bold } from './Common';
+
+const WIDTH = 960;
+const HEIGHT = 200;
+const MARGIN = 40;
+
+const toMB = (bytes: number): number => bytes / (1024 * 1024);
+
+const sampleTitle = (sample: ResourceSample): string => {
+  const lines = [
+    `Time: ${formatTimeInSeconds(sample.timeDeltaInSeconds)}`,
+    `RSS: ${toMB(sample.rss).toFixed(1)} MB`,
+    `CPU: ${sample.cpuPercent.toFixed(1)}%`,
+    `Open files: ${sample.fds}`,
+    `Threads: ${sample.threads}`,
+  ];
+  if (sample.children > 0) {
+    lines.push(
+      `Children: ${sample.children} (RSS: ${toMB(sample.childrenRss).toFixed(1)} MB, CPU: ${sample.childrenCpuPercent.toFixed(1)}%)`,
+    );
+  }
+  if (sample.running.length > 0) {
+    lines.push(`Running: ${sample.running.join(' > ')}`);
+  }
+  return lines.join('\n');
+};
+
+/**
+ * Shows the RSS (MB) and the CPU (%) of the resource samples in a chart
+ * (hovering a point shows the sample along with the elements running).
+ */
+export const ResourceSamplesComponent: FC<{ samples: ResourceSample[] }> = ({ samples }) => {
+  if (samples.length === 0) {
+    return <></>;
+  }
+  const first = samples[0].timeDeltaInSeconds;
+  const last = samples[samples.length - 1].timeDeltaInSeconds;
+  const timeRange = Math.max(last - first, 1e-6);
+  const maxRss = Math.max(...samples.map((s) => toMB(s.rss + s.childrenRss)), 1);
+  const maxCpu = Math.max(...samples.map((s) => s.cpuPercent + s.childrenCpuPercent), 100);
+
+  const x = (sample: ResourceSample) =>
+    MARGIN + ((sample.timeDeltaInSeconds - first) / timeRange) * (WIDTH - 2 * MARGIN);
+  const y = (value: number, max: number) => HEIGHT - MARGIN - (value / max) * (HEIGHT - 2 * MARGIN);
+
+  const rssPoints = samples.map((s) => `${x(s)},${y(toMB(s.rss + s.childrenRss), maxRss)}`);
+  const cpuPoints = samples.map(
+    (s) => `${x(s)},${y(s.cpuPercent + s.childrenCpuPercent, maxCpu)}`,
+  );
+
+  return (
+    <Box>
+      <Bold>Resources</Bold> (RSS in blue, max: {maxRss.toFixed(1)} MB; CPU in orange, max:{' '}
+      {maxCpu.toFixed(1)}%)
+      <svg width={WIDTH} height={HEIGHT} viewBox={`0 0 ${WIDTH} ${HEIGHT}`}>
+        <line
+          x1={MARGIN}
+          y1={HEIGHT - MARGIN}
+          x2={WIDTH - MARGIN}
+          y2={HEIGHT - MARGIN}
+          stroke="gray"
+        />
+        <text x={MARGIN} y={HEIGHT - MARGIN / 2} fill="gray" fontSize="12">
+          {formatTimeInSeconds(first)}
+        </text>
+        <text x={WIDTH - MARGIN} y={HEIGHT - MARGIN / 2} fill="gray" fontSize="12" textAnchor="end">
+          {formatTimeInSeconds(last)}
+        </text>
+        <polyline points={rssPoints.join(' ')} fill="none" stroke="#1f77b4" strokeWidth="2" />
+        <polyline points={cpuPoints.join(' ')} fill="none" stroke="#ff7f0e" strokeWidth="2" />
+        {samples.map((s, i) => (
+          <circle
+            key={i}
+            cx={x(s)}
+            cy={y(toMB(s.rss + s.childrenRss), maxRss)}
+            r="3"
+            fill="#1f77b4"
+          >
+            <title>{sampleTitle(s)}</title>
+          </circle>
+        ))}
+      </svg>
+    </Box>
+  );
+};
@@ -13,6 +13,23 @@ import { detectVSCodeTheme } from '../vscode/themeDetector';
 import { isInVSCode } from '../vscode/vscodeComm';
 
 export type RunInfoStatus = 'ERROR' | 'PASS' | 'UNSET';
+
+/**
+ * A sample of the resources used by the process (see: `RS` messages).
+ */
+export interface ResourceSample {
+  timeDeltaInSeconds: number;
+  rss: number;
+  cpuPercent: number;
+  fds: number;
+  threads: number;
+  children: number;
+  childrenRss: number;
+  childrenCpuPercent: number;
+  // The names of the elements running (in the main thread) when the sample was taken.
+  running: string[];
+}
+
 export interface RunInfo {
   versionTooNew: boolean;
   version: string;
@@ -23,6 +40,7 @@ export interface RunInfo {
   firstPart: number;
   lastPart: number;
   infoMessages: Set<string>;
+  resourceSamples: ResourceSample[];
 }
 
 export interface SearchInfoRequest {
@@ -159,6 +177,7 @@ export const createDefaultRunInfo = (): RunInfo => ({
   firstPart: -1,
   lastPart: -1,
   infoMessages: new Set<string>(),
+  resourceSamples: [],
 });
 
 export const createDefaultRunIdsAndLabel = (): RunIdsAndLabel => ({
@@ -150,8 +150,17 @@ class FlattenedTree {
   // entries which have arguments may not create a new scope).
   private argsTarget: EntryMethodBase | undefined;
 
+  // The id of the parent of the top-level entries ('' for the main thread
+  // and the id of the thread entry for other threads).
+  public readonly rootId: string;
+
   // The current parentId.
-  private parentId = '';
+  private parentId: string;
+
+  constructor(rootId = '') {
+    this.rootId = rootId;
+    this.parentId = rootId;
+  }
 
   newScopeId(addToStack = true, inTreeByDefault = true): string {
     let counter = this.stackCounter.at(-1);
@@ -606,7 +615,7 @@ class FlattenedTree {
           }
           this.parentId = last.id;
         } else {
-          this.parentId = '';
+          this.parentId = this.rootId;
         }
         break;
       } else {
@@ -683,6 +692,15 @@ class FlattenedTree {
   }
 }
 
+/**
+ * The entries logged by a thread other than the main thread are shown
+ * in a separate lane (inside an entry for the thread).
+ */
+interface ThreadLane {
+  entry: EntryTask;
+  flattened: FlattenedTree;
+}
+
 /**
  * A helper class to build the tree.
  *
@@ -712,7 +730,14 @@ export class TreeBuilder {
 
   suiteErrored = false;
 
-  flattened: FlattenedTree = new FlattenedTree();
+  // The entries of the main thread.
+  readonly mainFlattened: FlattenedTree = new FlattenedTree();
+
+  // The entries of the thread currently being logged.
+  flattened: FlattenedTree = this.mainFlattened;
+
+  // Thread id -> lane with the entries of the thread.
+  threadLanes: Map<number, ThreadLane> = new Map();
 
   constructor(opts: IOpts) {
     this.opts = opts;
@@ -744,6 +769,22 @@ export class TreeBuilder {
     }
   }
 
+  appendResourceSample(msg: IMessage) {
+    const decoded = msg.decoded;
+    this.runInfo.resourceSamples.push({
+      timeDeltaInSeconds: decoded['time_delta_in_seconds'],
+      rss: decoded['rss'],
+      cpuPercent: decoded['cpu_percent'],
+      fds: decoded['fds'],
+      threads: decoded['threads'],
+      children: decoded['children'],
+      childrenRss: decoded['children_rss'],
+      childrenCpuPercent: decoded['children_cpu_percent'],
+      running: this.mainFlattened.stack.map((entry: Entry) => ('name' in entry ? entry.name : '')),
+    });
+    this.runInfoChanged = true;
+  }
+
   appendVersion(msg: IMessage) {
     const version = msg.decoded['version'];
     const expectedVersion = SUPPORTED_VERSION;
@@ -774,6 +815,76 @@ export class TreeBuilder {
     }
   }
 
+  switchThread(msg: IMessage) {
+    const tid: number = msg.decoded['tid'];
+    if (tid === 0) {
+      this.flattened = this.mainFlattened;
+      return;
+    }
+    let lane = this.threadLanes.get(tid);
+    if (lane === undefined) {
+      const laneId = `thread${tid}`;
+      const entry: EntryTask = {
+        id: laneId,
+        type: Type.task,
+        name: `Thread: ${msg.decoded['name']}`,
+        libname: '',
+        source: '',
+        lineno: -1,
+        endDeltaInSeconds: -1,
+        status: StatusLevel.info,
+        startDeltaInSeconds: undefined,
+        entryIndexAll: -1, // Set when the entries are published.
+      };
+      lane = { entry, flattened: new FlattenedTree(laneId) };
+      this.threadLanes.set(tid, lane);
+    }
+    this.flattened = lane.flattened;
+  }
+
+  /**
+   * Provides the entries to be shown: the ones from the main thread and then
+   * the lane of each thread (with the entry of the thread followed by the
+   * entries from that thread).
+   */
+  getAllEntries(): [Entry[], Map<string, Entry>, string[]] {
+    const main = this.mainFlattened;
+    let newExpanded = main.newExpanded;
+    if (newExpanded.length > 0) {
+      // Don't add the same ones again.
+      main.newExpanded = [];
+    }
+    if (this.threadLanes.size === 0) {
+      return [main.entries, main.idToEntry, newExpanded];
+    }
+
+    const entries: Entry[] = [...main.entries];
+    const idToEntry: Map<string, Entry> = new Map(main.idToEntry);
+    const tids = [...this.threadLanes.keys()].sort((a, b) => a - b);
+    for (const tid of tids) {
+      const lane = this.threadLanes.get(tid);
+      if (lane === undefined) {
+        continue;
+      }
+      const laneEntry: EntryTask = { ...lane.entry, entryIndexAll: entries.length };
+      entries.push(laneEntry);
+      idToEntry.set(laneEntry.id, laneEntry);
+
+      // The entryIndexAll in the lane is relative to the lane, so, it must
+      // be updated to the index in the full array.
+      for (const entry of lane.flattened.entries) {
+        const entryCp: Entry = { ...entry, entryIndexAll: entries.length };
+        entries.push(entryCp);
+        idToEntry.set(entryCp.id, entryCp);
+      }
+      if (lane.flattened.newExpanded.length > 0) {
+        newExpanded = newExpanded.concat(lane.flattened.newExpanded);
+        lane.flattened.newExpanded = [];
+      }
+    }
+    return [entries, idToEntry, newExpanded];
+  }
+
   appendConsoleOutput(msg: IMessage) {
     this.flattened.pushConsole(msg);
   }
@@ -875,17 +986,8 @@ It's possible to customize the size of the logs with "--max-log-file-size" and "
     // as a result of that the item changes its size.
     const updateFromIndex = -1;
 
-    let newExpanded = this.flattened.newExpanded;
-    if (newExpanded.length > 0) {
-      // Don't add the same ones again.
-      this.flattened.newExpanded = [];
-    }
-    setAllEntriesWhenPossible(
-      this.flattened.entries,
-      this.flattened.idToEntry,
-      newExpanded,
-      updateFromIndex,
-    );
+    const [entries, idToEntry, newExpanded] = this.getAllEntries();
+    setAllEntriesWhenPossible(entries, idToEntry, newExpanded, updateFromIndex);
     if (this.runInfoChanged) {
       this.runInfoChanged = false;
       setRunInfoWhenPossible(this.runInfo);
@@ -1091,8 +1193,18 @@ It's possible to customize the size of the logs with "--max-log-file-size" and "
         this.appendInternalInfo(msg);
         break;
       case 'V':
+        // Each part starts in the main thread.
+        this.flattened = this.mainFlattened;
         this.appendVersion(msg);
         break;
+      case 'TH':
+        // thread switch
+        this.switchThread(msg);
+        break;
+      case 'RS':
+        // resource sample
+        this.appendResourceSample(msg);
+        break;
     }
   }
 }
@@ -11,8 +11,10 @@ from types import TracebackType
 from typing import (
     IO,
     Any,
+    BinaryIO,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Literal,
@@ -25,16 +27,27 @@ from typing import (
 
 from . import _config
 from ._log_redacter import _log_redacter
-from ._logger_instances import _get_logger_instances
+from ._logger_instances import (
+    _add_logger_instance,
+    _get_logger_instances,
+    _remove_logger_instance,
+)
 
 # Not part of the API, used to determine whether a file is a project file
 # or a library file when running with the FilterKind.log_on_project_call kind.
 from ._rewrite_filtering import FilesFiltering as _FilesFiltering
 from ._sensitive_variable_names import _sensitive_names
 from ._suppress_helper import SuppressHelper as _SuppressHelper
-from .protocols import IReadLines, LogHTMLStyle, Status
+from .protocols import (
+    IReadLines,
+    LogHTMLStyle,
+    OutputFormat,
+    QueueOverflowPolicy,
+    Status,
+)
 
 if typing.TYPE_CHECKING:
+    from ._decoder import LogRecord
     from ._robo_logger import _RoboLogger
 
 __version__ = "3.1.3"
@@ -66,19 +79,20 @@ def _log(level, message: Sequence[Any], html: bool = False) -> None:
     m = " ".join(str(x) for x in message)
 
     if accept_in_log:
-        back_frame = sys._getframe(2)
-        f_code = back_frame.f_code
-        source = f_code.co_filename
-        name = f_code.co_name
-        lineno = back_frame.f_lineno
-        libname = str(back_frame.f_globals.get("__package__", ""))
-
-        name, libname, source, lineno
-
         robo_logger: "_RoboLogger"
         with _get_logger_instances() as logger_instances:
-            for robo_logger in logger_instances:
-                robo_logger.log_message(level, m, html, name, libname, source, lineno)
+            if logger_instances:
+                back_frame = sys._getframe(2)
+                f_code = back_frame.f_code
+                source = f_code.co_filename
+                name = f_code.co_name
+                lineno = back_frame.f_lineno
+                libname = str(back_frame.f_globals.get("__package__", ""))
+
+                for robo_logger in logger_instances:
+                    robo_logger.log_message(
+                        level, m, html, name, libname, source, lineno
+                    )
 
     if not html:  # html messages are never put in the output.
         if accept_in_output:
@@ -263,7 +277,7 @@ def process_snapshot() -> None:
     A process snapshot can include details on the python process and subprocesses
     and should add a thread dump with the stack of all running threads.
     """
-    with _get_logger_instances(only_from_main_thread=False) as logger_instances:
+    with _get_logger_instances() as logger_instances:
         for robo_logger in logger_instances:
             robo_logger.process_snapshot()
 
@@ -337,8 +351,6 @@ def console_message(
         flush: Whether we should flush after sending the message (if None
                it's flushed if the end char ends with '\n').
     """
-    from ._safe_write_to_stream import safe_write_to_stream
-
     try:
         writing = _ConsoleMessagesLock.tlocal._writing
     except Exception:
@@ -358,34 +370,39 @@ def console_message(
             stream = sys.stdout
 
         if stream is not None:
-            stream = typing.cast(IO, stream)
+            _write_console_message(typing.cast(IO, stream), message, kind, flush)
+    finally:
+        _ConsoleMessagesLock.tlocal._writing = False
 
-            from . import console
 
-            ctx: Any
+def _write_console_message(
+    stream: IO, message: str, kind: str, flush: Optional[bool]
+) -> None:
+    from . import console
+    from ._safe_write_to_stream import safe_write_to_stream
 
-            if kind in (ConsoleMessageKind.ERROR, ConsoleMessageKind.STDERR):
-                ctx = console.set_color(console.COLOR_RED)
+    ctx: Any
 
-            elif kind in (ConsoleMessageKind.IMPORTANT, ConsoleMessageKind.TASK_NAME):
-                ctx = console.set_color(console.COLOR_CYAN)
+    if kind in (ConsoleMessageKind.ERROR, ConsoleMessageKind.STDERR):
+        ctx = console.set_color(console.COLOR_RED)
 
-            elif kind == ConsoleMessageKind.TRACEBACK:
-                ctx = console.set_color(console.COLOR_RED)
+    elif kind in (ConsoleMessageKind.IMPORTANT, ConsoleMessageKind.TASK_NAME):
+        ctx = console.set_color(console.COLOR_CYAN)
 
-            else:
-                ctx = nullcontext()
+    elif kind == ConsoleMessageKind.TRACEBACK:
+        ctx = console.set_color(console.COLOR_RED)
+
+    else:
+        ctx = nullcontext()
 
-            with ctx:
-                safe_write_to_stream(stream, message)
+    with ctx:
+        safe_write_to_stream(stream, message)
 
-            if flush is None:
-                flush = message.endswith("\n")
+    if flush is None:
+        flush = message.endswith("\n")
 
-            if flush:
-                stream.flush()
-    finally:
-        _ConsoleMessagesLock.tlocal._writing = False
+    if flush:
+        stream.flush()
 
 
 # --- Methods related to hiding logging information.
@@ -672,8 +689,14 @@ def end_run(name: str, status: str) -> None:
 
     Note: robocorp-tasks calls this method automatically.
     """
+    from ._auto_logging_setup import get_import_hook_stats
+
+    import_hook_stats = get_import_hook_stats()
     with _get_logger_instances() as logger_instances:
         for robo_logger in logger_instances:
+            if import_hook_stats is not None:
+                # Shown in the general information of the run.
+                robo_logger.send_info(str(import_hook_stats))
             robo_logger.end_run(name, status)
 
 
@@ -714,17 +737,72 @@ def end_task(name: str, libname: str, status: str, message: str) -> None:
             robo_logger.end_task(name, libname, status, message)
 
 
+def merge_output_dir(
+    output_dir: Union[str, Path],
+    show_console_messages: bool = False,
+    skip_task_libnames: Sequence[str] = (),
+) -> None:
+    """
+    Adds the messages from the `.robolog` files in the given output directory
+    (i.e.: the output of a run done in a subprocess) to the log outputs.
+
+    The messages related to the run itself (start/end of the run, version,
+    initial time, ...) are skipped and the time deltas are adjusted to the
+    initial time of each log output.
+
+    Args:
+        output_dir: The directory with the `.robolog` files to be merged.
+        show_console_messages: If True the console messages from the merged
+            output are also shown in the console (without adding those to the
+            log outputs again).
+        skip_task_libnames: The tasks with these libnames (and everything
+            logged inside those) aren't merged (i.e.: the tasks for the setup
+            and teardown of the run in the subprocess).
+
+    Note: robocorp-tasks calls this method automatically when running tasks
+    in parallel.
+    """
+    with _get_logger_instances() as logger_instances:
+        for robo_logger in logger_instances:
+            robo_logger.merge_output_dir(output_dir, skip_task_libnames)
+
+    if show_console_messages:
+        from ._decoder import iter_decoded_log_format_from_output_dir as _iter
+
+        try:
+            writing = _ConsoleMessagesLock.tlocal._writing
+        except Exception:
+            writing = False
+
+        # Set so that the messages aren't added to the log outputs again if
+        # the stdout is redirected to the log.
+        _ConsoleMessagesLock.tlocal._writing = True
+        try:
+            for msg in _iter(output_dir):
+                if msg["message_type"] == "C":
+                    _write_console_message(
+                        sys.stdout, msg["message"], msg["kind"], flush=False
+                    )
+            sys.stdout.flush()
+        finally:
+            _ConsoleMessagesLock.tlocal._writing = writing
+
+
 # ---- APIs to decode existing log files
 
 
-def iter_decoded_log_format_from_stream(stream: IReadLines) -> Iterator[dict]:
+def iter_decoded_log_format_from_stream(
+    stream: Union[IReadLines, Iterable[str], BinaryIO],
+) -> Iterator[dict]:
     """
     Iterates stream contents and decodes those as dicts.
 
     Args:
-        stream: The stream which should be iterated in (anything with a
-            `readlines()` method which should provide the messages encoded
-            in the internal format).
+        stream: The stream which should be iterated in (anything which provides
+            the lines with the messages encoded in the internal format when
+            iterated -- such as a file opened in text mode, which is read
+            lazily -- or with a `readlines()` method). A `.robolog` written
+            with `output_format="binary"` must be opened in binary mode.
 
     Returns:
         An iterator which will decode the messages and provides a dictionary for
@@ -748,6 +826,142 @@ def iter_decoded_log_format_from_stream(stream: IReadLines) -> Iterator[dict]:
     return iter_decoded_log_format(stream)
 
 
+def iter_decoded_log_format_from_output_dir(
+    output_dir: Union[str, Path],
+) -> Iterator[dict]:
+    """
+    Decodes all the `.robolog` files in the given output directory as a single
+    stream of messages (`output.robolog`, `output_2.robolog`, ...).
+
+    Note: each part starts with the `V`, `T`, `ID` and `I` messages followed by
+    messages to replay the elements which were still running in the previous
+    part (`RR`, `RT`, `RE`, ...).
+
+    Returns:
+        An iterator which provides a dictionary for each message found (see:
+        `iter_decoded_log_format_from_stream`).
+    """
+    from ._decoder import iter_decoded_log_format_from_output_dir as _iter
+
+    return _iter(output_dir)
+
+
+def iter_decoded_log_records_from_stream(
+    stream: Union[IReadLines, Iterable[str], BinaryIO],
+) -> Iterator["LogRecord"]:
+    """
+    Same as `iter_decoded_log_format_from_stream` but provides records instead
+    of dicts (which are faster to create and use less memory).
+
+    Each record is a namedtuple with the same fields of the related dict and a
+    `message_type` attribute.
+
+    Example of records provided:
+
+    ```python
+    VRecord(version='0.0.4')
+    SRRecord(name='Robot Check', time_delta_in_seconds=0.3)
+    ...
+    ```
+
+    Note: the exact format of the records provided is not stable across
+    releases.
+    """
+    from ._decoder import iter_decoded_log_records
+
+    return iter_decoded_log_records(stream)
+
+
+def iter_decoded_log_records_from_output_dir(
+    output_dir: Union[str, Path],
+) -> Iterator["LogRecord"]:
+    """
+    Same as `iter_decoded_log_format_from_output_dir` but provides records
+    instead of dicts (see: `iter_decoded_log_records_from_stream`).
+    """
+    from ._decoder import iter_decoded_log_format_from_output_dir as _iter
+
+    return _iter(output_dir, as_records=True)
+
+
+def iter_log_index_entries(robolog_path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Provides the entries of the index written along with the given `.robolog`
+    file (when the log output is added with `write_index=True`).
+
+    Example of entries provided:
+
+    ```python
+    {'kind': 'task_start', 'message_type': 'ST', 'offset': 1032, 'end': 1043,
+        'tid': 0, 'name': 'my_task', 'libname': 'tasks'}
+    {'kind': 'failure', 'message_type': 'EE', 'offset': 5201, 'end': 5214,
+        'tid': 0, 'name': 'some_method', 'libname': 'my_module',
+        'element_type': 'METHOD', 'status': 'ERROR', 'start': 4870}
+    {'kind': 'task_end', 'message_type': 'ET', 'offset': 5390, 'end': 5403,
+        'tid': 0, 'name': 'my_task', 'libname': 'tasks', 'status': 'FAIL'}
+    ```
+
+    The offsets are byte offsets in the `.robolog` file (`offset` is where the
+    message starts and `end` where it ends -- for failures, `start` is the offset
+    of the message which started the element). Note that a task which was running
+    when the file was rotated is started in the next file with an `RT` message.
+
+    Note: the exact format of the entries provided is not stable across
+    releases.
+    """
+    from ._log_index import iter_index_entries
+
+    return iter_index_entries(robolog_path)
+
+
+def iter_decoded_log_format_from_range(
+    robolog_path: Union[str, Path], start: int, end: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Decodes just the messages in the given range of a `.robolog` file which
+    has an index (see: `iter_log_index_entries`).
+
+    Args:
+        robolog_path: The `.robolog` file.
+        start: The offset where the first message to be decoded starts (i.e.:
+            the `offset` of a `task_start` entry).
+        end: The offset where the messages to be decoded end (i.e.: the `end`
+            of a `task_end` entry). If not given the messages are decoded up
+            to the end of the file.
+
+    Example (decoding just the messages of a task):
+
+    ```python
+    entries = list(log.iter_log_index_entries(robolog_path))
+    start = next(e for e in entries if e["kind"] == "task_start")
+    end = next(e for e in entries if e["kind"] == "task_end")
+    for msg in log.iter_decoded_log_format_from_range(
+        robolog_path, start["offset"], end["end"]
+    ):
+        ...
+    ```
+
+    Returns:
+        An iterator which provides a dictionary for each message found (see:
+        `iter_decoded_log_format_from_stream`).
+    """
+    from ._log_index import iter_decoded_log_range
+
+    return iter_decoded_log_range(robolog_path, start, end)
+
+
+def iter_decoded_log_records_from_range(
+    robolog_path: Union[str, Path], start: int, end: Optional[int] = None
+) -> Iterator["LogRecord"]:
+    """
+    Same as `iter_decoded_log_format_from_range` but provides records instead
+    of dicts (see: `iter_decoded_log_records_from_stream`).
+    """
+    from ._log_index import iter_decoded_log_range
+
+    return iter_decoded_log_range(robolog_path, start, end, as_records=True)
+
+
 def iter_decoded_log_format_from_log_html(log_html: Path) -> Iterator[dict]:
     """
     Reads the data saved in the log html and provides decoded messages (dicts).
@@ -798,38 +1012,54 @@ def iter_decoded_log_format_from_log_html_contents(
         releases.
     """
     import base64
+    import codecs
     import zlib
     from ast import literal_eval
 
     i = log_html_contents.find("let chunks = [")
     j = log_html_contents.find("];", i)
 
-    if i < 0 or j < 0:
-        # It may be that we're in dev mode and the target should be the bundle.js
-        if log_html is None:
-            raise AssertionError("Unable to find chunks in log html contents.")
+    if i < 0 and "window.robocorpLogChunks" in log_html_contents:
+        # The log.html was updated during the run (each chunk is in a script
+        # appended to the log.html).
+        import re
 
-        bundle_js = log_html.parent / "bundle.js"
-        if bundle_js.exists():
-            log_html_contents = bundle_js.read_text(encoding="utf-8")
-            i = log_html_contents.find("let chunks = [")
-            j = log_html_contents.find("];", i)
-
-    assert i > 0, (
-        f"Could not find the chunks in the file ({log_html or '<log_html_not_provided>'})."
-    )
-    assert j > 0, "Could not find the end of the chunks in the file."
+        lst = re.findall(
+            r'robocorpLogChunks\|\|\[\]\)\.push\("([^"]*)"\);</script>',
+            log_html_contents,
+        )
+    else:
+        if i < 0 or j < 0:
+            # It may be that we're in dev mode and the target should be the
+            # bundle.js
+            if log_html is None:
+                raise AssertionError("Unable to find chunks in log html contents.")
+
+            bundle_js = log_html.parent / "bundle.js"
+            if bundle_js.exists():
+                log_html_contents = bundle_js.read_text(encoding="utf-8")
+                i = log_html_contents.find("let chunks = [")
+                j = log_html_contents.find("];", i)
+
+        assert i > 0, (
+            f"Could not find the chunks in the file ({log_html or '<log_html_not_provided>'})."
+        )
+        assert j > 0, "Could not find the end of the chunks in the file."
 
-    sub = log_html_contents[i + len("let chunks = ") : j + 1]
-    # We have something as:
-    # ['base64strZippedStr', 'base64strZippedStr']
-    # so, at this point decode it and unzip it
-    lst = literal_eval(sub)
+        sub = log_html_contents[i + len("let chunks = ") : j + 1]
+        # We have something as:
+        # ['base64strZippedStr', 'base64strZippedStr']
+        # so, at this point decode it and unzip it
+        lst = literal_eval(sub)
 
+    # Note: a chunk may end in the middle of a multi-byte char (so, an
+    # incremental decoder is needed).
+    decoder = codecs.getincrementaldecoder("utf-8")()
     stream = StringIO()
     for s in lst:
         decoded = zlib.decompress(base64.b64decode(s))
-        stream.write(decoded.decode("utf-8"))
+        stream.write(decoder.decode(decoded))
+    stream.write(decoder.decode(b"", final=True))
 
     stream.seek(0)
     # Uncomment to see contents loaded.
@@ -1000,7 +1230,7 @@ def verify_log_messages_from_log_html(
 
 
 def verify_log_messages_from_stream(
-    stream: IReadLines,
+    stream: Union[IReadLines, Iterable[str], BinaryIO],
     expected: Sequence[dict],
     not_expected: Sequence[dict] = _DEFAULT_NOT_EXPECTED,
 ) -> Sequence[dict]:
@@ -1054,6 +1284,8 @@ class IContextManager(Protocol):
 
 OutStreamName = Literal["stdout", "stderr"]
 
+LoopIterationsLogEvery = Literal["adaptive"]
+
 
 def setup_log(
     *,
@@ -1069,6 +1301,9 @@ def setup_log(
             ],
         ]
     ] = None,
+    loop_iterations_log_first: Optional[int] = None,
+    loop_iterations_log_every: Optional[Union[int, LoopIterationsLogEvery]] = None,
+    resource_sample_interval: Optional[float] = None,
 ) -> IContextManager:
     """
     Setups the log "general" settings.
@@ -1108,6 +1343,34 @@ def setup_log(
             a literal (`"stdout"` or `"stderr"`) as if the stream is redirected it'll
             still print to the current `sys.stdout` / `sys.stderr`.
 
+        loop_iterations_log_first: If given, only the first N iterations of
+            `for` and `while` loops are logged (and then only the iterations
+            selected by `loop_iterations_log_every`). When iterations are
+            skipped, a message with the total number of iterations and the
+            time taken is added at the end of the loop.
+
+            Failing iterations are always logged.
+
+            By default all the iterations are logged.
+
+        loop_iterations_log_every: After the first iterations, log every
+            Nth iteration or `"adaptive"` to log iterations with an exponential
+            backoff (i.e.: with `loop_iterations_log_first=10` the iterations
+            11, 12, 14, 18, 26, ... are logged).
+
+            The default value for this setting is `0` (no other iteration is
+            logged after the first iterations).
+
+        resource_sample_interval: If given (and > 0), the resources used by
+            the process (memory, cpu, open files, threads and child processes)
+            are sampled in a background thread with this interval (in seconds)
+            and added to the log (where those are shown as a chart along with
+            the elements running when each sample was taken).
+
+            Passing `0` stops the sampling.
+
+            By default the resources aren't sampled.
+
     Returns:
         A context manager, so, it's possible to use this method with a `with statement`
         so that the configuration is reverted to a previous configuration when
@@ -1146,6 +1409,25 @@ def setup_log(
             output_stream={'warn': 'stdout', 'critical': 'stderr'}
         )
         ```
+
+    Example:
+
+        Logging only the first 10 iterations of loops and then every 100th
+        iteration:
+
+        ```python
+        from robocorp import log
+        log.setup_log(loop_iterations_log_first=10, loop_iterations_log_every=100)
+        ```
+
+    Example:
+
+        Sampling the resources used by the process every 2 seconds:
+
+        ```python
+        from robocorp import log
+        log.setup_log(resource_sample_interval=2)
+        ```
     """
     prev_values: dict = {}
 
@@ -1180,6 +1462,52 @@ def setup_log(
         prev_values["output_stream"] = _config._general_log_config.output_stream
         _config._general_log_config.output_stream = output_stream
 
+    if loop_iterations_log_first is not None:
+        if not isinstance(loop_iterations_log_first, int) or (
+            loop_iterations_log_first < 0
+        ):
+            raise ValueError(
+                "Expected loop_iterations_log_first to be an int >= 0. "
+                f"Found: {loop_iterations_log_first!r}."
+            )
+        prev_values["loop_iterations_log_first"] = (
+            _config._general_log_config.loop_iterations_log_first
+        )
+        _config._general_log_config.loop_iterations_log_first = (
+            loop_iterations_log_first
+        )
+
+    if loop_iterations_log_every is not None:
+        if loop_iterations_log_every != "adaptive" and (
+            not isinstance(loop_iterations_log_every, int)
+            or loop_iterations_log_every < 0
+        ):
+            raise ValueError(
+                'Expected loop_iterations_log_every to be an int >= 0 or "adaptive". '
+                f"Found: {loop_iterations_log_every!r}."
+            )
+        prev_values["loop_iterations_log_every"] = (
+            _config._general_log_config.loop_iterations_log_every
+        )
+        _config._general_log_config.loop_iterations_log_every = (
+            loop_iterations_log_every
+        )
+
+    if resource_sample_interval is not None:
+        if (
+            not isinstance(resource_sample_interval, (int, float))
+            or isinstance(resource_sample_interval, bool)
+            or resource_sample_interval < 0
+        ):
+            raise ValueError(
+                "Expected resource_sample_interval to be a number >= 0. "
+                f"Found: {resource_sample_interval!r}."
+            )
+        prev_values["resource_sample_interval"] = (
+            _config._general_log_config.resource_sample_interval
+        )
+        _config._general_log_config.resource_sample_interval = resource_sample_interval
+
     from ._on_exit_context_manager import OnExitContextManager
 
     def on_exit():
@@ -1189,6 +1517,46 @@ def setup_log(
     return OnExitContextManager(on_exit)
 
 
+def register_repr(
+    obj_type: type, repr_func: Callable[[Any, int], str]
+) -> IContextManager:
+    """
+    Registers a function to provide the representation of objects of the
+    given type (and its subclasses) when they're logged (i.e.: as method
+    arguments, assigns, return values, etc.).
+
+    This is useful to provide a faster/smaller representation than `repr(obj)`
+    for big objects (by default `repr(obj)` is used for objects which aren't
+    builtin containers, strings or bytes).
+
+    Args:
+        obj_type: The type of the objects to be represented with `repr_func`.
+        repr_func: A function which receives the object and the maximum
+            number of chars to be used in the representation (if a bigger
+            string is returned it's clipped) and returns its representation.
+
+    Returns:
+        A context manager, so, it's possible to use this method with a
+        `with statement` so that the function is unregistered when the
+        context manager exits.
+
+    Example:
+
+        ```python
+        from robocorp import log
+
+        def repr_matrix(matrix, max_size):
+            return f"<Matrix {matrix.rows}x{matrix.cols}>"
+
+        log.register_repr(Matrix, repr_matrix)
+        ```
+    """
+    from ._bounded_repr import register_repr as _register_repr
+    from ._on_exit_context_manager import OnExitContextManager
+
+    return OnExitContextManager(_register_repr(obj_type, repr_func))
+
+
 def setup_auto_logging(
     config: Optional[AutoLogConfigBase] = None, add_rewrite_hook: bool = True
 ):
@@ -1229,6 +1597,18 @@ def add_log_output(
     log_html: Optional[Union[str, Path]] = None,
     log_html_style: LogHTMLStyle = "standalone",
     min_messages_per_file: int = 50,
+    buffer_size: Union[str, int] = 0,
+    flush_interval: float = 1.0,
+    write_in_thread: bool = False,
+    max_queue_size: int = 10_000,
+    queue_overflow: QueueOverflowPolicy = "block",
+    log_html_compression_level: int = 6,
+    log_html_update_interval: float = 0,
+    output_format: OutputFormat = "text",
+    write_index: bool = False,
+    profile: bool = False,
+    memo_max_size: Union[str, int] = 0,
+    memo_max_entry_size: Union[str, int] = 0,
 ):
     """
     Adds a log output which will write the contents to the given output directory.
@@ -1255,6 +1635,70 @@ def add_log_output(
             this may make the max_file_size be surpassed). This is needed to
             prevent a case where a whole new file could be created after just
             a single message if the message was too big for the max file size.
+        buffer_size: If 0 (default) each message is flushed to the file as soon
+            as it's written. Otherwise messages are buffered in memory and are
+            only written to the file when the buffer reaches the given size (as
+            a string with the value and the unit -- i.e.: `"64kb"`), when
+            `flush_interval` seconds elapse, when the file is rotated, when a
+            task finishes, when the output is closed or when the process exits.
+        flush_interval: The maximum time (in seconds) that a message may be
+            kept in the buffer before being flushed to the file (only used when
+            `buffer_size` is given).
+        write_in_thread: If True the serialization, redaction, memoization and
+            file I/O are done in a separate thread (the instrumented code just
+            enqueues the messages to be written).
+            Messages are fully written when the output is closed (i.e.: when
+            `close_log_outputs()` is called).
+        max_queue_size: The maximum number of messages which may be waiting
+            to be written (only used when `write_in_thread` is True).
+        queue_overflow: What to do when the queue is full (only used when
+            `write_in_thread` is True):
+            "block": the instrumented code waits until there's space in
+            the queue.
+            "drop": messages (log messages, assigns, returns, console messages)
+            are discarded -- messages which start or end an element are never
+            discarded. A warning with the number of dropped messages is added
+            when the output is closed.
+        log_html_compression_level: The zlib compression level (from 0 to 9 or
+            -1 for the zlib default) used for the contents embedded in the
+            log.html (lower levels are faster and higher levels provide a
+            smaller log.html).
+        log_html_update_interval: If 0 (default) the log.html is only written
+            when the output is closed. Otherwise the log.html is written when
+            the output is added and the new contents are appended to it every
+            `log_html_update_interval` seconds (and when a task finishes), so,
+            the log.html is available even if the process is killed and it may
+            be reloaded in the browser to follow the progress of a long run.
+            Note: if log files are removed due to `max_files` the log.html is
+            fully rewritten when the output is closed.
+        output_format: The format of the `.robolog` files: "text" (default) or
+            "binary" (the same messages encoded as binary records, which are
+            smaller and faster to write and decode). Binary files are decoded
+            by the same APIs which decode the text format (i.e.:
+            `iter_decoded_log_format_from_output_dir`) and are converted to
+            the text format when embedded in the log.html.
+        write_index: If True an index is written along with each `.robolog` file
+            (`output.robolog.index`, ...) with the offsets of the tasks, of the
+            elements which failed and checkpoints of the memos, so that a task
+            (or a failure) can be decoded without decoding the whole file
+            (see: `iter_log_index_entries` and
+            `iter_decoded_log_format_from_range`).
+        profile: If True the timings of the logged methods are aggregated while
+            running (call count, total time, self time -- which excludes the
+            time of the methods called -- and p50/p95/max of each call) and,
+            when the run finishes, a report is written to `profile.json` in the
+            output directory and a summary is added to the log.
+        memo_max_size: If 0 (default) all the strings and locations written
+            are kept in memory so that each one is written only once in each
+            `.robolog` file (and referenced by an id afterwards). Otherwise
+            those are kept in a least recently used cache which uses up to
+            (approximately) the given size (as a string with the value and the
+            unit -- i.e.: `"32mb"`) and the entries evicted are written again
+            if used afterwards (so, the memory doesn't grow in long runs
+            which log many different messages).
+        memo_max_entry_size: If given, strings bigger than this size (as a
+            string with the value and the unit -- i.e.: `"4kb"`) are not kept
+            in memory (they're written again whenever used).
 
     Note:
         It's Ok to add more than one log output, but if 2 log outputs point
@@ -1274,13 +1718,23 @@ def add_log_output(
         log_html,
         log_html_style=log_html_style,
         min_messages_per_file=min_messages_per_file,
+        buffer_size=buffer_size,
+        flush_interval=flush_interval,
+        write_in_thread=write_in_thread,
+        max_queue_size=max_queue_size,
+        queue_overflow=queue_overflow,
+        log_html_compression_level=log_html_compression_level,
+        log_html_update_interval=log_html_update_interval,
+        output_format=output_format,
+        write_index=write_index,
+        profile=profile,
+        memo_max_size=memo_max_size,
+        memo_max_entry_size=memo_max_entry_size,
     )
-    with _get_logger_instances() as logger_instances:
-        logger_instances[logger] = 1
+    _add_logger_instance(logger)
 
     def _exit():
-        with _get_logger_instances() as logger_instances:
-            logger_instances.pop(logger, None)
+        if _remove_logger_instance(logger):
             logger.close()
 
     return OnExitContextManager(_exit)
@@ -1295,12 +1749,12 @@ def close_log_outputs():
     """
     while True:
         with _get_logger_instances() as logger_instances:
-            if logger_instances:
-                logger = next(iter(logger_instances))
-                logger_instances.pop(logger, None)
-                logger.close()
-            else:
+            if not logger_instances:
                 break
+            logger = next(iter(logger_instances))
+
+        if _remove_logger_instance(logger):
+            logger.close()
 
 
 def add_in_memory_log_output(write: Callable[[str], Any]):
@@ -1320,12 +1774,10 @@ def add_in_memory_log_output(write: Callable[[str], Any]):
 
     logger = _RoboLogger(__write__=write)
 
-    with _get_logger_instances() as logger_instances:
-        logger_instances[logger] = 1
+    _add_logger_instance(logger)
 
     def _exit():
-        with _get_logger_instances() as logger_instances:
-            logger_instances.pop(logger, None)
+        if _remove_logger_instance(logger):
             logger.close()
 
     return OnExitContextManager(_exit)
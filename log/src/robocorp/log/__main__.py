@@ -0,0 +1,6 @@
+if __name__ == "__main__":
+    import sys
+
+    from robocorp.log._precompile import main
+
+    sys.exit(main())
@@ -1,7 +1,8 @@
 import sys
 import threading
+import typing
 from functools import partial
-from typing import Any, List, Optional, Sequence, Tuple
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
 
 from robocorp.log import critical, is_sensitive_variable_name
 from robocorp.log._log_redacter import _log_redacter
@@ -17,6 +18,9 @@ try:
 except Exception:
     greenlet = None
 
+if typing.TYPE_CHECKING:
+    from ._rewrite_importhook import ImportHookStats
+
 
 def _get_obj_type_and_repr_and_hide_if_needed(key, val) -> Tuple[str, str]:
     obj_type, obj_repr = get_obj_type_and_repr(val)
@@ -30,6 +34,40 @@ def _get_obj_type_and_repr_and_hide_if_needed(key, val) -> Tuple[str, str]:
     return obj_type, obj_repr
 
 
+def _accepts_variables(logger_instances) -> bool:
+    for robo_logger in logger_instances:
+        if robo_logger.accepts_variables():
+            return True
+    return False
+
+
+def _hide_sensitive_values(variables: Iterable[Tuple[str, Any]]) -> None:
+    # Even if the variables aren't logged, the values of sensitive variables
+    # must still be hidden (as they could be logged afterwards).
+    for key, val in variables:
+        if is_sensitive_variable_name(key):
+            _get_obj_type_and_repr_and_hide_if_needed(key, val)
+
+
+def _get_variables_repr(
+    logger_instances, variables: Iterable[Tuple[str, Any]]
+) -> List[Tuple[str, str, str]]:
+    """
+    Provides the (name, type, repr) for the given variables (the repr is only
+    computed if some logger would actually record it, otherwise an empty list
+    is returned).
+    """
+    if not _accepts_variables(logger_instances):
+        _hide_sensitive_values(variables)
+        return []
+
+    variables_name_type_repr = []
+    for key, val in variables:
+        obj_type, obj_repr = _get_obj_type_and_repr_and_hide_if_needed(key, val)
+        variables_name_type_repr.append((f"{key}", obj_type, obj_repr))
+    return variables_name_type_repr
+
+
 class _StackEntry:
     __slots__ = "mod_name name status".split()
 
@@ -61,6 +99,20 @@ def remove_import_hook(import_hook):
     sys.meta_path.remove(import_hook)
 
 
+def get_import_hook_stats() -> Optional["ImportHookStats"]:
+    """
+    Returns:
+        The stats of the time added to the imports by the RewriteHook (or None
+        if it's not installed).
+    """
+    from ._rewrite_importhook import RewriteHook
+
+    for curr in sys.meta_path:
+        if isinstance(curr, RewriteHook):
+            return curr.stats
+    return None
+
+
 class _AutoLogging:
     """
     Class responsible for listening for callbacks and then dispatching those
@@ -71,7 +123,8 @@ class _AutoLogging:
         from ._rewrite_importhook import RewriteHook
 
         self.tid = threading.get_ident()
-        self.status_stack: List[_StackEntry] = []
+        # Each thread has its own stack.
+        self._tlocal = threading.local()
         self._rewrite_hook_config = rewrite_hook_config
         self._hook: Optional[RewriteHook] = None
 
@@ -82,16 +135,26 @@ class _AutoLogging:
         except Exception:
             pass
 
+    @property
+    def status_stack(self) -> List[_StackEntry]:
+        try:
+            return self._tlocal.status_stack
+        except AttributeError:
+            status_stack: List[_StackEntry] = []
+            self._tlocal.status_stack = status_stack
+            return status_stack
+
     def _is_same_thread_greenlet(self):
+        # Greenlets switch in the same thread, so, only the greenlet where
+        # the auto-logging was created (or the main greenlet of some other
+        # thread) is logged.
         if self.tid != threading.get_ident():
-            return False
+            return greenlet.getcurrent().parent is None
 
         return self._greenlet_curr == greenlet.getcurrent()
 
     def _is_same_thread(self):
-        if self.tid != threading.get_ident():
-            return False
-
+        # Each thread has its own stack (so, all threads are logged).
         return True
 
     def register(self, add_rewrite_hook: bool = True) -> None:
@@ -124,7 +187,7 @@ class _AutoLogging:
         filename: str,
         name: str,
         lineno: int,
-        args: List[Tuple[str, str, str]],
+        variables: Iterable[Tuple[str, Any]],
     ) -> None:
         if not self._is_same_thread():
             return
@@ -137,6 +200,11 @@ class _AutoLogging:
             self.status_stack.append(_StackEntry(mod_name, name, "PASS"))
 
         with _get_logger_instances() as logger_instances:
+            if not logger_instances:
+                _hide_sensitive_values(variables)
+                return
+
+            args = _get_variables_repr(logger_instances, variables)
             for robo_logger in logger_instances:
                 robo_logger.start_element(
                     name,
@@ -157,13 +225,9 @@ class _AutoLogging:
         lineno: int,
         args_dict: dict,
     ) -> None:
-        if not self._is_same_thread():
-            return
-        args: List[Tuple[str, str, str]] = []
-        for key, val in args_dict.items():
-            obj_type, obj_repr = _get_obj_type_and_repr_and_hide_if_needed(key, val)
-            args.append((f"{key}", obj_type, obj_repr))
-        self._call_before_element(method_type, mod_name, filename, name, lineno, args)
+        self._call_before_element(
+            method_type, mod_name, filename, name, lineno, args_dict.items()
+        )
 
     def call_before_iterate_step(
         self,
@@ -174,14 +238,9 @@ class _AutoLogging:
         lineno: int,
         targets: Sequence[Tuple[str, Any]],
     ) -> None:
-        if not self._is_same_thread():
-            return
-        args: List[Tuple[str, str, str]] = []
-        if targets is not None:
-            for key, val in targets:
-                obj_type, obj_repr = _get_obj_type_and_repr_and_hide_if_needed(key, val)
-                args.append((f"{key}", obj_type, obj_repr))
-        self._call_before_element(method_type, mod_name, filename, name, lineno, args)
+        self._call_before_element(
+            method_type, mod_name, filename, name, lineno, targets or ()
+        )
 
     def call_before_if(
         self,
@@ -192,14 +251,9 @@ class _AutoLogging:
         lineno: int,
         targets: Sequence[Tuple[str, Any]],
     ) -> None:
-        if not self._is_same_thread():
-            return
-        args: List[Tuple[str, str, str]] = []
-        if targets is not None:
-            for key, val in targets:
-                obj_type, obj_repr = _get_obj_type_and_repr_and_hide_if_needed(key, val)
-                args.append((f"{key}", obj_type, obj_repr))
-        self._call_before_element(method_type, mod_name, filename, name, lineno, args)
+        self._call_before_element(
+            method_type, mod_name, filename, name, lineno, targets or ()
+        )
 
     def call_before_else(
         self,
@@ -210,14 +264,9 @@ class _AutoLogging:
         lineno: int,
         targets: Sequence[Tuple[str, Any]],
     ) -> None:
-        if not self._is_same_thread():
-            return
-        args: List[Tuple[str, str, str]] = []
-        if targets is not None:
-            for key, val in targets:
-                obj_type, obj_repr = _get_obj_type_and_repr_and_hide_if_needed(key, val)
-                args.append((f"{key}", obj_type, obj_repr))
-        self._call_before_element(method_type, mod_name, filename, name, lineno, args)
+        self._call_before_element(
+            method_type, mod_name, filename, name, lineno, targets or ()
+        )
 
     def call_before_iterate(
         self,
@@ -266,6 +315,33 @@ class _AutoLogging:
 
     call_after_method = _call_after_element
     call_after_iterate = _call_after_element
+
+    def call_iterate_summary(
+        self,
+        method_type: LogElementType,
+        mod_name: str,
+        filename: str,
+        name: str,
+        lineno: int,
+        iterations: int,
+        logged: int,
+        elapsed: float,
+    ) -> None:
+        if not self._is_same_thread():
+            return
+
+        message = (
+            f"Loop finished after {iterations} iterations in {elapsed:.2f}s "
+            f"({logged} logged, {iterations - logged} skipped)."
+        )
+        with _get_logger_instances() as logger_instances:
+            for robo_logger in logger_instances:
+                # The loop may be inside an iteration which isn't logged.
+                if robo_logger.accepts_methods():
+                    robo_logger.log_message(
+                        Status.INFO, message, False, name, mod_name, filename, lineno
+                    )
+
     call_after_iterate_step = _call_after_element
     call_after_if = _call_after_element
     call_after_else = _call_after_element
@@ -297,9 +373,14 @@ class _AutoLogging:
                 )
                 return
 
-        yielded_value_type, yielded_value_repr = get_obj_type_and_repr(yielded_value)
-
         with _get_logger_instances() as logger_instances:
+            if _accepts_variables(logger_instances):
+                yielded_value_type, yielded_value_repr = get_obj_type_and_repr(
+                    yielded_value
+                )
+            else:
+                yielded_value_type, yielded_value_repr = "", ""
+
             for robo_logger in logger_instances:
                 robo_logger.yield_suspend(
                     name,
@@ -340,13 +421,15 @@ class _AutoLogging:
         if not self._is_same_thread():
             return
 
-        variables_name_type_repr = []
-        if variables is not None:
-            for key, val in variables:
-                obj_type, obj_repr = _get_obj_type_and_repr_and_hide_if_needed(key, val)
-                variables_name_type_repr.append((f"{key}", obj_type, obj_repr))
+        if variables is None:
+            variables = ()
 
         with _get_logger_instances() as logger_instances:
+            if not logger_instances:
+                _hide_sensitive_values(variables)
+                return
+
+            variables_name_type_repr = _get_variables_repr(logger_instances, variables)
             for robo_logger in logger_instances:
                 robo_logger.start_element(
                     name,
@@ -471,11 +554,14 @@ class _AutoLogging:
         if not self._is_same_thread():
             return
 
-        assign_type, assign_repr = _get_obj_type_and_repr_and_hide_if_needed(
-            assign_name, assign_value
-        )
-
         with _get_logger_instances() as logger_instances:
+            if not _accepts_variables(logger_instances):
+                _hide_sensitive_values(((assign_name, assign_value),))
+                return
+
+            assign_type, assign_repr = _get_obj_type_and_repr_and_hide_if_needed(
+                assign_name, assign_value
+            )
             for robo_logger in logger_instances:
                 robo_logger.after_assign(
                     name,
@@ -498,11 +584,13 @@ class _AutoLogging:
         if not self._is_same_thread():
             return
 
-        return_type, return_repr = _get_obj_type_and_repr_and_hide_if_needed(
-            "", return_value
-        )
-
         with _get_logger_instances() as logger_instances:
+            if not _accepts_variables(logger_instances):
+                return
+
+            return_type, return_repr = _get_obj_type_and_repr_and_hide_if_needed(
+                "", return_value
+            )
             for robo_logger in logger_instances:
                 robo_logger.method_return(
                     name,
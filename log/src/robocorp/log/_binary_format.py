@@ -0,0 +1,608 @@
+"""
+Binary encoding of the `.robolog` files (opt-in with
+`log.add_log_output(..., output_format="binary")`).
+
+The messages are the same ones from the text format (see `_decoder_spec.SPEC`)
+and are decoded to the same dicts/records, just encoded differently:
+
+- The file starts with `MAGIC` and then has one record for each message:
+  `varint(len(payload))` followed by the payload.
+- The payload starts with the code of the message type (its index in
+  `MESSAGE_TYPES`) followed by the fields in the order of the spec, where:
+    - `oid`, `loc_id` and `loc_and_doc_id` are the memo ids (as varints).
+    - `int` is a zigzag varint.
+    - `float` (all the floats in the spec are times) is a zigzag varint with
+      the value in milliseconds.
+    - `str`, `json.loads` and `dateisoformat` are the same contents from the
+      text format as utf-8 (prefixed by the length as a varint).
+- `M` has the memo id followed by the memoized string as utf-8 (up to the end
+  of the record, it's not json-encoded).
+- `P` has the memo id followed by the ids of the name, libname, source and
+  docstring and the lineno (zigzag varint).
+
+The viewer only reads the text format, so, binary parts are converted to the
+text format when embedded in the log.html.
+"""
+
+import itertools
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ._decoder import (
+    _MESSAGE_TYPE_FIELDS,
+    _RECORD_CLASSES,
+    Decoder,
+    _decode_dateisoformat,
+    _field_names,
+    _FieldDefinition,
+)
+
+MAGIC = b"\x00ROBOLOG-B1\n"
+
+# The code of a message type is its index in this tuple (new message types
+# must always be added to the end).
+MESSAGE_TYPES = (
+    "V",
+    "I",
+    "ID",
+    "T",
+    "M",
+    "P",
+    "L",
+    "C",
+    "LH",
+    "TH",
+    "SR",
+    "ER",
+    "ST",
+    "ET",
+    "SE",
+    "YR",
+    "YFR",
+    "EE",
+    "R",
+    "YS",
+    "YFS",
+    "AS",
+    "EA",
+    "S",
+    "STB",
+    "TBE",
+    "TBV",
+    "ETB",
+    "SPS",
+    "EPS",
+    "STD",
+    "ETD",
+    "RR",
+    "RT",
+    "RE",
+    "RTB",
+    "RYR",
+    "RYFR",
+    "RPS",
+    "RTD",
+    "RS",
+)
+
+# Codes are always written as a single byte.
+assert len(MESSAGE_TYPES) < 128
+
+_MESSAGE_TYPE_CODES: Dict[str, int] = {
+    message_type: code for code, message_type in enumerate(MESSAGE_TYPES)
+}
+_MEMO_CODE = bytes((_MESSAGE_TYPE_CODES["M"],))
+_PATH_LOCATION_CODE = bytes((_MESSAGE_TYPE_CODES["P"],))
+
+_ID_KINDS = ("oid", "loc_id", "loc_and_doc_id")
+
+# The size of each read when decoding.
+_READ_SIZE = 256 * 1024
+
+_SMALL_VARINTS = tuple(bytes((i,)) for i in range(128))
+
+
+def encode_varint(value: int) -> bytes:
+    if value < 128:
+        return _SMALL_VARINTS[value]
+    if value < 16384:
+        return bytes(((value & 0x7F) | 0x80, value >> 7))
+    if value < 2097152:
+        return bytes(((value & 0x7F) | 0x80, ((value >> 7) & 0x7F) | 0x80, value >> 14))
+
+    out = bytearray()
+    while value >= 128:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Returns:
+        The value read and the position after it.
+
+    Raises:
+        IndexError if the data ends before the varint is complete.
+    """
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 128:
+            return result, pos
+        shift += 7
+
+
+# --- Encoding
+
+
+_ENCODE_TEMPLATE = """
+def encode(args):
+    {args} = args
+{statements}
+    payload = b"".join(({parts}))
+    n = len(payload)
+    return (small_varints[n] if n < 128 else encode_varint(n)) + payload
+"""
+
+_ENCODE_ZIGZAG_TEMPLATE = """
+    v = {value}
+    z{i} = v * 2 if v >= 0 else -v * 2 - 1"""
+
+_ENCODE_STR_TEMPLATE = """
+    b{i} = {value}.encode("utf-8", "replace")
+    n{i} = len(b{i})"""
+
+
+def _varint_expr(value: str) -> str:
+    return f"(small_varints[{value}] if {value} < 128 else encode_varint({value}))"
+
+
+def _create_encoder(
+    message_type: str, fields: List[_FieldDefinition]
+) -> Callable[[Sequence[Any]], bytes]:
+    """
+    Creates the function which encodes the args of a message of the given type
+    (the same args which are joined with `|` in the text format, but where the
+    ids are already encoded as varints -- see: `new_id_generator` -- and
+    numbers are not converted to strings).
+    """
+    args: List[str] = []
+    statements: List[str] = []
+    parts: List[str] = [repr(bytes((_MESSAGE_TYPE_CODES[message_type],)))]
+    for i, (_name, kind) in enumerate(fields):
+        arg = f"a{i}"
+        args.append(arg)
+        if kind in _ID_KINDS:
+            parts.append(arg)
+        elif kind in ("int", "float"):
+            value = f"int({arg})" if kind == "int" else f"round(float({arg}) * 1000)"
+            statements.append(_ENCODE_ZIGZAG_TEMPLATE.format(i=i, value=value))
+            parts.append(_varint_expr(f"z{i}"))
+        elif kind in ("str", "json.loads", "dateisoformat"):
+            statements.append(_ENCODE_STR_TEMPLATE.format(i=i, value=arg))
+            parts.append(_varint_expr(f"n{i}"))
+            parts.append(f"b{i}")
+        else:
+            raise RuntimeError(f"Unexpected: {kind}")
+
+    code = _ENCODE_TEMPLATE.format(
+        args=", ".join(args) + ",",
+        statements="".join(statements),
+        parts=", ".join(parts),
+    )
+    namespace: Dict[str, Any] = {
+        "encode_varint": encode_varint,
+        "small_varints": _SMALL_VARINTS,
+    }
+    exec(compile(code, f"<robolog encoder: {message_type}>", "exec"), namespace)
+    return namespace["encode"]
+
+
+# The function which encodes the args of each message type (the keys are the
+# message types as used by the writer, with the trailing space, i.e.: "SE ").
+ENCODERS: Dict[str, Callable[[Sequence[Any]], bytes]] = {}
+for _message_type in MESSAGE_TYPES:
+    _fields = _MESSAGE_TYPE_FIELDS[_message_type]
+    if _fields is not None:
+        ENCODERS[f"{_message_type} "] = _create_encoder(_message_type, _fields)
+del _message_type, _fields
+
+
+def new_id_generator() -> Iterator[bytes]:
+    """
+    Provides the ids for the memos (already encoded as varints, so, the ids
+    don't need to be encoded again whenever those are referenced).
+    """
+    for i in itertools.count(1):
+        yield encode_varint(i)
+
+
+def encode_memo(memo_id: bytes, s: str) -> bytes:
+    b = s.encode("utf-8", errors="replace")
+    payload = b"".join((_MEMO_CODE, memo_id, b))
+    return encode_varint(len(payload)) + payload
+
+
+def encode_path_location(
+    memo_id: bytes,
+    name_id: bytes,
+    libname_id: bytes,
+    source_id: bytes,
+    doc_id: bytes,
+    lineno: int,
+) -> bytes:
+    payload = b"".join(
+        (
+            _PATH_LOCATION_CODE,
+            memo_id,
+            name_id,
+            libname_id,
+            source_id,
+            doc_id,
+            encode_varint(lineno * 2 if lineno >= 0 else -lineno * 2 - 1),
+        )
+    )
+    return encode_varint(len(payload)) + payload
+
+
+# --- Decoding
+
+
+def _check_magic(stream) -> None:
+    magic = stream.read(len(MAGIC))
+    if magic != MAGIC:
+        raise RuntimeError(
+            f"Expected a binary .robolog stream. Found header: {magic!r}."
+        )
+
+
+def _iter_frames(stream, check_magic: bool = True) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    Provides the payload of each record as `(data, start, end)`.
+
+    Note: a record which is incomplete at the end of the stream (i.e.: the file
+    is still being written) is ignored.
+    """
+    if check_magic:
+        _check_magic(stream)
+
+    read = stream.read
+    data = b""
+    pos = 0
+    while True:
+        chunk = read(_READ_SIZE)
+        if not chunk:
+            return
+        data = data[pos:] + chunk
+        pos = 0
+        size = len(data)
+        while pos < size:
+            b = data[pos]
+            if b < 128:
+                start = pos + 1
+                end = start + b
+            else:
+                try:
+                    length, start = read_varint(data, pos)
+                except IndexError:
+                    break
+                end = start + length
+            if end > size:
+                break
+            yield data, start, end
+            pos = end
+
+
+_DECODE_TEMPLATE = """
+def decode(data, pos, end):
+{statements}
+    return {{{dict_items}}}
+
+def decode_record(data, pos, end):
+{statements}
+    return tuple_new(record_class, ({values},))
+"""
+
+_READ_VARINT_TEMPLATE = """
+    b = data[pos]
+    if b < 128:
+        {var} = b
+        pos += 1
+    else:
+        b2 = data[pos + 1]
+        if b2 < 128:
+            {var} = (b & 0x7F) | (b2 << 7)
+            pos += 2
+        else:
+            b3 = data[pos + 2]
+            if b3 < 128:
+                {var} = (b & 0x7F) | ((b2 & 0x7F) << 7) | (b3 << 14)
+                pos += 3
+            else:
+                {var}, pos = read_varint(data, pos)"""
+
+_READ_STR_TEMPLATE = (
+    _READ_VARINT_TEMPLATE
+    + """
+    {str_var} = data[pos:pos + {var}].decode("utf-8", "replace")
+    pos += {var}"""
+)
+
+# Same as the text decoding: a field which can't be decoded is None.
+_FIELD_TEMPLATE = """
+    try:
+        v{i} = {expr}
+    except Exception:
+        v{i} = None"""
+
+
+def _create_decoders_code(message_type: str, fields: List[_FieldDefinition]) -> Any:
+    statements: List[str] = []
+    items: List[Tuple[str, str]] = [("message_type", "message_type")]
+    for i, (name, kind) in enumerate(fields):
+        if kind in ("loc_id", "loc_and_doc_id"):
+            statements.append(_READ_VARINT_TEMPLATE.format(var=f"i{i}"))
+            statements.append(
+                f"\n    loc{i} = location_memo_get(i{i}, missing_location)"
+            )
+            items.append(("name", f"loc{i}[0]"))
+            items.append(("libname", f"loc{i}[1]"))
+            items.append(("source", f"loc{i}[2]"))
+            if kind == "loc_and_doc_id":
+                items.append(("doc", f"loc{i}[3]"))
+            items.append(("lineno", f"loc{i}[4]"))
+            continue
+
+        if kind == "oid":
+            statements.append(_READ_VARINT_TEMPLATE.format(var=f"i{i}"))
+            statements.append(f"\n    v{i} = memo_get(i{i})")
+        elif kind in ("int", "float"):
+            statements.append(_READ_VARINT_TEMPLATE.format(var=f"u{i}"))
+            statements.append(f"\n    v{i} = (u{i} >> 1) ^ -(u{i} & 1)")
+            if kind == "float":
+                statements.append(f"\n    v{i} = v{i} / 1000")
+        elif kind == "str":
+            statements.append(_READ_STR_TEMPLATE.format(var=f"n{i}", str_var=f"v{i}"))
+        elif kind in ("json.loads", "dateisoformat"):
+            statements.append(_READ_STR_TEMPLATE.format(var=f"n{i}", str_var=f"s{i}"))
+            func = "json_loads" if kind == "json.loads" else "decode_dateisoformat"
+            statements.append(_FIELD_TEMPLATE.format(i=i, expr=f"{func}(s{i})"))
+        else:
+            raise RuntimeError(f"Unexpected: {kind}")
+        items.append((name, f"v{i}"))
+
+    assert [name for name, _value in items[1:]] == _field_names(fields)
+    code = _DECODE_TEMPLATE.format(
+        statements="".join(statements),
+        dict_items=", ".join(f"{name!r}: {value}" for name, value in items),
+        values=", ".join(value for _name, value in items[1:]),
+    )
+    return compile(code, f"<robolog binary decoder: {message_type}>", "exec")
+
+
+# The compiled code of the decoders of each message type (created when
+# first needed and then executed with the memos of each decoder).
+_DECODERS_CODE: Dict[str, Any] = {}
+
+
+def _create_decoder(
+    decoder: Decoder, message_type: str, as_records: bool
+) -> Callable[[bytes, int, int], Any]:
+    if message_type == "M":
+        memo = decoder.memo
+
+        def decode_memo(data, pos, end):
+            memo_id = data[pos]
+            if memo_id < 128:
+                pos += 1
+            else:
+                memo_id, pos = read_varint(data, pos)
+            memo[memo_id] = data[pos:end].decode("utf-8", "replace")
+
+        return decode_memo
+
+    if message_type == "P":
+
+        def decode_path_location(data, pos, end):
+            ids = []
+            for _i in range(5):
+                memo_id, pos = read_varint(data, pos)
+                ids.append(memo_id)
+            lineno, pos = read_varint(data, pos)
+            memo = decoder.memo
+            decoder.location_memo[ids[0]] = (
+                memo[ids[1]],
+                memo[ids[2]],
+                memo[ids[3]],
+                memo[ids[4]],
+                (lineno >> 1) ^ -(lineno & 1),
+            )
+
+        return decode_path_location
+
+    fields = _MESSAGE_TYPE_FIELDS[message_type]
+    assert fields is not None
+    code = _DECODERS_CODE.get(message_type)
+    if code is None:
+        code = _DECODERS_CODE[message_type] = _create_decoders_code(
+            message_type, fields
+        )
+
+    namespace: Dict[str, Any] = {
+        "memo_get": decoder.memo.get,
+        "location_memo_get": decoder.location_memo.get,
+        "missing_location": (None, None, None, None, None),
+        "read_varint": read_varint,
+        "json_loads": json.loads,
+        "decode_dateisoformat": lambda s: _decode_dateisoformat(decoder, s),
+        "tuple_new": tuple.__new__,
+        "record_class": _RECORD_CLASSES[message_type],
+        "message_type": message_type,
+    }
+    exec(code, namespace)
+    return namespace.pop("decode_record" if as_records else "decode")
+
+
+def _decoding_error(message_type: str, e: Exception, as_records: bool) -> Any:
+    if as_records:
+        record_class = _RECORD_CLASSES[message_type]
+        if record_class is None:
+            return None
+        return record_class._make([None] * len(record_class._fields))
+    return {
+        "message_type": message_type,
+        "error": f"Error decoding: {message_type}: {e}",
+    }
+
+
+def iter_decoded_binary_log(
+    stream,
+    as_records: bool = False,
+    decoder: Optional[Decoder] = None,
+    check_magic: bool = True,
+) -> Iterator[Any]:
+    """
+    Decodes a binary `.robolog` stream (opened in binary mode).
+
+    Provides the same dicts (or records if `as_records` is True) as the
+    decoding of the text format.
+
+    Args:
+        decoder: If given the messages are decoded with it (i.e.: with memos
+            restored from an index).
+        check_magic: If False the stream is expected to be positioned at the
+            start of a record (instead of at the start of the file).
+    """
+    if check_magic:
+        _check_magic(stream)
+
+    if decoder is None:
+        decoder = Decoder()
+    decoders: List[Optional[Callable[[bytes, int, int], Any]]] = [None] * len(
+        MESSAGE_TYPES
+    )
+
+    # Note: the same as `_iter_frames`, but inlined as this is the hot loop
+    # when decoding.
+    read = stream.read
+    data = b""
+    pos = 0
+    while True:
+        chunk = read(_READ_SIZE)
+        if not chunk:
+            return
+        data = data[pos:] + chunk
+        pos = 0
+        size = len(data)
+        while pos < size:
+            b = data[pos]
+            if b < 128:
+                start = pos + 1
+                end = start + b
+            else:
+                try:
+                    length, start = read_varint(data, pos)
+                except IndexError:
+                    break
+                end = start + length
+            if end > size:
+                break
+
+            code = data[start]
+            try:
+                decode = decoders[code]
+            except IndexError:
+                raise RuntimeError(f"Unexpected message type code: {code}")
+            if decode is None:
+                decode = decoders[code] = _create_decoder(
+                    decoder, MESSAGE_TYPES[code], as_records
+                )
+
+            pos = end
+            try:
+                decoded = decode(data, start + 1, end)
+            except Exception as e:
+                decoded = _decoding_error(MESSAGE_TYPES[code], e, as_records)
+            if decoded is not None:
+                yield decoded
+
+
+def is_binary_log_file(path) -> bool:
+    with open(path, "rb") as stream:
+        return stream.read(len(MAGIC)) == MAGIC
+
+
+# --- Conversion to the text format
+
+
+def _payload_to_text(data: bytes, pos: int, end: int) -> str:
+    message_type = MESSAGE_TYPES[data[pos]]
+    pos += 1
+    if message_type == "M":
+        memo_id, pos = read_varint(data, pos)
+        s = data[pos:end].decode("utf-8", "replace")
+        return f"M {memo_id}:{json.dumps(s)}\n"
+
+    parts: List[str] = []
+    if message_type == "P":
+        memo_id, pos = read_varint(data, pos)
+        for _i in range(4):
+            i, pos = read_varint(data, pos)
+            parts.append(str(i))
+        lineno, pos = read_varint(data, pos)
+        parts.append(str((lineno >> 1) ^ -(lineno & 1)))
+        return f"P {memo_id}:{'|'.join(parts)}\n"
+
+    fields = _MESSAGE_TYPE_FIELDS[message_type]
+    assert fields is not None
+    for _name, kind in fields:
+        value, pos = read_varint(data, pos)
+        if kind in _ID_KINDS:
+            parts.append(str(value))
+        elif kind == "int":
+            parts.append(str((value >> 1) ^ -(value & 1)))
+        elif kind == "float":
+            parts.append(str(((value >> 1) ^ -(value & 1)) / 1000))
+        else:
+            parts.append(data[pos : pos + value].decode("utf-8", "replace"))
+            pos += value
+    return f"{message_type} {'|'.join(parts)}\n"
+
+
+def record_to_text(record: bytes) -> bytes:
+    """
+    Converts a record (as provided by the `encode_*` functions) to the line
+    with the same message in the text format.
+    """
+    _length, start = read_varint(record, 0)
+    return _payload_to_text(record, start, len(record)).encode(
+        "utf-8", errors="replace"
+    )
+
+
+class TextFromBinaryReader:
+    """
+    Provides the contents of a binary `.robolog` stream converted to the text
+    format (just `read(size)` is available).
+    """
+
+    def __init__(self, stream) -> None:
+        self._frames = _iter_frames(stream)
+        self._pending = bytearray()
+
+    def read(self, size: int) -> bytes:
+        pending = self._pending
+        while len(pending) < size:
+            frame = next(self._frames, None)
+            if frame is None:
+                break
+            pending += _payload_to_text(*frame).encode("utf-8", errors="replace")
+
+        ret = bytes(pending[:size])
+        del pending[:size]
+        return ret
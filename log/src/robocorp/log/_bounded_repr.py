@@ -0,0 +1,334 @@
+"""
+A repr which stops producing output once a given size is reached (in the
+spirit of `reprlib`, but the result is the same as `repr(obj)` unless it'd be
+bigger than the max size, in which case it's clipped).
+
+Builtin containers, str and bytes are handled directly so that a repr of a
+huge object isn't fully built just to be clipped afterwards. Other objects
+use their own `repr(obj)` (note that numpy arrays and pandas objects already
+summarize big contents in their `repr`).
+
+Users may register a repr function for their own types with
+`robocorp.log.register_repr`.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+
+# The repr function registered by users: (obj, max_size) -> str
+ReprFunc = Callable[[Any, int], str]
+
+_Handler = Callable[[Any, "_ReprBuilder"], None]
+
+# Containers with only these types (or small strings) are written directly
+# with a `repr`.
+_ATOMIC_TYPES = frozenset((int, float, bool, type(None)))
+
+# Max chars expected for the repr of one of the _ATOMIC_TYPES.
+_MAX_ATOMIC_REPR_SIZE = 24
+
+_CONTAINER_TYPES = frozenset((list, tuple, set, frozenset, dict))
+
+# Max chars in a repr for each char in a str (i.e.: '\U0001f600').
+_MAX_STR_CHAR_REPR_SIZE = 10
+
+# The number of clipped chars is only computed for strings up to this size.
+_MAX_STR_SIZE_TO_COUNT_CLIPPED = 1_000_000
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+class _ReprBuilder:
+    __slots__ = ["parts", "remaining", "stack_ids", "clipped_chars"]
+
+    def __init__(self, max_size: int) -> None:
+        self.parts: List[str] = []
+        self.remaining = max_size
+
+        # ids of the containers being written (to detect recursion).
+        self.stack_ids: Set[int] = set()
+
+        # The number of chars clipped (if it's possible to compute it).
+        self.clipped_chars: Optional[int] = None
+
+    def write(self, s: str) -> None:
+        remaining = self.remaining
+        if len(s) > remaining:
+            self.parts.append(s[:remaining])
+            self.remaining = 0
+            raise _BudgetExhausted()
+
+        self.parts.append(s)
+        self.remaining = remaining - len(s)
+
+    def write_obj(self, obj: Any) -> None:
+        handler = _get_handler(type(obj))
+        if handler is None:
+            r = repr(obj)
+            if not self.stack_ids and len(r) > self.remaining:
+                # Top-level object: its full repr was built, so, it's known
+                # how much is clipped.
+                self.clipped_chars = len(r) - self.remaining
+            self.write(r)
+        else:
+            handler(obj, self)
+
+
+def _str_repr_size(s: str) -> Optional[int]:
+    """
+    Provides the size of `repr(s)` without computing it (or None if it's
+    not possible to know it cheaply).
+    """
+    if not s.isprintable():
+        return None
+
+    size = len(s) + 2 + s.count("\\")
+    if "'" in s and '"' in s:
+        # Only in this case quotes are escaped.
+        size += s.count("'")
+    return size
+
+
+def _repr_str(obj: str, builder: _ReprBuilder) -> None:
+    remaining = builder.remaining
+    if len(obj) <= remaining:
+        builder.write(repr(obj))
+        return
+
+    if not builder.stack_ids and len(obj) <= _MAX_STR_SIZE_TO_COUNT_CLIPPED:
+        # Top-level string: compute how much was clipped.
+        size = _str_repr_size(obj)
+        if size is not None:
+            builder.clipped_chars = size - remaining
+
+    # Note: the closing quote is removed (the content is clipped).
+    builder.write(repr(obj[: remaining + 1])[:-1])
+
+
+def _repr_bytes(obj: bytes, builder: _ReprBuilder) -> None:
+    remaining = builder.remaining
+    if len(obj) <= remaining:
+        builder.write(repr(obj))
+        return
+    builder.write(repr(obj[: remaining + 1])[:-1])
+
+
+def _repr_bytearray(obj: bytearray, builder: _ReprBuilder) -> None:
+    remaining = builder.remaining
+    if len(obj) <= remaining:
+        builder.write(repr(obj))
+        return
+    builder.write(repr(obj[: remaining + 1])[:-2])
+
+
+def _repr_surely_fits(obj: Any, max_size: int) -> bool:
+    """
+    Checks (cheaply) whether `repr(obj)` surely fits in `max_size` (only
+    builtin containers with atomic items or small strings are accepted).
+
+    Note: the time spent is proportional to `max_size` (as each item adds
+    at least 2 chars), even for recursive structures.
+    """
+    size = 0
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        item = pop()
+        item_type = type(item)
+        if item_type is str or item_type is bytes:
+            size += len(item) * _MAX_STR_CHAR_REPR_SIZE + 5
+        elif item_type in _ATOMIC_TYPES:
+            size += _MAX_ATOMIC_REPR_SIZE
+        elif item_type in _CONTAINER_TYPES:
+            size += 16
+            if size + len(item) * 2 > max_size:
+                return False
+            extend(item)
+            if item_type is dict:
+                extend(item.values())
+        else:
+            return False
+
+        if size > max_size:
+            return False
+    return True
+
+
+def _write_items(
+    builder: _ReprBuilder, obj: Any, items: Any, start: str, end: str
+) -> None:
+    # Fast path (common case): the repr surely fits.
+    if _repr_surely_fits(obj, builder.remaining):
+        builder.write(repr(obj))
+        return
+
+    obj_id = id(obj)
+    if obj_id in builder.stack_ids:
+        builder.write(f"{start}...{end}")
+        return
+
+    builder.stack_ids.add(obj_id)
+    try:
+        builder.write(start)
+        write_obj = builder.write_obj
+        for i, item in enumerate(items):
+            if i:
+                builder.write(", ")
+            write_obj(item)
+        builder.write(end)
+    finally:
+        builder.stack_ids.discard(obj_id)
+
+
+def _repr_list(obj: list, builder: _ReprBuilder) -> None:
+    _write_items(builder, obj, obj, "[", "]")
+
+
+def _repr_tuple(obj: tuple, builder: _ReprBuilder) -> None:
+    if len(obj) == 1:
+        _write_items(builder, obj, obj, "(", ",)")
+    else:
+        _write_items(builder, obj, obj, "(", ")")
+
+
+def _repr_set(obj: set, builder: _ReprBuilder) -> None:
+    if not obj:
+        builder.write("set()")
+    else:
+        _write_items(builder, obj, obj, "{", "}")
+
+
+def _repr_frozenset(obj: frozenset, builder: _ReprBuilder) -> None:
+    if not obj:
+        builder.write("frozenset()")
+    else:
+        _write_items(builder, obj, obj, "frozenset({", "})")
+
+
+def _repr_dict(obj: dict, builder: _ReprBuilder) -> None:
+    # Fast path (common case): the repr surely fits.
+    if _repr_surely_fits(obj, builder.remaining):
+        builder.write(repr(obj))
+        return
+
+    obj_id = id(obj)
+    if obj_id in builder.stack_ids:
+        builder.write("{...}")
+        return
+
+    builder.stack_ids.add(obj_id)
+    try:
+        builder.write("{")
+        write_obj = builder.write_obj
+        for i, (key, value) in enumerate(obj.items()):
+            if i:
+                builder.write(", ")
+            write_obj(key)
+            builder.write(": ")
+            write_obj(value)
+        builder.write("}")
+    finally:
+        builder.stack_ids.discard(obj_id)
+
+
+# Builtin handlers are only used for subclasses which don't override __repr__.
+_builtin_handlers: Dict[type, _Handler] = {
+    str: _repr_str,
+    bytes: _repr_bytes,
+    bytearray: _repr_bytearray,
+    list: _repr_list,
+    tuple: _repr_tuple,
+    set: _repr_set,
+    frozenset: _repr_frozenset,
+    dict: _repr_dict,
+}
+
+# Handlers registered by users (also used for subclasses).
+_user_handlers: Dict[type, _Handler] = {}
+
+# Cache for the handler to be used for a given type (None if `repr` should be
+# used). Note: dicts are replaced instead of changed for thread-safety.
+_handlers_cache: Dict[type, Optional[_Handler]] = dict(_builtin_handlers)
+
+_register_lock = threading.Lock()
+
+
+def _get_handler(cls: type) -> Optional[_Handler]:
+    try:
+        return _handlers_cache[cls]
+    except KeyError:
+        pass
+
+    handler: Optional[_Handler] = None
+    for base in cls.__mro__:
+        handler = _user_handlers.get(base)
+        if handler is not None:
+            break
+
+        handler = _builtin_handlers.get(base)
+        if handler is not None:
+            if cls.__repr__ is not base.__repr__:
+                handler = None
+            break
+
+    _handlers_cache[cls] = handler
+    return handler
+
+
+def register_repr(obj_type: Type, repr_func: ReprFunc) -> Callable[[], None]:
+    """
+    Registers a function to compute the repr of objects of the given type
+    (and its subclasses).
+
+    Returns:
+        A callable to unregister it.
+    """
+
+    def handler(obj: Any, builder: _ReprBuilder) -> None:
+        builder.write(repr_func(obj, builder.remaining))
+
+    global _user_handlers, _handlers_cache
+
+    with _register_lock:
+        _user_handlers = {**_user_handlers, obj_type: handler}
+        _handlers_cache = dict(_builtin_handlers)
+
+    def unregister() -> None:
+        global _user_handlers, _handlers_cache
+
+        with _register_lock:
+            if _user_handlers.get(obj_type) is handler:
+                _user_handlers = {
+                    k: v for k, v in _user_handlers.items() if k is not obj_type
+                }
+                _handlers_cache = dict(_builtin_handlers)
+
+    return unregister
+
+
+def bounded_repr(obj: Any, max_size: int) -> str:
+    """
+    Provides the `repr(obj)`, clipped to `max_size` chars (with a
+    `<clipped ...>` suffix if it was clipped).
+    """
+    obj_type = type(obj)
+    if obj_type in _ATOMIC_TYPES or (
+        obj_type is str and len(obj) * _MAX_STR_CHAR_REPR_SIZE < max_size
+    ):
+        return repr(obj)
+
+    if _repr_surely_fits(obj, max_size):
+        return repr(obj)
+
+    builder = _ReprBuilder(max_size)
+    try:
+        builder.write_obj(obj)
+    except _BudgetExhausted:
+        text = "".join(builder.parts)
+        if builder.clipped_chars is not None:
+            return f"{text} <clipped {builder.clipped_chars} chars>"
+        return f"{text} <clipped>"
+    return "".join(builder.parts)
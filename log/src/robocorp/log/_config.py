@@ -1,15 +1,18 @@
 import enum
 import itertools
+import os
+import re
 import typing
 from dataclasses import dataclass
-from fnmatch import fnmatch
-from functools import partial
-from typing import Callable, Dict, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
 
 from robocorp import log
 
 from .protocols import Status
 
+if TYPE_CHECKING:
+    from ._iterations_sampler import IterationsSampler
+
 
 class FilterKind(enum.Enum):
     # Note: the values are the name which appears in the .pyc cache.
@@ -36,6 +39,9 @@ class GeneralLogConfig:
         "_output_log_level",
         "_accept_output",
         "_output_stream",
+        "loop_iterations_log_first",
+        "loop_iterations_log_every",
+        "_resource_sample_interval",
     ]
 
     _accept: Dict[str, Sequence[str]]
@@ -62,6 +68,13 @@ class GeneralLogConfig:
             "critical": "stderr",
         }
 
+        # Sampling of loop iterations (by default all iterations are logged).
+        self.loop_iterations_log_first: Optional[int] = None
+        self.loop_iterations_log_every: Union[int, "log.LoopIterationsLogEvery"] = 0
+
+        # Sampling of the process resources (disabled by default).
+        self._resource_sample_interval: Optional[float] = None
+
     def _convert_from_internal_log_level(
         self, level: str
     ) -> "log.FilterLogLevelLiterals":
@@ -110,6 +123,17 @@ class GeneralLogConfig:
 
         raise AssertionError(f"Expecting str or dict. Found: {type(output_stream)}.")
 
+    @property
+    def resource_sample_interval(self) -> Optional[float]:
+        return self._resource_sample_interval
+
+    @resource_sample_interval.setter
+    def resource_sample_interval(self, interval: Optional[float]):
+        from . import _resource_sampler
+
+        _resource_sampler.set_interval(interval)
+        self._resource_sample_interval = interval
+
     @property
     def output_log_level(self):
         return self._output_log_level
@@ -168,6 +192,21 @@ class GeneralLogConfig:
         # Note: level from Status.
         return level in self._accept_output
 
+    def create_iterations_sampler(self) -> Optional["IterationsSampler"]:
+        """
+        Returns:
+            The sampler for the iterations of a loop which is starting (or None
+            if all the iterations should be logged).
+        """
+        log_first = self.loop_iterations_log_first
+        log_every = self.loop_iterations_log_every
+        if log_first is None and not log_every:
+            return None
+
+        from ._iterations_sampler import IterationsSampler
+
+        return IterationsSampler(log_first or 0, log_every)
+
 
 # Default instance. Not exposed to clients.
 _general_log_config = GeneralLogConfig()
@@ -178,17 +217,23 @@ class AutoLogConfigBase:
         self,
         rewrite_assigns=True,
         rewrite_yields=True,
+        rewrite_ifs=True,
+        rewrite_loops=True,
+        rewrite_max_function_depth: Optional[int] = None,
     ):
         self.rewrite_assigns = rewrite_assigns
         self.rewrite_yields = rewrite_yields
+        self.rewrite_ifs = rewrite_ifs
+        self.rewrite_loops = rewrite_loops
+        self.rewrite_max_function_depth = rewrite_max_function_depth
 
     def get_rewrite_yields(self) -> bool:
         """
         Returns:
             Whether yield pauses and resumes should be tracked. Note that
-            not tracking those with user code which actually has yields may
-            show weird representations as the contents of the caller of a
-            generator function will show inside the generator.
+            when those aren't tracked the generator functions aren't tracked
+            either (otherwise the contents of the caller of a generator
+            function would show inside the generator).
         """
         return self.rewrite_yields
 
@@ -201,6 +246,46 @@ class AutoLogConfigBase:
         """
         return self.rewrite_assigns
 
+    def get_rewrite_ifs(self) -> bool:
+        """
+        Returns:
+            Whether the `if`/`else` branches taken should be tracked (in
+            modules which are mapped to `FilterKind.full_log`).
+        """
+        return self.rewrite_ifs
+
+    def get_rewrite_loops(self) -> bool:
+        """
+        Returns:
+            Whether `for`/`while` loops (along with their iterations and
+            `continue`/`break` statements) should be tracked (in modules which
+            are mapped to `FilterKind.full_log`).
+        """
+        return self.rewrite_loops
+
+    def get_rewrite_max_function_depth(self) -> Optional[int]:
+        """
+        Returns:
+            If given, functions nested deeper than this (where functions at
+            the module level or methods of classes at the module level have
+            depth 1 and a function defined inside those has depth 2) are not
+            tracked (nor anything inside those).
+        """
+        return self.rewrite_max_function_depth
+
+    def get_rewrite_fingerprint(self) -> str:
+        """
+        Returns:
+            A string which identifies the options which change how the code
+            is rewritten (used as a part of the key of the cached rewritten
+            code). Subclasses which add such options must extend it.
+        """
+        return (
+            f"assigns={self.get_rewrite_assigns()};yields={self.get_rewrite_yields()};"
+            f"ifs={self.get_rewrite_ifs()};loops={self.get_rewrite_loops()};"
+            f"max_function_depth={self.get_rewrite_max_function_depth()}"
+        )
+
     def get_filter_kind_by_module_name(self, module_name: str) -> Optional[FilterKind]:
         """
         Args:
@@ -231,33 +316,117 @@ class AutoLogConfigBase:
         """
 
 
-class _FiterMatch:
-    _match_filter: Callable[[str], bool]
+def _is_pattern(name: str) -> bool:
+    return "*" in name or "[" in name or "?" in name
 
-    def __init__(self, filter: Filter) -> None:  # @ReservedAssignment
-        self._filter = filter
-        name = filter.name
-        self._filter_name = name
 
-        if "*" in name or "[" in name or "?" in name:
-            self._match_filter = partial(self._fnmatch, name)
+def _translate_pattern(pattern: str) -> str:
+    """
+    Translates a fnmatch-style pattern to a regex (same as `fnmatch.translate`
+    but without groups, so that the patterns can be combined in a single
+    regex).
+    """
+    i = 0
+    n = len(pattern)
+    res: List[str] = []
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            res.append(".*")
+        elif c == "?":
+            res.append(".")
+        elif c == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                res.append("\\[")
+            else:
+                stuff = pattern[i:j].replace("\\", "\\\\")
+                i = j + 1
+                if stuff.startswith("!"):
+                    stuff = "^" + stuff[1:]
+                elif stuff.startswith("^"):
+                    stuff = "\\" + stuff
+                res.append(f"[{stuff}]")
         else:
-            self._match_filter = self._match_module_name
-
-        self._kind = filter.kind
+            res.append(re.escape(c))
+    return "".join(res)
 
-    def _fnmatch(self, pattern: str, module_name: str) -> bool:
-        return fnmatch(module_name, pattern)
 
-    def _match_module_name(self, module_name: str) -> bool:
-        return self._filter_name == module_name or module_name.startswith(
-            self._filter_name + "."
-        )
+class _FilterMatcher:
+    """
+    Provides the kind of the first filter (in the given order) which matches
+    a module name.
+
+    Names are matched with a trie of the parts of the module name (a name
+    matches the module and its submodules) and fnmatch-style patterns are
+    matched with a single regex (with one alternative per pattern, in the same
+    order of the filters, so, the first alternative which matches is the one
+    with the higher priority).
+    """
 
-    def get_filter_kind_match(self, module_name: str) -> Optional[FilterKind]:
-        if self._match_filter(module_name):
-            return self._kind
-        return None
+    def __init__(self, filters: Sequence[Filter]) -> None:
+        self._kinds = [f.kind for f in filters]
+
+        # part -> [children, index of the filter matched at this part or None]
+        self._trie: Dict[str, List[Any]] = {}
+
+        # The regex group -> index of the filter.
+        self._group_to_index: List[int] = [-1]
+        patterns: List[str] = []
+
+        for i, f in enumerate(filters):
+            name = f.name
+            if _is_pattern(name):
+                patterns.append(f"({_translate_pattern(name)})")
+                self._group_to_index.append(i)
+            else:
+                children = self._trie
+                node: List[Any] = []
+                for part in name.split("."):
+                    node = children.setdefault(part, [{}, None])
+                    children = node[0]
+                if node[1] is None:
+                    node[1] = i
+
+        self._regex: Optional[re.Pattern] = None
+        if patterns:
+            flags = re.DOTALL
+            if os.path.normcase("A") == "a":
+                # Same as fnmatch (case-insensitive on Windows).
+                flags |= re.IGNORECASE
+            self._regex = re.compile("|".join(patterns), flags)
+
+    def get_filter_kind(self, module_name: str) -> Optional[FilterKind]:
+        kinds = self._kinds
+        best = len(kinds)
+
+        children = self._trie
+        for part in module_name.split("."):
+            node = children.get(part)
+            if node is None:
+                break
+            index = node[1]
+            if index is not None and index < best:
+                best = index
+            children = node[0]
+
+        regex = self._regex
+        if regex is not None:
+            m = regex.fullmatch(module_name)
+            if m is not None:
+                index = self._group_to_index[typing.cast(int, m.lastindex)]
+                if index < best:
+                    best = index
+
+        if best == len(kinds):
+            return None
+        return kinds[best]
 
 
 class DefaultAutoLogConfig(AutoLogConfigBase):
@@ -302,8 +471,17 @@ class DefaultAutoLogConfig(AutoLogConfigBase):
         rewrite_assigns=True,
         rewrite_yields=True,
         default_library_filter_kind=FilterKind.log_on_project_call,
+        rewrite_ifs=True,
+        rewrite_loops=True,
+        rewrite_max_function_depth: Optional[int] = None,
     ):
-        super().__init__(rewrite_assigns=rewrite_assigns, rewrite_yields=rewrite_yields)
+        super().__init__(
+            rewrite_assigns=rewrite_assigns,
+            rewrite_yields=rewrite_yields,
+            rewrite_ifs=rewrite_ifs,
+            rewrite_loops=rewrite_loops,
+            rewrite_max_function_depth=rewrite_max_function_depth,
+        )
 
         high_priority_filters = [
             # Make sure we don't log things internal to robocorp.log.
@@ -351,18 +529,15 @@ class DefaultAutoLogConfig(AutoLogConfigBase):
             high_priority_filters.append(Filter("robocorp.tasks", FilterKind.exclude))
 
         self._filters = filters
-        self._filter_matches = [
-            _FiterMatch(f)
-            for f in itertools.chain(
-                high_priority_filters, filters, low_priority_filters
-            )
-        ]
+        self._filter_matcher = _FilterMatcher(
+            list(itertools.chain(high_priority_filters, filters, low_priority_filters))
+        )
         self._cache_modname_to_kind: Dict[str, Optional[FilterKind]] = {}
         self._cache_filename_to_kind: Dict[str, FilterKind] = {}
         self._default_library_filter_kind = default_library_filter_kind
 
     def _to_dict(self):
-        return {
+        ret = {
             "log_filter_rules": [
                 {"name": f.name, "kind": str(f.kind).split(".")[-1]}
                 for f in self._filters
@@ -371,6 +546,17 @@ class DefaultAutoLogConfig(AutoLogConfigBase):
                 "."
             )[-1],
         }
+        # The rewrite options are only shown if changed from the default.
+        for key, value, default in (
+            ("rewrite_assigns", self.rewrite_assigns, True),
+            ("rewrite_yields", self.rewrite_yields, True),
+            ("rewrite_ifs", self.rewrite_ifs, True),
+            ("rewrite_loops", self.rewrite_loops, True),
+            ("rewrite_max_function_depth", self.rewrite_max_function_depth, None),
+        ):
+            if value != default:
+                ret[key] = value
+        return ret
 
     def __repr__(self):
         import json
@@ -392,11 +578,7 @@ class DefaultAutoLogConfig(AutoLogConfigBase):
         :return: True if it should be excluded, False if it should be included
             and None if no rule matched the given file.
         """
-        for filter_match in self._filter_matches:
-            filter_kind_match = filter_match.get_filter_kind_match(module_name)
-            if filter_kind_match is not None:
-                return filter_kind_match
-        return None
+        return self._filter_matcher.get_filter_kind(module_name)
 
     def _get_modname_filter_kind(self, module_name: str) -> Optional[FilterKind]:
         cache_key = module_name
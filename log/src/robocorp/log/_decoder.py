@@ -1,7 +1,25 @@
 import datetime
+import io
 import json
+import re
+import typing
+import weakref
+from collections import namedtuple
+from functools import partial
 from logging import getLogger
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from .protocols import IReadLines
 
@@ -15,12 +33,103 @@ Location = Tuple[str, str, str, str, int]
 _LOGGER = getLogger(__name__)
 
 
+class LogRecord(tuple):
+    """
+    Base class of the records provided when decoding (each message type has
+    its own namedtuple subclass of this class with the fields of the message
+    and the `message_type` as a class attribute).
+    """
+
+    __slots__ = ()
+
+    message_type: str
+    _fields: Tuple[str, ...]
+
+    if typing.TYPE_CHECKING:
+
+        def _asdict(self) -> Dict[str, Any]:
+            pass
+
+        def __getattr__(self, name: str) -> Any:
+            pass
+
+
 class Decoder:
     def __init__(self) -> None:
         self.memo: Dict[str, str] = {}
         self.location_memo: Dict[str, Location] = {}
 
+        # message_type -> functions which decode the message with the memos
+        # of this decoder (created when the message type is first found).
+        self._fast_decoders: Dict[str, Callable[[str], Optional[dict]]] = {}
+        self._fast_record_decoders: Dict[str, Callable[[str], Any]] = {}
+
     def decode_message_type(self, message_type: str, message: str) -> Optional[dict]:
+        fast_decode = self._fast_decoders.get(message_type)
+        if fast_decode is None:
+            fast_decode = self._create_fast_decoders(message_type)[0]
+
+        try:
+            return fast_decode(message)
+        except Exception:
+            # Some field is missing or couldn't be decoded: use the generic
+            # decoding (which reports errors in the returned dict).
+            return self._decode_message_type_generic(message_type, message)
+
+    def decode_message_type_as_record(
+        self, message_type: str, message: str
+    ) -> Optional[LogRecord]:
+        """
+        Same as `decode_message_type` but provides a record (a namedtuple with
+        the same fields of the dict and a `message_type` class attribute).
+
+        Fields which couldn't be decoded are None.
+        """
+        fast_decode = self._fast_record_decoders.get(message_type)
+        if fast_decode is None:
+            fast_decode = self._create_fast_decoders(message_type)[1]
+
+        try:
+            return fast_decode(message)
+        except Exception:
+            return self._decode_message_type_as_record_generic(message_type, message)
+
+    def _create_fast_decoders(
+        self, message_type: str
+    ) -> Tuple[Callable[[str], Optional[dict]], Callable[[str], Any]]:
+        # Raises KeyError for unknown message types.
+        fields = _MESSAGE_TYPE_FIELDS[message_type]
+
+        # Note: a proxy is used so that there's no cycle (the memos of a
+        # decoder may be big, so, they should be freed as soon as the decoder
+        # isn't used anymore).
+        decoder_proxy = weakref.proxy(self)
+        fast_decoders: Tuple[Callable[[str], Any], Callable[[str], Any]]
+        if fields is None:
+            fast_decode = partial(_MESSAGE_TYPE_INFO[message_type], decoder_proxy)
+            fast_decoders = (fast_decode, fast_decode)
+
+        else:
+            fast_decoders = _create_fast_decoders(decoder_proxy, message_type, fields)
+
+        self._fast_decoders[message_type] = fast_decoders[0]
+        self._fast_record_decoders[message_type] = fast_decoders[1]
+        return fast_decoders
+
+    def _decode_message_type_as_record_generic(
+        self, message_type: str, message: str
+    ) -> Optional[LogRecord]:
+        decoded = self._decode_message_type_generic(message_type, message)
+        record_class = _RECORD_CLASSES[message_type]
+        if decoded is None or record_class is None:
+            return None
+        return record_class._make(
+            [decoded.get(field) for field in record_class._fields]
+        )
+
+    def _decode_message_type_generic(
+        self, message_type: str, message: str
+    ) -> Optional[dict]:
         handler = _MESSAGE_TYPE_INFO[message_type]
         ret = {"message_type": message_type}
         try:
@@ -152,6 +261,127 @@ def _decode(message_definition: str) -> Callable[[Decoder, str], Any]:
     return dec_impl
 
 
+# (name, decode) for each field in a message definition.
+_FieldDefinition = Tuple[str, str]
+
+
+def _parse_message_definition(message_definition: str) -> List[_FieldDefinition]:
+    fields: List[_FieldDefinition] = []
+    for s in message_definition.split(","):
+        name, decode = s.strip().split(":", 1)
+        fields.append((name, decode))
+    return fields
+
+
+def _field_names(fields: List[_FieldDefinition]) -> List[str]:
+    """
+    Provides the names of the fields as provided in the decoded dicts (the
+    location is expanded to multiple fields).
+    """
+    names: List[str] = []
+    for name, decode in fields:
+        if decode == "loc_id":
+            names.extend(("name", "libname", "source", "lineno"))
+        elif decode == "loc_and_doc_id":
+            names.extend(("name", "libname", "source", "doc", "lineno"))
+        else:
+            names.append(name)
+    return names
+
+
+_FAST_DECODERS_TEMPLATE = """
+def fast_decode(message):
+    {parts} = message.split("|", {maxsplit})
+{statements}
+    return {{{dict_items}}}
+
+def fast_decode_record(message):
+    {parts} = message.split("|", {maxsplit})
+{statements}
+    return tuple_new(record_class, ({values},))
+"""
+
+# Same as the generic decoding: a field which can't be decoded is None.
+_FIELD_TEMPLATE = """
+    try:
+        v{i} = {expr}
+    except Exception:
+        v{i} = None"""
+
+
+def _create_fast_decoders(
+    decoder: Decoder, message_type: str, fields: List[_FieldDefinition]
+) -> Tuple[Callable[[str], Optional[dict]], Callable[[str], Any]]:
+    """
+    Creates the functions which decode a message of the given type (as a dict
+    and as a record) with the memos of the given decoder.
+
+    The code is generated for each message type so that there's no generic
+    handling for each field (decoding is the bottleneck when post-processing
+    big logs). The result is the same as the one from the generic decoding
+    (created by `_decode`) but they raise an exception if some field is
+    missing or if a location isn't found (in which case the generic decoding
+    must be used).
+    """
+    namespace: Dict[str, Any] = {
+        "memo": decoder.memo,
+        "location_memo": decoder.location_memo,
+        "json_loads": json.loads,
+        "decode_dateisoformat": partial(_decode_dateisoformat, decoder),
+        "tuple_new": tuple.__new__,
+        "record_class": _RECORD_CLASSES[message_type],
+        "message_type": message_type,
+    }
+
+    parts: List[str] = []
+    statements: List[str] = []
+    items: List[Tuple[str, str]] = [("message_type", "message_type")]
+    for i, (name, decode) in enumerate(fields):
+        part = f"p{i}"
+        parts.append(part)
+        if decode in ("loc_id", "loc_and_doc_id"):
+            statements.append(f"\n    loc{i} = location_memo[{part}]")
+            items.append(("name", f"loc{i}[0]"))
+            items.append(("libname", f"loc{i}[1]"))
+            items.append(("source", f"loc{i}[2]"))
+            if decode == "loc_and_doc_id":
+                items.append(("doc", f"loc{i}[3]"))
+            items.append(("lineno", f"loc{i}[4]"))
+            continue
+
+        if decode == "str":
+            items.append((name, part))
+            continue
+
+        if decode == "oid":
+            expr = f"memo[{part}]"
+        elif decode == "int":
+            expr = f"int({part})"
+        elif decode == "float":
+            expr = f"float({part})"
+        elif decode == "json.loads":
+            expr = f"json_loads({part})"
+        elif decode == "dateisoformat":
+            expr = f"decode_dateisoformat({part})"
+        else:
+            raise RuntimeError(f"Unexpected: {decode}")
+        statements.append(_FIELD_TEMPLATE.format(i=i, expr=expr))
+        items.append((name, f"v{i}"))
+
+    assert [name for name, _value in items[1:]] == _field_names(fields)
+    code = _FAST_DECODERS_TEMPLATE.format(
+        parts=", ".join(parts) + ",",
+        maxsplit=len(fields) - 1,
+        statements="".join(statements),
+        dict_items=", ".join(f"{name!r}: {value}" for name, value in items),
+        values=", ".join(value for _name, value in items[1:]),
+    )
+    exec(compile(code, f"<robolog decoder: {message_type}>", "exec"), namespace)
+    # Note: removed from the namespace (the functions' globals) so that
+    # there's no cycle.
+    return namespace.pop("fast_decode"), namespace.pop("fast_decode_record")
+
+
 def decode_memo(decoder: Decoder, message: str) -> None:
     """
     Args:
@@ -197,6 +427,25 @@ MESSAGE_TYPE_YIELD_FROM_SUSPEND = "YFS"
 
 _MESSAGE_TYPE_INFO: Dict[str, Callable[[Decoder, str], Any]] = {}
 
+# The fields of each message type (None for the memo messages).
+_MESSAGE_TYPE_FIELDS: Dict[str, Optional[List[_FieldDefinition]]] = {}
+
+# The record (namedtuple) class of each message type (None for the memo
+# messages).
+_RECORD_CLASSES: Dict[str, Any] = {}
+
+# The message type replayed by each restart message type (i.e.: RT -> ST).
+_RESTART_MESSAGE_TYPES: Dict[str, str] = {}
+
+
+def _create_record_class(message_type: str, fields: List[_FieldDefinition]) -> Any:
+    base = namedtuple(f"_{message_type}RecordBase", _field_names(fields))  # type: ignore
+    return type(
+        f"{message_type}Record",
+        (base, LogRecord),
+        {"__slots__": (), "message_type": message_type},
+    )
+
 
 def _build_decoding():
     from robocorp.log._decoder_spec import SPEC
@@ -216,27 +465,162 @@ def _build_decoding():
             key = key.strip()
             val = val.strip()
             _MESSAGE_TYPE_INFO[key] = _MESSAGE_TYPE_INFO[val]
+            _RESTART_MESSAGE_TYPES[key] = val
+            fields = _MESSAGE_TYPE_FIELDS[val]
         else:
             _MESSAGE_TYPE_INFO[key] = _decode(val)
+            if val in ("memorize", "memorize_path"):
+                fields = None
+            else:
+                fields = _parse_message_definition(val)
+
+        _MESSAGE_TYPE_FIELDS[key] = fields
+        _RECORD_CLASSES[key] = (
+            None if fields is None else _create_record_class(key, fields)
+        )
 
 
 _build_decoding()
 
 
-def iter_decoded_log_format(stream: IReadLines) -> Iterator[dict]:
-    decoder: Decoder = Decoder()
+def _iter_lines(stream: Any) -> Iterable[str]:
+    if hasattr(stream, "__iter__"):
+        # Files provide the lines lazily (so, the whole file isn't loaded in
+        # memory).
+        return stream  # type: ignore
+    return stream.readlines()
+
+
+def _is_binary_stream(stream: Any) -> bool:
+    return isinstance(stream, (io.RawIOBase, io.BufferedIOBase))
+
+
+def _error_decoding_line(line: str) -> RuntimeError:
+    if line.startswith("\x00"):
+        return RuntimeError(
+            "Error decoding line (binary .robolog streams must be opened in "
+            f"binary mode): {line!r}"
+        )
+    return RuntimeError(f"Error decoding line: {line}")
+
+
+def iter_decoded_log_format(
+    stream: Union[IReadLines, Iterable[str], BinaryIO],
+    decoder: Optional[Decoder] = None,
+) -> Iterator[dict]:
+    if _is_binary_stream(stream):
+        from ._binary_format import iter_decoded_binary_log
+
+        yield from iter_decoded_binary_log(stream, decoder=decoder)
+        return
+
+    if decoder is None:
+        decoder = Decoder()
+    decode_message_type = decoder.decode_message_type
     line: str
     message_type: str
     message: str
     decoded: Optional[dict]
 
-    for line in stream.readlines():
+    # Note: the fast decoder is called directly here (instead of calling
+    # `decoder.decode_message_type`) as this is the hot loop when decoding.
+    fast_decoders = decoder._fast_decoders
+    for line in _iter_lines(stream):
         line = line.strip()
         if line:
             try:
                 message_type, message = line.split(" ", 1)
             except Exception:
-                raise RuntimeError(f"Error decoding line: {line}")
-            decoded = decoder.decode_message_type(message_type, message)
+                raise _error_decoding_line(line)
+
+            fast_decode = fast_decoders.get(message_type)
+            if fast_decode is None:
+                decoded = decode_message_type(message_type, message)
+            else:
+                try:
+                    decoded = fast_decode(message)
+                except Exception:
+                    decoded = decoder._decode_message_type_generic(
+                        message_type, message
+                    )
             if decoded:
                 yield decoded
+
+
+def iter_decoded_log_records(
+    stream: Union[IReadLines, Iterable[str], BinaryIO],
+    decoder: Optional[Decoder] = None,
+) -> Iterator[LogRecord]:
+    if _is_binary_stream(stream):
+        from ._binary_format import iter_decoded_binary_log
+
+        yield from iter_decoded_binary_log(stream, as_records=True, decoder=decoder)
+        return
+
+    if decoder is None:
+        decoder = Decoder()
+    decode_message_type_as_record = decoder.decode_message_type_as_record
+    line: str
+    message_type: str
+    message: str
+    record: Optional[LogRecord]
+
+    fast_decoders = decoder._fast_record_decoders
+    for line in _iter_lines(stream):
+        line = line.strip()
+        if line:
+            try:
+                message_type, message = line.split(" ", 1)
+            except Exception:
+                raise _error_decoding_line(line)
+
+            fast_decode = fast_decoders.get(message_type)
+            if fast_decode is None:
+                record = decode_message_type_as_record(message_type, message)
+            else:
+                try:
+                    record = fast_decode(message)
+                except Exception:
+                    record = decoder._decode_message_type_as_record_generic(
+                        message_type, message
+                    )
+            if record is not None:
+                yield record
+
+
+_OUTPUT_FILE_PATTERN = re.compile(r"output(_(\d+))?\.robolog")
+
+
+def get_output_files(output_dir: Union[str, Path]) -> List[Path]:
+    """
+    Provides the `.robolog` files in the given directory in the order in which
+    those were written (`output.robolog`, `output_2.robolog`, ...).
+    """
+    found: List[Tuple[int, Path]] = []
+    for path in Path(output_dir).iterdir():
+        match = _OUTPUT_FILE_PATTERN.fullmatch(path.name)
+        if match is not None:
+            part = match.group(2)
+            found.append((int(part) if part else 1, path))
+    found.sort()
+    return [path for _part, path in found]
+
+
+def iter_decoded_log_format_from_output_dir(
+    output_dir: Union[str, Path], as_records: bool = False
+) -> Iterator[Any]:
+    # Each part is self-contained (the memos used are written again after a
+    # rotation), so, a new decoder is used for each part (and the memory used
+    # doesn't grow with the number of parts).
+    iter_decoded: Callable[[Any], Iterator[Any]] = (
+        iter_decoded_log_records if as_records else iter_decoded_log_format
+    )
+    from ._binary_format import is_binary_log_file
+
+    for path in get_output_files(output_dir):
+        if is_binary_log_file(path):
+            with open(path, "rb") as binary_stream:
+                yield from iter_decoded(binary_stream)
+        else:
+            with open(path, "r", encoding="utf-8", errors="replace") as stream:
+                yield from iter_decoded(stream)
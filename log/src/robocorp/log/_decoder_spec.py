@@ -84,6 +84,13 @@ C: kind:oid, message:oid, time_delta_in_seconds:float
 # would be interpreted as an image in the final HTML. 
 LH=L
 
+# Thread switch
+# The messages afterwards are related to the thread with the given id (each
+# thread has its own stack of elements). Each output starts in the main
+# thread (tid == 0) and it's only sent when the thread changes.
+# Example: 'TH 1|a' (where 'a' is the name of the thread).
+TH: tid:int, name:oid
+
 # Start Run
 SR: name:oid, time_delta_in_seconds:float
 
@@ -206,6 +213,17 @@ STD=STB
 # End thread dump
 ETD=ETB
 
+# ---------------------------------------------------------- Resource samples
+# Written periodically by a background thread when enabled with
+# `log.setup_log(resource_sample_interval=...)`: the RSS of the process
+# (in bytes), its CPU usage (percent), the number of open file descriptors
+# (handles on Windows), the number of threads and the number of child
+# processes along with their RSS (in bytes) and CPU usage (percent).
+# Note: it's not related to the current thread or element (the elements
+# running are the ones which were started and haven't ended yet).
+# Example: 'RS 104857600|12.5|20|4|1|52428800|0.0|3.25'
+RS: rss:int, cpu_percent:float, fds:int, threads:int, children:int, children_rss:int, children_cpu_percent:float, time_delta_in_seconds:float
+
 # These messages have the same format (just the message type is different).
 # Restart Run
 RR=SR
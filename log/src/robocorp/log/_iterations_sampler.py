@@ -0,0 +1,108 @@
+"""
+Sampling of the iterations of `for` and `while` loops.
+
+By default all the iterations of loops are logged, but in long-running loops
+this means that the log is mostly composed of iteration steps (and most of the
+time to run is spent logging). When configured (with `log.setup_log` or in the
+`[tool.robocorp.log]` section of the `pyproject.toml`) only a sample of the
+iterations is logged.
+
+Skipped iterations are still executed with the loggers suppressed (as with
+`log.suppress_methods`): the callbacks from the rewritten code are still
+called for the statements inside the iteration, but nothing is written to
+the log (note that failing iterations are always logged). The summary of
+loops inside iterations which aren't logged is also not written.
+"""
+
+import time
+from typing import Optional, Union
+
+from ._logger_instances import _get_logger_instances
+
+
+class IterationsSampler:
+    __slots__ = [
+        "_log_first",
+        "_log_every",
+        "_next_logged",
+        "iterations",
+        "logged",
+        "initial_time",
+        "_suppressed_loggers",
+    ]
+
+    def __init__(self, log_first: int, log_every: Union[int, str]):
+        """
+        Args:
+            log_first: The number of iterations which are always logged at the
+                start of the loop.
+            log_every: After the first iterations, log every Nth iteration
+                (0 means that no other iteration is logged) or "adaptive" to
+                log with an exponential backoff (iterations N+1, N+2, N+4,
+                N+8, ... where N is `log_first`).
+        """
+        self._log_first = log_first
+        self._log_every = log_every
+        if isinstance(log_every, str):
+            assert log_every == "adaptive", f"Unexpected log_every: {log_every}"
+            self._next_logged = log_first + 1
+        elif log_every:
+            self._next_logged = log_first + log_every
+        else:
+            self._next_logged = -1
+
+        self.iterations = 0
+        self.logged = 0
+        self.initial_time = time.monotonic()
+
+        # The loggers which were suppressed (None if not suppressed).
+        self._suppressed_loggers: Optional[tuple] = None
+
+    def accept_iteration(self) -> bool:
+        """
+        Called at the start of each iteration.
+
+        Returns:
+            Whether the iteration should be logged.
+        """
+        self.iterations = iterations = self.iterations + 1
+        if iterations <= self._log_first:
+            self.logged += 1
+            return True
+
+        if iterations == self._next_logged:
+            if self._log_every == "adaptive":
+                self._next_logged = self._log_first + (iterations - self._log_first) * 2
+            else:
+                assert isinstance(self._log_every, int)
+                self._next_logged = iterations + self._log_every
+            self.logged += 1
+            return True
+
+        return False
+
+    @property
+    def skipped(self) -> int:
+        return self.iterations - self.logged
+
+    def suppress(self) -> None:
+        if self._suppressed_loggers is not None:
+            return
+
+        with _get_logger_instances() as logger_instances:
+            loggers = tuple(logger_instances)
+            for robo_logger in loggers:
+                robo_logger.stop_logging_methods()
+        self._suppressed_loggers = loggers
+
+    def resume(self) -> None:
+        loggers = self._suppressed_loggers
+        if loggers is None:
+            return
+
+        self._suppressed_loggers = None
+        for robo_logger in loggers:
+            robo_logger.start_logging_methods()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.initial_time
@@ -4,6 +4,7 @@ from logging import getLogger
 from typing import Iterator, Tuple
 
 from robocorp import log
+from robocorp.log import _config
 
 logger = getLogger(__name__)
 
@@ -140,6 +141,10 @@ iterate_step_except = Callback()
 # Called as: after_iterate(log_element_type, __name__, filename, name, lineno)
 after_iterate = Callback()
 
+# Called as: iterate_summary(log_element_type, __name__, filename, name, lineno, iterations, logged, elapsed)
+# Only called (before the `after_iterate`) if some iteration was not logged.
+iterate_summary = Callback()
+
 
 def iter_all_callbacks() -> Iterator[Callback]:
     for _key, val in globals().copy().items():
@@ -199,18 +204,44 @@ class MethodLifecycleContext:
             if not self._in_generator:
                 return
 
+        exc_info = None
+        if exc_type is not None and exc_val is not None:
+            exc_info = (exc_type, exc_val, exc_tb)
+
         while self._stack:
             _report_id, method_name, tup = self._stack.pop()
+            self._end_scope(method_name, tup, exc_info)
 
-            if exc_type is not None and exc_val is not None:
-                exc_info = (exc_type, exc_val, exc_tb)
-                # Something as 'method_except' or 'iterate_except'
-                method = _name_to_callback[f"{method_name}_except"]
-                method(*tup, exc_info)
+    def _end_scope(self, method_name, tup, exc_info=None):
+        if method_name == "skipped_iterate_step":
+            sampler, tup = tup
+            if exc_info is None:
+                return
 
-            # Something as 'after_method' or 'after_iterate'
-            method = _name_to_callback[f"after_{method_name}"]
-            method(*tup)
+            # Failing iterations are always logged.
+            sampler.resume()
+            sampler.logged += 1
+            before_iterate_step(*tup)
+            method_name = "iterate_step"
+            tup = tup[:-1]
+
+        elif method_name == "sampled_iterate":
+            sampler, tup = tup
+            sampler.resume()
+            if sampler.skipped:
+                iterate_summary(
+                    *tup, sampler.iterations, sampler.logged, sampler.elapsed()
+                )
+            method_name = "iterate"
+
+        if exc_info is not None:
+            # Something as 'method_except' or 'iterate_except'
+            method = _name_to_callback[f"{method_name}_except"]
+            method(*tup, exc_info)
+
+        # Something as 'after_method' or 'after_iterate'
+        method = _name_to_callback[f"after_{method_name}"]
+        method(*tup)
 
     def after_yield(self, *tup):
         self._in_generator = True
@@ -250,7 +281,12 @@ class MethodLifecycleContext:
 
         # tup is (log_element_type, __name__, filename, name, lineno)
         before_iterate(*tup)
-        self._stack.append((report_id, "iterate", tup))
+
+        sampler = _config._general_log_config.create_iterations_sampler()
+        if sampler is None:
+            self._stack.append((report_id, "iterate", tup))
+        else:
+            self._stack.append((report_id, "sampled_iterate", (sampler, tup)))
 
     report_while_start = report_for_start
 
@@ -263,6 +299,18 @@ class MethodLifecycleContext:
         if self._stack and self._stack[-1][0] >= report_id:
             self._report_end(report_id)
 
+        # At this point the top of the stack is the loop itself.
+        if self._stack[-1][1] == "sampled_iterate":
+            sampler = self._stack[-1][2][0]
+            if not sampler.accept_iteration():
+                # Skipped iterations are run with the loggers suppressed (the
+                # loggers are only resumed when some iteration is logged).
+                sampler.suppress()
+                self._stack.append((report_id, "skipped_iterate_step", (sampler, tup)))
+                return
+
+            sampler.resume()
+
         # tup is (log_element_type, __name__, filename, name, lineno, targets)
         before_iterate_step(*tup)
         self._stack.append((report_id, "iterate_step", tup[:-1]))
@@ -275,9 +323,7 @@ class MethodLifecycleContext:
 
         while self._stack:
             stack_report_id, method_name, tup = self._stack.pop()
-
-            method = _name_to_callback[f"after_{method_name}"]
-            method(*tup)
+            self._end_scope(method_name, tup)
 
             if stack_report_id == report_id:
                 break
@@ -306,14 +352,7 @@ class MethodLifecycleContext:
             if stack_report_id not in report_ids:
                 break
             stack_report_id, method_name, tup = self._stack.pop()
-
-            exc_info = sys.exc_info()
-            # Something as 'method_except' or 'iterate_except'
-            method = _name_to_callback[f"{method_name}_except"]
-            method(*tup, exc_info)
-
-            method = _name_to_callback[f"after_{method_name}"]
-            method(*tup)
+            self._end_scope(method_name, tup, sys.exc_info())
 
 
 class MethodLifecycleContextCallerInProject(MethodLifecycleContext):
@@ -124,8 +124,28 @@ def pretty_format_logs_from_iter(
     indent = ""
     out = ["\n"]
     regular_start_found = False
+
+    # Each thread has its own level (the elements of threads other than the
+    # main thread are shown inside the thread).
+    tid = 0
+    tid_to_level = {}
     for msg in iter_in:
         msg_type = msg["message_type"]
+        if msg_type == "V":
+            # Each output starts in the main thread.
+            tid_to_level[tid] = level
+            tid = 0
+            level = tid_to_level.get(tid, 0)
+            indent = "    " * level
+
+        elif msg_type == "TH":
+            tid_to_level[tid] = level
+            tid = msg["tid"]
+            out.append(f"TH: {tid}\n")
+            level = tid_to_level.get(tid, 1 if tid else 0)
+            indent = "    " * level
+            continue
+
         if msg_type not in format_msg:
             if msg_type in ignore:
                 continue
@@ -0,0 +1,256 @@
+"""
+Index sidecar of the `.robolog` files (opt-in with
+`log.add_log_output(..., write_index=True)`).
+
+Each part (`output.robolog`, `output_2.robolog`, ...) gets an index file
+along with it (`output.robolog.index`, `output_2.robolog.index`, ...) so that a
+reader can seek straight to a task (or to a failure) and decode just that
+range instead of decoding the part from the start.
+
+The index has one json object per line (written while the part is written):
+
+- `{"kind": "checkpoint", "offset": int, "memo": [[id, value], ...],
+  "location": [[id, name_id, libname_id, source_id, doc_id, lineno], ...]}`:
+  the memos (`M`) and locations (`P`) written in the part (before `offset`)
+  since the previous checkpoint. Applying all the checkpoints up to an offset
+  restores the memos needed to decode the messages from there.
+- `{"kind": "task_start", "message_type": "ST" | "RT", ...}`
+- `{"kind": "task_end", "message_type": "ET", "status": str, ...}`
+- `{"kind": "failure", "message_type": "EE", "element_type": str,
+  "status": str, "start": int, ...}`: an element which finished with the
+  `FAIL` or `ERROR` status (`start` is the offset of the message which started
+  it in the same part).
+
+All the entries besides checkpoints also have the `offset` (where the message
+starts), `end` (where the message ends), `name`, `libname` and `tid` (the
+thread, see: `TH` messages).
+
+Offsets are byte offsets in the part and the memo ids are the ones written in
+the part (strings in the text format and ints in the binary format).
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+INDEX_SUFFIX = ".index"
+
+# A checkpoint is always written before an entry, but if many memos are
+# written without an entry a checkpoint is written after this many memos (so
+# that a reader seeking to an arbitrary offset has less to scan).
+_CHECKPOINT_AFTER_MEMOS = 1000
+
+# The statuses of the elements added to the index as failures.
+FAILED_STATUSES = frozenset(("FAIL", "ERROR"))
+
+
+def index_path(robolog_path: Union[str, Path]) -> Path:
+    robolog_path = Path(robolog_path)
+    return robolog_path.with_name(robolog_path.name + INDEX_SUFFIX)
+
+
+class _IndexWriter:
+    def __init__(self, path: Path, decode_id: Callable[[Any], Any]) -> None:
+        self._stream = path.open("w", encoding="utf-8")
+        self._decode_id = decode_id
+        self._memo: List[list] = []
+        self._location: List[list] = []
+
+    def add_memo(self, memo_id: Any, value: str, offset: int) -> None:
+        self._memo.append([self._decode_id(memo_id), value])
+        if len(self._memo) + len(self._location) >= _CHECKPOINT_AFTER_MEMOS:
+            self._write_checkpoint(offset)
+
+    def add_location(
+        self, memo_id, name_id, libname_id, source_id, doc_id, lineno: int, offset: int
+    ) -> None:
+        decode_id = self._decode_id
+        self._location.append(
+            [
+                decode_id(memo_id),
+                decode_id(name_id),
+                decode_id(libname_id),
+                decode_id(source_id),
+                decode_id(doc_id),
+                lineno,
+            ]
+        )
+        if len(self._memo) + len(self._location) >= _CHECKPOINT_AFTER_MEMOS:
+            self._write_checkpoint(offset)
+
+    def add_entry(self, entry: Dict[str, Any]) -> None:
+        # The memos pending were all written before the entry.
+        self._write_checkpoint(entry["offset"])
+        self._write(entry)
+        # Entries are few (task boundaries and failures), so, those are
+        # available right away for readers.
+        self._stream.flush()
+
+    def _write_checkpoint(self, offset: int) -> None:
+        if self._memo or self._location:
+            self._write(
+                {
+                    "kind": "checkpoint",
+                    "offset": offset,
+                    "memo": self._memo,
+                    "location": self._location,
+                }
+            )
+            self._memo = []
+            self._location = []
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._stream.write(json.dumps(entry))
+        self._stream.write("\n")
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def _iter_index(robolog_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    with index_path(robolog_path).open("r", encoding="utf-8") as stream:
+        for line in stream:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line may be incomplete (i.e.: the index is still
+                # being written or the process was killed).
+                return
+            yield entry
+
+
+def iter_index_entries(robolog_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    for entry in _iter_index(robolog_path):
+        if entry["kind"] != "checkpoint":
+            yield entry
+
+
+def _restore_memos(decoder: Any, robolog_path: Union[str, Path], offset: int) -> int:
+    """
+    Applies the checkpoints up to the given offset to the decoder.
+
+    Returns:
+        The offset of the last checkpoint applied (or -1 if none was applied).
+    """
+    memo = decoder.memo
+    location_memo = decoder.location_memo
+    checkpoint_offset = -1
+    for entry in _iter_index(robolog_path):
+        if entry["kind"] != "checkpoint":
+            continue
+        if entry["offset"] > offset:
+            break
+        checkpoint_offset = entry["offset"]
+        for memo_id, value in entry["memo"]:
+            memo[memo_id] = value
+        for memo_id, name_id, libname_id, source_id, doc_id, lineno in entry[
+            "location"
+        ]:
+            location_memo[memo_id] = (
+                memo[name_id],
+                memo[libname_id],
+                memo[source_id],
+                memo[doc_id],
+                lineno,
+            )
+    return checkpoint_offset
+
+
+class _LimitedReader:
+    """
+    Reads up to `size` bytes from the stream (or up to the end of the stream
+    if `size` is None).
+    """
+
+    def __init__(self, stream, size: Optional[int]) -> None:
+        self._stream = stream
+        self._remaining = size
+
+    def read(self, size: int) -> bytes:
+        if self._remaining is None:
+            return self._stream.read(size)
+        data = self._stream.read(min(size, self._remaining))
+        self._remaining -= len(data)
+        return data
+
+
+def _iter_text_lines(stream, size: Optional[int]) -> Iterator[str]:
+    for line in stream:
+        if size is not None:
+            if size <= 0:
+                return
+            size -= len(line)
+        yield line.decode("utf-8", "replace")
+
+
+def _scan_memos(decoder: Any, stream, size: int, binary: bool) -> None:
+    """
+    Decodes just the memos (`M`) and locations (`P`) in the next `size` bytes.
+    """
+    if binary:
+        from ._binary_format import MESSAGE_TYPES, _create_decoder, _iter_frames
+
+        decoders: Dict[int, Callable] = {}
+        for data, start, end in _iter_frames(
+            _LimitedReader(stream, size), check_magic=False
+        ):
+            code = data[start]
+            message_type = MESSAGE_TYPES[code]
+            if message_type in ("M", "P"):
+                decode = decoders.get(code)
+                if decode is None:
+                    decode = decoders[code] = _create_decoder(
+                        decoder, message_type, False
+                    )
+                decode(data, start + 1, end)
+    else:
+        for line in _iter_text_lines(stream, size):
+            if line.startswith(("M ", "P ")):
+                message_type, message = line.strip().split(" ", 1)
+                decoder.decode_message_type(message_type, message)
+
+
+def iter_decoded_log_range(
+    robolog_path: Union[str, Path],
+    start: int,
+    end: Optional[int] = None,
+    as_records: bool = False,
+) -> Iterator[Any]:
+    """
+    Decodes the messages of the given `.robolog` part from the `start` offset
+    (which must be the offset where a message starts) up to the `end` offset
+    (or up to the end of the part if not given) using the index to restore the
+    memos needed to decode those.
+    """
+    from ._binary_format import MAGIC, is_binary_log_file, iter_decoded_binary_log
+    from ._decoder import Decoder, iter_decoded_log_format, iter_decoded_log_records
+
+    decoder = Decoder()
+    checkpoint_offset = _restore_memos(decoder, robolog_path, start)
+    binary = is_binary_log_file(robolog_path)
+    if checkpoint_offset == -1:
+        checkpoint_offset = len(MAGIC) if binary else 0
+
+    size = None if end is None else end - start
+    with open(robolog_path, "rb") as stream:
+        if checkpoint_offset < start:
+            # Memos written after the last checkpoint (before the start).
+            stream.seek(checkpoint_offset)
+            _scan_memos(decoder, stream, start - checkpoint_offset, binary)
+
+        stream.seek(start)
+        if binary:
+            yield from iter_decoded_binary_log(
+                _LimitedReader(stream, size),
+                as_records,
+                decoder=decoder,
+                check_magic=False,
+            )
+        elif as_records:
+            yield from iter_decoded_log_records(
+                _iter_text_lines(stream, size), decoder=decoder
+            )
+        else:
+            yield from iter_decoded_log_format(
+                _iter_text_lines(stream, size), decoder=decoder
+            )
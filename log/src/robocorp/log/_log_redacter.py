@@ -1,10 +1,11 @@
 import itertools
+import threading
 from collections.abc import MutableSet
 from functools import partial
-from re import Pattern
-from typing import Optional
+from typing import List
 
 from robocorp.log._lifecycle_hooks import Callback
+from robocorp.log._multi_pattern_matcher import MultiPatternMatcher
 
 
 class _SetWithChangeModification(MutableSet[str]):
@@ -13,17 +14,20 @@ class _SetWithChangeModification(MutableSet[str]):
         self._data.update(initial)
 
         # Clients may register 'on_change' to get notifications.
+        # Called as: on_change(added=None)
+        # where `added` is a tuple with the values added (or None if values
+        # were removed).
         self.on_change = Callback()
         self.on_change.raise_exceptions = True
 
     def update(self, values):
-        initial_len = len(self._data)
-        self._data.update(values)
-        if len(self._data) == initial_len:
+        added = tuple(v for v in values if v not in self._data)
+        if not added:
             # Nothing actually changed
             return
 
-        self.on_change()
+        self._data.update(added)
+        self.on_change(added=added)
 
     def pop(self):
         self._data.pop()
@@ -40,7 +44,7 @@ class _SetWithChangeModification(MutableSet[str]):
         if value in self._data:
             return  # Don't trigger a modified
         self._data.add(value)
-        self.on_change()
+        self.on_change(added=(value,))
 
     def discard(self, value):
         if value not in self._data:
@@ -71,10 +75,15 @@ class RedactConfiguration:
         # By default, strings with 1 or 2 chars won't be
         self._minimum_string_size: int = 2
 
-        self._dont_hide_strings.on_change.register(on_changed)
+        # Called as: on_changed(added=None) where `added` are the strings added
+        # to `hide_strings` (or None if a full update is needed).
+        self._dont_hide_strings.on_change.register(self._on_dont_hide_changed)
         self._hide_strings.on_change.register(on_changed)
         self._on_changed = on_changed
 
+    def _on_dont_hide_changed(self, added=None):
+        self._on_changed()
+
     # Public API
 
     @property
@@ -100,46 +109,70 @@ class RedactConfiguration:
 
 class LogRedacter:
     def __init__(self) -> None:
-        self._hide_strings_re: Optional[Pattern[str]] = None
+        self._matcher = MultiPatternMatcher()
+
+        # Strings added to `hide_strings` since the last update (only used
+        # when a full update isn't needed).
+        self._added_hide_strings: List[str] = []
+        self._needs_full_update = True
+
+        # The redact may be done in a different thread (when the log output is
+        # written in a thread), so, changes are synchronized with this lock.
+        self._lock = threading.Lock()
+
         self.config = RedactConfiguration(self._after_redact_info_changed)
         self.redact = self._no_redact
 
     def hide_from_output(self, string_to_hide: str) -> None:
         self.config.hide_strings.add(string_to_hide)
 
-    def _after_redact_info_changed(self):
-        self.redact = self._update_redact_re_and_redact
-
-    def _update_redact_information(self):
-        import re
-
-        lst = []
-        dont_hide_strings = self.config.dont_hide_strings
-        dont_hide_strings_smaller_or_equal_to = (
-            self.config.dont_hide_strings_smaller_or_equal_to
+    def _after_redact_info_changed(self, added=None):
+        with self._lock:
+            if added is None:
+                self._needs_full_update = True
+            else:
+                self._added_hide_strings.extend(added)
+            self.redact = self._update_redact_information_and_redact
+
+    def _should_hide(self, s: str) -> bool:
+        return (
+            bool(s)
+            and s not in self.config.dont_hide_strings
+            and len(s) > self.config.dont_hide_strings_smaller_or_equal_to
         )
-        for s in self.config.hide_strings:
-            if s and s not in dont_hide_strings:
-                if len(s) > dont_hide_strings_smaller_or_equal_to:
-                    lst.append(re.escape(s))
 
-        if lst:
-            self._hide_strings_re = re.compile("|".join(lst))
+    def _update_redact_information(self):
+        added_hide_strings = self._added_hide_strings
+        self._added_hide_strings = []
+
+        matcher = self._matcher
+        if self._needs_full_update:
+            self._needs_full_update = False
+            # Note: copy as it may be changed in another thread.
+            matcher = MultiPatternMatcher(
+                s for s in tuple(self.config.hide_strings) if self._should_hide(s)
+            )
+            self._matcher = matcher
         else:
-            self._hide_strings_re = None
+            # Just add the new strings (no need to rebuild everything).
+            for s in added_hide_strings:
+                if self._should_hide(s):
+                    matcher.add(s)
 
-    def _update_redact_re_and_redact(self, s, replacement="<redacted>"):
-        self._update_redact_information()
-        hide_strings_re = self._hide_strings_re
-        if hide_strings_re is None:
+        if len(matcher) == 0:
             self.redact = self._no_redact
-            return s
+        else:
+            self.redact = self._matcher_redact
 
-        self.redact = self._re_redact
+    def _update_redact_information_and_redact(self, s, replacement="<redacted>"):
+        with self._lock:
+            # Check again as another thread could've done it already.
+            if self.redact == self._update_redact_information_and_redact:
+                self._update_redact_information()
         return self.redact(s, replacement)
 
-    def _re_redact(self, s, replacement="<redacted>"):
-        return self._hide_strings_re.sub(replacement, s)
+    def _matcher_redact(self, s, replacement="<redacted>"):
+        return self._matcher.sub(replacement, s)
 
     def _no_redact(self, s, replacement="<redacted>"):
         return s
@@ -7,7 +7,10 @@ from typing import Dict, Iterator
 if typing.TYPE_CHECKING:
     from ._robo_logger import _RoboLogger
 
-_instances_lock = threading.RLock()
+# Only used to synchronize the changes in the instances (the instances dict
+# itself is never changed: a new dict is created instead, so, it's possible to
+# iterate over it without holding a lock).
+_instances_lock = threading.Lock()
 instances: Dict["_RoboLogger", int] = {}
 
 _main_thread_id = threading.get_ident()
@@ -16,25 +19,50 @@ _main_thread_id = threading.get_ident()
 # We could use a set, but we're using a dict to keep the order.
 @contextmanager
 def _get_logger_instances(
-    only_from_main_thread: bool = True,
+    only_from_main_thread: bool = False,
 ) -> Iterator[Dict["_RoboLogger", int]]:
     """
     Args:
         only_from_main_thread:
             If true the logger instances will only be provided if this is the
             main thread.
-            If false the logger instances will be provided even if not currently
-            in the main thread.
+            If false (default) the logger instances will be provided even if
+            not currently in the main thread.
 
     Returns:
-        The logger instances registered so far. Note that a lock is held when
-        the instances are requested and it's only released when the context
-        exits.
+        The logger instances registered so far. Note that the returned dict
+        must not be changed (use `_add_logger_instance` and
+        `_remove_logger_instance` for that). Each logger is responsible for
+        synchronizing calls from multiple threads.
     """
     if only_from_main_thread:
         if _main_thread_id != threading.get_ident():
             yield {}
             return
 
+    yield instances
+
+
+def _add_logger_instance(logger: "_RoboLogger") -> None:
+    global instances
+
+    with _instances_lock:
+        new_instances = instances.copy()
+        new_instances[logger] = 1
+        instances = new_instances
+
+
+def _remove_logger_instance(logger: "_RoboLogger") -> bool:
+    """
+    Returns:
+        True if the logger was removed and False if it wasn't registered.
+    """
+    global instances
+
     with _instances_lock:
-        yield instances
+        if logger not in instances:
+            return False
+        new_instances = instances.copy()
+        del new_instances[logger]
+        instances = new_instances
+        return True
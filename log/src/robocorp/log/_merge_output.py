@@ -0,0 +1,148 @@
+"""
+Helpers to add the messages from the `.robolog` files of another output
+directory (i.e.: the output of a run done in a subprocess) to an output which
+is being written.
+"""
+
+import datetime
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ._decoder import Location
+
+# The messages related to the run itself (the run is the one from the output
+# where the messages are added).
+_SKIPPED_MESSAGE_TYPES = frozenset(("V", "T", "ID", "I", "SR", "ER", "RR"))
+
+
+def _iter_lines(path: Path) -> Iterator[str]:
+    from ._binary_format import _iter_frames, _payload_to_text, is_binary_log_file
+
+    if is_binary_log_file(path):
+        with open(path, "rb") as stream:
+            for frame in _iter_frames(stream):
+                yield _payload_to_text(*frame)
+    else:
+        with open(path, "r", encoding="utf-8", errors="replace") as stream:
+            yield from stream
+
+
+def iter_messages_to_merge(
+    output_dir: Union[str, Path],
+    initial_time: datetime.datetime,
+    skip_task_libnames: Sequence[str] = (),
+) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    Provides the messages from the `.robolog` files in the given output
+    directory as `(message_type, args)` where the args are the same ones from
+    the text format but:
+
+    - `oid` fields are provided as the memoized string and `loc_id` and
+      `loc_and_doc_id` fields as the `Location` (the `M` and `P` messages
+      aren't provided).
+    - The time deltas are relative to the given initial time.
+
+    The messages related to the run (`V`, `T`, `ID`, `I`, `SR`, `ER`) are
+    skipped, as well as the messages replaying the elements at the start of
+    each part (unless the first parts were removed due to `max_files`, in
+    which case the elements replayed in the first part found are provided
+    as regular messages).
+
+    The tasks with a libname in `skip_task_libnames` (from the `ST` to the
+    related `ET`) are skipped.
+
+    Each part starts in the main thread, so, a `TH` to the main thread
+    (`("TH", ["0", ""])`) is provided if the previous part ended in some
+    other thread.
+    """
+    from ._decoder import (
+        _MESSAGE_TYPE_FIELDS,
+        _RESTART_MESSAGE_TYPES,
+        get_output_files,
+    )
+
+    time_offset: Optional[float] = None
+    in_thread = False
+    in_skipped_task = False
+    for part_index, path in enumerate(get_output_files(output_dir)):
+        # Each part is self-contained (the memos used are written again).
+        memo: Dict[str, str] = {}
+        location_memo: Dict[str, Location] = {}
+        if in_thread:
+            in_thread = False
+            yield "TH", ["0", ""]
+
+        for line in _iter_lines(path):
+            try:
+                message_type, message = line.rstrip("\n").split(" ", 1)
+            except ValueError:
+                continue
+
+            try:
+                if message_type == "M":
+                    memo_id, value = message.split(":", 1)
+                    memo[memo_id] = json.loads(value)
+                    continue
+
+                if message_type == "P":
+                    memo_id, refs = message.split(":", 1)
+                    name, libname, source, doc, lineno = refs.split("|", 4)
+                    location_memo[memo_id] = (
+                        memo[name],
+                        memo[libname],
+                        memo[source],
+                        memo[doc],
+                        int(lineno),
+                    )
+                    continue
+
+                if message_type == "T":
+                    if time_offset is None:
+                        time = datetime.datetime.fromisoformat(message)
+                        time_offset = (time - initial_time).total_seconds()
+                    continue
+
+                if message_type in _SKIPPED_MESSAGE_TYPES:
+                    continue
+
+                replayed = _RESTART_MESSAGE_TYPES.get(message_type)
+                if replayed is not None:
+                    if part_index != 0:
+                        continue
+                    message_type = replayed
+
+                if message_type == "TH":
+                    tid, name = message.split("|", 1)
+                    in_thread = tid != "0"
+                    yield "TH", [tid, memo[name]]
+                    continue
+
+                fields = _MESSAGE_TYPE_FIELDS[message_type]
+                assert fields is not None
+                args: List[Any] = message.split("|", len(fields) - 1)
+                if len(args) != len(fields):
+                    continue
+
+                for i, (name, kind) in enumerate(fields):
+                    if kind == "oid":
+                        args[i] = memo[args[i]]
+                    elif kind in ("loc_id", "loc_and_doc_id"):
+                        args[i] = location_memo[args[i]]
+                    elif kind == "float" and "time_delta" in name and time_offset:
+                        args[i] = str(round(float(args[i]) + time_offset, 3))
+            except (KeyError, ValueError):
+                # Unknown message type or some reference which wasn't found
+                # (i.e.: a part which was truncated).
+                continue
+
+            if in_skipped_task:
+                if message_type == "ET":
+                    in_skipped_task = False
+                continue
+
+            if message_type == "ST" and args[0][1] in skip_task_libnames:
+                in_skipped_task = True
+                continue
+
+            yield message_type, args
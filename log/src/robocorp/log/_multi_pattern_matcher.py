@@ -0,0 +1,226 @@
+"""
+Matcher used to find (and replace) many literal strings at once.
+
+Building a single regular expression with an alternation of all the strings
+doesn't scale (`re` tries each alternative at each position, so, the time
+to scan is proportional to the number of strings and the time to compile
+grows as more strings are added).
+
+This module provides a matcher based on Aho–Corasick automata (which scan the
+text once, regardless of the number of strings) where new strings can be added
+without rebuilding everything.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+# The maximum number of strings which are matched with a regular expression
+# before they're added to the automaton.
+_MAX_PENDING = 16
+
+
+class _AhoCorasick:
+    __slots__ = ["_goto", "_fail", "_out", "_search_first_char"]
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        # Each state is an index in the lists below.
+        goto: List[Dict[str, int]] = [{}]
+
+        # For each state, the length of the longest pattern which ends at it
+        # (either the state itself or one of its suffixes), 0 if none.
+        out: List[int] = [0]
+
+        for pattern in patterns:
+            state = 0
+            for c in pattern:
+                next_state = goto[state].get(c)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][c] = next_state
+                    goto.append({})
+                    out.append(0)
+                state = next_state
+            out[state] = len(pattern)
+
+        fail: List[int] = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, next_state in goto[state].items():
+                queue.append(next_state)
+
+                f = fail[state]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(c, 0)
+                fail[next_state] = f
+                if not out[next_state]:
+                    out[next_state] = out[f]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+        # Used to skip (in C) the chars which can't start a match.
+        first_chars = "".join(re.escape(c) for c in goto[0])
+        self._search_first_char = re.compile(f"[{first_chars}]").search
+
+    def find_spans(self, s: str, spans: List[Tuple[int, int]]) -> None:
+        """
+        Adds to `spans` the (start, end) of the longest pattern ending at each
+        position of `s` (matches may overlap).
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        search_first_char = self._search_first_char
+
+        state = 0
+        i = 0
+        len_s = len(s)
+        while i < len_s:
+            if state == 0:
+                found = search_first_char(s, i)
+                if found is None:
+                    return
+                i = found.start()
+
+            c = s[i]
+            next_state = goto[state].get(c)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(c)
+            # Note: the root (0) is never a next state.
+            state = next_state or 0
+
+            i += 1
+            match_len = out[state]
+            if match_len:
+                spans.append((i - match_len, i))
+
+
+class _PendingStrings:
+    """
+    Matches a few strings with a regular expression (it's faster than the
+    automaton for a few strings and it's cheap to recreate).
+    """
+
+    __slots__ = ["_search"]
+
+    def __init__(self, strings: List[str]) -> None:
+        # Longest first so that the longest match at a position is found.
+        self._search = re.compile(
+            "|".join(re.escape(s) for s in sorted(strings, key=len, reverse=True))
+        ).search
+
+    def find_spans(self, s: str, spans: List[Tuple[int, int]]) -> None:
+        search = self._search
+        found = search(s)
+        while found is not None:
+            start = found.start()
+            spans.append((start, found.end()))
+            # Search from the next char (and not from the end) to find
+            # overlapping matches too.
+            found = search(s, start + 1)
+
+
+class MultiPatternMatcher:
+    """
+    Matches many literal strings in a text.
+
+    New strings are first matched with a regular expression and after a few
+    are added they're moved to an automaton. To avoid rebuilding a big
+    automaton whenever that happens, a list of automata is kept where each
+    automaton has at least twice the strings of the next one (when a new
+    automaton would be bigger than the last one they're merged), so, each
+    string is only added to a new automaton a logarithmic number of times.
+
+    Strings may be added (`add`) while `sub` is being called from another
+    thread (but `add` itself must not be called concurrently).
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self._patterns: Set[str] = set()
+        self._pending: List[str] = []
+
+        # The automata and the strings in each one (the first is the biggest).
+        self._automata: List[_AhoCorasick] = []
+        self._automata_strings: List[List[str]] = []
+
+        # The automata and the pending strings: always replaced at once so
+        # that `sub` sees a consistent state.
+        self._matchers: Tuple[Union[_AhoCorasick, _PendingStrings], ...] = ()
+
+        initial = set(patterns)
+        if "" in initial:
+            raise ValueError("Empty strings cannot be matched.")
+
+        if len(initial) > _MAX_PENDING:
+            self._patterns = initial
+            self._automata.append(_AhoCorasick(initial))
+            self._automata_strings.append(list(initial))
+            self._matchers = tuple(self._automata)
+        else:
+            for pattern in initial:
+                self.add(pattern)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str) -> None:
+        if not pattern:
+            raise ValueError("Empty strings cannot be matched.")
+
+        if pattern in self._patterns:
+            return
+
+        self._patterns.add(pattern)
+        self._pending.append(pattern)
+
+        if len(self._pending) > _MAX_PENDING:
+            automata_strings = self._automata_strings
+            automata = self._automata
+            strings = self._pending
+            self._pending = []
+            while automata_strings and len(automata_strings[-1]) <= len(strings):
+                strings = automata_strings.pop() + strings
+                automata.pop()
+            automata_strings.append(strings)
+            automata.append(_AhoCorasick(strings))
+            self._matchers = tuple(automata)
+        else:
+            self._matchers = tuple(self._automata) + (_PendingStrings(self._pending),)
+
+    def sub(self, replacement: str, s: str) -> str:
+        """
+        Replaces all the occurrences of the patterns in `s` by `replacement`.
+
+        Overlapping occurrences are replaced by a single `replacement`.
+        """
+        spans: List[Tuple[int, int]] = []
+        for matcher in self._matchers:
+            matcher.find_spans(s, spans)
+
+        if not spans:
+            return s
+
+        spans.sort()
+        parts: List[str] = []
+        last_end = 0
+        span_start, span_end = spans[0]
+        for start, end in spans:
+            if start < span_end:
+                if end > span_end:
+                    span_end = end
+                continue
+
+            parts.append(s[last_end:span_start])
+            parts.append(replacement)
+            last_end = span_end
+            span_start, span_end = start, end
+
+        parts.append(s[last_end:span_start])
+        parts.append(replacement)
+        parts.append(s[span_end:])
+        return "".join(parts)
@@ -1,6 +1,7 @@
 from typing import Any, Tuple
 
 from . import _config, suppress
+from ._bounded_repr import bounded_repr
 
 
 def get_obj_type_and_repr(obj: Any) -> Tuple[str, str]:
@@ -16,14 +17,10 @@ def get_obj_type_and_repr(obj: Any) -> Tuple[str, str]:
             except RecursionError:
                 val_type = "<recursion error getting type>"
 
+        max_size = _config._general_log_config.max_value_repr_size
         try:
-            r = repr(obj)
+            r = bounded_repr(obj, max_size)
         except (Exception, RecursionError) as e:
             r = f"<error getting repr: {e}>"
 
-        max_size = _config._general_log_config.max_value_repr_size
-        if len(r) > max_size:
-            diff = len(r) - max_size
-            r = f"{r[:max_size]} <clipped {diff} chars>"
-
         return val_type, r
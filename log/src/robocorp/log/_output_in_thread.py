@@ -0,0 +1,164 @@
+"""
+Helper to do the work of a `_RoboOutputImpl` in a separate thread.
+
+The caller just enqueues a record (the method name and its arguments, with the
+time delta already computed) and a dedicated writer thread does the
+serialization, redaction, memoization and file I/O.
+"""
+
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Dict, Tuple
+
+from .protocols import QueueOverflowPolicy
+
+
+class _Finish:
+    pass
+
+
+def _enqueued(method_name: str, droppable: bool = False) -> Callable[..., None]:
+    """
+    Args:
+        method_name: The name of the method to be called in the writer thread.
+        droppable: Whether the message may be dropped if the queue is full
+            and the overflow policy is "drop". Messages which open or close
+            a scope are never dropped (as that'd break the log structure).
+    """
+
+    def method(self: "_OutputInThread", *args) -> None:
+        self._enqueue(method_name, args, droppable)
+
+    method.__name__ = method_name
+    return method
+
+
+class _OutputInThread:
+    """
+    Wraps a `_RoboOutputImpl` so that its methods are called in a writer thread.
+
+    Methods which can't be postponed (i.e.: because they need to inspect the
+    current frames such as `log_method_except` or `process_snapshot`) wait for
+    the queue to be drained and are then called in the current thread.
+    """
+
+    def __init__(
+        self,
+        robot_output_impl,
+        max_queue_size: int,
+        queue_overflow: QueueOverflowPolicy,
+    ):
+        if queue_overflow not in ("block", "drop"):
+            raise ValueError(f"Unexpected queue overflow policy: {queue_overflow}")
+
+        self._robot_output_impl = robot_output_impl
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_queue_size)
+        self._queue_overflow = queue_overflow
+        self._closed = False
+
+        # Held whenever the robot_output_impl is being used.
+        self._impl_lock = threading.Lock()
+
+        self.dropped_messages = 0
+
+        self._thread = threading.Thread(
+            target=self._write_in_thread, name="RobocorpLogWriterThread"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _write_in_thread(self) -> None:
+        robot_output_impl = self._robot_output_impl
+        get = self._queue.get
+        task_done = self._queue.task_done
+        impl_lock = self._impl_lock
+
+        while True:
+            record = get()
+            try:
+                if isinstance(record, _Finish):
+                    return
+
+                method_name, args = record
+                with impl_lock:
+                    getattr(robot_output_impl, method_name)(*args)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                task_done()
+
+    def _enqueue(self, method_name: str, args: Tuple[Any, ...], droppable: bool):
+        if self._closed:
+            self._call_sync(getattr(self._robot_output_impl, method_name), args, {})
+            return
+
+        if droppable and self._queue_overflow == "drop":
+            try:
+                self._queue.put_nowait((method_name, args))
+            except queue.Full:
+                self.dropped_messages += 1
+        else:
+            self._queue.put((method_name, args))
+
+    def _call_sync(self, method, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        if not self._closed:
+            self._queue.join()
+        with self._impl_lock:
+            return method(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything not explicitly handled is synchronized with the writer thread.
+        attr = getattr(self._robot_output_impl, name)
+        if not callable(attr):
+            return attr
+
+        def call_sync(*args, **kwargs):
+            return self._call_sync(attr, args, kwargs)
+
+        return call_sync
+
+    def get_time_delta(self) -> float:
+        return self._robot_output_impl.get_time_delta()
+
+    switch_thread = _enqueued("switch_thread")
+    start_run = _enqueued("start_run")
+    end_run = _enqueued("end_run")
+    start_task = _enqueued("start_task")
+    end_task = _enqueued("end_task")
+    send_info = _enqueued("send_info", droppable=True)
+    send_start_time_delta = _enqueued("send_start_time_delta")
+    start_element = _enqueued("start_element")
+    end_method = _enqueued("end_method")
+    yield_suspend = _enqueued("yield_suspend")
+    yield_resume = _enqueued("yield_resume")
+    yield_from_suspend = _enqueued("yield_from_suspend")
+    yield_from_resume = _enqueued("yield_from_resume")
+    after_assign = _enqueued("after_assign", droppable=True)
+    method_return = _enqueued("method_return", droppable=True)
+    log_message = _enqueued("log_message", droppable=True)
+    console_message = _enqueued("console_message", droppable=True)
+    resource_sample = _enqueued("resource_sample", droppable=True)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        self._queue.put(_Finish())
+        self._thread.join()
+        self._closed = True
+
+        robot_output_impl = self._robot_output_impl
+        if self.dropped_messages:
+            robot_output_impl.log_message(
+                "WARN",
+                f"robocorp.log: {self.dropped_messages} messages were dropped "
+                "because the log writer queue was full.",
+                False,
+                "",
+                "",
+                "",
+                0,
+                robot_output_impl.get_time_delta(),
+            )
+        robot_output_impl.close()
@@ -0,0 +1,231 @@
+"""
+Warms the cache of the rewritten code ahead of time
+(`python -m robocorp.log precompile <path>`), so that the runs (or the
+workers) which use the same cache don't need to rewrite the modules
+when those are first imported.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Directories which are never searched for modules to precompile.
+_SKIP_DIRS = frozenset(("__pycache__", "node_modules", "output"))
+
+_config = None
+
+
+def _create_config(root: str):
+    from robocorp.log import DefaultAutoLogConfig
+    from robocorp.log.pyproject_config import (
+        read_pyproject_toml,
+        read_robocorp_auto_log_config,
+    )
+
+    pyproject = read_pyproject_toml(Path(root))
+    if pyproject is None:
+        return DefaultAutoLogConfig()
+
+    class _Context:
+        def show_error(self, message: str) -> None:
+            sys.stderr.write(message + "\n")
+
+    return read_robocorp_auto_log_config(_Context(), pyproject)
+
+
+@contextmanager
+def _pyc_cache_dir(cache_dir: Optional[str]) -> Iterator[None]:
+    """
+    Sets the directory where the rewritten pycs are cached while in the
+    context (restoring the previous value afterwards).
+    """
+    from ._rewrite_importhook import PYC_CACHE_DIR_ENV_VAR
+
+    if not cache_dir:
+        yield
+        return
+
+    initial = os.environ.get(PYC_CACHE_DIR_ENV_VAR)
+    os.environ[PYC_CACHE_DIR_ENV_VAR] = cache_dir
+    try:
+        yield
+    finally:
+        if initial is None:
+            del os.environ[PYC_CACHE_DIR_ENV_VAR]
+        else:
+            os.environ[PYC_CACHE_DIR_ENV_VAR] = initial
+
+
+def _init_worker(root: str, cache_dir: Optional[str]) -> None:
+    global _config
+
+    if cache_dir:
+        from ._rewrite_importhook import PYC_CACHE_DIR_ENV_VAR
+
+        os.environ[PYC_CACHE_DIR_ENV_VAR] = cache_dir
+    _config = _create_config(root)
+    _config.set_as_global()
+
+
+def _precompile_module(module_name: str, filename: str) -> Tuple[str, str]:
+    assert _config is not None
+    return _precompile_module_with_config(_config, module_name, filename)
+
+
+def _precompile_module_with_config(
+    config, module_name: str, filename: str
+) -> Tuple[str, str]:
+    """
+    Returns:
+        The filename and whether it was "cached", "compiled", "excluded" or
+        the error found.
+    """
+    from ._config import FilterKind
+    from ._rewrite_importhook import get_rewritten_code
+
+    try:
+        filter_kind = config.get_filter_kind_by_module_name_and_path(
+            module_name, filename
+        )
+        if filter_kind == FilterKind.exclude:
+            return filename, "excluded"
+
+        _co, cached = get_rewritten_code(Path(filename), config, filter_kind, True)
+    except Exception as e:
+        return filename, f"error: {e}"
+    return filename, "cached" if cached else "compiled"
+
+
+def iter_modules(root: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Provides the module names and filenames of the `.py` files in the given
+    directory (which is considered to be in the `sys.path`).
+    """
+    if root.is_file():
+        yield root.stem, str(root)
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if not d.startswith(".") and d not in _SKIP_DIRS
+        )
+        relative = Path(dirpath).relative_to(root).parts
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            name = filename[:-3]
+            if name == "__init__":
+                parts = relative
+            else:
+                parts = relative + (name,)
+            if not parts:
+                continue
+            yield ".".join(parts), os.path.join(dirpath, filename)
+
+
+def precompile(
+    root: Path, jobs: Optional[int] = None, cache_dir: Optional[str] = None
+) -> List[Tuple[str, str]]:
+    """
+    Rewrites the modules in the given directory (with the auto-logging
+    config from the `pyproject.toml` found for it, if any) and writes those
+    to the cache.
+
+    Args:
+        root: The directory (a `sys.path` entry) or file to precompile.
+        jobs: The number of processes used (by default the number of cpus).
+        cache_dir: If given, the pycs are written to this directory
+            (otherwise the default location is used, see:
+            `ROBOCORP_LOG_PYC_CACHE_DIR`).
+
+    Returns:
+        A list with the filename and the result of each module (see:
+        `_precompile_module_with_config`).
+    """
+    root = root.absolute()
+    config_root = str(root if root.is_dir() else root.parent)
+    modules = list(iter_modules(root))
+    if not modules:
+        return []
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(modules)))
+
+    if jobs == 1:
+        # Precompile in this process (the global config isn't changed and the
+        # cache dir is only set while precompiling).
+        config = _create_config(config_root)
+        with _pyc_cache_dir(cache_dir):
+            return [
+                _precompile_module_with_config(config, *module) for module in modules
+            ]
+
+    with ProcessPoolExecutor(
+        jobs, initializer=_init_worker, initargs=(config_root, cache_dir)
+    ) as executor:
+        module_names = [module[0] for module in modules]
+        filenames = [module[1] for module in modules]
+        # Submit in chunks as the work for each module is small.
+        chunksize = max(1, len(modules) // (jobs * 4))
+        return list(
+            executor.map(
+                _precompile_module, module_names, filenames, chunksize=chunksize
+            )
+        )
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m robocorp.log",
+        description="Utilities for robocorp.log.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    precompile_parser = subparsers.add_parser(
+        "precompile",
+        help="Rewrites the modules in the given path and caches those so that "
+        "the runs don't need to rewrite them for the auto-logging.",
+    )
+    precompile_parser.add_argument(
+        "path",
+        nargs="+",
+        help="The directories (i.e.: the project root or entries in the "
+        "PYTHONPATH) or files to precompile.",
+    )
+    precompile_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="The number of processes used (by default the number of cpus).",
+    )
+    precompile_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="The directory where the rewritten modules are cached (the "
+        "same directory must be set in the ROBOCORP_LOG_PYC_CACHE_DIR "
+        "environment variable in the runs). If not given, the "
+        "ROBOCORP_LOG_PYC_CACHE_DIR is used if set or the `__pycache__` "
+        "along with the sources otherwise.",
+    )
+    parsed = parser.parse_args(args)
+
+    errors = 0
+    for path in parsed.path:
+        counts = {"compiled": 0, "cached": 0, "excluded": 0}
+        for filename, result in precompile(Path(path), parsed.jobs, parsed.cache_dir):
+            if result in counts:
+                counts[result] += 1
+            else:
+                errors += 1
+                sys.stderr.write(f"{filename}: {result}\n")
+        print(
+            f"{path}: {counts['compiled']} compiled, {counts['cached']} already "
+            f"cached, {counts['excluded']} excluded."
+        )
+    return 1 if errors else 0
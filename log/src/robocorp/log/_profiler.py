@@ -0,0 +1,196 @@
+"""
+Aggregates the timings of the logged methods in-process (opt-in with
+`log.add_log_output(..., profile=True)`).
+
+The start/end of each method (and each time a generator runs until it yields
+or finishes) is matched with the stack of the thread where it ran, so, the
+self time of a method excludes the time of the methods it called (the time
+of loops/ifs inside a method is part of its self time).
+
+When the run finishes a report is written as json (`profile.json` in the
+output directory) and a summary with the methods with the biggest self time
+is added to the log.
+"""
+
+import html
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+PROFILE_REPORT_NAME = "profile.json"
+
+# The elements profiled (loops, ifs, etc. are part of the method's self time).
+PROFILED_ELEMENT_TYPES = frozenset(("METHOD", "GENERATOR"))
+
+# The number of methods shown in the summary added to the log.
+_SUMMARY_TOP = 20
+
+
+class _FunctionStats:
+    __slots__ = [
+        "name",
+        "libname",
+        "source",
+        "lineno",
+        "count",
+        "total_time",
+        "self_time",
+        "max_time",
+        "durations",
+    ]
+
+    def __init__(self, name: str, libname: str, source: str, lineno: int) -> None:
+        self.name = name
+        self.libname = libname
+        self.source = source
+        self.lineno = lineno
+        self.count = 0
+        # The time of recursive calls is only added to the total time once.
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.max_time = 0.0
+        # duration in milliseconds -> count (the times in the log have
+        # millisecond resolution, so, percentiles are exact).
+        self.durations: Dict[int, int] = {}
+
+    def percentile(self, percent: int) -> float:
+        target = math.ceil(self.count * percent / 100)
+        seen = 0
+        durations = self.durations
+        for ms in sorted(durations):
+            seen += durations[ms]
+            if seen >= target:
+                return ms / 1000
+        return self.max_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "libname": self.libname,
+            "source": self.source,
+            "lineno": self.lineno,
+            "count": self.count,
+            "total_time": round(self.total_time, 3),
+            "self_time": round(self.self_time, 3),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": round(self.max_time, 3),
+        }
+
+
+class _ThreadProfile:
+    def __init__(self) -> None:
+        # [stack_entry, key, start_time, children_time]
+        self.frames: List[list] = []
+        # key -> number of frames of the key in the stack (to know whether a
+        # call is recursive).
+        self.active: Dict[Tuple[str, str], int] = {}
+
+
+class _ElementProfiler:
+    def __init__(self) -> None:
+        self._threads: Dict[int, _ThreadProfile] = {}
+        self._stats: Dict[Tuple[str, str], _FunctionStats] = {}
+
+    def start(
+        self,
+        tid: int,
+        stack_entry: Any,
+        name: str,
+        libname: str,
+        source: str,
+        lineno: int,
+        time_delta: float,
+    ) -> None:
+        thread_profile = self._threads.get(tid)
+        if thread_profile is None:
+            thread_profile = self._threads[tid] = _ThreadProfile()
+
+        key = (libname, name)
+        if key not in self._stats:
+            self._stats[key] = _FunctionStats(name, libname, source, lineno)
+
+        thread_profile.frames.append([stack_entry, key, time_delta, 0.0])
+        active = thread_profile.active
+        active[key] = active.get(key, 0) + 1
+
+    def end(self, tid: int, stack_entry: Any, time_delta: float) -> None:
+        thread_profile = self._threads.get(tid)
+        if thread_profile is None:
+            return
+
+        frames = thread_profile.frames
+        for i in range(len(frames) - 1, -1, -1):
+            if frames[i][0] is stack_entry:
+                break
+        else:
+            # Not profiled (i.e.: started before a thread switch was noticed).
+            return
+
+        # Frames without an end are discarded (the log stack handles those
+        # as errors).
+        active = thread_profile.active
+        while len(frames) > i:
+            _stack_entry, key, start_time, children_time = frames.pop()
+            active[key] -= 1
+
+        elapsed = max(time_delta - start_time, 0.0)
+        if frames:
+            frames[-1][3] += elapsed
+
+        stats = self._stats[key]
+        stats.count += 1
+        if not active[key]:
+            stats.total_time += elapsed
+        stats.self_time += max(elapsed - children_time, 0.0)
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        ms = round(elapsed * 1000)
+        stats.durations[ms] = stats.durations.get(ms, 0) + 1
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Provides the stats of the methods (sorted by the self time).
+        """
+        functions = sorted(
+            self._stats.values(), key=lambda stats: stats.self_time, reverse=True
+        )
+        return {
+            "version": 1,
+            "functions": [stats.to_dict() for stats in functions if stats.count],
+        }
+
+
+def report_to_html(report: Dict[str, Any], report_path: Optional[str]) -> str:
+    """
+    Provides the summary of the report to be added to the log.html.
+    """
+    rows = []
+    for func in report["functions"][:_SUMMARY_TOP]:
+        rows.append(
+            "<tr><td>%s</td><td>%s</td><td>%s</td><td>%.3f</td><td>%.3f</td>"
+            "<td>%.3f</td><td>%.3f</td><td>%.3f</td></tr>"
+            % (
+                html.escape(func["name"]),
+                html.escape(func["libname"]),
+                func["count"],
+                func["self_time"],
+                func["total_time"],
+                func["p50"],
+                func["p95"],
+                func["max"],
+            )
+        )
+
+    contents = [
+        "<table>",
+        "<tr><th>Method</th><th>Library</th><th>Calls</th><th>Self (s)</th>"
+        "<th>Total (s)</th><th>p50 (s)</th><th>p95 (s)</th><th>Max (s)</th></tr>",
+        *rows,
+        "</table>",
+    ]
+    total = len(report["functions"])
+    if total > _SUMMARY_TOP:
+        contents.append(f"<p>Showing {_SUMMARY_TOP} of {total} methods.</p>")
+    if report_path:
+        contents.append(f"<p>Full report: {html.escape(report_path)}</p>")
+    return "".join(contents)
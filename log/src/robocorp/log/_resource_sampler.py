@@ -0,0 +1,123 @@
+"""
+Samples the resources used by the process (memory, cpu, open files, threads
+and child processes) periodically in a background thread and writes those as
+`RS` messages to the registered loggers (opt-in with
+`log.setup_log(resource_sample_interval=...)`).
+"""
+
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from ._logger_instances import _get_logger_instances
+
+
+class _ResourceSampler:
+    def __init__(self, interval: float) -> None:
+        import psutil
+
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._process = psutil.Process()
+
+        # pid -> Process (the cpu percent is computed from the previous call
+        # in the same Process instance, so, those are kept among samples).
+        self._children: Dict[int, Any] = {}
+
+        # The first call to cpu_percent() just sets the baseline.
+        self._process.cpu_percent()
+
+        self._thread = threading.Thread(
+            target=self._run, name="RobocorpLogResourceSampler"
+        )
+        self._thread.daemon = True
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        import traceback
+
+        wait = self._stop_event.wait
+        interval = self._interval
+        while not wait(interval):
+            try:
+                self._sample()
+            except Exception:
+                traceback.print_exc()
+
+    def _num_fds(self, process) -> int:
+        if sys.platform == "win32":
+            return process.num_handles()
+        return process.num_fds()
+
+    def _sample(self) -> None:
+        from psutil import AccessDenied, NoSuchProcess, ZombieProcess
+
+        process = self._process
+        with process.oneshot():
+            rss = process.memory_info().rss
+            cpu_percent = process.cpu_percent()
+            threads = process.num_threads()
+            try:
+                fds = self._num_fds(process)
+            except AccessDenied:
+                fds = -1
+
+        children_rss = 0
+        children_cpu_percent = 0.0
+        new_children: Dict[int, Any] = {}
+        try:
+            children = process.children(recursive=True)
+        except (AccessDenied, NoSuchProcess, ZombieProcess):
+            children = []
+
+        for child in children:
+            child = self._children.get(child.pid, child)
+            try:
+                with child.oneshot():
+                    children_rss += child.memory_info().rss
+                    # Note: 0.0 in the first sample of a child.
+                    children_cpu_percent += child.cpu_percent()
+            except (AccessDenied, NoSuchProcess, ZombieProcess):
+                continue
+            new_children[child.pid] = child
+        self._children = new_children
+
+        with _get_logger_instances() as logger_instances:
+            for robo_logger in logger_instances:
+                robo_logger.resource_sample(
+                    rss,
+                    cpu_percent,
+                    fds,
+                    threads,
+                    len(new_children),
+                    children_rss,
+                    children_cpu_percent,
+                )
+
+
+_sampler: Optional[_ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def set_interval(interval: Optional[float]) -> None:
+    """
+    Starts sampling with the given interval (in seconds) or stops sampling if
+    the interval is 0 or None.
+    """
+    global _sampler
+
+    with _sampler_lock:
+        if _sampler is not None:
+            _sampler.stop()
+            _sampler = None
+
+        if interval:
+            _sampler = _ResourceSampler(interval)
+            _sampler.start()
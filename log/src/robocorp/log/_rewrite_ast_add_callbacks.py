@@ -383,6 +383,23 @@ def _handle_funcdef(
             yield rewrite_ctx.DONT_GO_INTO_NODE
             return
 
+        max_function_depth = config.get_rewrite_max_function_depth()
+        if max_function_depth is not None:
+            depth = 1
+            for parent in rewrite_ctx.stack:
+                if isinstance(parent, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    depth += 1
+            if depth > max_function_depth:
+                # Functions nested in this one are even deeper.
+                yield rewrite_ctx.DONT_GO_INTO_NODE
+                return
+
+        if not config.get_rewrite_yields() and rewrite_ctx.is_generator(function):
+            # Without the yield callbacks the contents of the caller would be
+            # shown inside the generator, so, generators aren't tracked.
+            yield rewrite_ctx.DONT_GO_INTO_NODE
+            return
+
         if filter_kind == FILTER_KIND_PROJECT_CALL and rewrite_ctx.is_generator(
             function
         ):
@@ -471,6 +488,9 @@ def _handle_continue_break(
     filter_kind: FilterKindLiteral,
     node: Union[ast.Continue, ast.Break],
 ):
+    if not config.get_rewrite_loops():
+        return None
+
     func_and_class_name = rewrite_ctx.get_function_and_class_name()
     if not func_and_class_name:
         return None
@@ -517,6 +537,10 @@ def _handle_if(
     notify that an if branch was taken, but we don't notify when it exits, which
     is meant for generators) or scoped (regular case without generators).
     """
+    if not config.get_rewrite_ifs():
+        yield
+        return None
+
     func_and_class_name = rewrite_ctx.get_function_and_class_name()
     if not func_and_class_name:
         yield
@@ -947,6 +971,10 @@ def _handle_for_or_while(
     filter_kind: FilterKindLiteral,
     node: Union[ast.For, ast.While],
 ):
+    if not config.get_rewrite_loops():
+        yield
+        return None
+
     func_and_class_name = rewrite_ctx.get_function_and_class_name()
     if not func_and_class_name:
         yield
@@ -1132,6 +1160,9 @@ def _handle_yield(
     filter_kind: FilterKindLiteral,
     node: Union[ast.Yield, ast.YieldFrom],
 ):
+    if not config.get_rewrite_yields():
+        return None
+
     func_and_class_name = rewrite_ctx.get_function_and_class_name()
     if not func_and_class_name:
         return None
@@ -29,11 +29,25 @@ import importlib.machinery
 import importlib.util
 import marshal
 import os
-import struct
 import sys
+import threading
+import time
 import types
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import IO, Callable, Dict, Optional, Sequence, Tuple, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from ._config import AutoLogConfigBase, FilterKind
 
@@ -62,11 +76,20 @@ from ._config import AutoLogConfigBase, FilterKind
 # 0.0.23: continue/break reported
 # 0.0.24: if/elif/else can create a scope when not in generators
 # 0.0.25: fix dealing with generators
-version = "0.0.25"
+# 0.0.26: pycs are hash-based and keyed by the rewrite config
+version = "0.0.26"
 NAME_WITH_TAG = f"{sys.implementation.cache_tag}-log-{version}"
 PYC_EXT = ".py" + (__debug__ and "c" or "o")
 PYC_TAIL = "." + NAME_WITH_TAG + PYC_EXT
 
+# If set, the rewritten pycs are cached in this directory (which may be shared
+# by all the runs/workers in an environment) instead of the `__pycache__`
+# folder along with the sources.
+PYC_CACHE_DIR_ENV_VAR = "ROBOCORP_LOG_PYC_CACHE_DIR"
+
+# PEP 552: hash-based pyc which should be checked against the source.
+_PYC_FLAGS = b"\x03\x00\x00\x00"
+
 FORCE_CODE_GENERATION = False
 DEBUG = False
 
@@ -82,6 +105,47 @@ else:
         pass
 
 
+class ImportHookStats:
+    """
+    The time added to the imports by the hook (finding the modules to be
+    rewritten and rewriting them or loading them from the cache).
+    """
+
+    __slots__ = [
+        "find_spec_calls",
+        "find_spec_time",
+        "cached_decisions",
+        "modules_rewritten",
+        "modules_from_cache",
+        "load_time",
+    ]
+
+    def __init__(self) -> None:
+        self.find_spec_calls = 0
+        self.find_spec_time = 0.0
+        self.cached_decisions = 0
+        self.modules_rewritten = 0
+        self.modules_from_cache = 0
+        self.load_time = 0.0
+
+    @property
+    def total_time(self) -> float:
+        return self.find_spec_time + self.load_time
+
+    def __str__(self) -> str:
+        return (
+            f"Auto-logging import hook added {self.total_time:.3f}s to imports "
+            f"(finding modules: {self.find_spec_time:.3f}s in "
+            f"{self.find_spec_calls} calls, {self.cached_decisions} from the cache; "
+            f"loading modules: {self.load_time:.3f}s, {self.modules_rewritten} "
+            f"rewritten, {self.modules_from_cache} from the cache)."
+        )
+
+
+# Decision of the hook for a module which isn't rewritten.
+_NOT_REWRITTEN = ("", None)
+
+
 class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
     """PEP302/PEP451 import hook which rewrites asserts."""
 
@@ -91,10 +155,21 @@ class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         # flag to guard against trying to rewrite a pyc file while we are already writing another pyc file,
         # which might result in infinite recursion (#3506)
         self._writing_pyc = False
+        self.stats = ImportHookStats()
+
+        # (name, path) -> (filename, submodule_search_locations) of the modules
+        # to be rewritten or _NOT_REWRITTEN (so that the same module isn't
+        # searched again, i.e.: on reloads). Cleared when the sys.path changes
+        # or in `invalidate_caches()`.
+        self._decisions: Dict[Tuple[str, Optional[tuple]], Tuple[str, Any]] = {}
+        self._decisions_sys_path: List[str] = list(sys.path)
 
     # Indirection so we can mock calls to find_spec originated from the hook during testing
     _find_spec = importlib.machinery.PathFinder.find_spec
 
+    def invalidate_caches(self) -> None:
+        self._decisions.clear()
+
     def find_spec(
         self,
         name: str,
@@ -104,6 +179,17 @@ class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         if self._writing_pyc:
             return None
 
+        stats = self.stats
+        stats.find_spec_calls += 1
+        initial_time = time.perf_counter()
+        try:
+            return self._find_spec_to_rewrite(name, path)
+        finally:
+            stats.find_spec_time += time.perf_counter() - initial_time
+
+    def _find_spec_to_rewrite(
+        self, name: str, path: Optional[Sequence[Union[str, bytes]]]
+    ) -> Optional[importlib.machinery.ModuleSpec]:
         filter_kind: Optional[FilterKind] = self.config.get_filter_kind_by_module_name(
             name
         )
@@ -112,21 +198,51 @@ class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
             if filter_kind == FilterKind.exclude:
                 return None
 
+        if path is None and name in sys.builtin_module_names:
+            # Builtin modules are never found in the path.
+            return None
+
+        if self._decisions_sys_path != sys.path:
+            self._decisions.clear()
+            self._decisions_sys_path = list(sys.path)
+
+        key = (name, None if path is None else tuple(path))
+        decision = self._decisions.get(key)
+        if decision is not None:
+            self.stats.cached_decisions += 1
+            if decision is _NOT_REWRITTEN:
+                return None
+            fn, submodule_search_locations = decision
+            if os.path.exists(fn):
+                return importlib.util.spec_from_file_location(
+                    name,
+                    fn,
+                    loader=self,
+                    submodule_search_locations=None
+                    if submodule_search_locations is None
+                    else list(submodule_search_locations),
+                )
+            del self._decisions[key]
+
         trace("find_module called for: %s" % name)
 
         # Type ignored because mypy is confused about the `self` binding here.
         spec = self._find_spec(name, path)  # type: ignore
-        if (
+        if spec is None:
             # the import machinery could not find a file to import
-            spec is None
+            # (not cached as it may be found afterwards).
+            return None
+
+        if (
             # this is a namespace package (without `__init__.py`)
             # there's nothing to rewrite there
-            or spec.origin is None
+            spec.origin is None
             # we can only rewrite source files
             or not isinstance(spec.loader, importlib.machinery.SourceFileLoader)
             # if the file doesn't exist, we can't rewrite it
             or not os.path.exists(spec.origin)
         ):
+            self._decisions[key] = _NOT_REWRITTEN
             return None
         else:
             fn = spec.origin
@@ -134,8 +250,13 @@ class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         if filter_kind is None:
             filter_kind = self.config.get_filter_kind_by_module_name_and_path(name, fn)
             if filter_kind == FilterKind.exclude:
+                self._decisions[key] = _NOT_REWRITTEN
                 return None
 
+        submodule_search_locations = spec.submodule_search_locations
+        if submodule_search_locations is not None:
+            submodule_search_locations = list(submodule_search_locations)
+        self._decisions[key] = (fn, submodule_search_locations)
         return importlib.util.spec_from_file_location(
             name,
             fn,
@@ -163,40 +284,31 @@ class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         # tricky race conditions, we maintain the following invariant: The
         # cached pyc is always a complete, valid pyc. Operations on it must be
         # atomic. POSIX's atomic rename comes in handy.
-        write = not sys.dont_write_bytecode
-        cache_dir = get_cache_dir(fn)
-        if write:
-            ok = try_makedirs(cache_dir)
-            if not ok:
-                write = False
-                trace(f"read only directory: {cache_dir}")
-
         filter_kind: FilterKind = self.config.get_filter_kind_by_module_name_and_path(
             module.__name__, module.__spec__.origin
         )
 
-        cache_name = fn.name[:-3] + "-" + filter_kind.value + PYC_TAIL
-
-        pyc = cache_dir / cache_name
-        # Notice that even if we're in a read-only directory, I'm going
-        # to check for a cached pyc. This may not be optimal...
-        if FORCE_CODE_GENERATION:
-            co = None
-        else:
-            co = _read_pyc(fn, pyc, trace)
-        if co is None:
-            trace(f"rewriting {fn!r}")
-            source_stat, co, _tree = _rewrite(fn, self.config, filter_kind)
-            if write:
-                self._writing_pyc = True
-                try:
-                    _write_pyc(co, source_stat, pyc)
-                finally:
-                    self._writing_pyc = False
+        write = not sys.dont_write_bytecode
+        stats = self.stats
+        initial_time = time.perf_counter()
+        co, cached = get_rewritten_code(
+            fn, self.config, filter_kind, write, self._writing_pyc_guard
+        )
+        stats.load_time += time.perf_counter() - initial_time
+        if cached:
+            stats.modules_from_cache += 1
         else:
-            trace(f"found cached rewritten pyc for {fn}")
+            stats.modules_rewritten += 1
         exec(co, module.__dict__)
 
+    @contextmanager
+    def _writing_pyc_guard(self) -> Iterator[None]:
+        self._writing_pyc = True
+        try:
+            yield
+        finally:
+            self._writing_pyc = False
+
     def get_data(self, pathname: Union[str, bytes]) -> bytes:
         """Optional PEP302 get_data API."""
         with open(pathname, "rb") as f:
@@ -219,33 +331,84 @@ class RewriteHook(importlib.abc.MetaPathFinder, importlib.abc.Loader):
             )
 
 
-def _write_pyc_fp(
-    fp: IO[bytes], source_stat: os.stat_result, co: types.CodeType
-) -> None:
+def get_rewritten_code(
+    fn: Path,
+    config: AutoLogConfigBase,
+    filter_kind: FilterKind,
+    write: bool,
+    writing_pyc_guard: Callable[[], ContextManager[None]] = nullcontext,
+) -> Tuple[types.CodeType, bool]:
+    """
+    Provides the rewritten code for the given source (from the cache if
+    available, otherwise the source is rewritten and added to the cache if
+    `write` is True -- the pyc is written inside the `writing_pyc_guard`).
+
+    Returns:
+        The code and whether it was loaded from the cache.
+    """
+    source = fn.read_bytes()
+    source_hash = importlib.util.source_hash(source)
+    cache_dirs = get_cache_dirs(fn)
+    pyc_name = get_pyc_name(fn, config, filter_kind)
+
+    # Notice that even if we're in a read-only directory, I'm going
+    # to check for a cached pyc. This may not be optimal...
+    if not FORCE_CODE_GENERATION:
+        for cache_dir in cache_dirs:
+            co = _read_pyc(fn, cache_dir / pyc_name, source_hash, trace)
+            if co is not None:
+                trace(f"found cached rewritten pyc for {fn}")
+                return co, True
+
+    trace(f"rewriting {fn!r}")
+    source_hash, co, _tree = _rewrite(fn, config, filter_kind, source)
+    if write:
+        with writing_pyc_guard():
+            for cache_dir in cache_dirs:
+                if not try_makedirs(cache_dir):
+                    trace(f"read only directory: {cache_dir}")
+                    continue
+                if _write_pyc(co, source_hash, cache_dir / pyc_name):
+                    break
+    return co, False
+
+
+def get_pyc_name(fn: Path, config: AutoLogConfigBase, filter_kind: FilterKind) -> str:
+    """
+    The name of the pyc has the filter kind and a hash of the config options
+    which change how the code is rewritten (so, the same file rewritten with
+    different configs doesn't collide).
+    """
+    fingerprint = importlib.util.source_hash(
+        config.get_rewrite_fingerprint().encode("utf-8")
+    ).hex()
+    return f"{fn.name[:-3]}-{filter_kind.value}-{fingerprint}{PYC_TAIL}"
+
+
+def _write_pyc_fp(fp: IO[bytes], source_hash: bytes, co: types.CodeType) -> None:
     # Technically, we don't have to have the same pyc format as
     # (C)Python, since these "pycs" should never be seen by builtin
     # import. However, there's little reason to deviate.
     fp.write(importlib.util.MAGIC_NUMBER)
     # https://www.python.org/dev/peps/pep-0552/
-    flags = b"\x00\x00\x00\x00"
-    fp.write(flags)
-    # as of now, bytecode header expects 32-bit numbers for size and mtime (#4903)
-    mtime = int(source_stat.st_mtime) & 0xFFFFFFFF
-    size = source_stat.st_size & 0xFFFFFFFF
-    # "<LL" stands for 2 unsigned longs, little-endian.
-    fp.write(struct.pack("<LL", mtime, size))
+    # The hash of the contents is used (and not the mtime/size) so that the
+    # pyc is still valid when the sources are copied/checked out elsewhere.
+    fp.write(_PYC_FLAGS)
+    fp.write(source_hash)
     fp.write(marshal.dumps(co))
 
 
 def _write_pyc(
     co: types.CodeType,
-    source_stat: os.stat_result,
+    source_hash: bytes,
     pyc: Path,
 ) -> bool:
-    proc_pyc = f"{pyc}.{os.getpid()}"
+    # The temporary file is unique per process/thread so that concurrent
+    # writers (i.e.: workers sharing the cache dir) don't clash.
+    proc_pyc = f"{pyc}.{os.getpid()}.{threading.get_ident()}"
     try:
         with open(proc_pyc, "wb") as fp:
-            _write_pyc_fp(fp, source_stat, co)
+            _write_pyc_fp(fp, source_hash, co)
     except OSError as e:
         trace(f"error writing pyc file at {proc_pyc}: errno={e.errno}")
         return False
@@ -257,18 +420,26 @@ def _write_pyc(
         # we ignore any failure to write the cache file
         # there are many reasons, permission-denied, pycache dir being a
         # file etc.
+        try:
+            os.remove(proc_pyc)
+        except OSError:
+            pass
         return False
     return True
 
 
 def _rewrite(
-    fn: Path, config: AutoLogConfigBase, filter_kind: FilterKind
-) -> Tuple[os.stat_result, types.CodeType, ast.AST]:
+    fn: Path,
+    config: AutoLogConfigBase,
+    filter_kind: FilterKind,
+    source: Optional[bytes] = None,
+) -> Tuple[bytes, types.CodeType, ast.AST]:
     """Read and rewrite *fn* and return the code object."""
     from ._rewrite_ast_add_callbacks import rewrite_ast_add_callbacks
 
-    stat = os.stat(fn)
-    source = fn.read_bytes()
+    if source is None:
+        source = fn.read_bytes()
+    source_hash = importlib.util.source_hash(source)
     strfn = str(fn)
     tree = ast.parse(source, filename=strfn)
     rewrite_ast_add_callbacks(tree, filter_kind, source, strfn, config)
@@ -276,11 +447,14 @@ def _rewrite(
         print(f"Changed {strfn} to:")
         print(ast.unparse(tree))
     co = compile(tree, strfn, "exec", dont_inherit=True)
-    return stat, co, tree
+    return source_hash, co, tree
 
 
 def _read_pyc(
-    source: Path, pyc: Path, trace: Callable[[str], None] = lambda x: None
+    source: Path,
+    pyc: Path,
+    source_hash: bytes,
+    trace: Callable[[str], None] = lambda x: None,
 ) -> Optional[types.CodeType]:
     """Possibly read a pytest pyc containing rewritten code.
 
@@ -292,9 +466,6 @@ def _read_pyc(
         return None
     with fp:
         try:
-            stat_result = os.stat(source)
-            mtime = int(stat_result.st_mtime)
-            size = stat_result.st_size
             data = fp.read(16)
         except OSError as e:
             trace(f"_read_pyc({source}): OSError {e}")
@@ -306,17 +477,12 @@ def _read_pyc(
         if data[:4] != importlib.util.MAGIC_NUMBER:
             trace("_read_pyc(%s): invalid pyc (bad magic number)" % source)
             return None
-        if data[4:8] != b"\x00\x00\x00\x00":
+        if data[4:8] != _PYC_FLAGS:
             trace("_read_pyc(%s): invalid pyc (unsupported flags)" % source)
             return None
-        mtime_data = data[8:12]
-        if int.from_bytes(mtime_data, "little") != mtime & 0xFFFFFFFF:
+        if data[8:16] != source_hash:
             trace("_read_pyc(%s): out of date" % source)
             return None
-        size_data = data[12:16]
-        if int.from_bytes(size_data, "little") != size & 0xFFFFFFFF:
-            trace("_read_pyc(%s): invalid pyc (incorrect size)" % source)
-            return None
         try:
             co = marshal.load(fp)
         except Exception as e:
@@ -350,15 +516,44 @@ def try_makedirs(cache_dir: Path) -> bool:
     return True
 
 
+def get_cache_dirs(file_path: Path) -> List[Path]:
+    """
+    Return the directories where the rewritten pycs of the given .py file path
+    may be cached (in order of preference).
+    """
+    shared_cache_dir = os.environ.get(PYC_CACHE_DIR_ENV_VAR)
+    if shared_cache_dir:
+        return [_get_mirrored_dir(Path(shared_cache_dir), file_path)]
+
+    # If the `__pycache__` can't be written (i.e.: read-only deployment) the
+    # user cache dir is used.
+    return [
+        get_cache_dir(file_path),
+        _get_mirrored_dir(get_user_cache_dir(), file_path),
+    ]
+
+
+def get_user_cache_dir() -> Path:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "robocorp" / "log-pyc"
+
+
+def _get_mirrored_dir(cache_dir: Path, file_path: Path) -> Path:
+    # given:
+    #   cache_dir = '/tmp/pycs'
+    #   path = '/home/user/proj/test_app.py'
+    # we want:
+    #   '/tmp/pycs/home/user/proj'
+    return cache_dir / Path(*file_path.parts[1:-1])
+
+
 def get_cache_dir(file_path: Path) -> Path:
     """Return the cache directory to write .pyc files for the given .py file path."""
     if sys.version_info >= (3, 8) and sys.pycache_prefix:
-        # given:
-        #   prefix = '/tmp/pycs'
-        #   path = '/home/user/proj/test_app.py'
-        # we want:
-        #   '/tmp/pycs/home/user/proj'
-        return Path(sys.pycache_prefix) / Path(*file_path.parts[1:-1])
+        return _get_mirrored_dir(Path(sys.pycache_prefix), file_path)
     else:
         # classic pycache directory
         return file_path.parent / "__pycache__"
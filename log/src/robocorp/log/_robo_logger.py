@@ -3,10 +3,20 @@ import functools
 import sys
 import threading
 import traceback
+from _thread import get_ident
 from pathlib import Path
-from typing import Any, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple, Union
 
-from .protocols import LogElementType, LogHTMLStyle, OptExcInfo
+from .protocols import (
+    LogElementType,
+    LogHTMLStyle,
+    OptExcInfo,
+    OutputFormat,
+    QueueOverflowPolicy,
+)
+
+if TYPE_CHECKING:
+    from ._output_in_thread import _OutputInThread
 
 
 class _LogErrorLock:
@@ -41,6 +51,34 @@ def _log_error(func):
     return new_func
 
 
+def _synchronized(func):
+    """
+    Calls to the output are synchronized with a lock (per logger) and the
+    output is notified whenever the thread doing the call changes (so that
+    each thread has its own stack of elements).
+    """
+
+    @functools.wraps(func)
+    def new_func(self, *args, **kwargs) -> Any:
+        with self._lock:
+            thread_ident = get_ident()
+            if thread_ident != self._last_thread_ident:
+                self._last_thread_ident = thread_ident
+                self._robot_output_impl.switch_thread(
+                    thread_ident, threading.current_thread().name
+                )
+            return func(self, *args, **kwargs)
+
+    return new_func
+
+
+class _SkipCounters(threading.local):
+    # Suppressing is done per thread (i.e.: a thread suppressing methods
+    # or variables doesn't affect the logging done by other threads).
+    skip_log_methods = 0
+    skip_log_variables = 0
+
+
 class _RoboLogger:
     def __init__(
         self,
@@ -50,6 +88,18 @@ class _RoboLogger:
         log_html: Optional[Union[Path, str]] = None,
         log_html_style: LogHTMLStyle = "standalone",
         min_messages_per_file: int = 50,
+        buffer_size: Union[str, int] = 0,
+        flush_interval: float = 1.0,
+        write_in_thread: bool = False,
+        max_queue_size: int = 10_000,
+        queue_overflow: QueueOverflowPolicy = "block",
+        log_html_compression_level: int = 6,
+        log_html_update_interval: float = 0,
+        output_format: OutputFormat = "text",
+        write_index: bool = False,
+        profile: bool = False,
+        memo_max_size: Union[str, int] = 0,
+        memo_max_entry_size: Union[str, int] = 0,
         **kwargs,
     ):
         from ._convert_units import _convert_to_bytes
@@ -90,15 +140,69 @@ class _RoboLogger:
                 f" 10kb. Found: {config.max_file_size_in_bytes}. Arg: {max_file_size}."
             )
 
+        config.buffer_size_in_bytes = _convert_to_bytes(buffer_size)
+        if flush_interval <= 0:
+            raise ValueError(f"flush_interval must be > 0. Found: {flush_interval}")
+        config.flush_interval = flush_interval
+
+        if not -1 <= log_html_compression_level <= 9:
+            raise ValueError(
+                "log_html_compression_level must be between -1 and 9. Found:"
+                f" {log_html_compression_level}"
+            )
+        config.log_html_compression_level = log_html_compression_level
+
+        if log_html_update_interval < 0:
+            raise ValueError(
+                "log_html_update_interval must be >= 0. Found:"
+                f" {log_html_update_interval}"
+            )
+        config.log_html_update_interval = log_html_update_interval
+
+        if output_format not in ("text", "binary"):
+            raise ValueError(f"Unexpected output format: {output_format}")
+        if output_format == "binary" and output_dir is None:
+            raise ValueError("The binary output format requires an output_dir.")
+        config.output_format = output_format
+        config.write_index = write_index
+        config.profile = profile
+        config.memo_max_size_in_bytes = _convert_to_bytes(memo_max_size)
+        config.memo_max_entry_size_in_bytes = _convert_to_bytes(memo_max_entry_size)
+
         # Note: expected to be used just when used in-memory (not part of the
         # public API).
         config.write = kwargs.get("__write__")
         config.initial_time = kwargs.get("__initial_time__")
         config.additional_info = kwargs.get("__additional_info__")
 
+        self._robot_output_impl: "Union[_RoboOutputImpl, _OutputInThread]"
         self._robot_output_impl = _RoboOutputImpl(config)
-        self._skip_log_methods = 0
-        self._skip_log_variables = 0
+        if write_in_thread:
+            from . import _output_in_thread
+
+            self._robot_output_impl = _output_in_thread._OutputInThread(
+                self._robot_output_impl, max_queue_size, queue_overflow
+            )
+        self._skip_counters = _SkipCounters()
+
+        self._lock = threading.RLock()
+        self._last_thread_ident = threading.main_thread().ident
+
+    @property
+    def _skip_log_methods(self) -> int:
+        return self._skip_counters.skip_log_methods
+
+    @_skip_log_methods.setter
+    def _skip_log_methods(self, value: int) -> None:
+        self._skip_counters.skip_log_methods = value
+
+    @property
+    def _skip_log_variables(self) -> int:
+        return self._skip_counters.skip_log_variables
+
+    @_skip_log_variables.setter
+    def _skip_log_variables(self, value: int) -> None:
+        self._skip_counters.skip_log_variables = value
 
     @property
     def robot_output_impl(self):
@@ -111,6 +215,7 @@ class _RoboLogger:
     def _get_time_delta(self) -> float:
         return self._robot_output_impl.get_time_delta()
 
+    @_synchronized
     def start_logging_methods(self):
         if self._skip_log_methods <= 0:
             self._robot_output_impl.log_message(
@@ -132,6 +237,7 @@ class _RoboLogger:
     def stop_logging_methods(self):
         self._skip_log_methods += 1
 
+    @_synchronized
     def start_logging_variables(self):
         if self._skip_log_variables <= 0:
             self._robot_output_impl.log_message(
@@ -153,7 +259,24 @@ class _RoboLogger:
     def stop_logging_variables(self):
         self._skip_log_variables += 1
 
+    def accepts_variables(self) -> bool:
+        """
+        Returns:
+            Whether the values of variables (arguments, assigns, return values)
+            would be logged right now.
+        """
+        return not (self._skip_log_variables or self._skip_log_methods)
+
+    def accepts_methods(self) -> bool:
+        """
+        Returns:
+            Whether the methods (and the loops and their iterations) would be
+            logged right now.
+        """
+        return not self._skip_log_methods
+
     @_log_error
+    @_synchronized
     def start_run(self, name: str) -> None:
         return self._robot_output_impl.start_run(
             name,
@@ -161,10 +284,12 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def end_run(self, name: str, status: str):
         return self._robot_output_impl.end_run(name, status, self._get_time_delta())
 
     @_log_error
+    @_synchronized
     def start_task(self, name: str, libname: str, source: str, lineno: int, doc: str):
         return self._robot_output_impl.start_task(
             name,
@@ -176,10 +301,12 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def send_info(self, info: str):
         return self._robot_output_impl.send_info(info)
 
     @_log_error
+    @_synchronized
     def send_start_time_delta(self, time_delta_in_seconds: float):
         if self._skip_log_methods:
             return
@@ -187,6 +314,7 @@ class _RoboLogger:
         return self._robot_output_impl.send_start_time_delta(time_delta_in_seconds)
 
     @_log_error
+    @_synchronized
     def end_task(self, name: str, libname: str, status: str, message: str):
         return self._robot_output_impl.end_task(
             name,
@@ -197,6 +325,14 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
+    def merge_output_dir(
+        self, output_dir: Union[str, Path], skip_task_libnames: Sequence[str] = ()
+    ):
+        return self._robot_output_impl.merge_output_dir(output_dir, skip_task_libnames)
+
+    @_log_error
+    @_synchronized
     def start_element(
         self,
         name: str,
@@ -238,6 +374,7 @@ class _RoboLogger:
             hide_from_logs,
         )
 
+    @_synchronized
     def yield_resume(
         self,
         name: str,
@@ -256,6 +393,7 @@ class _RoboLogger:
             hide_from_logs,
         )
 
+    @_synchronized
     def yield_suspend(
         self,
         name: str,
@@ -279,6 +417,7 @@ class _RoboLogger:
             self._get_time_delta(),
         )
 
+    @_synchronized
     def yield_from_resume(
         self,
         name: str,
@@ -297,6 +436,7 @@ class _RoboLogger:
             hide_from_logs,
         )
 
+    @_synchronized
     def yield_from_suspend(
         self,
         name: str,
@@ -313,6 +453,7 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def after_assign(
         self,
         name: str,
@@ -338,6 +479,7 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def method_return(
         self,
         name: str,
@@ -361,6 +503,7 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def end_method(
         self,
         element_type: LogElementType,
@@ -373,6 +516,7 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def log_message(
         self,
         level: str,
@@ -388,6 +532,7 @@ class _RoboLogger:
         )
 
     @_log_error
+    @_synchronized
     def log_method_except(
         self,
         exc_info: OptExcInfo,
@@ -403,6 +548,7 @@ class _RoboLogger:
         return self._robot_output_impl.log_method_except(exc_info, unhandled, hide_vars)
 
     @_log_error
+    @_synchronized
     def process_snapshot(
         self,
     ):
@@ -416,6 +562,7 @@ class _RoboLogger:
         return self._robot_output_impl.process_snapshot(hide_vars)
 
     @_log_error
+    @_synchronized
     def console_message(
         self,
         message: str,
@@ -426,5 +573,32 @@ class _RoboLogger:
         )
 
     @_log_error
+    def resource_sample(
+        self,
+        rss: int,
+        cpu_percent: float,
+        fds: int,
+        threads: int,
+        children: int,
+        children_rss: int,
+        children_cpu_percent: float,
+    ):
+        # Note: not `@_synchronized` as the sample isn't related to the stack
+        # of the thread doing the sampling (so, there's no need to notify a
+        # thread switch).
+        with self._lock:
+            return self._robot_output_impl.resource_sample(
+                rss,
+                cpu_percent,
+                fds,
+                threads,
+                children,
+                children_rss,
+                children_cpu_percent,
+                self._get_time_delta(),
+            )
+
+    @_log_error
+    @_synchronized
     def close(self):
         self.robot_output_impl.close()
@@ -1,3 +1,4 @@
+import atexit
 import datetime
 import itertools
 import json
@@ -8,19 +9,61 @@ import threading
 import time
 import traceback
 import weakref
+from collections import OrderedDict
 from datetime import timezone
 from functools import partial
 from pathlib import Path
 from types import FrameType
-from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from robocorp.log._constants import UNSCOPED_ELEMENTS
+from robocorp.log._log_index import FAILED_STATUSES, _IndexWriter, index_path
 from robocorp.log._log_redacter import _log_redacter
+from robocorp.log._profiler import (
+    PROFILE_REPORT_NAME,
+    PROFILED_ELEMENT_TYPES,
+    _ElementProfiler,
+    report_to_html,
+)
 
 from .protocols import LogElementType, OptExcInfo
 
 WRITE_CONTENTS_TO_STDERR: bool = False
 
+# Each part of the log is embedded in the log.html as a single zlib stream
+# (unless it's bigger than this size, in which case it's split in blocks of
+# this size -- uncompressed -- so that the viewer doesn't need to inflate a
+# huge string at once).
+_LOG_HTML_BLOCK_SIZE = 8 * 1024 * 1024
+
+# The size of each read when compressing the contents for the log.html.
+_LOG_HTML_READ_SIZE = 256 * 1024
+
+# When the log.html is updated during the run, the contents are added to this
+# global (in the browser) by the scripts appended to the log.html.
+_LOG_HTML_CHUNKS_GLOBAL = "robocorpLogChunks"
+
+# Whether the thread switches (`TH`) are written. Note: those may only be
+# enabled (along with bumping the `DOC_VERSION` to 0.0.5) once the viewer
+# embedded in the log.html (`_index_v3.py`) is rebuilt with support for those
+# (the viewer currently bundled expects 0.0.4 and would mix the elements of
+# all the threads in a single stack anyways).
+_WRITE_THREAD_SWITCHES = False
+
+# The (approximate) memory used by each entry of a bounded memo besides the
+# contents of its strings (used to account the `memo_max_size`).
+_MEMO_ENTRY_OVERHEAD = 300
+
 _valid_chars = tuple(string.ascii_letters + string.digits)
 
 
@@ -145,6 +188,40 @@ class _Config:
     log_html_style: int
     uuid: str
 
+    # When 0 each message is flushed to the file as soon as it's written,
+    # otherwise messages are kept in memory until this many bytes are
+    # buffered (or until `flush_interval` seconds elapse).
+    buffer_size_in_bytes: int = 0
+    flush_interval: float = 1.0
+
+    # The zlib compression level used for the contents embedded in the
+    # log.html.
+    log_html_compression_level: int = 6
+
+    # When > 0 the log.html is written when the output is created and the
+    # new contents are appended to it every `log_html_update_interval`
+    # seconds (otherwise it's only written when the output is closed).
+    log_html_update_interval: float = 0
+
+    # "text" or "binary" (see: `_binary_format`).
+    output_format: str = "text"
+
+    # When True an index is written along with each part (see: `_log_index`).
+    write_index: bool = False
+
+    # When True the timings of the methods are aggregated and a report is
+    # written when the run finishes (see: `_profiler`).
+    profile: bool = False
+
+    # When > 0 the memos (strings and locations) are kept in an LRU with
+    # (approximately) up to this many bytes (the entries evicted are written
+    # again when used afterwards).
+    memo_max_size_in_bytes: int = 0
+
+    # When > 0 strings bigger than this are not memoized (they're written
+    # again whenever used).
+    memo_max_entry_size_in_bytes: int = 0
+
     # Loaded from constructor kwargs (to be used
     # only when used as an API).
     write: Optional[Callable[[str], None]] = None
@@ -160,6 +237,142 @@ class _Config:
         self.output_dir = "./out_"
 
 
+def _write_compressed_chunks(
+    fsrc, write: Callable[[bytes], Any], level: int, block_size: int
+) -> None:
+    """
+    Writes the contents of `fsrc` as js strings (`"<base64>",`) where each
+    string is a complete zlib stream with up to `block_size` bytes (before
+    compression).
+    """
+    import base64
+    import zlib
+
+    b64encode = base64.b64encode
+    while True:
+        data = fsrc.read(min(_LOG_HTML_READ_SIZE, block_size))
+        if not data:
+            return
+
+        compressobj = zlib.compressobj(level)
+        block_remaining = block_size
+        pending = b""
+        write(b'"')
+        while True:
+            block_remaining -= len(data)
+            pending += compressobj.compress(data)
+
+            # Encode in multiples of 3 bytes so that there's no padding in
+            # the middle of the base64 string.
+            n = len(pending) - len(pending) % 3
+            if n:
+                write(b64encode(pending[:n]))
+                pending = pending[n:]
+
+            if block_remaining <= 0:
+                break
+            data = fsrc.read(min(_LOG_HTML_READ_SIZE, block_remaining))
+            if not data:
+                break
+
+        pending += compressobj.flush()
+        write(b64encode(pending))
+        write(b'",\n')
+
+
+class _LogHtmlUpdater:
+    """
+    Appends the contents written to the log output to the log.html while the
+    run is in progress (so, the log.html is available even if the process is
+    killed and it may be reloaded to see the progress of a long run).
+
+    Each update is appended to the end of the log.html as a `<script>` with a
+    complete zlib stream (so, the contents previously written never need to be
+    read again).
+    """
+
+    def __init__(self, stream, level: int, update_interval: float) -> None:
+        # Needed because updates may be requested from the flusher thread.
+        self._lock = threading.Lock()
+        self._stream = stream
+        self._level = level
+        self._update_interval = update_interval
+        self._last_update_time = time.monotonic()
+
+        # Contents not compressed yet.
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+
+        # The zlib stream of the next update (None if there's nothing to be
+        # written) and the number of uncompressed bytes in it.
+        self._compressobj: Any = None
+        self._compressed: List[bytes] = []
+        self._block_size = 0
+
+    def add(self, in_bytes: bytes) -> None:
+        with self._lock:
+            self._pending.append(in_bytes)
+            self._pending_size += len(in_bytes)
+            if self._pending_size >= _LOG_HTML_READ_SIZE:
+                self._compress_pending()
+                if (
+                    self._block_size >= _LOG_HTML_BLOCK_SIZE
+                    or time.monotonic() - self._last_update_time
+                    >= self._update_interval
+                ):
+                    self._write_update()
+
+    def update(self) -> None:
+        with self._lock:
+            self._write_update()
+
+    def update_if_needed(self) -> None:
+        with self._lock:
+            if time.monotonic() - self._last_update_time >= self._update_interval:
+                self._write_update()
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_update()
+            self._stream.close()
+
+    def _compress_pending(self) -> None:
+        if not self._pending:
+            return
+
+        if self._compressobj is None:
+            import zlib
+
+            self._compressobj = zlib.compressobj(self._level)
+
+        self._compressed.append(self._compressobj.compress(b"".join(self._pending)))
+        self._block_size += self._pending_size
+        self._pending = []
+        self._pending_size = 0
+
+    def _write_update(self) -> None:
+        import base64
+
+        self._last_update_time = time.monotonic()
+        self._compress_pending()
+        compressobj = self._compressobj
+        if compressobj is None:
+            return
+
+        self._compressed.append(compressobj.flush())
+        data = base64.b64encode(b"".join(self._compressed))
+        self._compressobj = None
+        self._compressed = []
+        self._block_size = 0
+
+        chunks_global = _LOG_HTML_CHUNKS_GLOBAL.encode("ascii")
+        self._stream.write(
+            b'<script>(window.%s=window.%s||[]).push("%s");</script>\n'
+            % (chunks_global, chunks_global, data)
+        )
+        self._stream.flush()
+
+
 class _RotateHandler:
     def __init__(self, max_file_size_in_bytes: int, max_files: int):
         if max_files <= 0:
@@ -170,6 +383,7 @@ class _RotateHandler:
 
         self._found_files: List[Path] = []
         self._max_files = max_files
+        self.removed_files = 0
 
     def add_bytes(self, bytes_len):
         self._total_bytes += bytes_len
@@ -185,15 +399,80 @@ class _RotateHandler:
 
         while len(self._found_files) > self._max_files:
             p: Path = self._found_files.pop(0)
+            self.removed_files += 1
             try:
                 os.remove(p)
             except Exception:
                 traceback.print_exc()
 
+            index = index_path(p)
+            if index.exists():
+                try:
+                    os.remove(index)
+                except Exception:
+                    traceback.print_exc()
+
     def iter_found_files(self):
         yield from iter(self._found_files)
 
 
+class _BufferedOutputsFlusher:
+    """
+    Keeps track of the outputs which buffer their writes and makes sure that
+    those are flushed periodically (in a daemon thread) and at process exit.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._outputs: "weakref.WeakSet[_RoboOutputImpl]" = weakref.WeakSet()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, robot_output_impl: "_RoboOutputImpl") -> None:
+        with self._lock:
+            self._outputs.add(robot_output_impl)
+            if self._thread is None:
+                atexit.register(self.flush_all)
+                self._thread = threading.Thread(
+                    target=self._flush_periodically, name="RobocorpLogFlusherThread"
+                )
+                self._thread.daemon = True
+                self._thread.start()
+
+    def unregister(self, robot_output_impl: "_RoboOutputImpl") -> None:
+        with self._lock:
+            self._outputs.discard(robot_output_impl)
+
+    def _get_outputs(self) -> List["_RoboOutputImpl"]:
+        with self._lock:
+            return list(self._outputs)
+
+    def flush_all(self) -> None:
+        for robot_output_impl in self._get_outputs():
+            try:
+                robot_output_impl.flush()
+            except Exception:
+                traceback.print_exc()
+
+    def _flush_periodically(self) -> None:
+        while True:
+            outputs = self._get_outputs()
+            timeout = 0.5
+            now = time.monotonic()
+            for robot_output_impl in outputs:
+                interval = robot_output_impl.flush_interval
+                timeout = min(timeout, interval)
+                try:
+                    robot_output_impl.flush_if_older_than(now - interval)
+                except Exception:
+                    traceback.print_exc()
+            del outputs
+
+            time.sleep(max(timeout, 0.01))
+
+
+_buffered_outputs_flusher = _BufferedOutputsFlusher()
+
+
 class _StackEntry:
     def __init__(
         self, entry_type, entry_id, msg_type, replay_msg_type, hide_from_logs, write_it
@@ -205,9 +484,13 @@ class _StackEntry:
         self.hide_from_logs = hide_from_logs
         self._messages: List[str] = []
         self.write_it = write_it
+        # The offset of the message which started the entry in the current
+        # part (used in the index).
+        self.offset = 0
 
     def rewrite(self, robot_output_impl):
         self.write_it(robot_output_impl, self.replay_msg_type)
+        self.offset = robot_output_impl._last_message_offset
 
     def __str__(self):
         return (
@@ -231,12 +514,15 @@ class _StackHandler:
         replay_msg_type: str,
         hide_from_logs: bool,
         write_it: Callable[[Any, str], Any],
-    ) -> None:
+    ) -> _StackEntry:
         entry = _StackEntry(
             entry_type, entry_id, msg_type, replay_msg_type, hide_from_logs, write_it
         )
-        write_it(self._robot_output_impl(), msg_type)
+        robot_output_impl = self._robot_output_impl()
+        write_it(robot_output_impl, msg_type)
+        entry.offset = robot_output_impl._last_message_offset
         self._queue.append(entry)
+        return entry
 
     def pop(self, entry_type, entry_id) -> Optional[_StackEntry]:
         if not self._queue:
@@ -308,25 +594,50 @@ class _StackHandler:
 
         return None
 
+    def has_entries(self) -> bool:
+        return bool(self._queue)
+
     def __iter__(self):
         for stack_entry in self._queue:
             assert isinstance(stack_entry, _StackEntry)
             yield stack_entry
 
 
+class _ThreadState:
+    """
+    The state of a thread which logged something (each thread has its own
+    stack of elements).
+    """
+
+    def __init__(self, robot_output_impl, tid: int, name: str) -> None:
+        # The thread id in the log (0 is the main thread, others are
+        # sequential in the order in which threads logged something).
+        self.tid = tid
+        self.name = name
+        self.stack_handler = _StackHandler(robot_output_impl)
+
+
 class _RoboOutputImpl:
     def __init__(self, config: _Config):
         self._written_initial = False
         self._closed = False
 
         # Base memory for all streams (rotated or not)
-        self._base_memo: Dict[str, str] = {}
-        self._base_loc_memo: Dict[Tuple[str, str, str, int], str] = {}
+        self._base_memo: Dict[str, Any] = {}
+        self._base_loc_memo: Dict[Tuple[str, str, str, int], Any] = {}
 
         # Memory just for the current stream (if a name is not
         # here it has to be added because the output was rotated).
-        self._current_memo: Dict[str, str] = {}
-        self._current_loc_memo: Dict[Tuple[str, str, str, int], str] = {}
+        self._current_memo: Dict[str, Any] = {}
+        self._current_loc_memo: Dict[Tuple[str, str, str, int], Any] = {}
+
+        # When the memos are bounded the strings and the locations are kept
+        # in this LRU instead of in the dicts above (see: `_obtain_bounded_id`).
+        # key -> [id, part in which it was last written, size]
+        self._bounded_memo: Optional["OrderedDict[Any, List[Any]]"] = None
+        self._bounded_memo_size = 0
+        if config.memo_max_size_in_bytes > 0 or config.memo_max_entry_size_in_bytes > 0:
+            self._bounded_memo = OrderedDict()
 
         self._config = config
         self._id = config.uuid
@@ -344,23 +655,82 @@ class _RoboOutputImpl:
         self._messages_written_after_rotation = 0
         self._current_file: Optional[Path] = None
 
-        from io import BufferedWriter
+        # The size of the current file and the offset where the last message
+        # written starts (used in the index).
+        self._current_file_size = 0
+        self._last_message_offset = 0
+        self._index: Optional[_IndexWriter] = None
 
-        self._stream: Optional[BufferedWriter] = None
+        self._stream: Optional[BinaryIO] = None
+
+        # The lock is needed to synchronize a flush from the flusher thread
+        # with the stream being rotated.
+        self._stream_lock = threading.Lock()
+        self._buffered = config.buffer_size_in_bytes > 0
+        self._last_flush_time = time.monotonic()
 
         if config.initial_time is None:
             self._initial_time = datetime.datetime.now(timezone.utc)
         else:
             self._initial_time = config.initial_time
-        self._initial_time_in_seconds = time.time()
-
-        self._stack_handler = _StackHandler(self)
+        # The time deltas are computed with a monotonic clock (so, those don't
+        # jump if the wall clock is adjusted during the run).
+        self._initial_perf_counter_ns = time.perf_counter_ns()
+
+        # The last time delta (as (milliseconds, seconds)) and its text
+        # representation (as (seconds, str)). Usually many messages are
+        # written in the same millisecond, so, the same float instance is
+        # reused and the conversion to str is done just once.
+        self._last_time_delta: Tuple[int, float] = (-1, 0.0)
+        self._last_time_delta_str: Tuple[Optional[float], str] = (None, "")
+
+        # Each thread has its own stack (the `_stack_handler` is the one
+        # from the current thread).
+        self._next_tid: "partial[int]" = partial(next, itertools.count(1))
+        main_thread_state = _ThreadState(self, 0, threading.main_thread().name)
+        self._main_thread_state = main_thread_state
+        self._thread_states: Dict[int, _ThreadState] = {
+            threading.main_thread().ident or 0: main_thread_state
+        }
+        self._current_thread = main_thread_state
+        # The thread of the last message written (a `TH` message is written
+        # when the thread changes).
+        self._written_thread = main_thread_state
+        self._stack_handler = main_thread_state.stack_handler
 
         self._rotating = False
         self._rotate_handler = _RotateHandler(
             config.max_file_size_in_bytes, config.max_files
         )
-        self._id_generator = _gen_id()
+
+        # In the binary format the ids are varints (bytes).
+        self._binary = config.output_format == "binary"
+        self._binary_format: Any = None
+        self._id_generator: Iterator[Any]
+        if self._binary:
+            from . import _binary_format
+
+            self._binary_format = _binary_format
+            self._id_generator = _binary_format.new_id_generator()
+        else:
+            self._id_generator = _gen_id()
+
+        self._profiler: Optional[_ElementProfiler] = None
+        if config.profile:
+            self._profiler = _ElementProfiler()
+
+        self._log_html_updater: Optional[_LogHtmlUpdater] = None
+        if (
+            config.log_html
+            and config.log_html_update_interval > 0
+            and self._output_dir is not None
+        ):
+            target = self._write_log_html(incremental=True)
+            self._log_html_updater = _LogHtmlUpdater(
+                open(target, "ab"),
+                config.log_html_compression_level,
+                config.log_html_update_interval,
+            )
 
         if self._output_dir is not None:
             self._rotate_output()
@@ -371,6 +741,11 @@ class _RoboOutputImpl:
         self.on_show_error_message = None
         self._next_int: "partial[int]" = partial(next, itertools.count(0))
 
+        if (
+            self._buffered or self._log_html_updater is not None
+        ) and self._output_dir is not None:
+            _buffered_outputs_flusher.register(self)
+
     def show_error_message(self, msg):
         from robocorp.log._safe_write_to_stream import safe_write_to_stream
 
@@ -409,13 +784,34 @@ class _RoboOutputImpl:
             else:
                 self._current_file = self._output_dir / f"output.robolog"
 
-            if self._stream is not None:
-                self._stream.close()
-                self._stream = None
+            with self._stream_lock:
+                if self._stream is not None:
+                    # Note: closing also flushes what's still buffered.
+                    self._stream.close()
+                    self._stream = None
 
-            self._rotate_handler.register_file(self._current_file)
+                self._rotate_handler.register_file(self._current_file)
 
-            self._stream = self._current_file.open("wb")
+                if self._buffered:
+                    stream = self._current_file.open(
+                        "wb", buffering=self._config.buffer_size_in_bytes
+                    )
+                else:
+                    stream = self._current_file.open("wb")
+                if self._binary:
+                    stream.write(self._binary_format.MAGIC)
+                    self._current_file_size = len(self._binary_format.MAGIC)
+                else:
+                    self._current_file_size = 0
+                self._stream = stream
+                self._last_flush_time = time.monotonic()
+
+                if self._config.write_index:
+                    if self._index is not None:
+                        self._index.close()
+                    self._index = _IndexWriter(
+                        index_path(self._current_file), self._index_id
+                    )
             self._write_on_start_or_after_rotate()
             self._messages_written_after_rotation = 0
         finally:
@@ -427,32 +823,149 @@ class _RoboOutputImpl:
         # if self._current_file is not None:
         #     print("Robocorp Log output:", self._current_file.absolute())
 
-        self._write_with_separator("V ", (DOC_VERSION,))
-        self._write_with_separator(
-            "T ", (self._initial_time.isoformat(timespec="milliseconds"),)
-        )
-        self._write_with_separator("ID ", (f"{self._current_entry}", self._id))
-        if self._config.additional_info:
-            for info in self._config.additional_info:
-                self._write_json("I ", info)
-        else:
-            self._write_json("I ", f"sys.platform={sys.platform}")
-            self._write_json("I ", f"python={sys.version}")
+        # A new stream always starts in the main thread.
+        current_thread = self._current_thread
+        self._current_thread = self._main_thread_state
+        self._written_thread = self._main_thread_state
+        try:
+            self._write_with_separator("V ", (DOC_VERSION,))
+            self._write_with_separator(
+                "T ", (self._initial_time.isoformat(timespec="milliseconds"),)
+            )
+            self._write_with_separator("ID ", (f"{self._current_entry}", self._id))
+            if self._config.additional_info:
+                for info in self._config.additional_info:
+                    self._write_json("I ", info)
+            else:
+                self._write_json("I ", f"sys.platform={sys.platform}")
+                self._write_json("I ", f"python={sys.version}")
+
+            # Replay the stack of the main thread and then the stack of each
+            # other thread.
+            for thread_state in tuple(self._thread_states.values()):
+                self._current_thread = thread_state
+                self._stack_handler = thread_state.stack_handler
+                for stack_entry in thread_state.stack_handler:
+                    stack_entry.rewrite(self)
+        finally:
+            self._current_thread = current_thread
+            self._stack_handler = current_thread.stack_handler
 
-        for stack_entry in self._stack_handler:
-            stack_entry.rewrite(self)
+    def switch_thread(self, thread_ident: int, thread_name: str) -> None:
+        """
+        Called when the thread which is logging changes (the messages
+        afterwards are related to the stack of the given thread).
+        """
+        thread_state = self._thread_states.get(thread_ident)
+        if thread_state is None or (
+            thread_state.name != thread_name
+            and thread_state is not self._main_thread_state
+            and not thread_state.stack_handler.has_entries()
+        ):
+            # New thread (or the ident of a thread which finished was reused).
+            self._remove_finished_thread_states()
+            thread_state = _ThreadState(self, self._next_tid(), thread_name)
+            self._thread_states[thread_ident] = thread_state
+
+        self._current_thread = thread_state
+        self._stack_handler = thread_state.stack_handler
+
+    def _remove_finished_thread_states(self) -> None:
+        """
+        Removes the state of the threads which finished with an empty stack
+        (so that runs which start many threads don't keep those around).
+        """
+        alive = set(t.ident for t in threading.enumerate())
+        for thread_ident, thread_state in tuple(self._thread_states.items()):
+            if (
+                thread_ident not in alive
+                and thread_state is not self._main_thread_state
+                and not thread_state.stack_handler.has_entries()
+            ):
+                del self._thread_states[thread_ident]
+
+    def _write_thread_switch(self) -> None:
+        thread_state = self._current_thread
+        # Set it before writing as writing the name may write a memo.
+        self._written_thread = thread_state
+        if not _WRITE_THREAD_SWITCHES:
+            return
+        name_id = self._obtain_id(thread_state.name)
+        if self._binary:
+            self._do_write_binary(
+                self._binary_format.ENCODERS["TH "]((thread_state.tid, name_id))
+            )
+        else:
+            self._do_write(f"TH {thread_state.tid}|{name_id}\n")
 
     def _do_write(self, s: str) -> None:
+        if self._current_thread is not self._written_thread:
+            self._write_thread_switch()
+
         if self._write is not None:
             self._write(s)
 
         in_bytes = s.encode("utf-8", errors="replace")
+        bytes_len = len(in_bytes)
+        if self._stream is not None:
+            self._stream.write(in_bytes)
+            if not self._buffered:
+                self._stream.flush()
+
+            if self._log_html_updater is not None:
+                self._log_html_updater.add(in_bytes)
+
+        self._last_message_offset = self._current_file_size
+        self._current_file_size += bytes_len
+        self._messages_written_after_rotation += 1
+        self._rotate_handler.add_bytes(bytes_len)
+
+    def _do_write_binary(self, in_bytes: bytes) -> None:
+        """
+        Same as `_do_write` for a record in the binary format.
+        """
+        if self._current_thread is not self._written_thread:
+            self._write_thread_switch()
+
         if self._stream is not None:
             self._stream.write(in_bytes)
-            self._stream.flush()
+            if not self._buffered:
+                self._stream.flush()
 
+            if self._log_html_updater is not None:
+                # The viewer only reads the text format.
+                self._log_html_updater.add(self._binary_format.record_to_text(in_bytes))
+
+        bytes_len = len(in_bytes)
+        self._last_message_offset = self._current_file_size
+        self._current_file_size += bytes_len
         self._messages_written_after_rotation += 1
-        self._rotate_handler.add_bytes(len(in_bytes))
+        self._rotate_handler.add_bytes(bytes_len)
+
+    @property
+    def flush_interval(self) -> float:
+        return self._config.flush_interval
+
+    def flush(self) -> None:
+        """
+        Flushes any buffered contents to the current file (and to the log.html
+        if it's updated during the run).
+        """
+        self._flush_stream()
+        if self._log_html_updater is not None:
+            self._log_html_updater.update()
+
+    def _flush_stream(self) -> None:
+        with self._stream_lock:
+            self._last_flush_time = time.monotonic()
+            if self._stream is not None:
+                self._stream.flush()
+
+    def flush_if_older_than(self, monotonic_time: float) -> None:
+        if self._last_flush_time <= monotonic_time:
+            self._flush_stream()
+        if self._log_html_updater is not None:
+            self._log_html_updater.update_if_needed()
 
     def _rotate_if_needed(self):
         if (
@@ -464,19 +977,90 @@ class _RoboOutputImpl:
 
     def _write_json(self, msg_type, args):
         args_as_str = json.dumps(args)
+        if self._binary:
+            self._do_write_binary(
+                self._binary_format.ENCODERS[msg_type]((args_as_str,))
+            )
+            return
         s = f"{msg_type}{args_as_str}\n"
         self._do_write(s)
         return s
 
     def _write_with_separator(self, msg_type, args):
+        if self._binary:
+            self._do_write_binary(self._binary_format.ENCODERS[msg_type](args))
+            return
         args_as_str = "|".join(args)
         s = f"{msg_type}{args_as_str}\n"
         self._do_write(s)
         return s
 
+    def _write_memo(self, memo_id, s: str) -> None:
+        if self._binary:
+            self._do_write_binary(self._binary_format.encode_memo(memo_id, s))
+        else:
+            self._write_json(f"M {memo_id}:", s)
+        if self._index is not None:
+            self._index.add_memo(memo_id, s, self._current_file_size)
+
+    def _write_path_location(
+        self, memo_id, name_id, libname_id, source_id, doc_id, lineno: int
+    ) -> None:
+        if self._binary:
+            self._do_write_binary(
+                self._binary_format.encode_path_location(
+                    memo_id, name_id, libname_id, source_id, doc_id, lineno
+                )
+            )
+        else:
+            self._do_write(
+                f"P {memo_id}:{name_id}|{libname_id}|{source_id}|{doc_id}|{lineno}\n"
+            )
+        if self._index is not None:
+            self._index.add_location(
+                memo_id,
+                name_id,
+                libname_id,
+                source_id,
+                doc_id,
+                lineno,
+                self._current_file_size,
+            )
+
+    def _index_id(self, memo_id) -> Any:
+        """
+        Provides the memo id as it's decoded (an int in the binary format).
+        """
+        if self._binary:
+            return self._binary_format.read_varint(memo_id, 0)[0]
+        return memo_id
+
+    def _add_index_entry(self, kind: str, msg_type: str, **kwargs) -> None:
+        """
+        Adds the last message written to the index.
+        """
+        index = self._index
+        if index is not None:
+            entry = {
+                "kind": kind,
+                "message_type": msg_type,
+                "offset": self._last_message_offset,
+                "end": self._current_file_size,
+                "tid": self._current_thread.tid,
+            }
+            entry.update(kwargs)
+            index.add_entry(entry)
+
     def get_time_delta(self) -> float:
-        delta = time.time() - self._initial_time_in_seconds
-        return round(delta, 3)
+        """
+        Provides the seconds (with millisecond precision) since the output was
+        created.
+        """
+        ms = (time.perf_counter_ns() - self._initial_perf_counter_ns) // 1_000_000
+        last = self._last_time_delta
+        if last[0] != ms:
+            last = self._last_time_delta = (ms, ms / 1000)
+        return last[1]
 
     def _move_old_runs(self):
         pass
@@ -484,32 +1068,38 @@ class _RoboOutputImpl:
         # for entry in self._output_dir.iterdir():
         #     print(entry)
 
-    def _gen_id(self) -> str:
+    def _gen_id(self) -> Any:
         while True:
             gen = next(self._id_generator)
             if gen not in self._base_memo:
                 return gen
 
-    def _obtain_id(self, s: str) -> str:
+    def _obtain_id(self, s: str) -> Any:
+        if self._bounded_memo is not None:
+            return self._obtain_bounded_id(s)
+
         curr_id = self._current_memo.get(s)
         if curr_id is not None:
             return curr_id
 
         curr_id = self._base_memo.get(s)
         if curr_id is not None:
-            self._write_json(f"M {curr_id}:", s)
+            self._write_memo(curr_id, s)
             self._current_memo[s] = curr_id
             return curr_id
 
         new_id = self._gen_id()
-        self._write_json(f"M {new_id}:", s)
+        self._write_memo(new_id, s)
         self._base_memo[s] = new_id
         self._current_memo[s] = new_id
         return new_id
 
     def _obtain_loc_id(
         self, name: str, libname: str, source: str, lineno: int, docstring: str = ""
-    ) -> str:
+    ) -> Any:
+        if self._bounded_memo is not None:
+            return self._obtain_bounded_loc_id(name, libname, source, lineno, docstring)
+
         key = (name, libname, source, lineno)
         curr_id = self._current_loc_memo.get(key)
         if curr_id is not None:
@@ -518,21 +1108,102 @@ class _RoboOutputImpl:
 
         curr_id = self._base_loc_memo.get(key)
         if curr_id is not None:
-            self._do_write(
-                f"P {curr_id}:{oid(name)}|{oid(libname)}|{oid(source)}|{oid(docstring)}|{lineno}\n"
+            self._write_path_location(
+                curr_id, oid(name), oid(libname), oid(source), oid(docstring), lineno
             )
             self._current_loc_memo[key] = curr_id
             return curr_id
 
         new_id = self._gen_id()
-        self._do_write(
-            f"P {new_id}:{oid(name)}|{oid(libname)}|{oid(source)}|{oid(docstring)}|{lineno}\n"
+        self._write_path_location(
+            new_id, oid(name), oid(libname), oid(source), oid(docstring), lineno
         )
         self._base_loc_memo[key] = new_id
         self._current_loc_memo[key] = new_id
         return new_id
 
+    def _obtain_bounded_id(self, s: str) -> Any:
+        """
+        Same as `_obtain_id` but keeping the memos in an LRU (see:
+        `memo_max_size_in_bytes` and `memo_max_entry_size_in_bytes`).
+        """
+        memo = self._bounded_memo
+        assert memo is not None
+        entry = memo.get(s)
+        if entry is not None:
+            memo.move_to_end(s)
+            if entry[1] != self._current_entry:
+                # Memoized in a previous part: write it again.
+                self._write_memo(entry[0], s)
+                entry[1] = self._current_entry
+            return entry[0]
+
+        new_id = self._gen_id()
+        self._write_memo(new_id, s)
+
+        size = len(s)
+        max_entry_size = self._config.memo_max_entry_size_in_bytes
+        if max_entry_size > 0 and size > max_entry_size:
+            # Too big: don't keep it (a new memo is written when used again).
+            return new_id
+
+        memo[s] = [new_id, self._current_entry, size]
+        self._add_bounded_memo_size(size)
+        return new_id
+
+    def _obtain_bounded_loc_id(
+        self, name: str, libname: str, source: str, lineno: int, docstring: str
+    ) -> Any:
+        """
+        Same as `_obtain_loc_id` but keeping the memos in an LRU (the
+        locations share the LRU with the strings).
+        """
+        memo = self._bounded_memo
+        assert memo is not None
+        key = (name, libname, source, lineno)
+        entry = memo.get(key)
+        if entry is not None:
+            memo.move_to_end(key)
+            if entry[1] == self._current_entry:
+                return entry[0]
+            loc_id = entry[0]
+        else:
+            loc_id = self._gen_id()
+
+        oid = self._obtain_bounded_id
+        self._write_path_location(
+            loc_id, oid(name), oid(libname), oid(source), oid(docstring), lineno
+        )
+        if entry is not None:
+            entry[1] = self._current_entry
+        else:
+            size = len(name) + len(libname) + len(source)
+            memo[key] = [loc_id, self._current_entry, size]
+            self._add_bounded_memo_size(size)
+        return loc_id
+
+    def _add_bounded_memo_size(self, size: int) -> None:
+        self._bounded_memo_size += size + _MEMO_ENTRY_OVERHEAD
+        max_size = self._config.memo_max_size_in_bytes
+        if max_size > 0 and self._bounded_memo_size > max_size:
+            memo = self._bounded_memo
+            assert memo is not None
+            # Evict the least recently used entries (if any of those is used
+            # again it's written again with a new id).
+            while self._bounded_memo_size > max_size and memo:
+                _key, entry = memo.popitem(last=False)
+                self._bounded_memo_size -= entry[2] + _MEMO_ENTRY_OVERHEAD
+
     def _number(self, v):
+        if self._binary:
+            return v
+        last = self._last_time_delta_str
+        if last[0] is v:
+            return last[1]
+        if v is self._last_time_delta[1]:
+            s = str(v)
+            self._last_time_delta_str = (v, s)
+            return s
         return str(v)
 
     class _WriteStartRun:
@@ -558,6 +1229,9 @@ class _RoboOutputImpl:
         )
 
     def end_run(self, name: str, status: str, time_delta: float) -> None:
+        if self._profiler is not None:
+            self._write_profile_report()
+
         oid = self._obtain_id
         self._write_with_separator(
             "ER ",
@@ -568,6 +1242,48 @@ class _RoboOutputImpl:
         )
         self._stack_handler.pop("run", name)
 
+    def _write_profile_report(self) -> None:
+        """
+        Writes the report of the profiler as json (in the output directory)
+        and adds a summary of it to the log.
+        """
+        profiler = self._profiler
+        assert profiler is not None
+        # The summary itself isn't profiled.
+        self._profiler = None
+
+        report = profiler.get_report()
+        report_path = None
+        if self._output_dir is not None:
+            target = self._output_dir / PROFILE_REPORT_NAME
+            target.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            report_path = str(target)
+
+        name = "Profile report"
+        libname = "robocorp.log"
+        self.start_element(
+            name,
+            libname,
+            "METHOD",
+            "Methods with the biggest self time.",
+            __file__,
+            0,
+            self.get_time_delta(),
+            [],
+            False,
+        )
+        self.log_message(
+            "INFO",
+            report_to_html(report, report_path),
+            True,
+            name,
+            libname,
+            __file__,
+            0,
+            self.get_time_delta(),
+        )
+        self.end_method("METHOD", name, libname, "PASS", self.get_time_delta())
+
     class _WriteStartTask:
         def __init__(self, name, libname, source, line, doc, time_delta):
             self.name = name
@@ -591,6 +1307,9 @@ class _RoboOutputImpl:
                     ],
                 ),
             )
+            robot_impl._add_index_entry(
+                "task_start", msg_type, name=self.name, libname=self.libname
+            )
 
     def start_task(
         self,
@@ -631,8 +1350,127 @@ class _RoboOutputImpl:
                 self._number(time_delta),
             ],
         )
+        self._add_index_entry(
+            "task_end", "ET", name=name, libname=libname, status=status
+        )
         task_id = f"{libname}.{name}"
         self._stack_handler.pop("task", task_id)
+        if self._buffered or self._log_html_updater is not None:
+            self.flush()
+
+    # The message types which start an element (and the message type used to
+    # replay those after a rotation) and the ones which end an element.
+    _MERGE_START_MESSAGE_TYPES = {
+        "ST": "RT",
+        "SE": "RE",
+        "YR": "RYR",
+        "YFR": "RYFR",
+        "STB": "RTB",
+        "STD": "RTD",
+        "SPS": "RPS",
+    }
+    _MERGE_END_MESSAGE_TYPES = frozenset(("ET", "EE", "YS", "YFS", "ETB", "ETD", "EPS"))
+
+    class _WriteMergedMessage:
+        def __init__(self, fields, args):
+            self.fields = fields
+            self.args = args
+
+        def __call__(self, robot_impl, msg_type):
+            oid = robot_impl._obtain_id
+            loc_id = robot_impl._obtain_loc_id
+
+            # The memos are obtained when writing (a replay after a rotation
+            # must write those again).
+            args = list(self.args)
+            for i, (_name, kind) in enumerate(self.fields):
+                if kind == "oid":
+                    args[i] = oid(args[i])
+                elif kind in ("loc_id", "loc_and_doc_id"):
+                    name, libname, source, doc, lineno = args[i]
+                    args[i] = loc_id(name, libname, source, lineno, doc)
+            robot_impl._write_with_separator(f"{msg_type} ", args)
+
+    def merge_output_dir(
+        self, output_dir, skip_task_libnames: Sequence[str] = ()
+    ) -> None:
+        """
+        Writes the messages from the `.robolog` files in the given output
+        directory (see: `_merge_output.iter_messages_to_merge`).
+
+        The elements merged are added to the stack of their thread (so, those
+        are replayed if the output is rotated in the middle of the merge), but
+        not to the index.
+        """
+        from ._decoder import _MESSAGE_TYPE_FIELDS
+        from ._merge_output import iter_messages_to_merge
+
+        start_message_types = self._MERGE_START_MESSAGE_TYPES
+        end_message_types = self._MERGE_END_MESSAGE_TYPES
+
+        # The threads from the merged output get new ids in this output (and
+        # are added to the thread states while merging so that the elements
+        # in their stacks are replayed on a rotation).
+        thread_states: Dict[str, _ThreadState] = {"0": self._main_thread_state}
+        # The ids of the entries pushed in the stack of each thread.
+        pushed: Dict[_ThreadState, List[str]] = {self._main_thread_state: []}
+        current_thread = self._current_thread
+        self._current_thread = self._main_thread_state
+        self._stack_handler = self._main_thread_state.stack_handler
+        try:
+            for message_type, args in iter_messages_to_merge(
+                output_dir, self._initial_time, skip_task_libnames
+            ):
+                if message_type == "TH":
+                    tid, name = args
+                    thread_state = thread_states.get(tid)
+                    if thread_state is None:
+                        thread_state = _ThreadState(self, self._next_tid(), name)
+                        thread_states[tid] = thread_state
+                        pushed[thread_state] = []
+                        # Negative keys don't clash with the ident of a thread.
+                        self._thread_states[-thread_state.tid] = thread_state
+                    self._current_thread = thread_state
+                    self._stack_handler = thread_state.stack_handler
+                    continue
+
+                self._rotate_if_needed()
+                fields = _MESSAGE_TYPE_FIELDS[message_type]
+                assert fields is not None
+                write_it = self._WriteMergedMessage(fields, args)
+                entry_ids = pushed[self._current_thread]
+
+                replay_message_type = start_message_types.get(message_type)
+                if replay_message_type is not None:
+                    entry_id = f"merged_{self._next_int()}"
+                    self._stack_handler.push_record(
+                        "merged",
+                        entry_id,
+                        message_type,
+                        replay_message_type,
+                        False,
+                        write_it,
+                    )
+                    entry_ids.append(entry_id)
+                    continue
+
+                if message_type in end_message_types and entry_ids:
+                    self._stack_handler.pop("merged", entry_ids.pop())
+                write_it(self, message_type)
+        finally:
+            # The elements which weren't ended in the merged output (i.e.: the
+            # process running it was killed) are removed from the stacks.
+            for thread_state, entry_ids in pushed.items():
+                while entry_ids:
+                    thread_state.stack_handler.pop("merged", entry_ids.pop())
+                if thread_state is not self._main_thread_state:
+                    self._thread_states.pop(-thread_state.tid, None)
+
+            self._current_thread = current_thread
+            self._stack_handler = current_thread.stack_handler
+
+        if self._buffered or self._log_html_updater is not None:
+            self.flush()
 
     class _WriteProcessSnapshot:
         def __init__(self, time_delta):
@@ -1023,12 +1861,23 @@ Virtual Memory Size: {vms}"""
         if element_type not in UNSCOPED_ELEMENTS:
             # We don't change the scope for untracked generators as
             # we have no idea when it'll pause/resume.
-            self._stack_handler.push_record(
+            stack_entry = self._stack_handler.push_record(
                 "element", element_id, "SE", "RE", hide_from_logs, write_it
             )
             if hide_from_logs:
                 # I.e.: add to internal stack but don't write anything else.
                 return
+
+            if self._profiler is not None and element_type in PROFILED_ELEMENT_TYPES:
+                self._profiler.start(
+                    self._current_thread.tid,
+                    stack_entry,
+                    name,
+                    libname,
+                    source,
+                    lineno,
+                    start_time_delta,
+                )
         else:
             if hide_from_logs:
                 # Don't write anything
@@ -1060,6 +1909,7 @@ Virtual Memory Size: {vms}"""
     ):
         element_id = f"{libname}.{name}"
 
+        stack_entry = None
         if element_type != "UNTRACKED_GENERATOR":
             stack_entry = self._stack_handler.pop("element", element_id)
             if stack_entry is None or stack_entry.hide_from_logs:
@@ -1076,6 +1926,18 @@ Virtual Memory Size: {vms}"""
                 self._number(time_delta),
             ],
         )
+        if self._profiler is not None and stack_entry is not None:
+            self._profiler.end(self._current_thread.tid, stack_entry, time_delta)
+        if self._index is not None and status in FAILED_STATUSES:
+            self._add_index_entry(
+                "failure",
+                "EE",
+                name=name,
+                libname=libname,
+                element_type=element_type,
+                status=status,
+                start=None if stack_entry is None else stack_entry.offset,
+            )
 
     def yield_suspend(
         self,
@@ -1115,6 +1977,8 @@ Virtual Memory Size: {vms}"""
                 self._number(time_delta),
             ],
         )
+        if self._profiler is not None:
+            self._profiler.end(self._current_thread.tid, stack_entry, time_delta)
 
     def method_return(
         self,
@@ -1179,9 +2043,19 @@ Virtual Memory Size: {vms}"""
         else:
             write_it = self._WriteYieldResume(name, libname, source, lineno, time_delta)
 
-        self._stack_handler.push_record(
+        stack_entry = self._stack_handler.push_record(
             "element", element_id, "YR", "RYR", hide_from_logs, write_it
         )
+        if self._profiler is not None and not hide_from_logs:
+            self._profiler.start(
+                self._current_thread.tid,
+                stack_entry,
+                name,
+                libname,
+                source,
+                lineno,
+                time_delta,
+            )
 
     def yield_from_suspend(
         self,
@@ -1213,6 +2087,8 @@ Virtual Memory Size: {vms}"""
                 self._number(time_delta),
             ],
         )
+        if self._profiler is not None:
+            self._profiler.end(self._current_thread.tid, stack_entry, time_delta)
 
     class _WriteYieldFromResume:
         def __init__(self, name, libname, source, lineno, time_delta):
@@ -1255,9 +2131,19 @@ Virtual Memory Size: {vms}"""
             write_it = self._WriteYieldFromResume(
                 name, libname, source, lineno, time_delta
             )
-        self._stack_handler.push_record(
+        stack_entry = self._stack_handler.push_record(
             "element", element_id, "YFR", "RYFR", hide_from_logs, write_it
         )
+        if self._profiler is not None and not hide_from_logs:
+            self._profiler.start(
+                self._current_thread.tid,
+                stack_entry,
+                name,
+                libname,
+                source,
+                lineno,
+                time_delta,
+            )
 
     def after_assign(
         self,
@@ -1322,7 +2208,6 @@ Virtual Memory Size: {vms}"""
                 level[0].upper(),
                 oid(message),
                 self._obtain_loc_id(name, libname, source, lineno),
-                self._number(lineno),
                 self._number(time_delta),
             ],
         )
@@ -1345,42 +2230,102 @@ Virtual Memory Size: {vms}"""
             ],
         )
 
+    def resource_sample(
+        self,
+        rss: int,
+        cpu_percent: float,
+        fds: int,
+        threads: int,
+        children: int,
+        children_rss: int,
+        children_cpu_percent: float,
+        time_delta: float,
+    ) -> None:
+        self._rotate_if_needed()
+
+        number = self._number
+        self._write_with_separator(
+            "RS ",
+            [
+                number(rss),
+                number(cpu_percent),
+                number(fds),
+                number(threads),
+                number(children),
+                number(children_rss),
+                number(children_cpu_percent),
+                number(time_delta),
+            ],
+        )
+
     def close(self):
         if self._closed:
             return
 
         self._closed = True
 
-        log_html = self._config.log_html
-        if log_html:
-            target = os.path.abspath(log_html)
-            dirname = os.path.dirname(target)
-            if not os.path.exists(dirname):
-                os.makedirs(dirname, exist_ok=True)
+        if self._buffered:
+            self._flush_stream()
+        _buffered_outputs_flusher.unregister(self)
+
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+        if self._config.log_html:
+            log_html_updater = self._log_html_updater
+            if log_html_updater is not None:
+                self._log_html_updater = None
+                log_html_updater.close()
+
+            if log_html_updater is None or self._rotate_handler.removed_files:
+                # When files were removed due to `max_files` the log.html is
+                # recreated with just the files which were kept.
+                target = self._write_log_html(incremental=False)
+            else:
+                target = os.path.abspath(self._config.log_html)
             print(f"Log (html): {target}")
 
-            from robocorp.log import _index_v3 as index
+    def _write_log_html(self, incremental: bool) -> str:
+        """
+        Writes the log.html (along with the related files).
 
-            has_separate_bundle_js = "bundle.js" in index.FILE_CONTENTS
+        Args:
+            incremental: If True the contents of the log are not embedded
+                (they're appended later on by the `_LogHtmlUpdater`).
 
-            for name, contents in index.FILE_CONTENTS.items():
-                if name == "index.html":
-                    if has_separate_bundle_js:
-                        self._write_simple(target, contents)
-                    else:
-                        self._write_index_updating_sample(target, contents)
-                elif name == "bundle.js":
-                    self._write_bundle_updating_sample(
-                        os.path.join(dirname, name), contents
-                    )
+        Returns:
+            The absolute path to the log.html.
+        """
+        assert self._config.log_html
+        target = os.path.abspath(self._config.log_html)
+        dirname = os.path.dirname(target)
+        if not os.path.exists(dirname):
+            os.makedirs(dirname, exist_ok=True)
+
+        from robocorp.log import _index_v3 as index
+
+        has_separate_bundle_js = "bundle.js" in index.FILE_CONTENTS
+
+        for name, contents in index.FILE_CONTENTS.items():
+            if name == "index.html":
+                if has_separate_bundle_js:
+                    self._write_simple(target, contents)
                 else:
-                    self._write_simple(os.path.join(dirname, name), contents)
+                    self._write_index_updating_sample(target, contents, incremental)
+            elif name == "bundle.js":
+                self._write_bundle_updating_sample(
+                    os.path.join(dirname, name), contents, incremental
+                )
+            else:
+                self._write_simple(os.path.join(dirname, name), contents)
+        return target
 
     def _write_simple(self, target, contents):
         with open(target, "wb") as stream:
             stream.write(contents.encode("utf-8"))
 
-    def _write_bundle_updating_sample(self, target, contents):
+    def _write_bundle_updating_sample(self, target, contents, incremental):
         with open(target, "wb") as stream:
             sample_contents_index = contents.index("function getSampleContents() {")
 
@@ -1392,10 +2337,14 @@ Virtual Memory Size: {vms}"""
             end_of_json_parse_index = contents.index("\n}", return_json_parse_index) + 1
             assert end_of_json_parse_index > 0
             self._write_updating_sample(
-                stream, contents, return_json_parse_index, end_of_json_parse_index
+                stream,
+                contents,
+                return_json_parse_index,
+                end_of_json_parse_index,
+                incremental,
             )
 
-    def _write_index_updating_sample(self, target, contents):
+    def _write_index_updating_sample(self, target, contents, incremental):
         with open(target, "wb") as stream:
             # Note: the version here only needs to be changed if the
             # version is changed in the sample.ts.
@@ -1418,15 +2367,15 @@ Virtual Memory Size: {vms}"""
                     break
                 i -= 1
 
-            self._write_updating_sample(stream, contents, string_start, string_end)
-
-    def _write_updating_sample(self, stream, contents, start_index, end_index):
-        import base64
+            self._write_updating_sample(
+                stream, contents, string_start, string_end, incremental
+            )
 
+    def _write_updating_sample(
+        self, stream, contents, start_index, end_index, incremental
+    ):
         stream.write(contents[:start_index].encode("utf-8"))
 
-        import zlib
-
         write = stream.write
         if WRITE_CONTENTS_TO_STDERR:
             stream_write = write
@@ -1435,18 +2384,22 @@ Virtual Memory Size: {vms}"""
                 stream_write(b)
                 sys.stderr.buffer.write(b)
 
-        write(b"\nlet chunks = [")
-        for f in self._rotate_handler.iter_found_files():
-            with open(f, "rb") as fsrc:
-                while True:
-                    chunk = fsrc.read(1024 * 8)
-                    if not chunk:
-                        break
-                    write(b'"')
-                    chunk = zlib.compress(chunk)
-                    write(base64.b64encode(chunk))
-                    write(b'",\n')
-        write(b"];\n")
+        if incremental:
+            # The chunks are added by the scripts appended to the log.html.
+            write(
+                b"\nlet chunks = window.%s || [];\n"
+                % (_LOG_HTML_CHUNKS_GLOBAL.encode("ascii"),)
+            )
+        else:
+            write(b"\nlet chunks = [")
+            level = self._config.log_html_compression_level
+            for f in self._rotate_handler.iter_found_files():
+                with open(f, "rb") as fsrc:
+                    if self._binary:
+                        # The viewer only reads the text format.
+                        fsrc = self._binary_format.TextFromBinaryReader(fsrc)
+                    _write_compressed_chunks(fsrc, write, level, _LOG_HTML_BLOCK_SIZE)
+            write(b"];\n")
 
         # Add code to decompress the data we added.
         write(
@@ -6,6 +6,16 @@ OptExcInfo = Union[ExcInfo, tuple[None, None, None]]
 
 LogHTMLStyle = Literal["standalone", "vscode"]
 
+# What to do when a queue holding messages to be written is full:
+# "block": wait until there's space in the queue.
+# "drop": discard the message.
+QueueOverflowPolicy = Literal["block", "drop"]
+
+# The format of the `.robolog` files:
+# "text": line-based messages (see: `_decoder_spec.SPEC`).
+# "binary": the same messages as length-prefixed binary records.
+OutputFormat = Literal["text", "binary"]
+
 
 class IReadLines(Protocol):
     def readlines(self) -> Sequence[str]:
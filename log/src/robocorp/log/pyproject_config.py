@@ -5,7 +5,7 @@ read the related tool.robocorp.log section.
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from robocorp import log
 from robocorp.log.protocols import IContextErrorReport
@@ -129,6 +129,7 @@ def read_robocorp_auto_log_config(
     filters: List[log.Filter] = []
 
     default_library_filter_kind = FilterKind.log_on_project_call
+    rewrite_options: Dict[str, Any] = {}
 
     if isinstance(obj, dict):
         # Filter(name="RPA", kind=FilterKind.log_on_project_call),
@@ -156,11 +157,118 @@ def read_robocorp_auto_log_config(
                     else:
                         default_library_filter_kind = f
 
+            rewrite_options = _load_rewrite_options(obj, context, pyproject.pyproject)
+
     return log.DefaultAutoLogConfig(
-        filters=filters, default_library_filter_kind=default_library_filter_kind
+        filters=filters,
+        default_library_filter_kind=default_library_filter_kind,
+        **rewrite_options,
     )
 
 
+def _load_rewrite_options(
+    obj: dict, context: IContextErrorReport, pyproject: Path
+) -> Dict[str, Any]:
+    """
+    Loads the options which define which callbacks are added when the code is
+    rewritten (so, callbacks which would never log anything aren't even
+    added).
+    """
+    rewrite_options: Dict[str, Any] = {}
+    for key in ("rewrite_assigns", "rewrite_yields", "rewrite_ifs", "rewrite_loops"):
+        value = obj.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, bool):
+            context.show_error(
+                f"Expected 'tool.robocorp.log.{key}' to be a bool "
+                f"(found: {value!r}) in {pyproject}."
+            )
+        else:
+            rewrite_options[key] = value
+
+    max_function_depth = obj.get("rewrite_max_function_depth")
+    if max_function_depth is not None:
+        if (
+            not isinstance(max_function_depth, int)
+            or isinstance(max_function_depth, bool)
+            or max_function_depth < 1
+        ):
+            context.show_error(
+                "Expected 'tool.robocorp.log.rewrite_max_function_depth' to be "
+                f"an int >= 1 (found: {max_function_depth!r}) in {pyproject}."
+            )
+        else:
+            rewrite_options["rewrite_max_function_depth"] = max_function_depth
+    return rewrite_options
+
+
+def read_robocorp_log_settings(
+    context: IContextErrorReport, pyproject: PyProjectInfo
+) -> dict:
+    """
+    Args:
+        context: The context used to report errors.
+        pyproject: The pyproject information from where the settings should
+            be loaded.
+
+    Returns:
+        The settings in the `tool.robocorp.log` section which should be
+        passed to `log.setup_log` (i.e.: `log.setup_log(**settings)`).
+    """
+    settings: dict = {}
+    if not pyproject.toml_contents:
+        return settings
+
+    obj = read_section_from_toml(pyproject, "tool.robocorp.log", context)
+    if not isinstance(obj, dict):
+        return settings
+
+    log_first = obj.get("loop_iterations_log_first")
+    if log_first is not None:
+        if (
+            isinstance(log_first, bool)
+            or not isinstance(log_first, int)
+            or (log_first < 0)
+        ):
+            context.show_error(
+                f"Expected 'tool.robocorp.log.loop_iterations_log_first' to be an int >= 0 "
+                f"(found: {log_first!r}) in {pyproject.pyproject}."
+            )
+        else:
+            settings["loop_iterations_log_first"] = log_first
+
+    log_every = obj.get("loop_iterations_log_every")
+    if log_every is not None:
+        if log_every != "adaptive" and (
+            isinstance(log_every, bool)
+            or not isinstance(log_every, int)
+            or log_every < 0
+        ):
+            context.show_error(
+                f"Expected 'tool.robocorp.log.loop_iterations_log_every' to be an int >= 0 "
+                f'or "adaptive" (found: {log_every!r}) in {pyproject.pyproject}.'
+            )
+        else:
+            settings["loop_iterations_log_every"] = log_every
+
+    sample_interval = obj.get("resource_sample_interval")
+    if sample_interval is not None:
+        if (
+            isinstance(sample_interval, bool)
+            or not isinstance(sample_interval, (int, float))
+            or sample_interval < 0
+        ):
+            context.show_error(
+                f"Expected 'tool.robocorp.log.resource_sample_interval' to be a number >= 0 "
+                f"(found: {sample_interval!r}) in {pyproject.pyproject}."
+            )
+        else:
+            settings["resource_sample_interval"] = sample_interval
+
+    return settings
+
+
 def _load_filters(
     obj: dict, context: IContextErrorReport, pyproject: Path
 ) -> List[log.Filter]:
@@ -0,0 +1,21 @@
+def work(i):
+    if i == 10:
+        raise RuntimeError("Failed at 10")
+    return i
+
+
+def main(iterations):
+    for i in range(iterations):
+        work(i)
+
+
+def main_while(iterations):
+    i = 0
+    while i < iterations:
+        i += 1
+
+
+def main_nested(outer, inner):
+    for i in range(outer):
+        for j in range(inner):
+            work(j)
@@ -0,0 +1,29 @@
+import time
+
+
+def leaf():
+    time.sleep(0.02)
+
+
+def parent():
+    time.sleep(0.02)
+    leaf()
+    leaf()
+
+
+def recursive(n):
+    if n > 0:
+        recursive(n - 1)
+
+
+def gen():
+    for i in range(2):
+        time.sleep(0.01)
+        yield i
+
+
+def main():
+    parent()
+    recursive(3)
+    for _i in gen():
+        pass
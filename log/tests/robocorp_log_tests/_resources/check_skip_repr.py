@@ -0,0 +1,19 @@
+class CountRepr:
+    repr_calls = 0
+
+    def __repr__(self):
+        CountRepr.repr_calls += 1
+        return "CountRepr()"
+
+
+def call_this(arg):
+    value = arg
+    return value
+
+
+def login(password):
+    pass
+
+
+def main():
+    call_this(CountRepr())
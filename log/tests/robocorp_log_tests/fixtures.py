@@ -169,6 +169,17 @@ def raise_exceptions():
         callback.raise_exceptions = True
 
 
+@pytest.fixture()
+def write_thread_switches(monkeypatch):
+    """
+    Writes the thread switches (`TH`), which are disabled by default until the
+    viewer embedded in the log.html supports those.
+    """
+    from robocorp.log import _robo_output_impl
+
+    monkeypatch.setattr(_robo_output_impl, "_WRITE_THREAD_SWITCHES", True)
+
+
 @pytest.fixture()
 def log_setup(tmpdir):
     import io
@@ -41,3 +41,55 @@ def test_auto_log_config_catch_all() -> None:
 
     # robocorp.log is always excluded.
     assert config.get_filter_kind_by_module_name("robocorp.log") == FilterKind.exclude
+
+
+def test_filter_matcher() -> None:
+    from fnmatch import fnmatch
+
+    from robocorp.log._config import _FilterMatcher
+
+    filters: List[Filter] = [
+        Filter("a.b", kind=FilterKind.exclude),
+        Filter("a.b.*", kind=FilterKind.full_log),
+        Filter("a", kind=FilterKind.log_on_project_call),
+        Filter("mod_?", kind=FilterKind.full_log),
+        Filter("mod_[!0-4]x", kind=FilterKind.exclude),
+        Filter("mod_[0-4]*", kind=FilterKind.log_on_project_call),
+        Filter("*.tests.*", kind=FilterKind.exclude),
+        Filter("x.y.z", kind=FilterKind.full_log),
+        Filter("x", kind=FilterKind.exclude),
+        Filter("[bad", kind=FilterKind.exclude),
+    ]
+
+    def linear(module_name):
+        # The previous (linear) implementation.
+        for f in filters:
+            name = f.name
+            if "*" in name or "[" in name or "?" in name:
+                if fnmatch(module_name, name):
+                    return f.kind
+            elif name == module_name or module_name.startswith(name + "."):
+                return f.kind
+        return None
+
+    matcher = _FilterMatcher(filters)
+    for module_name in [
+        "a",
+        "a.b",
+        "a.b.c",
+        "a.bc",
+        "ab",
+        "mod_1",
+        "mod_5x",
+        "mod_3x",
+        "mod_12",
+        "pkg.tests.mod",
+        "x",
+        "x.y",
+        "x.y.z",
+        "x.y.z.w",
+        "y",
+        "[bad",
+        "",
+    ]:
+        assert matcher.get_filter_kind(module_name) == linear(module_name), module_name
@@ -0,0 +1,123 @@
+def _without_times_and_ids(msg: dict) -> dict:
+    return {k: v for k, v in msg.items() if "time" not in k and k != "id"}
+
+
+def test_binary_format_same_messages_as_text(tmpdir) -> None:
+    from importlib import reload
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        iter_decoded_log_format_from_stream,
+        iter_decoded_log_records_from_output_dir,
+    )
+    from robocorp.log._binary_format import MAGIC
+    from robocorp_log_tests._resources import check
+
+    text_dir = Path(tmpdir.join("text"))
+    binary_dir = Path(tmpdir.join("binary"))
+
+    with robolog.setup_auto_logging():
+        check = reload(check)
+
+        # Both outputs receive the same messages.
+        with robolog.add_log_output(text_dir, max_file_size="1MB"):
+            with robolog.add_log_output(
+                binary_dir, max_file_size="1MB", output_format="binary"
+            ):
+                robolog.start_run("Root Suite")
+                robolog.start_task("my_task", "task_mod", __file__, 0)
+                check.recurse_some_method()
+                robolog.info("Message with unicode: ação ✓")
+                robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+                robolog.end_run("Root Suite", "PASS")
+
+    binary_file = binary_dir / "output.robolog"
+    assert binary_file.read_bytes().startswith(MAGIC)
+    assert binary_file.stat().st_size < (text_dir / "output.robolog").stat().st_size
+
+    text_msgs = list(iter_decoded_log_format_from_output_dir(text_dir))
+    binary_msgs = list(iter_decoded_log_format_from_output_dir(binary_dir))
+    assert [_without_times_and_ids(msg) for msg in binary_msgs] == [
+        _without_times_and_ids(msg) for msg in text_msgs
+    ]
+    assert {"message_type": "L", "message": "Message with unicode: ação ✓"}.items() <= (
+        [msg for msg in binary_msgs if msg["message_type"] == "L"][-1].items()
+    )
+    for msg in binary_msgs:
+        if "time_delta_in_seconds" in msg:
+            assert isinstance(msg["time_delta_in_seconds"], float), msg
+
+    with binary_file.open("rb") as stream:
+        assert list(iter_decoded_log_format_from_stream(stream)) == binary_msgs
+
+    records = list(iter_decoded_log_records_from_output_dir(binary_dir))
+    assert [record._asdict() for record in records] == [
+        {k: v for k, v in msg.items() if k != "message_type"} for msg in binary_msgs
+    ]
+
+
+def test_binary_format_opened_in_text_mode(tmpdir) -> None:
+    from pathlib import Path
+
+    import pytest
+
+    from robocorp import log as robolog
+    from robocorp.log import iter_decoded_log_format_from_stream
+
+    with robolog.add_log_output(tmpdir, output_format="binary"):
+        robolog.start_run("Root Suite")
+        robolog.end_run("Root Suite", "PASS")
+
+    with pytest.raises(RuntimeError, match="binary mode"):
+        with Path(tmpdir.join("output.robolog")).open("r", encoding="utf-8") as stream:
+            list(iter_decoded_log_format_from_stream(stream))
+
+    with pytest.raises(ValueError):
+        robolog.add_log_output(tmpdir, output_format="xml")  # type: ignore
+
+
+def test_binary_format_rotation_and_log_html(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        verify_log_messages_from_log_html,
+    )
+
+    for log_html_update_interval in (0, 5):
+        output_dir = Path(tmpdir.join(f"output_{log_html_update_interval}"))
+        log_target = output_dir / "log.html"
+        with robolog.add_log_output(
+            output_dir,
+            max_file_size="10kb",
+            max_files=100,
+            log_html=log_target,
+            log_html_update_interval=log_html_update_interval,
+            output_format="binary",
+        ):
+            robolog.start_run("Root Suite")
+            robolog.start_task("my_task", "task_mod", __file__, 0)
+            for i in range(3000):
+                robolog.info(f"Message {i}")
+            robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+            robolog.end_run("Root Suite", "PASS")
+
+        assert len(tuple(output_dir.glob("*.robolog"))) > 2
+
+        msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+        assert [msg["message"] for msg in msgs if msg["message_type"] == "L"] == [
+            f"Message {i}" for i in range(3000)
+        ]
+
+        # The log.html has the contents in the text format.
+        verify_log_messages_from_log_html(
+            log_target,
+            [
+                {"message_type": "L", "message": "Message 0"},
+                {"message_type": "L", "message": "Message 2999"},
+                {"message_type": "ER", "status": "PASS"},
+            ],
+        )
@@ -0,0 +1,116 @@
+import pytest
+
+
+class _CountReprCalls:
+    repr_calls = 0
+
+    def __repr__(self):
+        _CountReprCalls.repr_calls += 1
+        return "Counted"
+
+
+class _ListWithRepr(list):
+    def __repr__(self):
+        return "custom"
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        "some 'str'",
+        "both ' and \"\\",
+        "line\nbreak",
+        b"bytes\x00",
+        bytearray(b"abc"),
+        [1, 2.5, None, True, "a", [b"b", ("c",)]],
+        (1,),
+        (),
+        set(),
+        {1, "a"},
+        frozenset(),
+        frozenset([1]),
+        {"a": [1, {"b": 2}], 1: (None,)},
+        {},
+        _ListWithRepr([1, 2]),
+        type("_StrSubclass", (str,), {})("sub"),
+        _CountReprCalls(),
+    ],
+)
+def test_bounded_repr_same_as_repr(obj) -> None:
+    from robocorp.log._bounded_repr import bounded_repr
+
+    assert bounded_repr(obj, 1000) == repr(obj)
+
+
+def test_bounded_repr_clipped() -> None:
+    from robocorp.log._bounded_repr import bounded_repr
+
+    s = "abc'd\\" * 100
+    assert bounded_repr(s, 10) == f"{repr(s)[:10]} <clipped {len(repr(s)) - 10} chars>"
+    assert bounded_repr("a\nb" * 10, 5) == "'a\\nb <clipped>"
+    assert bounded_repr(b"abcd" * 10, 5) == "b'abc <clipped>"
+    assert bounded_repr(bytearray(b"abcd" * 10), 15) == "bytearray(b'abc <clipped>"
+
+    lst = list(range(100))
+    assert bounded_repr(lst, 10) == "[0, 1, 2,  <clipped>"
+
+    d = {"a": "b" * 100}
+    assert bounded_repr(d, 10) == "{'a': 'bbb <clipped>"
+
+    # Exactly the max size is not clipped.
+    assert bounded_repr("abc", 5) == "'abc'"
+
+    # Objects without a dedicated handler have their full repr built, so, the
+    # clipped size is known.
+    class Obj:
+        def __repr__(self):
+            return "x" * 30
+
+    assert bounded_repr(Obj(), 10) == "xxxxxxxxxx <clipped 20 chars>"
+    assert bounded_repr([Obj()], 10) == "[xxxxxxxxx <clipped>"
+
+
+def test_bounded_repr_stops_early() -> None:
+    from robocorp.log._bounded_repr import bounded_repr
+
+    _CountReprCalls.repr_calls = 0
+    big = [_CountReprCalls() for _ in range(100_000)]
+    assert bounded_repr(big, 50).endswith("<clipped>")
+    assert _CountReprCalls.repr_calls < 10
+
+
+def test_bounded_repr_recursive() -> None:
+    from robocorp.log._bounded_repr import bounded_repr
+
+    lst: list = [1]
+    lst.append(lst)
+    d: dict = {"a": lst}
+    d["d"] = d
+    assert bounded_repr(lst, 1000) == repr(lst)
+    assert bounded_repr(d, 1000) == repr(d)
+
+
+def test_register_repr() -> None:
+    from robocorp import log
+    from robocorp.log._bounded_repr import bounded_repr
+
+    class Matrix:
+        pass
+
+    class SubMatrix(Matrix):
+        pass
+
+    received_max_sizes = []
+
+    def repr_matrix(obj, max_size):
+        received_max_sizes.append(max_size)
+        return f"<{obj.__class__.__name__}>" * 10
+
+    with log.register_repr(Matrix, repr_matrix):
+        assert bounded_repr([Matrix()], 1000) == f"[{'<Matrix>' * 10}]"
+        assert bounded_repr(SubMatrix(), 1000) == "<SubMatrix>" * 10
+        assert bounded_repr(Matrix(), 10) == "<Matrix><M <clipped>"
+        assert received_max_sizes == [999, 1000, 10]
+
+    matrix = Matrix()
+    assert bounded_repr(matrix, 1000) == repr(matrix)
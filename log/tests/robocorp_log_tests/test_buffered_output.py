@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import List
+
+
+def _read_robolog_message_types(path: Path):
+    from robocorp.log import iter_decoded_log_format_from_stream
+
+    with path.open("r", encoding="utf-8") as stream:
+        return [
+            msg["message_type"] for msg in iter_decoded_log_format_from_stream(stream)
+        ]
+
+
+def test_buffered_output_flushes_on_end_task_and_close(tmpdir) -> None:
+    from robocorp import log
+
+    in_memory: List[str] = []
+    log_target = Path(tmpdir.join("log.html"))
+    robolog = Path(tmpdir.join("output.robolog"))
+
+    with log.add_in_memory_log_output(write=in_memory.append):
+        with log.add_log_output(
+            tmpdir,
+            log_html=log_target,
+            buffer_size="64kb",
+            flush_interval=1000,
+        ):
+            log.start_run("Root Suite")
+            log.start_task("my_task", "task_mod", __file__, 0)
+            log.info("Some message")
+
+            # The in-memory sink receives everything right away.
+            assert any("Some message" in msg for msg in in_memory)
+
+            # Nothing was flushed to the file so far.
+            assert robolog.read_bytes() == b""
+
+            log.end_task("my_task", "task_mod", "PASS", "Ok")
+            assert "ET" in _read_robolog_message_types(robolog)
+
+            log.info("After task")
+            log.end_run("Root Suite", "PASS")
+            assert "ER" not in _read_robolog_message_types(robolog)
+
+    assert "ER" in _read_robolog_message_types(robolog)
+    log.verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "L", "message": "Some message"},
+            {"message_type": "L", "message": "After task"},
+        ],
+    )
+
+
+def test_buffered_output_flush_interval(tmpdir) -> None:
+    import time
+
+    from robocorp import log
+
+    robolog = Path(tmpdir.join("output.robolog"))
+
+    with log.add_log_output(tmpdir, buffer_size="64kb", flush_interval=0.05):
+        log.start_run("Root Suite")
+        log.info("Some message")
+
+        timeout_at = time.time() + 5
+        while "L" not in _read_robolog_message_types(robolog):
+            if time.time() > timeout_at:
+                raise AssertionError("Buffered contents not flushed in the interval.")
+            time.sleep(0.05)
+
+        log.end_run("Root Suite", "PASS")
+
+
+def test_buffered_output_rotation(tmpdir) -> None:
+    from robocorp import log
+
+    with log.add_log_output(
+        tmpdir,
+        max_file_size="10kb",
+        max_files=100,
+        min_messages_per_file=10,
+        buffer_size="1mb",
+        flush_interval=1000,
+    ):
+        log.start_run("Root Suite")
+        log.start_task("my_task", "task_mod", __file__, 0)
+        for i in range(1000):
+            log.info(f"Some message {i}")
+        log.end_task("my_task", "task_mod", "PASS", "Ok")
+        log.end_run("Root Suite", "PASS")
+
+    files = sorted(Path(tmpdir).glob("*.robolog"))
+    assert len(files) > 2, f"Found: {files}"
+
+    found_log_messages = 0
+    for f in files:
+        # Rotated files must be self-contained (and fully flushed).
+        message_types = _read_robolog_message_types(f)
+        assert message_types[:3] == ["V", "T", "ID"], f"Wrong start in: {f}"
+        found_log_messages += message_types.count("L")
+    assert found_log_messages == 1000
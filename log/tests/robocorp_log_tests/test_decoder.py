@@ -41,3 +41,96 @@ I "my-name"
     )
     msgs = list(iter_decoded_log_format(s))
     assert msgs == [{"message_type": "I", "info": "my-name"}]
+
+
+def test_decoder_records():
+    from io import StringIO
+
+    from robocorp.log import iter_decoded_log_records_from_stream
+
+    s = StringIO(
+        """
+M a:"my-name"
+M b:"my-libname"
+M c:"my-source"
+M d:"my-doc"
+M e:"METHOD"
+P x:a|b|c|d|123
+SE x|e|0.012
+EE e|a|bad-float
+I "my-info"
+"""
+    )
+    records = list(iter_decoded_log_records_from_stream(s))
+    assert [record.message_type for record in records] == ["SE", "EE", "I"]
+    assert records[0] == (
+        "my-name",
+        "my-libname",
+        "my-source",
+        "my-doc",
+        123,
+        "METHOD",
+        0.012,
+    )
+    assert records[0].lineno == 123
+    assert records[0]._asdict() == {
+        "name": "my-name",
+        "libname": "my-libname",
+        "source": "my-source",
+        "doc": "my-doc",
+        "lineno": 123,
+        "type": "METHOD",
+        "time_delta_in_seconds": 0.012,
+    }
+    # Fields which can't be decoded are None.
+    assert records[1]._asdict() == {
+        "type": "METHOD",
+        "status": "my-name",
+        "time_delta_in_seconds": None,
+    }
+    assert records[2].info == "my-info"
+
+
+def test_decoder_errors():
+    from io import StringIO
+
+    from robocorp.log._decoder import iter_decoded_log_format
+
+    s = StringIO(
+        """
+M a:"my-name"
+SR a
+ER not-there|0.1
+EE a|a|bad-float
+M b
+"""
+    )
+    msgs = list(iter_decoded_log_format(s))
+    assert msgs[:3] == [
+        {"message_type": "SR", "name": "my-name"},
+        {"message_type": "ER", "status": None, "time_delta_in_seconds": 0.1},
+        {
+            "message_type": "EE",
+            "type": "my-name",
+            "status": "my-name",
+            "time_delta_in_seconds": None,
+        },
+    ]
+    assert msgs[3]["message_type"] == "M"
+    assert "error" in msgs[3]
+
+
+def test_decoder_is_lazy():
+    from robocorp.log._decoder import iter_decoded_log_format
+
+    def iter_lines():
+        yield 'M a:"my-name"\n'
+        yield "SR a|0.1\n"
+        raise AssertionError("Lines should be read only as needed.")
+
+    it = iter_decoded_log_format(iter_lines())
+    assert next(it) == {
+        "message_type": "SR",
+        "name": "my-name",
+        "time_delta_in_seconds": 0.1,
+    }
@@ -1,32 +1,29 @@
 import threading
 
 
-def test_log_and_threads(tmpdir):
+def test_log_and_threads(tmpdir, write_thread_switches):
     from importlib import reload
 
-    from robocorp_log_tests._resources import check
-    from robocorp_log_tests.fixtures import AutoLogConfigForTest, basic_log_setup
-
     from robocorp import log
     from robocorp.log import verify_log_messages_from_log_html
+    from robocorp_log_tests._resources import check
+    from robocorp_log_tests.fixtures import AutoLogConfigForTest, basic_log_setup
 
     config = AutoLogConfigForTest()
     with basic_log_setup(tmpdir, config=config) as setup_info:
         check = reload(check)
 
         def run_in_thread():
-            # This won't be logged (in auto-logging we check that logging
-            # from threads aren't logged).
+            # Methods called from threads are logged (in the stack of the
+            # thread).
             check.some_method()
 
-            # This won't be logged either because it's not in the main thread.
-            log.critical("critical in log")
+            log.warn("warn in log")
 
-            # This is a special case though because we want to be able to request
-            # a process snapshot from any thread.
+            # It's also possible to request a process snapshot from any thread.
             log.process_snapshot()
 
-        t = threading.Thread(target=run_in_thread)
+        t = threading.Thread(target=run_in_thread, name="SomeThread")
         t.start()
         t.join()
 
@@ -36,6 +33,9 @@ def test_log_and_threads(tmpdir):
     verify_log_messages_from_log_html(
         log_target,
         [
+            {"message_type": "TH", "tid": 1, "name": "SomeThread"},
+            {"message_type": "SE", "name": "some_method"},
+            {"message_type": "L", "level": "W", "message": "warn in log"},
             {
                 "message_type": "SPS",  # Start process snapshot
             },
@@ -46,6 +46,109 @@ def test_log_and_threads(tmpdir):
             {
                 "message_type": "STD",
             },
+            # Back to the main thread to finish the task.
+            {"message_type": "TH", "tid": 0, "name": "MainThread"},
+            {"message_type": "ET"},
         ],
-        [{"message_type": "L", "level": "E"}],
     )
+
+
+def test_log_and_threads_no_thread_switches_by_default(tmpdir):
+    from importlib import reload
+
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+    from robocorp_log_tests._resources import check
+    from robocorp_log_tests.fixtures import AutoLogConfigForTest, basic_log_setup
+
+    config = AutoLogConfigForTest()
+    with basic_log_setup(tmpdir, config=config):
+        check = reload(check)
+
+        t = threading.Thread(target=check.some_method, name="SomeThread")
+        t.start()
+        t.join()
+
+    # The viewer embedded in the log.html doesn't support the `TH` messages
+    # yet (so, those aren't written), but the thread is still logged.
+    msgs = list(iter_decoded_log_format_from_output_dir(tmpdir))
+    message_types = [msg["message_type"] for msg in msgs]
+    assert "TH" not in message_types
+    assert [msg["name"] for msg in msgs if msg["message_type"] == "SE"] == [
+        "some_method",
+        "call_another_method",
+    ]
+
+
+def test_log_multiple_threads_and_rotation(tmpdir, write_thread_switches):
+    from concurrent.futures import ThreadPoolExecutor
+    from importlib import reload
+
+    from robocorp.log import iter_decoded_log_format_from_log_html
+    from robocorp_log_tests._resources import check
+    from robocorp_log_tests.fixtures import AutoLogConfigForTest, basic_log_setup
+
+    config = AutoLogConfigForTest()
+    barrier = threading.Barrier(4)
+    with basic_log_setup(
+        tmpdir, max_file_size="10kb", max_files=100, config=config
+    ) as setup_info:
+        check = reload(check)
+
+        def run_in_thread():
+            barrier.wait(5)
+            for _i in range(100):
+                check.some_method()
+
+        with ThreadPoolExecutor(4) as executor:
+            for future in [executor.submit(run_in_thread) for _i in range(4)]:
+                future.result()
+
+    # Each thread must have a consistent stack in each output file (note
+    # that each file starts in the main thread and replays the stack of
+    # each thread).
+    tid_to_stack: dict = {}
+    tid_to_methods: dict = {}
+    tid = 0
+    files = 0
+    for msg in iter_decoded_log_format_from_log_html(setup_info.log_target):
+        msg_type = msg["message_type"]
+        if msg_type == "V":
+            files += 1
+            tid = 0
+            tid_to_stack = {}
+        elif msg_type == "TH":
+            tid = msg["tid"]
+        elif msg_type in ("SR", "ST", "SE", "RR", "RT", "RE"):
+            tid_to_stack.setdefault(tid, []).append(msg_type)
+            if msg_type == "SE" and msg["name"] == "some_method":
+                tid_to_methods[tid] = tid_to_methods.get(tid, 0) + 1
+        elif msg_type in ("ER", "ET", "EE"):
+            stack = tid_to_stack.get(tid)
+            assert stack, f"Unbalanced {msg} in thread: {tid}"
+            stack.pop()
+
+    assert files > 1
+    assert tid_to_methods == {1: 100, 2: 100, 3: 100, 4: 100}
+    assert not any(tid_to_stack.values())
+
+
+def test_log_threads_finished_are_removed(tmpdir):
+    from importlib import reload
+
+    from robocorp import log
+    from robocorp_log_tests._resources import check
+    from robocorp_log_tests.fixtures import AutoLogConfigForTest, basic_log_setup
+
+    config = AutoLogConfigForTest()
+    with basic_log_setup(tmpdir, config=config):
+        check = reload(check)
+        for _i in range(20):
+            t = threading.Thread(target=check.some_method)
+            t.start()
+            t.join()
+
+        with log._get_logger_instances() as logger_instances:
+            for robo_logger in logger_instances:
+                thread_states = robo_logger.robot_output_impl._thread_states
+                # The main thread and the last thread which logged.
+                assert len(thread_states) <= 2
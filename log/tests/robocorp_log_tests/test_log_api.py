@@ -6,7 +6,7 @@ import contextlib
 import threading
 
 
-def test_log_api(tmpdir, str_regression) -> None:
+def test_log_api(tmpdir, str_regression, write_thread_switches) -> None:
     import io
     from importlib import reload
 
@@ -43,12 +43,12 @@ def test_log_api(tmpdir, str_regression) -> None:
                     # This one will appear in both
                     log.critical("msg-critical")
 
-            # Calls from thread won't appear in the auto-logging right now.
+            # Calls from threads are logged in the stack of each thread.
             t = threading.Thread(target=check.some_method, args=())
             t.start()
             t.join(10)
 
-            t = threading.Thread(target=log.info, args=("SHOULD NOT APPEAR",))
+            t = threading.Thread(target=log.info, args=("Logged from thread",))
             t.start()
             t.join(10)
 
@@ -95,3 +95,31 @@ def test_log_api_without_with_statments(tmpdir) -> None:
 
         assert log_target.exists()
         verify_log_messages_from_log_html(log_target, [dict(message_type="SE")], [])
+
+
+def test_time_delta_not_affected_by_wall_clock(tmpdir, monkeypatch) -> None:
+    import time
+
+    from robocorp import log
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+
+    with log.add_log_output(tmpdir):
+        log.start_run("Run name")
+        log.start_task("my_task", "modname", __file__, 0)
+        log.info("Before")
+
+        # The wall clock going back must not affect the time deltas.
+        monkeypatch.setattr(time, "time", lambda: 0.0)
+        log.info("After")
+
+        log.end_task("my_task", "modname", "PASS", "Ok")
+        log.end_run("Run name", "PASS")
+
+    time_deltas = [
+        msg["time_delta_in_seconds"]
+        for msg in iter_decoded_log_format_from_output_dir(tmpdir)
+        if "time_delta_in_seconds" in msg
+    ]
+    assert len(time_deltas) >= 6
+    assert time_deltas == sorted(time_deltas)
+    assert all(0 <= t < 60 for t in time_deltas)
@@ -219,3 +219,126 @@ def test_log_html_features(tmpdir, ui_regenerate) -> None:
             import webbrowser
 
             webbrowser.open(log_target.as_uri())
+
+
+def test_log_html_compressed_in_blocks(tmpdir, monkeypatch) -> None:
+    from pathlib import Path
+
+    import pytest
+
+    from robocorp import log
+    from robocorp.log import _robo_output_impl, verify_log_messages_from_log_html
+
+    # Small blocks so that multi-byte chars are split among chunks.
+    monkeypatch.setattr(_robo_output_impl, "_LOG_HTML_BLOCK_SIZE", 1001)
+    monkeypatch.setattr(_robo_output_impl, "_LOG_HTML_READ_SIZE", 100)
+
+    log_target = Path(tmpdir.join("log.html"))
+
+    with pytest.raises(ValueError):
+        log.add_log_output(tmpdir, log_html=log_target, log_html_compression_level=10)
+
+    with log.add_log_output(tmpdir, log_html=log_target, log_html_compression_level=9):
+        log.start_run("Test Log HTML Compression")
+        log.start_task("my_task", "modname", str(tmpdir), 0)
+        for i in range(100):
+            log.info(f"Message {i}: ação ✓")
+        log.end_task("my_task", "modname", "PASS", "Ok")
+        log.end_run("Test Log HTML Compression", "PASS")
+
+    contents = log_target.read_text("utf-8")
+    start = contents.index("let chunks = [")
+    chunks = contents[start : contents.index("];", start)]
+    assert chunks.count('",\n') > 3
+
+    verify_log_messages_from_log_html(
+        log_target,
+        [{"message_type": "L", "message": f"Message {i}: ação ✓"} for i in range(100)],
+    )
+
+
+def test_log_html_updated_during_run(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log
+    from robocorp.log import verify_log_messages_from_log_html
+
+    log_target = Path(tmpdir.join("log.html"))
+
+    with log.add_log_output(tmpdir, log_html=log_target, log_html_update_interval=5):
+        # The log.html is available (without the contents) right away.
+        assert log_target.exists()
+
+        log.start_run("Test Log HTML Updates")
+        log.start_task("my_task", "modname", str(tmpdir), 0)
+        log.info("Message in task 1: ação ✓")
+        log.end_task("my_task", "modname", "PASS", "Ok")
+
+        # The contents are appended when the task finishes (even before the
+        # update interval elapses).
+        verify_log_messages_from_log_html(
+            log_target,
+            [
+                {"message_type": "L", "message": "Message in task 1: ação ✓"},
+                {"message_type": "ET", "status": "PASS"},
+            ],
+        )
+        contents_in_run = log_target.read_text("utf-8")
+
+        log.start_task("my_task2", "modname", str(tmpdir), 0)
+        log.info("Message in task 2")
+        log.end_task("my_task2", "modname", "PASS", "Ok")
+        log.end_run("Test Log HTML Updates", "PASS")
+
+    # Contents are only appended to the log.html.
+    contents = log_target.read_text("utf-8")
+    assert contents.startswith(contents_in_run)
+    assert contents.count("robocorpLogChunks||[]).push(") == 3
+
+    verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "L", "message": "Message in task 1: ação ✓"},
+            {"message_type": "L", "message": "Message in task 2"},
+            {"message_type": "ER", "status": "PASS"},
+        ],
+    )
+
+
+def test_log_html_updated_during_run_with_removed_files(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log
+    from robocorp.log import verify_log_messages_from_log_html
+
+    log_target = Path(tmpdir.join("log.html"))
+
+    with log.add_log_output(
+        tmpdir,
+        max_file_size="10kb",
+        max_files=2,
+        log_html=log_target,
+        log_html_update_interval=5,
+    ):
+        log.start_run("Test Log HTML Updates")
+        log.start_task("my_task", "modname", str(tmpdir), 0)
+        for i in range(2000):
+            log.info(f"Message {i}")
+        log.end_task("my_task", "modname", "PASS", "Ok")
+        log.end_run("Test Log HTML Updates", "PASS")
+
+    assert len(tmpdir.listdir("*.robolog")) == 2
+
+    # As files were removed, the log.html is rewritten with the contents
+    # which were kept.
+    contents = log_target.read_text("utf-8")
+    assert "let chunks = [" in contents
+    assert "robocorpLogChunks||[]).push(" not in contents
+
+    verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "L", "message": "Message 1999"},
+            {"message_type": "ER", "status": "PASS"},
+        ],
+    )
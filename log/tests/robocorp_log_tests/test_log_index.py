@@ -0,0 +1,172 @@
+import pytest
+
+
+@pytest.mark.parametrize("output_format", ["text", "binary"])
+def test_log_index(tmpdir, output_format) -> None:
+    from importlib import reload
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        iter_decoded_log_format_from_range,
+        iter_decoded_log_records_from_range,
+        iter_log_index_entries,
+    )
+    from robocorp.log._decoder import get_output_files
+    from robocorp_log_tests._resources import check
+
+    output_dir = Path(tmpdir)
+    with robolog.setup_auto_logging():
+        check = reload(check)
+
+        with robolog.add_log_output(
+            output_dir,
+            max_file_size="10kb",
+            max_files=100,
+            output_format=output_format,
+            write_index=True,
+        ):
+            robolog.start_run("Root Suite")
+            for i in range(6):
+                robolog.start_task(f"task_{i}", "task_mod", __file__, 0)
+                for j in range(200):
+                    robolog.info(f"Message {i}-{j}")
+                status = "PASS"
+                if i == 3:
+                    status = "FAIL"
+                    try:
+                        check.some_call_with_exc()
+                    except RuntimeError:
+                        pass
+                robolog.end_task(f"task_{i}", "task_mod", status, "Ok")
+            robolog.end_run("Root Suite", "PASS")
+
+    files = get_output_files(output_dir)
+    assert len(files) > 1
+    for f in files:
+        assert (f.parent / (f.name + ".index")).exists()
+
+    all_msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+
+    task_to_messages: dict = {}
+    failures = []
+    for f in files:
+        entries = list(iter_log_index_entries(f))
+        starts = [e for e in entries if e["kind"] == "task_start"]
+        ends = dict((e["name"], e) for e in entries if e["kind"] == "task_end")
+        for start in starts:
+            end = ends.get(start["name"])
+            msgs = list(
+                iter_decoded_log_format_from_range(
+                    f, start["offset"], None if end is None else end["end"]
+                )
+            )
+            assert msgs[0]["message_type"] == start["message_type"]
+            assert msgs[0]["name"] == start["name"]
+            if end is not None:
+                assert msgs[-1] == {
+                    "message_type": "ET",
+                    "status": end["status"],
+                    "message": "Ok",
+                    "time_delta_in_seconds": msgs[-1]["time_delta_in_seconds"],
+                }
+            task_to_messages.setdefault(start["name"], []).extend(
+                msg["message"] for msg in msgs if msg["message_type"] == "L"
+            )
+
+            records = list(
+                iter_decoded_log_records_from_range(
+                    f, start["offset"], None if end is None else end["end"]
+                )
+            )
+            assert [r._asdict() for r in records] == [
+                {k: v for k, v in msg.items() if k != "message_type"} for msg in msgs
+            ]
+
+        for failure in (e for e in entries if e["kind"] == "failure"):
+            msgs = list(
+                iter_decoded_log_format_from_range(f, failure["start"], failure["end"])
+            )
+            failures.append(msgs)
+
+    # Each task is fully decoded from the ranges in the index (even the ones
+    # which span more than one file).
+    for i in range(6):
+        assert task_to_messages[f"task_{i}"] == [f"Message {i}-{j}" for j in range(200)]
+
+    assert len(failures) == 1
+    msgs = failures[0]
+    assert msgs[0]["message_type"] == "SE"
+    assert msgs[0]["name"] == "some_call_with_exc"
+    assert msgs[-1]["message_type"] == "EE"
+    assert msgs[-1]["status"] == "ERROR"
+    assert {"message_type": "STB", "message": "RuntimeError: some_exc"}.items() <= (
+        [msg for msg in msgs if msg["message_type"] == "STB"][0].items()
+    )
+
+    # The same messages decoded from the start.
+    assert [msg["message"] for msg in all_msgs if msg["message_type"] == "L"] == [
+        f"Message {i}-{j}" for i in range(6) for j in range(200)
+    ]
+
+
+def test_log_index_arbitrary_offset(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import iter_decoded_log_format_from_range
+    from robocorp.log._decoder import Decoder, iter_decoded_log_format
+
+    output_dir = Path(tmpdir)
+    with robolog.add_log_output(output_dir, max_file_size="1MB", write_index=True):
+        robolog.start_run("Root Suite")
+        robolog.start_task("my_task", "task_mod", __file__, 0)
+        for i in range(2500):
+            # Each message is a new memo (checkpoints are written in the middle
+            # and the memos after the last checkpoint need to be scanned).
+            robolog.info(f"Message {i}")
+        robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+        robolog.end_run("Root Suite", "PASS")
+
+    robolog_file = output_dir / "output.robolog"
+    lines = robolog_file.read_bytes().splitlines(keepends=True)
+    index = len(lines) // 2
+    while not lines[index].startswith(b"L "):
+        index += 1
+    offset = sum(len(line) for line in lines[:index])
+
+    decoder = Decoder()
+    for _msg in iter_decoded_log_format(
+        [line.decode("utf-8") for line in lines[:index]], decoder
+    ):
+        pass
+    expected = list(
+        iter_decoded_log_format(
+            [line.decode("utf-8") for line in lines[index:]], decoder
+        )
+    )
+    assert expected[0]["message_type"] == "L"
+    assert list(iter_decoded_log_format_from_range(robolog_file, offset)) == expected
+
+
+def test_log_index_removed_with_rotation(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+
+    output_dir = Path(tmpdir)
+    with robolog.add_log_output(
+        output_dir, max_file_size="10kb", max_files=2, write_index=True
+    ):
+        robolog.start_run("Root Suite")
+        robolog.start_task("my_task", "task_mod", __file__, 0)
+        for i in range(1000):
+            robolog.info(f"Message {i}")
+        robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+        robolog.end_run("Root Suite", "PASS")
+
+    robolog_files = sorted(p.name for p in output_dir.glob("*.robolog"))
+    index_files = sorted(p.name for p in output_dir.glob("*.robolog.index"))
+    assert len(robolog_files) == 2
+    assert index_files == [f"{name}.index" for name in robolog_files]
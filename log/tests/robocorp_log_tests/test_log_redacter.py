@@ -31,3 +31,59 @@ def test_log_redacter() -> None:
 
     config.dont_hide_strings_smaller_or_equal_to = 1
     assert log_redacter.redact("mm") == "<redacted>"
+
+
+def test_log_redacter_overlapping_strings() -> None:
+    from robocorp.log._log_redacter import LogRedacter
+
+    log_redacter = LogRedacter()
+    log_redacter.hide_from_output("abcdef")
+    log_redacter.hide_from_output("defgh")
+    log_redacter.hide_from_output("xyz")
+
+    # Overlapping matches must not leak any part of the hidden strings.
+    assert log_redacter.redact("0abcdefgh1") == "0<redacted>1"
+    assert log_redacter.redact("xyzxyz abcdef") == "<redacted><redacted> <redacted>"
+    assert log_redacter.redact("nothing here") == "nothing here"
+
+
+def test_multi_pattern_matcher() -> None:
+    import random
+
+    from robocorp.log._multi_pattern_matcher import _MAX_PENDING, MultiPatternMatcher
+
+    def brute_force_sub(patterns, s):
+        # Removes all the chars which are part of any of the patterns.
+        hidden = [False] * len(s)
+        for p in patterns:
+            start = s.find(p)
+            while start != -1:
+                for i in range(start, start + len(p)):
+                    hidden[i] = True
+                start = s.find(p, start + 1)
+        return "".join(c for i, c in enumerate(s) if not hidden[i])
+
+    rnd = random.Random(0)
+
+    def random_str(size):
+        return "".join(rnd.choice("abcd") for _ in range(size))
+
+    matcher = MultiPatternMatcher()
+    patterns = set()
+    texts = [random_str(200) for _ in range(20)]
+
+    # Add patterns incrementally (checking before and after the automaton
+    # is built with the pending strings).
+    for _ in range(_MAX_PENDING * 3):
+        pattern = random_str(rnd.randint(3, 8))
+        patterns.add(pattern)
+        matcher.add(pattern)
+        text = rnd.choice(texts)
+        assert matcher.sub("", text) == brute_force_sub(patterns, text)
+
+    assert len(matcher) == len(patterns)
+    built_at_once = MultiPatternMatcher(patterns)
+    for text in texts:
+        expected = brute_force_sub(patterns, text)
+        assert matcher.sub("", text) == expected
+        assert built_at_once.sub("", text) == expected
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_rotate_logs(tmpdir, str_regression) -> None:
     from importlib import reload
     from pathlib import Path
@@ -58,3 +61,99 @@ def test_rotate_logs(tmpdir, str_regression) -> None:
 
     # Depending on the times printed it may break a bit different.
     # str_regression.check(pretty_format_logs_from_log_html(log_target))
+
+
+def test_decode_rotated_logs_from_output_dir(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        iter_decoded_log_records_from_output_dir,
+    )
+
+    with robolog.add_log_output(tmpdir, max_file_size="10kb", max_files=100):
+        robolog.start_run("Root Suite")
+        robolog.start_task("my_task", "task_mod", __file__, 0)
+        for i in range(3000):
+            robolog.info(f"Message {i}")
+        robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+        robolog.end_run("Root Suite", "PASS")
+
+    # More than 10 so that `output_10.robolog` must be after `output_9.robolog`.
+    files = tuple(Path(tmpdir).glob("*.robolog"))
+    assert len(files) > 10
+
+    msgs = list(iter_decoded_log_format_from_output_dir(tmpdir))
+    parts = [msg["part"] for msg in msgs if msg["message_type"] == "ID"]
+    assert parts == list(range(1, len(files) + 1))
+    assert [msg["message"] for msg in msgs if msg["message_type"] == "L"] == [
+        f"Message {i}" for i in range(3000)
+    ]
+
+    records = list(iter_decoded_log_records_from_output_dir(tmpdir))
+    assert [record._asdict() for record in records] == [
+        {k: v for k, v in msg.items() if k != "message_type"} for msg in msgs
+    ]
+    assert [record.message_type for record in records] == [
+        msg["message_type"] for msg in msgs
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["text", "binary"])
+def test_bounded_memo(tmpdir, output_format) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        iter_decoded_log_format_from_stream,
+    )
+    from robocorp.log._logger_instances import _get_logger_instances
+
+    big = "big" * 1000
+    expected = []
+    with robolog.add_log_output(
+        tmpdir,
+        max_file_size="50kb",
+        max_files=100,
+        output_format=output_format,
+        memo_max_size="20kb",
+        memo_max_entry_size="1kb",
+    ):
+        with _get_logger_instances() as logger_instances:
+            (robo_logger,) = logger_instances
+        output_impl = robo_logger._robot_output_impl
+
+        robolog.start_run("Root Suite")
+        robolog.start_task("my_task", "task_mod", __file__, 0)
+        for i in range(3000):
+            # The first messages are reused (and evicted in the meanwhile).
+            message = f"Message {i % 1000}"
+            robolog.info(message)
+            expected.append(message)
+            assert output_impl._bounded_memo_size <= 20 * 1024
+        robolog.info(big)
+        robolog.info(big)
+        expected.extend([big, big])
+        robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+        robolog.end_run("Root Suite", "PASS")
+
+    files = tuple(Path(tmpdir).glob("*.robolog"))
+    assert len(files) > 1
+
+    msgs = list(iter_decoded_log_format_from_output_dir(tmpdir))
+    assert [msg["message"] for msg in msgs if msg["message_type"] == "L"] == expected
+
+    # Each part can be decoded by itself.
+    for f in files:
+        mode = "rb" if output_format == "binary" else "r"
+        with f.open(mode) as stream:
+            for msg in iter_decoded_log_format_from_stream(stream):
+                if msg["message_type"] == "L":
+                    assert msg["message"].startswith(("Message ", "big"))
+
+    # The big message isn't memoized (so, it's written twice).
+    if output_format == "text":
+        contents = "".join(f.read_text() for f in files)
+        assert contents.count(big) == 2
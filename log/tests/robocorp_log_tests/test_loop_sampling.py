@@ -0,0 +1,135 @@
+import pytest
+
+from robocorp import log
+
+
+def test_iterations_sampler_pattern():
+    from robocorp.log._iterations_sampler import IterationsSampler
+
+    def logged_iterations(log_first, log_every, iterations=40):
+        sampler = IterationsSampler(log_first, log_every)
+        return [i for i in range(1, iterations + 1) if sampler.accept_iteration()]
+
+    assert logged_iterations(3, 0) == [1, 2, 3]
+    assert logged_iterations(3, 10) == [1, 2, 3, 13, 23, 33]
+    assert logged_iterations(0, 10) == [10, 20, 30, 40]
+    assert logged_iterations(2, "adaptive") == [1, 2, 3, 4, 6, 10, 18, 34]
+
+
+def test_setup_log_loop_iterations_validation():
+    with pytest.raises(ValueError):
+        log.setup_log(loop_iterations_log_first=-1)
+
+    with pytest.raises(ValueError):
+        log.setup_log(loop_iterations_log_every="other")  # type: ignore
+
+    from robocorp.log import _config
+
+    with log.setup_log(loop_iterations_log_first=1, loop_iterations_log_every=5):
+        assert _config._general_log_config.create_iterations_sampler() is not None
+    assert _config._general_log_config.create_iterations_sampler() is None
+
+
+def _run(func, *args):
+    from importlib import reload
+    from io import StringIO
+
+    from robocorp_log_tests._resources import check_loop_sampling
+
+    s = StringIO()
+    with log.setup_auto_logging():
+        check_loop_sampling = reload(check_loop_sampling)
+        with log.add_in_memory_log_output(s.write):
+            log.start_run("Root")
+            log.start_task("my_task", "task_mod", __file__, 0)
+            try:
+                getattr(check_loop_sampling, func)(*args)
+            except RuntimeError:
+                pass
+            log.end_task("my_task", "task_mod", "PASS", "Ok")
+            log.end_run("Root", "PASS")
+
+    s.seek(0)
+    return s
+
+
+def _step_values(s):
+    s.seek(0)
+    values = []
+    in_step = False
+    for msg in log.iter_decoded_log_format_from_stream(s):
+        if msg["message_type"] == "SE":
+            in_step = msg["type"] in ("FOR_STEP", "WHILE_STEP")
+        elif msg["message_type"] == "EA" and in_step:
+            values.append(msg["value"])
+            in_step = False
+    return values
+
+
+def test_loop_sampling():
+    with log.setup_log(loop_iterations_log_first=2, loop_iterations_log_every=3):
+        s = _run("main", 10)
+
+    assert _step_values(s) == ["0", "1", "4", "7"]
+
+    s.seek(0)
+    log.verify_log_messages_from_stream(
+        s,
+        [
+            {
+                "message_type": "L",
+                "__check__": lambda msg: (
+                    msg["message"].startswith("Loop finished after 10 iterations")
+                    and msg["message"].endswith("(4 logged, 6 skipped).")
+                ),
+            },
+            {"message_type": "EE", "type": "FOR", "status": "PASS"},
+        ],
+        not_expected=[{"message_type": "EA", "name": "i", "value": "2"}],
+    )
+
+
+def test_loop_sampling_while():
+    with log.setup_log(loop_iterations_log_first=1, loop_iterations_log_every=0):
+        s = _run("main_while", 5)
+
+    assert _step_values(s) == ["0"]
+
+
+def test_loop_sampling_nested():
+    with log.setup_log(loop_iterations_log_first=2, loop_iterations_log_every=0):
+        s = _run("main_nested", 10, 5)
+
+    s.seek(0)
+    summaries = [
+        msg["message"]
+        for msg in log.iter_decoded_log_format_from_stream(s)
+        if msg["message_type"] == "L"
+    ]
+    # Only the inner loops in the 2 logged iterations of the outer loop and
+    # the outer loop itself have a summary.
+    assert len(summaries) == 3, summaries
+    assert summaries[-1].startswith("Loop finished after 10 iterations")
+
+
+def test_loop_sampling_failing_iteration_is_logged():
+    with log.setup_log(loop_iterations_log_first=2):
+        s = _run("main", 20)
+
+    assert _step_values(s) == ["0", "1", "10"]
+
+    s.seek(0)
+    log.verify_log_messages_from_stream(
+        s,
+        [
+            {"message_type": "STB", "message": "RuntimeError: Failed at 10"},
+            {"message_type": "EE", "type": "FOR_STEP", "status": "ERROR"},
+            {
+                "message_type": "L",
+                "__check__": lambda msg: msg["message"].endswith(
+                    "(3 logged, 8 skipped)."
+                ),
+            },
+            {"message_type": "EE", "type": "FOR", "status": "ERROR"},
+        ],
+    )
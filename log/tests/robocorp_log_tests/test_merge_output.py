@@ -0,0 +1,200 @@
+import pytest
+
+
+def _create_output_to_merge(output_dir, **kwargs) -> None:
+    import threading
+
+    from robocorp import log as robolog
+
+    with robolog.add_log_output(output_dir, **kwargs):
+        robolog.start_run("Worker Run")
+        robolog.start_task("worker_task", "worker_mod", __file__, 0)
+        for i in range(1000):
+            robolog.info(f"Worker message {i}")
+
+        def in_thread():
+            robolog.info("Message in thread")
+
+        t = threading.Thread(target=in_thread, name="WorkerThread")
+        t.start()
+        t.join()
+        robolog.info("Worker message after thread")
+        robolog.end_task("worker_task", "worker_mod", "FAIL", "Worker failed")
+        robolog.end_run("Worker Run", "ERROR")
+
+
+@pytest.mark.parametrize("output_format", ["text", "binary"])
+def test_merge_output_dir(tmpdir, output_format, write_thread_switches) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        verify_log_messages_from_log_html,
+    )
+
+    worker_dir = Path(tmpdir.join("worker"))
+    _create_output_to_merge(
+        worker_dir,
+        output_format=output_format,
+        max_file_size="10kb",
+        max_files=100,
+    )
+    assert len(tuple(worker_dir.glob("*.robolog"))) > 1
+
+    output_dir = Path(tmpdir.join("output"))
+    log_target = output_dir / "log.html"
+    with robolog.add_log_output(
+        output_dir, output_format=output_format, log_html=log_target
+    ):
+        robolog.start_run("Root Run")
+        robolog.info("Parent message")
+        robolog.merge_output_dir(worker_dir)
+        robolog.info("Parent message after merge")
+        robolog.end_run("Root Run", "ERROR")
+
+    msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+    assert [msg["name"] for msg in msgs if msg["message_type"] == "SR"] == ["Root Run"]
+    assert [msg["message_type"] for msg in msgs].count("ER") == 1
+    assert [msg["message"] for msg in msgs if msg["message_type"] == "L"] == (
+        ["Parent message"]
+        + [f"Worker message {i}" for i in range(1000)]
+        + ["Message in thread", "Worker message after thread"]
+        + ["Parent message after merge"]
+    )
+    assert [
+        (msg["name"], msg["libname"]) for msg in msgs if msg["message_type"] == "ST"
+    ] == [("worker_task", "worker_mod")]
+    assert [
+        (msg["status"], msg["message"]) for msg in msgs if msg["message_type"] == "ET"
+    ] == [("FAIL", "Worker failed")]
+
+    # The thread from the worker has its own id and the parent messages
+    # afterwards are in the main thread.
+    thread_switches = [
+        (msg["tid"], msg["name"]) for msg in msgs if msg["message_type"] == "TH"
+    ]
+    assert thread_switches == [(1, "WorkerThread"), (0, "MainThread")]
+
+    # The time deltas are relative to the initial time of the output (and the
+    # worker output was created before it).
+    worker_msgs = [
+        msg
+        for msg in msgs
+        if msg["message_type"] == "L" and msg["message"].startswith("Worker")
+    ]
+    assert worker_msgs[0]["time_delta_in_seconds"] <= 0
+
+    verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "L", "message": "Worker message 999"},
+            {"message_type": "ET", "status": "FAIL"},
+            {"message_type": "ER", "status": "ERROR"},
+        ],
+    )
+
+
+def test_merge_output_dir_first_parts_removed(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+
+    worker_dir = Path(tmpdir.join("worker"))
+    _create_output_to_merge(worker_dir, max_file_size="10kb", max_files=2)
+    assert not (worker_dir / "output.robolog").exists()
+
+    output_dir = Path(tmpdir.join("output"))
+    with robolog.add_log_output(output_dir):
+        robolog.start_run("Root Run")
+        robolog.merge_output_dir(worker_dir)
+        robolog.end_run("Root Run", "ERROR")
+
+    msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+
+    # The task replayed in the first part found is added as a regular start.
+    assert [msg["name"] for msg in msgs if msg["message_type"] == "ST"] == [
+        "worker_task"
+    ]
+    assert not [msg for msg in msgs if msg["message_type"] in ("RR", "RT")]
+    assert [msg["status"] for msg in msgs if msg["message_type"] == "ET"] == ["FAIL"]
+
+
+def test_merge_output_dir_with_rotation(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        iter_decoded_log_format_from_stream,
+    )
+    from robocorp.log._decoder import get_output_files
+
+    worker_dir = Path(tmpdir.join("worker"))
+    _create_output_to_merge(worker_dir)
+
+    # The output is rotated in the middle of the merge.
+    output_dir = Path(tmpdir.join("output"))
+    with robolog.add_log_output(output_dir, max_file_size="10kb", max_files=100):
+        robolog.start_run("Root Run")
+        robolog.merge_output_dir(worker_dir)
+        robolog.end_run("Root Run", "ERROR")
+
+    parts = get_output_files(output_dir)
+    assert len(parts) > 2
+
+    # Each part replays the task merged which is still running (so, the end of
+    # the task is in a part which also has its start).
+    for part in parts[1:]:
+        with open(part, "r", encoding="utf-8") as stream:
+            msgs = list(iter_decoded_log_format_from_stream(stream))
+        message_types = [msg["message_type"] for msg in msgs]
+        assert "RR" in message_types
+        if "ET" in message_types:
+            assert message_types.index("RT") < message_types.index("ET")
+        else:
+            assert "RT" in message_types
+
+    msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+    assert [msg["name"] for msg in msgs if msg["message_type"] == "ST"] == [
+        "worker_task"
+    ]
+    assert [msg["status"] for msg in msgs if msg["message_type"] == "ET"] == ["FAIL"]
+    assert [msg["message"] for msg in msgs if msg["message_type"] == "L"] == (
+        [f"Worker message {i}" for i in range(1000)]
+        + ["Message in thread", "Worker message after thread"]
+    )
+
+
+def test_merge_output_dir_skip_task_libnames(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp import log as robolog
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+
+    worker_dir = Path(tmpdir.join("worker"))
+    with robolog.add_log_output(worker_dir):
+        robolog.start_run("Worker Run")
+        robolog.start_task("Collect tasks", "setup", "", 0)
+        robolog.info("Message in setup")
+        robolog.end_task("Collect tasks", "setup", "PASS", "")
+        robolog.start_task("worker_task", "worker_mod", __file__, 0)
+        robolog.info("Message in task")
+        robolog.end_task("worker_task", "worker_mod", "PASS", "")
+        robolog.end_run("Worker Run", "PASS")
+
+    output_dir = Path(tmpdir.join("output"))
+    with robolog.add_log_output(output_dir):
+        robolog.start_run("Root Run")
+        robolog.merge_output_dir(worker_dir, skip_task_libnames=("setup",))
+        robolog.end_run("Root Run", "PASS")
+
+    msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+    assert [msg["name"] for msg in msgs if msg["message_type"] == "ST"] == [
+        "worker_task"
+    ]
+    assert [msg["message_type"] for msg in msgs].count("ET") == 1
+    assert [msg["message"] for msg in msgs if msg["message_type"] == "L"] == [
+        "Message in task"
+    ]
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+
+def _get_logger():
+    from robocorp.log._logger_instances import _get_logger_instances
+
+    with _get_logger_instances() as logger_instances:
+        assert len(logger_instances) == 1
+        return next(iter(logger_instances))
+
+
+def test_output_in_thread(tmpdir) -> None:
+    from importlib import reload
+
+    from robocorp import log
+    from robocorp_log_tests._resources import check
+
+    log_target = Path(tmpdir.join("log.html"))
+
+    with log.setup_auto_logging():
+        check = reload(check)
+
+        try:
+            log.add_log_output(tmpdir, log_html=log_target, write_in_thread=True)
+
+            log.start_run("Root Suite")
+            log.start_task("my_task", "task_mod", __file__, 0)
+            check.some_method()
+            log.info("Some message")
+            try:
+                raise RuntimeError("Some error")
+            except RuntimeError:
+                log.exception()
+            log.end_task("my_task", "task_mod", "PASS", "Ok")
+            log.end_run("Root Suite", "PASS")
+        finally:
+            log.close_log_outputs()
+
+    log.verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "SE", "name": "some_method"},
+            {"message_type": "EA", "name": "param1", "value": "'arg'"},
+            {"message_type": "R", "value": "22"},
+            {"message_type": "L", "message": "Some message"},
+            {"message_type": "STB", "message": "RuntimeError: Some error"},
+            {"message_type": "ET", "status": "PASS"},
+            {"message_type": "ER", "status": "PASS"},
+        ],
+    )
+
+
+def test_output_in_thread_drop(tmpdir) -> None:
+    from robocorp import log
+
+    log_target = Path(tmpdir.join("log.html"))
+
+    with log.add_log_output(
+        tmpdir,
+        log_html=log_target,
+        write_in_thread=True,
+        max_queue_size=5,
+        queue_overflow="drop",
+    ):
+        output_in_thread = _get_logger().robot_output_impl
+        log.start_run("Root Suite")
+        log.start_task("my_task", "task_mod", __file__, 0)
+
+        # While the writer thread can't progress, messages should be dropped
+        # (but start/end of elements must still be kept).
+        with output_in_thread._impl_lock:
+            for i in range(20):
+                log.info(f"Message {i}")
+
+            assert output_in_thread.dropped_messages > 0
+
+        log.end_task("my_task", "task_mod", "PASS", "Ok")
+        log.end_run("Root Suite", "PASS")
+
+    log.verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "ST", "name": "my_task"},
+            {
+                "message_type": "L",
+                "level": "W",
+                "__check__": lambda msg: "were dropped" in msg["message"],
+            },
+            {"message_type": "ET", "status": "PASS"},
+            {"message_type": "ER", "status": "PASS"},
+        ],
+        not_expected=[{"message_type": "L", "message": "Message 19"}],
+    )
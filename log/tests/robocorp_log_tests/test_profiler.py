@@ -0,0 +1,77 @@
+def test_profiler(tmpdir) -> None:
+    import json
+    from importlib import reload
+    from pathlib import Path
+
+    import pytest
+
+    from robocorp import log as robolog
+    from robocorp.log import (
+        iter_decoded_log_format_from_output_dir,
+        verify_log_messages_from_log_html,
+    )
+    from robocorp_log_tests._resources import check_profile
+
+    output_dir = Path(tmpdir)
+    log_target = output_dir / "log.html"
+    with robolog.setup_auto_logging():
+        check_profile = reload(check_profile)
+
+        with robolog.add_log_output(output_dir, log_html=log_target, profile=True):
+            robolog.start_run("Root Suite")
+            robolog.start_task("my_task", "task_mod", __file__, 0)
+            check_profile.main()
+            robolog.end_task("my_task", "task_mod", "PASS", "Ok")
+            robolog.end_run("Root Suite", "PASS")
+
+    report = json.loads((output_dir / "profile.json").read_text("utf-8"))
+    name_to_stats = dict((f["name"], f) for f in report["functions"])
+    assert set(name_to_stats) == {"main", "parent", "leaf", "recursive", "gen"}
+
+    main = name_to_stats["main"]
+    parent = name_to_stats["parent"]
+    leaf = name_to_stats["leaf"]
+    assert main["count"] == 1
+    assert parent["count"] == 1
+    assert leaf["count"] == 2
+    assert leaf["max"] >= 0.02
+    assert leaf["p50"] >= 0.02
+
+    # The self time excludes the time of the methods called.
+    assert parent["total_time"] >= 0.06
+    assert parent["total_time"] - parent["self_time"] == pytest.approx(
+        leaf["total_time"]
+    )
+    assert 0.02 <= parent["self_time"] < parent["total_time"]
+    assert main["self_time"] < main["total_time"]
+
+    # The time of recursive calls is only accounted once in the total time.
+    recursive = name_to_stats["recursive"]
+    assert recursive["count"] == 4
+    assert recursive["total_time"] <= main["total_time"]
+
+    # Each time the generator runs is counted.
+    assert name_to_stats["gen"]["count"] == 3
+
+    # Sorted by the self time.
+    self_times = [f["self_time"] for f in report["functions"]]
+    assert self_times == sorted(self_times, reverse=True)
+
+    msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+    report_msgs = [
+        msg
+        for msg in msgs
+        if msg.get("name") == "Profile report" and msg["message_type"] == "SE"
+    ]
+    assert len(report_msgs) == 1
+    summary = [msg for msg in msgs if msg["message_type"] == "LH"][-1]["message"]
+    assert "<td>parent</td>" in summary
+    assert "profile.json" in summary
+
+    verify_log_messages_from_log_html(
+        log_target,
+        [
+            {"message_type": "SE", "name": "Profile report"},
+            {"message_type": "ER", "status": "PASS"},
+        ],
+    )
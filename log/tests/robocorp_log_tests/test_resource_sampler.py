@@ -0,0 +1,73 @@
+import pytest
+
+from robocorp import log
+
+
+def test_setup_log_resource_sample_interval_validation():
+    with pytest.raises(ValueError):
+        log.setup_log(resource_sample_interval=-1)
+
+    with pytest.raises(ValueError):
+        log.setup_log(resource_sample_interval="1")  # type: ignore
+
+    from robocorp.log import _resource_sampler
+
+    with log.setup_log(resource_sample_interval=10):
+        assert _resource_sampler._sampler is not None
+    assert _resource_sampler._sampler is None
+
+
+@pytest.mark.parametrize("output_format", ["text", "binary"])
+def test_resource_sampler(tmpdir, output_format) -> None:
+    import subprocess
+    import sys
+    import time
+    from pathlib import Path
+
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+
+    output_dir = Path(tmpdir)
+    with log.add_log_output(output_dir, output_format=output_format):
+        log.start_run("Root Suite")
+        log.start_task("my_task", "task_mod", __file__, 0)
+
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time;time.sleep(5)"],
+        )
+        try:
+            with log.setup_log(resource_sample_interval=0.05):
+                time.sleep(0.5)
+        finally:
+            process.kill()
+            process.wait()
+
+        log.end_task("my_task", "task_mod", "PASS", "Ok")
+        log.end_run("Root Suite", "PASS")
+
+    msgs = list(iter_decoded_log_format_from_output_dir(output_dir))
+    samples = [msg for msg in msgs if msg["message_type"] == "RS"]
+    assert len(samples) >= 2
+
+    for sample in samples:
+        assert set(sample.keys()) == {
+            "message_type",
+            "rss",
+            "cpu_percent",
+            "fds",
+            "threads",
+            "children",
+            "children_rss",
+            "children_cpu_percent",
+            "time_delta_in_seconds",
+        }
+        assert sample["rss"] > 0
+        assert sample["threads"] >= 2  # main thread + sampler thread
+        assert sample["cpu_percent"] >= 0
+
+    assert any(sample["children"] >= 1 for sample in samples)
+    assert any(sample["children_rss"] > 0 for sample in samples)
+
+    # The sampling thread doesn't change the current thread in the log.
+    assert not [msg for msg in msgs if msg["message_type"] == "TH"]
+    time_deltas = [sample["time_delta_in_seconds"] for sample in samples]
+    assert time_deltas == sorted(time_deltas)
@@ -583,3 +583,73 @@ def foo():
 
     unparsed = ast.unparse(mod)
     str_regression.check(unparsed)
+
+
+def test_rewrite_options(tmpdir):
+    import ast
+
+    target = Path(tmpdir)
+    target /= "check.py"
+    target.write_text(
+        """
+def method(a):
+    if a:
+        a = 1
+    for i in range(2):
+        continue
+
+    def inner():
+        b = 2
+        yield b
+    return inner
+"""
+    )
+
+    config = AutoLogConfigForTest()
+    unparsed = ast.unparse(
+        _rewrite(target, config, filter_kind=FilterKind.full_log)[-1]
+    )
+    for callback in ("if_", "for_", "report_continue", "before_yield", "inner"):
+        assert callback in unparsed
+    assert unparsed.count("MethodLifecycleContext") == 2
+
+    config = AutoLogConfigForTest(
+        rewrite_ifs=False,
+        rewrite_loops=False,
+        rewrite_yields=False,
+        rewrite_max_function_depth=1,
+    )
+    unparsed = ast.unparse(
+        _rewrite(target, config, filter_kind=FilterKind.full_log)[-1]
+    )
+    for callback in ("if_", "for_", "report_continue", "before_yield"):
+        assert callback not in unparsed
+    # Just the outer method is tracked.
+    assert unparsed.count("MethodLifecycleContext") == 1
+    assert unparsed.count("after_assign") == 1
+
+    # Without the yield callbacks the generators aren't tracked (otherwise the
+    # contents of the caller would show inside the generator).
+    target.write_text(
+        """
+def gen():
+    b = 2
+    yield b
+
+def method():
+    c = 3
+    return c
+"""
+    )
+    config = AutoLogConfigForTest(rewrite_yields=False)
+    unparsed = ast.unparse(
+        _rewrite(target, config, filter_kind=FilterKind.full_log)[-1]
+    )
+    assert "before_yield" not in unparsed
+    assert unparsed.count("MethodLifecycleContext") == 1
+    assert unparsed.count("after_assign") == 1
+
+    # The options are a part of the key of the cached code.
+    assert config.get_rewrite_fingerprint() != (
+        AutoLogConfigForTest().get_rewrite_fingerprint()
+    )
@@ -171,3 +171,190 @@ def test_rewrite_hook_log_on_project_call():
                     ("after", "in_lib"),
                     ("after", "main"),
                 ]
+
+
+def test_rewrite_hook_cache(tmpdir, monkeypatch):
+    import os
+    from pathlib import Path
+
+    from robocorp.log._config import FilterKind
+    from robocorp.log._rewrite_importhook import (
+        PYC_CACHE_DIR_ENV_VAR,
+        get_cache_dirs,
+        get_pyc_name,
+        get_rewritten_code,
+    )
+
+    cache_dir = Path(tmpdir) / "cache"
+    monkeypatch.setenv(PYC_CACHE_DIR_ENV_VAR, str(cache_dir))
+
+    target = Path(tmpdir) / "src" / "my_mod.py"
+    target.parent.mkdir()
+    target.write_text("def method():\n    a = 1\n    return a\n")
+    (pyc_dir,) = get_cache_dirs(target)
+    assert str(pyc_dir).startswith(str(cache_dir))
+
+    config = DefaultAutoLogConfig()
+    config_no_assigns = DefaultAutoLogConfig(rewrite_assigns=False)
+
+    # Different configs are cached in different files.
+    pyc_name = get_pyc_name(target, config, FilterKind.full_log)
+    pyc_name_no_assigns = get_pyc_name(target, config_no_assigns, FilterKind.full_log)
+    assert pyc_name != pyc_name_no_assigns
+
+    assert not get_rewritten_code(target, config, FilterKind.full_log, True)[1]
+    assert get_rewritten_code(target, config, FilterKind.full_log, True)[1]
+    assert not get_rewritten_code(target, config_no_assigns, FilterKind.full_log, True)[
+        1
+    ]
+    assert sorted(os.listdir(pyc_dir)) == sorted([pyc_name, pyc_name_no_assigns])
+
+    # The pyc is invalidated by the contents (even with the same size/mtime).
+    stat = os.stat(target)
+    target.write_text("def method():\n    b = 1\n    return b\n")
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    co, cached = get_rewritten_code(target, config, FilterKind.full_log, True)
+    assert not cached
+    (method_co,) = [c for c in co.co_consts if getattr(c, "co_name", "") == "method"]
+    assert "b" in method_co.co_varnames
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_precompile(tmpdir, monkeypatch, jobs):
+    import os
+    from pathlib import Path
+
+    from robocorp.log._config import FilterKind
+    from robocorp.log._precompile import iter_modules, precompile
+    from robocorp.log._rewrite_importhook import (
+        PYC_CACHE_DIR_ENV_VAR,
+        get_rewritten_code,
+    )
+
+    monkeypatch.delenv(PYC_CACHE_DIR_ENV_VAR, raising=False)
+    root = Path(tmpdir) / "proj"
+    cache_dir = Path(tmpdir) / "cache"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "mod.py").write_text("def method():\n    return 1\n")
+    (root / "main.py").write_text("import pkg.mod\n")
+
+    assert sorted(iter_modules(root)) == [
+        ("main", str(root / "main.py")),
+        ("pkg", str(root / "pkg" / "__init__.py")),
+        ("pkg.mod", str(root / "pkg" / "mod.py")),
+    ]
+
+    results = precompile(root, jobs=jobs, cache_dir=str(cache_dir))
+    assert sorted(result for _filename, result in results) == ["compiled"] * 3
+    results = precompile(root, jobs=jobs, cache_dir=str(cache_dir))
+    assert sorted(result for _filename, result in results) == ["cached"] * 3
+
+    # The cache dir given is only used while precompiling.
+    assert PYC_CACHE_DIR_ENV_VAR not in os.environ
+
+    monkeypatch.setenv(PYC_CACHE_DIR_ENV_VAR, str(cache_dir))
+    assert get_rewritten_code(
+        root / "pkg" / "mod.py", DefaultAutoLogConfig(), FilterKind.full_log, False
+    )[1]
+
+
+def test_rewrite_hook_decisions_cache(tmpdir, monkeypatch):
+    import sys
+    from pathlib import Path
+
+    from robocorp.log._auto_logging_setup import add_import_hook
+    from robocorp.log._rewrite_importhook import RewriteHook
+
+    root = Path(tmpdir)
+    (root / "hook_cache_mod.py").write_text("def method():\n    return 1\n")
+    monkeypatch.syspath_prepend(str(root))
+
+    hook = RewriteHook(DefaultAutoLogConfig())
+    find_spec_calls = []
+    original_find_spec = hook._find_spec
+
+    def find_spec(name, path):
+        find_spec_calls.append(name)
+        return original_find_spec(name, path)
+
+    hook._find_spec = find_spec  # type: ignore
+
+    with add_import_hook(hook):
+        spec = hook.find_spec("hook_cache_mod")
+        assert spec is not None and spec.loader is hook
+        spec = hook.find_spec("hook_cache_mod")
+        assert spec is not None and spec.loader is hook
+        assert find_spec_calls == ["hook_cache_mod"]
+
+        # Builtin modules are never searched in the path.
+        assert hook.find_spec("sys") is None
+        assert find_spec_calls == ["hook_cache_mod"]
+
+        # Changing the sys.path invalidates the decisions.
+        sys.path.append(str(root / "other"))
+        try:
+            assert hook.find_spec("hook_cache_mod") is not None
+        finally:
+            sys.path.remove(str(root / "other"))
+        assert find_spec_calls == ["hook_cache_mod"] * 2
+
+        assert hook.find_spec("hook_cache_mod") is not None
+        assert hook.find_spec("hook_cache_mod") is not None
+        assert find_spec_calls == ["hook_cache_mod"] * 3
+
+        hook.invalidate_caches()
+        assert hook.find_spec("hook_cache_mod") is not None
+        assert find_spec_calls == ["hook_cache_mod"] * 4
+
+        import hook_cache_mod  # type: ignore # noqa
+
+        try:
+            assert hook_cache_mod.method() == 1
+        finally:
+            del sys.modules["hook_cache_mod"]
+
+    stats = hook.stats
+    assert stats.find_spec_calls >= 7
+    assert stats.cached_decisions >= 2
+    assert stats.modules_rewritten + stats.modules_from_cache == 1
+    assert "Auto-logging import hook added" in str(stats)
+
+
+def test_rewrite_hook_excluded_source_module(tmpdir, monkeypatch):
+    import importlib.machinery
+    import sys
+    from pathlib import Path
+
+    from robocorp.log._auto_logging_setup import add_import_hook
+    from robocorp.log._config import FilterKind
+    from robocorp.log._rewrite_importhook import RewriteHook
+
+    root = Path(tmpdir)
+    (root / "hook_excluded_mod.py").write_text("def method():\n    return 1\n")
+    monkeypatch.syspath_prepend(str(root))
+
+    config = DefaultAutoLogConfig()
+    monkeypatch.setattr(
+        config,
+        "get_filter_kind_by_module_name_and_path",
+        lambda module_name, filename: FilterKind.exclude,
+    )
+    hook = RewriteHook(config)
+
+    # The module isn't provided by the hook (regardless of the decision being
+    # cached) so that the other finders are used in the regular order.
+    assert hook.find_spec("hook_excluded_mod") is None
+    assert hook.find_spec("hook_excluded_mod") is None
+    assert hook.stats.cached_decisions == 1
+
+    with add_import_hook(hook):
+        import hook_excluded_mod  # type: ignore # noqa
+
+        try:
+            assert isinstance(
+                hook_excluded_mod.__spec__.loader,
+                importlib.machinery.SourceFileLoader,
+            )
+        finally:
+            del sys.modules["hook_excluded_mod"]
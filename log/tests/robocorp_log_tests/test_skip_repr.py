@@ -0,0 +1,52 @@
+from robocorp import log
+
+
+def test_no_repr_if_not_logged():
+    from importlib import reload
+
+    from robocorp_log_tests._resources import check_skip_repr
+
+    messages = []
+
+    with log.setup_auto_logging():
+        check_skip_repr = reload(check_skip_repr)
+        CountRepr = check_skip_repr.CountRepr
+
+        # No outputs.
+        check_skip_repr.main()
+        assert CountRepr.repr_calls == 0
+
+        with log.add_in_memory_log_output(messages.append):
+            with log.suppress_variables():
+                check_skip_repr.main()
+            assert CountRepr.repr_calls == 0
+
+            with log.suppress_methods():
+                check_skip_repr.main()
+            assert CountRepr.repr_calls == 0
+
+            # Argument, assign and return.
+            check_skip_repr.main()
+            assert CountRepr.repr_calls == 3
+
+
+def test_sensitive_values_hidden_if_not_logged():
+    from importlib import reload
+    from io import StringIO
+
+    from robocorp_log_tests._resources import check_skip_repr
+
+    s = StringIO()
+
+    with log.setup_auto_logging():
+        check_skip_repr = reload(check_skip_repr)
+
+        with log.add_in_memory_log_output(s.write):
+            with log.suppress_variables():
+                check_skip_repr.login("not_logged_pass")
+
+            # The password must be hidden even if it was passed to a
+            # method when variables weren't being logged.
+            log.info("The password is: not_logged_pass")
+
+    assert "not_logged_pass" not in s.getvalue()
@@ -0,0 +1,146 @@
+"""
+Benchmark: the startup time of `python -m robocorp.tasks run` for an empty task.
+
+Generates a project with a single task (which does nothing) and runs it in a
+new process multiple times:
+
+- cold: each run uses new (empty) directories for the pycs of the interpreter
+  and for the code rewritten by the auto-logging import hook (so, everything
+  is compiled/rewritten again).
+- warm: the runs reuse the same directories (after a first run to fill those).
+
+The wall time of each run is measured from the parent process. Afterwards
+the task is run once more with `--profile-startup` (warm) to show the time of
+each phase.
+
+The results may be saved as json (i.e.: to compare the startup time across
+releases).
+
+Usage (from the `tasks` folder):
+
+    python benchmarks/bench_startup.py [--runs 10] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SRC = str(Path(__file__).absolute().parent.parent / "src")
+LOG_SRC = str(Path(__file__).absolute().parent.parent.parent / "log" / "src")
+
+_TASKS_CONTENTS = """
+from robocorp.tasks import task
+
+
+@task
+def empty_task():
+    pass
+"""
+
+
+def _run_task(root: Path, cache_dir: Path, *args: str) -> float:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([SRC, LOG_SRC])
+    env["PYTHONPYCACHEPREFIX"] = str(cache_dir / "pycache")
+    env["ROBOCORP_LOG_PYC_CACHE_DIR"] = str(cache_dir / "log-pyc")
+    # The pycs must be written (so that the warm runs use those).
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["RC_DUMP_THREADS_AFTER_RUN"] = "0"
+
+    initial_time = time.perf_counter()
+    subprocess.check_call(
+        [
+            sys.executable,
+            "-m",
+            "robocorp.tasks",
+            "run",
+            "--console-colors=plain",
+            "--output-dir",
+            str(root / "output"),
+            *args,
+        ],
+        env=env,
+        cwd=str(root),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - initial_time
+
+
+def _summary(times: List[float]) -> Dict[str, float]:
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "max": max(times),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--output", help="If given, the results are saved as json in this file."
+    )
+    args = parser.parse_args()
+
+    print(f"Python: {sys.version.split()[0]} ({sys.platform}, cpus: {os.cpu_count()})")
+
+    results: dict = {"python": sys.version.split()[0], "platform": sys.platform}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "project"
+        root.mkdir()
+        (root / "tasks.py").write_text(_TASKS_CONTENTS)
+
+        cold = [
+            _run_task(root, Path(tmpdir) / f"cache-cold-{i}") for i in range(args.runs)
+        ]
+
+        warm_cache_dir = Path(tmpdir) / "cache-warm"
+        _run_task(root, warm_cache_dir)
+        warm = [_run_task(root, warm_cache_dir) for _i in range(args.runs)]
+
+        for label, times in (("cold", cold), ("warm", warm)):
+            summary = _summary(times)
+            results[label] = summary
+            print(
+                f"{label:<5} start of an empty task ({args.runs} runs): "
+                f"min: {summary['min']:.3f}s | median: {summary['median']:.3f}s | "
+                f"max: {summary['max']:.3f}s"
+            )
+
+        _run_task(root, warm_cache_dir, "--profile-startup")
+        profile = json.loads(
+            (root / "output" / "startup_profile.json").read_text("utf-8")
+        )
+
+    results["profile"] = {
+        "process_startup_time": profile["process_startup_time"],
+        "total_time": profile["total_time"],
+        "phases": {phase["name"]: phase["time"] for phase in profile["phases"]},
+        "import_hook": profile["import_hook"],
+    }
+    print("Startup profile (warm):")
+    if profile["process_startup_time"] is not None:
+        print(
+            f"    {'Process startup (until `run`)':<40} "
+            f"{profile['process_startup_time']:.3f}s"
+        )
+    for phase in profile["phases"]:
+        print(f"    {phase['name']:<40} {phase['time']:.3f}s")
+    print(f"    {'Total':<40} {profile['total_time']:.3f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(results, stream, indent=2)
+        print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
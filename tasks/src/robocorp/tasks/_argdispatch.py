@@ -67,6 +67,10 @@ class _ArgDispatcher:
             "--glob",
             help=f"May be used to specify a glob to select from which files tasks should be searched (default '{_constants.DEFAULT_TASK_SEARCH_GLOB}')",
         )
+        run_parser.add_argument(
+            "--exclude",
+            help=f"May be used to specify the names of the directories or files (globs separated by '|') which should be skipped when searching for tasks, besides the ones ignored in '.gitignore' files (default '{_constants.DEFAULT_TASK_SEARCH_EXCLUDE}')",
+        )
         self._add_task_argument(run_parser)
         run_parser.add_argument(
             "-o",
@@ -156,6 +160,21 @@ class _ArgDispatcher:
             help="Can be used to do an early os._exit to avoid the tasks session teardown or the interpreter teardown. Not recommended in general.",
         )
 
+        run_parser.add_argument(
+            "--parallel",
+            dest="parallel",
+            type=int,
+            default=0,
+            help="When greater than 1, each task is run in a new process (with up to this number of processes running at the same time). Each process has its own session lifecycle, log output and console output (which are merged in the log output of the run).",
+        )
+
+        run_parser.add_argument(
+            "--profile-startup",
+            dest="profile_startup",
+            action="store_true",
+            help="When set, the time of each startup phase (until the tasks are collected) and the time to import each module (including the time added by the auto-logging import hook) is shown and written to 'startup_profile.json' in the output directory.",
+        )
+
         return run_parser
 
     def _create_list_tasks_parser(self, main_parser):
@@ -176,9 +195,60 @@ class _ArgDispatcher:
                 f"May be used to specify a glob to select from which files tasks should be searched (default '{_constants.DEFAULT_TASK_SEARCH_GLOB}')"
             ),
         )
+        list_parser.add_argument(
+            "--exclude",
+            help=(
+                f"May be used to specify the names of the directories or files (globs separated by '|') which should be skipped when searching for tasks, besides the ones ignored in '.gitignore' files (default '{_constants.DEFAULT_TASK_SEARCH_EXCLUDE}')"
+            ),
+        )
+        list_parser.add_argument(
+            "--static",
+            action="store_true",
+            help="Collects the tasks from the source of the files (without importing those when possible) and caches the result for each file.",
+        )
 
         return list_parser
 
+    def _create_serve_parser(self, main_parser):
+        serve_parser = main_parser.add_parser(
+            "serve",
+            help="Preloads the modules and collects the tasks once and then runs the tasks requested through a local socket (each run in a new forked process).",
+        )
+        serve_parser.add_argument(
+            dest="path",
+            help="The directory or file with the tasks to run.",
+            nargs="?",
+            default=".",
+        )
+        serve_parser.add_argument(
+            "--socket",
+            required=True,
+            help="The path of the unix domain socket where the run requests are received.",
+        )
+        serve_parser.add_argument(
+            "--glob",
+            help=f"May be used to specify a glob to select from which files tasks should be searched (default '{_constants.DEFAULT_TASK_SEARCH_GLOB}')",
+        )
+        serve_parser.add_argument(
+            "--exclude",
+            help=f"May be used to specify the names of the directories or files (globs separated by '|') which should be skipped when searching for tasks, besides the ones ignored in '.gitignore' files (default '{_constants.DEFAULT_TASK_SEARCH_EXCLUDE}')",
+        )
+        serve_parser.add_argument(
+            "--preload-module",
+            action="append",
+            help="May be used to load a module(s) as the first step when collecting tasks.",
+            dest="preload_module",
+        )
+        serve_parser.add_argument(
+            "--console-colors",
+            help="Define how the console messages shown by the server should be color encoded.",
+            dest="console_colors",
+            type=str,
+            choices=["auto", "plain", "ansi"],
+            default="auto",
+        )
+        return serve_parser
+
     def _create_argparser(self):
         cls = self._get_argument_parser_class()
         parser = cls(
@@ -190,6 +260,7 @@ class _ArgDispatcher:
         subparsers = parser.add_subparsers(dest="command")
         self._create_run_parser(subparsers)
         self._create_list_tasks_parser(subparsers)
+        self._create_serve_parser(subparsers)
         return parser
 
     def parse_args(self, args: List[str]):
@@ -1,6 +1,6 @@
-import itertools
 import os
 import sys
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from types import ModuleType
@@ -10,6 +10,7 @@ from robocorp import log
 
 from ._customization._plugin_manager import PluginManager
 from ._protocols import ITask
+from ._walk_files import CollectTasksStats
 
 
 def module_name_from_path(path: Path, root: Path) -> str:
@@ -139,16 +140,69 @@ def clear_previously_collected_tasks():
     _found_as_set.clear()
 
 
+def iter_task_files(
+    path: Path,
+    glob: Optional[str] = None,
+    exclude: Optional[str] = None,
+    stats: Optional[CollectTasksStats] = None,
+) -> Iterator[Path]:
+    """
+    Provides the files from where tasks should be collected in the given
+    directory (the `__init__.py` of the directory followed by the files
+    matching the glob).
+
+    Args:
+        glob: The glob(s) (separated by `|`) to match the files.
+        exclude: The names or relative paths (fnmatch-style patterns separated
+            by `|`) of the directories or files which should be skipped.
+            `.gitignore` files are also respected.
+        stats: If given, the time spent walking the directory is added to it.
+    """
+    from robocorp.tasks import _constants
+
+    from ._walk_files import iter_matching_files
+
+    # Use dict to make unique keeping order.
+    paths_with_tasks: Dict[Path, int] = {}
+
+    package_init = path / "__init__.py"
+    if package_init.exists():
+        paths_with_tasks[package_init] = 1
+
+    use_glob = glob or _constants.DEFAULT_TASK_SEARCH_GLOB
+    if exclude is None:
+        exclude = _constants.DEFAULT_TASK_SEARCH_EXCLUDE
+
+    # We want to accept '|' in glob (all the globs are matched in one pass).
+    for filename in iter_matching_files(
+        str(path),
+        use_glob.split("|"),
+        exclude=[e for e in exclude.split("|") if e],
+        stats=stats,
+    ):
+        if filename.endswith(".py"):
+            paths_with_tasks[Path(filename)] = 1
+
+    yield from paths_with_tasks
+
+
 def collect_tasks(
     pm: PluginManager,
     path: Path,
     task_names: Sequence[str] = (),
     glob: Optional[str] = None,
+    exclude: Optional[str] = None,
+    stats: Optional[CollectTasksStats] = None,
 ) -> Iterator[ITask]:
     """
     Note: collecting tasks is not thread-safe.
+
+    Args:
+        exclude: See: `iter_task_files`.
+        stats: If given, the time spent finding the files and importing
+            those is added to it.
     """
-    from robocorp.tasks import _constants, _hooks
+    from robocorp.tasks import _hooks
 
     path = path.absolute()
     task_names_as_set = set(task_names)
@@ -161,6 +215,44 @@ def collect_tasks(
 
         return task.name in task_names
 
+    if path.is_dir():
+        root = _get_root(path, is_dir=True)
+        sys.path.insert(0, str(root))
+        paths_with_tasks: Sequence[Path] = tuple(
+            iter_task_files(path, glob, exclude, stats)
+        )
+
+    elif path.is_file():
+        root = _get_root(path, is_dir=False)
+        paths_with_tasks = (path,)
+
+    else:
+        from ._exceptions import RobocorpTasksCollectError
+
+        if not path.exists():
+            raise RobocorpTasksCollectError(f"Path: {path} does not exist")
+
+        raise RobocorpTasksCollectError(
+            f"Expected {path} to map to a directory or file."
+        )
+
+    for task in import_tasks(pm, root, paths_with_tasks, stats):
+        if accept_task(task):
+            yield task
+
+
+def import_tasks(
+    pm: PluginManager,
+    root: Path,
+    paths_with_tasks: Sequence[Path],
+    stats: Optional[CollectTasksStats] = None,
+) -> Iterator[ITask]:
+    """
+    Imports the given files (with the given root in the `sys.path`) and
+    provides the tasks found.
+    """
+    from robocorp.tasks import _hooks
+
     def on_func_found(func, options: Dict):
         from robocorp.tasks._exceptions import RobocorpTasksError
 
@@ -179,49 +271,15 @@ def collect_tasks(
             )
         )
 
-    with _hooks.on_task_func_found.register(on_func_found):
-        if path.is_dir():
-            root = _get_root(path, is_dir=True)
-            sys.path.insert(0, str(root))
+    initial_time = time.perf_counter()
+    try:
+        with _hooks.on_task_func_found.register(on_func_found):
             with _add_to_sys_path_0(root):
-                package_init = path / "__init__.py"
-                lst = []
-                if package_init.exists():
-                    lst.append(package_init)
-
-                use_glob = glob or _constants.DEFAULT_TASK_SEARCH_GLOB
-
-                # We want to accept '|' in glob.
-                globs = use_glob.split("|")
-
-                # Use dict to make unique keeping order.
-                glob_paths = dict()
-                for g in globs:
-                    for p in path.rglob(g):
-                        glob_paths[p] = 1
-
-                for path_with_task in itertools.chain(lst, tuple(glob_paths.keys())):
-                    if path_with_task.is_dir() or not path_with_task.name.endswith(
-                        ".py"
-                    ):
-                        continue
-
+                for path_with_task in paths_with_tasks:
                     import_path(path_with_task, root=root)
-
-        elif path.is_file():
-            root = _get_root(path, is_dir=False)
-            with _add_to_sys_path_0(root):
-                import_path(path, root=root)
-
-        else:
-            from ._exceptions import RobocorpTasksCollectError
-
-            if not path.exists():
-                raise RobocorpTasksCollectError(f"Path: {path} does not exist")
-
-            raise RobocorpTasksCollectError(
-                f"Expected {path} to map to a directory or file."
-            )
+    finally:
+        if stats is not None:
+            stats.import_time += time.perf_counter() - initial_time
 
     from robocorp.tasks._task import Task
 
@@ -229,10 +287,7 @@ def collect_tasks(
         module_name = method.__module__
         module_file = method.__code__.co_filename
 
-        task = Task(pm, module_name, module_file, method, options=options)
-
-        if accept_task(task):
-            yield task
+        yield Task(pm, module_name, module_file, method, options=options)
 
 
 def _get_root(path: Path, is_dir: bool) -> Path:
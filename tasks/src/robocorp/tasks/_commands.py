@@ -10,7 +10,17 @@ from argparse import ArgumentParser, ArgumentTypeError
 from ast import FunctionDef
 from io import StringIO
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Sequence, Union, overload
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
 from robocorp.tasks._customization._extension_points import EPManagedParameters
 from robocorp.tasks._protocols import ITask
@@ -27,6 +37,8 @@ def list_tasks(
     *,
     path: str,
     glob: Optional[str] = None,
+    exclude: Optional[str] = None,
+    static: bool = False,
     __stream__: Optional[typing.IO] = None,
     pm: Optional[PluginManager] = None,
 ) -> int:
@@ -45,6 +57,12 @@ def list_tasks(
 
     Args:
         path: The path (file or directory) from where tasks should be collected.
+        glob: A glob to define from which module names the tasks should be loaded.
+        exclude: The names of the directories or files (globs separated by
+            `|`) which should be skipped when searching for tasks.
+        static: If True the tasks are collected from the AST of the files
+            (and cached) and only the files which can't be handled that
+            way are imported.
     """
     from contextlib import redirect_stdout
 
@@ -70,7 +88,17 @@ def list_tasks(
     with redirect_stdout(sys.stderr):
         task: ITask
         tasks_found: List[TasksListTaskTypedDict] = []
-        for task in collect_tasks(pm, p, glob=glob):
+        if static and not pm.has_instance(EPManagedParameters):
+            # Note: the managed parameters can only be computed from the
+            # imported function.
+            from robocorp.tasks._static_collect_tasks import collect_task_entries
+
+            tasks_found.extend(collect_task_entries(pm, p, glob=glob, exclude=exclude))
+            write_to.write(json.dumps(tasks_found))
+            write_to.flush()
+            return 0
+
+        for task in collect_tasks(pm, p, glob=glob, exclude=exclude):
             entry: TasksListTaskTypedDict = {
                 "name": task.name,
                 "line": task.lineno,
@@ -159,7 +187,10 @@ def run(
     additional_arguments: Optional[List[str]] = None,
     preload_module: Optional[List[str]] = None,
     glob: Optional[str] = None,
+    exclude: Optional[str] = None,
     json_input: Optional[str] = None,
+    parallel: int = 0,
+    profile_startup: bool = False,
     pm: Optional[PluginManager] = None,
 ) -> int:
     """
@@ -209,7 +240,19 @@ def run(
         preload_module: The modules which should be pre-loaded (i.e.: loaded
             after the logging is in place but before any other task is collected).
         glob: A glob to define from which module names the tasks should be loaded.
+        exclude: The names of the directories or files (globs separated by
+            `|`) which should be skipped when searching for tasks (besides the
+            ones ignored in `.gitignore` files).
         json_input: The path to a json file to be loaded to get the arguments.
+        parallel: If greater than 1 each task is run in a new process (with
+            up to this number of processes running at the same time). Each
+            process has its own session lifecycle, log output and console
+            output, which are merged in the output of this process as each
+            process finishes (see: `_parallel.py`).
+        profile_startup: If True the time of each phase until the tasks are
+            collected and the time to import each module is shown and
+            written to `startup_profile.json` in the output directory (see:
+            `_startup_profile.py`).
 
     Returns:
         0 if everything went well.
@@ -217,12 +260,20 @@ def run(
     """
     import copy
 
-    from robocorp.log import console, redirect
-    from robocorp.log.pyproject_config import (
-        read_pyproject_toml,
-        read_robocorp_auto_log_config,
+    from ._startup_profile import (
+        StartupProfile,
+        profile_enter_phase,
+        profile_phase,
     )
 
+    startup_profile: Optional[StartupProfile] = None
+    if profile_startup:
+        startup_profile = StartupProfile()
+        startup_profile.start()
+
+    with profile_phase(startup_profile, "Import robocorp.log"):
+        from robocorp.log import console, redirect
+
     from robocorp.tasks._interrupts import interrupt_on_timeout
 
     from ._collect_tasks import collect_tasks
@@ -238,6 +289,7 @@ def run(
     from ._log_output_setup import setup_log_output, setup_log_output_to_port
     from ._protocols import Status
     from ._task import Context, set_current_task
+    from ._walk_files import CollectTasksStats
 
     if not output_dir:
         output_dir = os.environ.get("ROBOT_ARTIFACTS", "")
@@ -258,6 +310,8 @@ def run(
     p = Path(path).absolute()
     context = Context()
     if not p.exists():
+        if startup_profile is not None:
+            startup_profile.stop()
         context.show_error(f"Path: {path} does not exist")
         return 1
 
@@ -323,15 +377,10 @@ def run(
         task_name = ", ".join(str(x) for x in task_names)
         task_or_tasks = "task" if len(task_names) == 1 else "tasks"
 
-    config: log.AutoLogConfigBase
-    pyproject_path_and_contents = read_pyproject_toml(p)
-    pyproject_toml_contents: dict
-    if pyproject_path_and_contents is None:
-        config = log.DefaultAutoLogConfig()
-        pyproject_toml_contents = {}
-    else:
-        config = read_robocorp_auto_log_config(context, pyproject_path_and_contents)
-        pyproject_toml_contents = pyproject_path_and_contents.toml_contents
+    with profile_phase(startup_profile, "Read pyproject.toml"):
+        config, log_settings, pyproject_toml_contents = _read_pyproject_config(
+            context, p
+        )
 
     output_dir_path = Path(output_dir).absolute()
     output_dir_path.mkdir(parents=True, exist_ok=True)
@@ -382,13 +431,22 @@ def run(
     try:
         with (
             set_config(run_config),
-            setup_cli_auto_logging(
+            profile_enter_phase(
+                startup_profile,
+                "Setup auto-logging (import hook)",
+                setup_cli_auto_logging,
                 # Note: we can't customize what's a "project" file or a "library" file,
                 # right now the customizations are all based on module names.
-                config
+                config,
+            ),
+            profile_enter_phase(
+                startup_profile, "Setup log", log.setup_log, **log_settings
             ),
             redirect.setup_stdout_logging(log_output_to_stdout),
-            setup_log_output(
+            profile_enter_phase(
+                startup_profile,
+                "Setup log output",
+                setup_log_output,
                 output_dir=output_dir_path,
                 max_files=max_log_files,
                 max_file_size=max_log_file_size,
@@ -404,14 +462,16 @@ def run(
             log.start_run(run_name)
             try:
                 setup_message = ""
+                collect_tasks_stats = CollectTasksStats()
                 log.start_task("Collect tasks", "setup", "", 0)
                 try:
                     if preload_module:
                         import importlib
 
-                        for module in preload_module:
-                            context.show(f"\nPre-loading module: {module}")
-                            importlib.import_module(module)
+                        with profile_phase(startup_profile, "Preload modules"):
+                            for module in preload_module:
+                                context.show(f"\nPre-loading module: {module}")
+                                importlib.import_module(module)
 
                     if not task_name:
                         context.show(f"\nCollecting tasks from: {path}")
@@ -420,7 +480,17 @@ def run(
                             f"\nCollecting {task_or_tasks} {task_name} from: {path}"
                         )
 
-                    tasks: List[ITask] = list(collect_tasks(pm, p, task_names, glob))
+                    with profile_phase(startup_profile, "Collect tasks"):
+                        tasks: List[ITask] = list(
+                            collect_tasks(
+                                pm,
+                                p,
+                                task_names,
+                                glob,
+                                exclude=exclude,
+                                stats=collect_tasks_stats,
+                            )
+                        )
 
                     if not tasks:
                         raise RobocorpTasksCollectError(
@@ -439,46 +509,85 @@ def run(
                     retcode = 1
                     return retcode
                 finally:
+                    log.info(str(collect_tasks_stats))
                     log.end_task("Collect tasks", "setup", run_status, setup_message)
+                    if startup_profile is not None:
+                        startup_profile.stop()
+                        startup_profile.show(
+                            context, startup_profile.write(output_dir_path)
+                        )
 
-                before_all_tasks_run(tasks)
+                # Note: with managed parameters the tasks must run in this
+                # process.
+                run_in_workers = (
+                    parallel > 1
+                    and len(tasks) > 1
+                    and not pm.has_instance(EPManagedParameters)
+                )
+                if not run_in_workers:
+                    before_all_tasks_run(tasks)
 
                 try:
-                    for task in tasks:
-                        set_current_task(task)
-                        before_task_run(task)
-                        try:
-                            if json_loaded_arguments is not None:
-                                kwargs = copy.deepcopy(json_loaded_arguments)
-                                kwargs = _validate_and_convert_kwargs(pm, task, kwargs)
-
-                            else:
-                                kwargs = _normalize_arguments(
-                                    pm, task, additional_arguments or []
-                                )
+                    if run_in_workers:
+                        from ._parallel import create_worker_args, run_tasks_in_workers
+
+                        worker_args = create_worker_args(
+                            path=p,
+                            max_log_files=max_log_files,
+                            max_log_file_size=max_log_file_size,
+                            teardown_dump_threads_timeout=teardown_dump_threads_timeout,
+                            teardown_interrupt_timeout=teardown_interrupt_timeout,
+                            os_exit=os_exit,
+                            additional_arguments=additional_arguments,
+                            preload_module=preload_module,
+                            glob=glob,
+                            exclude=exclude,
+                            json_input=json_input,
+                        )
+                        run_tasks_in_workers(
+                            context, tasks, parallel, output_dir_path, worker_args
+                        )
+                        if any(task.failed for task in tasks):
+                            run_status = "ERROR"
 
-                            result = task.run(**kwargs)
-                            task.result = result
-                            task.status = Status.PASS
-                        except Exception as e:
-                            task.status = Status.FAIL
-                            # Make sure we put some message even if str(e) is empty.
-                            task.message = str(e) or f"{e.__class__}"
-                            task.exc_info = sys.exc_info()
-                        finally:
-                            with interrupt_on_timeout(
-                                teardown_dump_threads_timeout,
-                                teardown_interrupt_timeout,
-                                "Teardown",
-                                "--teardown-dump-threads-timeout",
-                                "RC_TEARDOWN_DUMP_THREADS_TIMEOUT",
-                                "--teardown-interrupt-timeout",
-                                "RC_TEARDOWN_INTERRUPT_TIMEOUT",
-                            ):
-                                after_task_run(task)
-                            set_current_task(None)
-                            if task.failed:
-                                run_status = "ERROR"
+                    else:
+                        for task in tasks:
+                            set_current_task(task)
+                            before_task_run(task)
+                            try:
+                                if json_loaded_arguments is not None:
+                                    kwargs = copy.deepcopy(json_loaded_arguments)
+                                    kwargs = _validate_and_convert_kwargs(
+                                        pm, task, kwargs
+                                    )
+
+                                else:
+                                    kwargs = _normalize_arguments(
+                                        pm, task, additional_arguments or []
+                                    )
+
+                                result = task.run(**kwargs)
+                                task.result = result
+                                task.status = Status.PASS
+                            except Exception as e:
+                                task.status = Status.FAIL
+                                # Make sure we put some message even if str(e) is empty.
+                                task.message = str(e) or f"{e.__class__}"
+                                task.exc_info = sys.exc_info()
+                            finally:
+                                with interrupt_on_timeout(
+                                    teardown_dump_threads_timeout,
+                                    teardown_interrupt_timeout,
+                                    "Teardown",
+                                    "--teardown-dump-threads-timeout",
+                                    "RC_TEARDOWN_DUMP_THREADS_TIMEOUT",
+                                    "--teardown-interrupt-timeout",
+                                    "RC_TEARDOWN_INTERRUPT_TIMEOUT",
+                                ):
+                                    after_task_run(task)
+                                set_current_task(None)
+                                if task.failed:
+                                    run_status = "ERROR"
                 finally:
                     log.start_task("Teardown tasks", "teardown", "", 0)
                     try:
@@ -495,7 +604,7 @@ def run(
                                 log.info(
                                     "The tasks teardown was skipped due to option to os._exit before teardown."
                                 )
-                            else:
+                            elif not run_in_workers:
                                 after_all_tasks_run(tasks)
                         # Always do a process snapshot as the process is about to finish.
                         log.process_snapshot()
@@ -520,6 +629,9 @@ def run(
             traceback.print_exc()
         raise
     finally:
+        if startup_profile is not None:
+            startup_profile.stop()
+
         if os_exit_enum != _OsExit.NO:
             # Either before or after will exit here (the difference is that
             # if before teardown was requested the teardown is skipped).
@@ -562,6 +674,82 @@ def run(
             t.start()
 
 
+@_arg_dispatch.register()
+def serve(
+    *,
+    socket: str,
+    path: str,
+    glob: Optional[str] = None,
+    exclude: Optional[str] = None,
+    preload_module: Optional[List[str]] = None,
+    console_colors: str = "auto",
+    pm: Optional[PluginManager] = None,
+) -> int:
+    """
+    Preloads the modules and collects the tasks once and then waits for
+    requests to run tasks in the given (unix domain) socket. Each request
+    is run in a new process forked from the current one (see `_serve.py`
+    for the protocol).
+
+    Args:
+        socket: The path of the socket to listen to.
+        path: The path (file or directory where the tasks should be collected from.
+        glob: A glob to define from which module names the tasks should be loaded.
+        exclude: The names of the directories or files (globs separated by
+            `|`) which should be skipped when searching for tasks.
+        preload_module: The modules which should be pre-loaded (before the
+            tasks are collected).
+
+    Returns:
+        0 if the server was stopped by a `shutdown` request.
+        1 if there was some error collecting the tasks or creating the server.
+    """
+    from robocorp.log import console
+
+    from ._serve import serve_run_requests
+
+    if pm is None:
+        pm = PluginManager()
+
+    console.set_mode(console_colors)
+    return serve_run_requests(
+        pm,
+        Path(path),
+        socket,
+        glob=glob,
+        exclude=exclude,
+        preload_module=preload_module,
+    )
+
+
+def _read_pyproject_config(context, p: Path) -> Tuple[Any, dict, dict]:
+    """
+    Returns:
+        The auto-logging config, the log settings and the contents of the
+        `pyproject.toml` found for the given path.
+    """
+    from robocorp.log.pyproject_config import (
+        read_pyproject_toml,
+        read_robocorp_auto_log_config,
+        read_robocorp_log_settings,
+    )
+
+    from robocorp import log
+
+    config: log.AutoLogConfigBase
+    pyproject_path_and_contents = read_pyproject_toml(p)
+    pyproject_toml_contents: dict
+    log_settings: dict = {}
+    if pyproject_path_and_contents is None:
+        config = log.DefaultAutoLogConfig()
+        pyproject_toml_contents = {}
+    else:
+        config = read_robocorp_auto_log_config(context, pyproject_path_and_contents)
+        log_settings = read_robocorp_log_settings(context, pyproject_path_and_contents)
+        pyproject_toml_contents = pyproject_path_and_contents.toml_contents
+    return config, log_settings, pyproject_toml_contents
+
+
 class _CustomArgumentParser(ArgumentParser):
     def error(self, msg):
         raise RuntimeError(msg)
@@ -8,4 +8,11 @@ SUPPORTED_TYPES_IN_SCHEMA = (str, int, float, bool)
 
 DEFAULT_TASK_SEARCH_GLOB = "*task*.py"
 
+# Directories which are skipped when searching for tasks (besides the ones
+# ignored in `.gitignore` files).
+DEFAULT_TASK_SEARCH_EXCLUDE = (
+    ".git|.hg|.svn|.venv|venv|.tox|.nox|__pycache__|.mypy_cache|.pytest_cache|"
+    ".ruff_cache|node_modules|output"
+)
+
 MODULE_ENTRY_POINT = "robocorp.tasks"
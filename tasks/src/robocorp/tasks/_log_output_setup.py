@@ -1,8 +1,10 @@
 import os
+import sys
 import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator, Optional, Union
+from typing import Callable, Iterator, List, Optional
 
 
 def setup_log_output(
@@ -23,18 +25,177 @@ def setup_log_output(
     )
 
 
-class _LogErrorLock:
-    tlocal = threading.local()
+# The messages are sent to the listener in batches: a batch is sent when it
+# has at least this many bytes or when its first message was written this many
+# seconds ago.
+_BATCH_SIZE = 64 * 1024
+_BATCH_INTERVAL = 0.05
 
+_DEFAULT_MAX_QUEUE_SIZE = 10 * 1024 * 1024
 
-class _Finish:
-    pass
+
+class _PortStreamer:
+    """
+    Sends the messages written to a socket in a thread.
+
+    The messages waiting to be sent are bounded (`max_queue_size` bytes) and
+    when the limit is reached the writer either waits (`queue_overflow="block"`)
+    or the message is discarded (`queue_overflow="drop"`).
+
+    If `compression="zlib"` the data is sent as a zlib stream (flushed after
+    each batch, so, the listener can decompress each batch as it's received).
+    """
+
+    def __init__(
+        self,
+        client_socket,
+        max_queue_size: int = _DEFAULT_MAX_QUEUE_SIZE,
+        queue_overflow: str = "block",
+        compression: str = "",
+        on_error: Optional[Callable[[], None]] = None,
+    ):
+        import zlib
+
+        self._socket = client_socket
+        self._max_queue_size = max_queue_size
+        self._drop = queue_overflow == "drop"
+        self._compressor = zlib.compressobj() if compression == "zlib" else None
+        self._on_error = on_error
+
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._first_pending_time = 0.0
+        self._finish = False
+        self._broken = False
+
+        # Counters (in bytes, `sent_bytes` is after the compression).
+        self.queued_bytes = 0
+        self.sent_bytes = 0
+        self.dropped_bytes = 0
+        self.dropped_messages = 0
+
+        self._thread = threading.Thread(target=self._run, name="OutputToPortThread")
+        self._thread.daemon = True
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def write(self, msg: str) -> None:
+        data = msg.encode("utf-8")
+        size = len(data)
+        with self._cond:
+            if self._broken:
+                self.dropped_bytes += size
+                self.dropped_messages += 1
+                return
+
+            if self._pending_size + size > self._max_queue_size and self._pending:
+                if self._drop:
+                    self.dropped_bytes += size
+                    self.dropped_messages += 1
+                    return
+
+                # Note: messages written while sending (i.e.: an error) must
+                # not wait for the thread itself.
+                if self._thread is not threading.current_thread():
+                    while (
+                        self._pending_size + size > self._max_queue_size
+                        and self._pending
+                        and not self._broken
+                    ):
+                        self._cond.wait()
+
+            if not self._pending:
+                self._first_pending_time = time.monotonic()
+            self._pending.append(data)
+            self._pending_size += size
+            self.queued_bytes += size
+            if self._pending_size >= _BATCH_SIZE or len(self._pending) == 1:
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        cond = self._cond
+        while True:
+            with cond:
+                while True:
+                    if self._pending:
+                        if self._finish or self._pending_size >= _BATCH_SIZE:
+                            break
+                        timeout = (
+                            self._first_pending_time + _BATCH_INTERVAL
+                        ) - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        cond.wait(timeout)
+                    elif self._finish:
+                        self._send_end()
+                        return
+                    else:
+                        cond.wait()
+
+                batch = self._pending
+                self._pending = []
+                self._pending_size = 0
+                # Writers may be waiting for space in the queue.
+                cond.notify_all()
+
+            self._send(batch)
+
+    def _send(self, batch: List[bytes]) -> None:
+        import zlib
+
+        data = b"".join(batch)
+        if not self._broken:
+            to_send = data
+            if self._compressor is not None:
+                to_send = self._compressor.compress(data) + self._compressor.flush(
+                    zlib.Z_SYNC_FLUSH
+                )
+            try:
+                self._socket.sendall(to_send)
+            except Exception:
+                with self._cond:
+                    # The messages written afterwards are discarded.
+                    self._broken = True
+                    self._cond.notify_all()
+                if self._on_error is not None:
+                    self._on_error()
+            else:
+                self.sent_bytes += len(to_send)
+                return
+
+        with self._cond:
+            self.dropped_bytes += len(data)
+            self.dropped_messages += len(batch)
+
+    def _send_end(self) -> None:
+        if self._compressor is not None and not self._broken:
+            data = self._compressor.flush()
+            try:
+                self._socket.sendall(data)
+            except Exception:
+                pass
+            else:
+                self.sent_bytes += len(data)
+
+    def close(self, timeout: float) -> bool:
+        """
+        Sends the pending messages and stops the thread.
+
+        Returns:
+            True if all the messages were sent before the timeout and False
+            otherwise.
+        """
+        with self._cond:
+            self._finish = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
 
 
 @contextmanager
 def setup_log_output_to_port() -> Iterator[None]:
-    import queue
-
     port_in_env: Optional[str] = os.environ.get("ROBOCORP_TASKS_LOG_LISTENER_PORT")
     if not port_in_env:
         yield
@@ -51,6 +212,35 @@ def setup_log_output_to_port() -> Iterator[None]:
         yield
         return
 
+    max_queue_size = _DEFAULT_MAX_QUEUE_SIZE
+    max_queue_size_in_env = os.environ.get("ROBOCORP_TASKS_LOG_LISTENER_MAX_QUEUE_SIZE")
+    if max_queue_size_in_env:
+        try:
+            max_queue_size = int(max_queue_size_in_env)
+        except Exception:
+            log.critical(
+                "ROBOCORP_TASKS_LOG_LISTENER_MAX_QUEUE_SIZE set to a non-int value:"
+                f" {max_queue_size_in_env}"
+            )
+
+    queue_overflow = os.environ.get(
+        "ROBOCORP_TASKS_LOG_LISTENER_QUEUE_OVERFLOW", "block"
+    )
+    if queue_overflow not in ("block", "drop"):
+        log.critical(
+            "ROBOCORP_TASKS_LOG_LISTENER_QUEUE_OVERFLOW must be 'block' or 'drop'."
+            f" Found: {queue_overflow}"
+        )
+        queue_overflow = "block"
+
+    compression = os.environ.get("ROBOCORP_TASKS_LOG_LISTENER_COMPRESSION", "")
+    if compression not in ("", "zlib"):
+        log.critical(
+            "ROBOCORP_TASKS_LOG_LISTENER_COMPRESSION must be 'zlib' (or not set)."
+            f" Found: {compression}"
+        )
+        compression = ""
+
     try:
         import socket
 
@@ -63,51 +253,38 @@ def setup_log_output_to_port() -> Iterator[None]:
         yield
         return
 
-    q: "queue.Queue[Union[str, _Finish]]" = queue.Queue()
-
-    def write(msg: str):
-        q.put(msg)
-
-    def write_in_thread():
-        while True:
-            msg = q.get()
-            if isinstance(msg, _Finish):
-                break
-
-            try:
-                client_socket.send(msg.encode("utf-8"))
-            except Exception:
-                try:
-                    writing = _LogErrorLock.tlocal._writing
-                except Exception:
-                    writing = _LogErrorLock.tlocal._writing = False
-
-                if writing:
-                    # Prevent recursing printing errors.
-                    return
+    def on_error():
+        log.exception(
+            f"Error sending data to ROBOCORP_TASKS_LOG_LISTENER_PORT ({port_in_env})."
+        )
 
-                _LogErrorLock.tlocal._writing = True
-                try:
-                    log.exception(
-                        "Error sending data to ROBOCORP_TASKS_LOG_LISTENER_PORT"
-                        + f" ({port_in_env})."
-                    )
-                finally:
-                    _LogErrorLock.tlocal._writing = False
-
-    t = threading.Thread(target=write_in_thread, name="OutputToPortThread")
-    t.daemon = True
-    t.start()
+    streamer = _PortStreamer(
+        client_socket, max_queue_size, queue_overflow, compression, on_error
+    )
+    streamer.start()
     try:
-        with log.add_in_memory_log_output(write):
+        with log.add_in_memory_log_output(streamer.write):
             yield
     finally:
-        q.put(_Finish())
+        # Give up to 10 seconds for it to finish.
+        if not streamer.close(10):
+            log.info("robocorp-tasks: OutputToPortThread did not finish.")
 
-    # Give up to 10 seconds for it to finish.
-    t.join(10)
-    if t.is_alive():
-        log.info("robocorp-tasks: OutputToPortThread did not finish.")
+    # Note: the run already finished at this point, so, the counters are
+    # only shown in the stderr (logging those would add messages after the
+    # end of the run in the log).
+    if streamer.dropped_messages:
+        sys.stderr.write(
+            f"robocorp-tasks: {streamer.dropped_messages} messages"
+            f" ({streamer.dropped_bytes} bytes) were not sent to"
+            f" ROBOCORP_TASKS_LOG_LISTENER_PORT ({port_in_env}).\n"
+        )
+    if os.environ.get("ROBOCORP_TASKS_LOG_LISTENER_SHOW_STATS", "") in ("true", "1"):
+        sys.stderr.write(
+            f"robocorp-tasks: {streamer.queued_bytes} bytes queued and"
+            f" {streamer.sent_bytes} bytes sent to"
+            f" ROBOCORP_TASKS_LOG_LISTENER_PORT ({port_in_env}).\n"
+        )
 
     try:
         client_socket.close()
@@ -0,0 +1,278 @@
+"""
+Runs the collected tasks in worker processes.
+
+Each task is run in a new `python -m robocorp.tasks run <path> -t <task>`
+process (with at most `parallel` processes running at the same time), so,
+each task has its own session lifecycle (`session_cache`, session fixtures,
+...), its own log output (in `<output_dir>/parallel/<task>`) and its own
+console (in `<output_dir>/parallel/<task>/console.txt`).
+
+Whenever a worker finishes, its log output is merged into the current log
+output (so, the `log.html` has the tasks in the order in which those
+finished) and its console messages are shown.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ._protocols import ITask, Status
+from ._task import Context
+
+# The directory (inside the output directory) with the output of each worker.
+PARALLEL_OUTPUT_DIR_NAME = "parallel"
+
+# The environment variables which are related to the run in the current
+# process and aren't passed to the workers (i.e.: the log of the workers is
+# merged in the current log, which is streamed to the listener from here).
+_NOT_INHERITED_ENV_VARS = (
+    "ROBOCORP_TASKS_LOG_LISTENER_PORT",
+    "ROBOCORP_TASKS_LOG_LISTENER_MAX_QUEUE_SIZE",
+    "ROBOCORP_TASKS_LOG_LISTENER_QUEUE_OVERFLOW",
+    "ROBOCORP_TASKS_LOG_LISTENER_COMPRESSION",
+)
+
+
+def create_worker_args(
+    *,
+    path: Path,
+    max_log_files: int,
+    max_log_file_size: str,
+    teardown_dump_threads_timeout: float,
+    teardown_interrupt_timeout: float,
+    os_exit: Optional[str],
+    additional_arguments: Optional[List[str]],
+    preload_module: Optional[List[str]],
+    glob: Optional[str],
+    exclude: Optional[str],
+    json_input: Optional[str],
+) -> List[str]:
+    """
+    Returns:
+        The arguments for `run` which are the same for all the workers (the
+        task name and the output directory are added for each worker).
+    """
+    args = [
+        str(path),
+        "--max-log-files",
+        str(max_log_files),
+        "--max-log-file-size",
+        max_log_file_size,
+        # The console messages are shown by the parent process from the log.
+        "--console-colors",
+        "plain",
+        "--log-output-to-stdout",
+        "no",
+        "--teardown-dump-threads-timeout",
+        str(teardown_dump_threads_timeout),
+        "--teardown-interrupt-timeout",
+        str(teardown_interrupt_timeout),
+    ]
+    if os_exit:
+        args.extend(("--os-exit", os_exit))
+    if glob:
+        args.extend(("--glob", glob))
+    if exclude is not None:
+        args.extend(("--exclude", exclude))
+    for module in preload_module or ():
+        args.extend(("--preload-module", module))
+    if json_input:
+        args.extend(("--json-input", str(Path(json_input).absolute())))
+    if additional_arguments:
+        args.append("--")
+        args.extend(additional_arguments)
+    return args
+
+
+def create_worker_env() -> Dict[str, str]:
+    """
+    Returns:
+        The environment for the workers (the environment of the current
+        process without the variables which are related to the current run).
+    """
+    env = os.environ.copy()
+    for name in _NOT_INHERITED_ENV_VARS:
+        env.pop(name, None)
+    return env
+
+
+class _Worker:
+    def __init__(self, task_name: str, output_dir: Path) -> None:
+        self.task_name = task_name
+        self.output_dir = output_dir
+        self.console_path = output_dir / "console.txt"
+        self.process: Optional[subprocess.Popen] = None
+        self.start_time = 0.0
+        self.elapsed_time = 0.0
+
+    def start(self, worker_args: Sequence[str], env: Dict[str, str]) -> None:
+        # Remove the output of a previous run (otherwise a `.robolog` from
+        # it could be merged).
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # The task name and the output dir go before the arguments (which may
+        # end with `--` followed by the arguments to the task).
+        cmdline = [
+            sys.executable,
+            "-m",
+            "robocorp.tasks",
+            "run",
+            "-t",
+            self.task_name,
+            "--output-dir",
+            str(self.output_dir),
+            *worker_args,
+        ]
+        self.start_time = time.monotonic()
+        with open(self.console_path, "wb") as console_stream:
+            self.process = subprocess.Popen(
+                cmdline,
+                stdin=subprocess.DEVNULL,
+                stdout=console_stream,
+                stderr=subprocess.STDOUT,
+                env=env,
+            )
+
+    def read_result(self, returncode: int) -> Tuple[Status, str]:
+        """
+        Returns:
+            The status and message of the task (as written by the worker in
+            its log output).
+        """
+        from robocorp import log
+
+        status = None
+        message = ""
+        in_task = False
+        try:
+            for msg in log.iter_decoded_log_format_from_output_dir(self.output_dir):
+                message_type = msg["message_type"]
+                if message_type in ("ST", "RT"):
+                    in_task = msg.get("name") == self.task_name
+                elif message_type == "ET" and in_task:
+                    in_task = False
+                    # If multiple tasks have the same name all of those run
+                    # in the same worker (any failure is reported).
+                    if status != Status.FAIL:
+                        status = msg.get("status")
+                        message = msg.get("message") or ""
+        except OSError:
+            pass
+
+        if status == Status.FAIL:
+            return Status.FAIL, message
+
+        if returncode != 0 or status != Status.PASS:
+            return Status.FAIL, (
+                f"The worker process running the task exited with returncode: "
+                f"{returncode} (console output: {self.console_path})."
+            )
+        return Status.PASS, message
+
+
+def run_tasks_in_workers(
+    context: Context,
+    tasks: Sequence[ITask],
+    parallel: int,
+    output_dir: Path,
+    worker_args: Sequence[str],
+) -> None:
+    """
+    Runs each of the given tasks in a worker process (with up to `parallel`
+    workers at the same time) and sets the status and message of each task
+    based on the results from its worker.
+    """
+    from robocorp import log
+
+    # Tasks with the same name (from different files) run in the same worker.
+    name_to_tasks: Dict[str, List[ITask]] = {}
+    for task in tasks:
+        name_to_tasks.setdefault(task.name, []).append(task)
+
+    parallel_dir = output_dir / PARALLEL_OUTPUT_DIR_NAME
+    pending = [_Worker(name, parallel_dir / name) for name in name_to_tasks]
+    pending.reverse()
+    finished: List[_Worker] = []
+    running: Dict[_Worker, int] = {}
+
+    context.show(
+        f"\nRunning {len(pending)} tasks in up to {parallel} worker processes "
+        f"(output: {parallel_dir})."
+    )
+
+    # Each worker has a thread waiting for it to finish (and the main thread
+    # handles the results in the order in which those finish).
+    finished_queue: "queue.Queue[Tuple[_Worker, int]]" = queue.Queue()
+
+    def wait_worker(worker: _Worker, process: subprocess.Popen) -> None:
+        finished_queue.put((worker, process.wait()))
+
+    worker_env = create_worker_env()
+    try:
+        while pending or running:
+            while pending and len(running) < parallel:
+                worker = pending.pop()
+                worker.start(worker_args, worker_env)
+                assert worker.process is not None
+                running[worker] = 1
+                threading.Thread(
+                    target=wait_worker,
+                    args=(worker, worker.process),
+                    name=f"Wait worker: {worker.task_name}",
+                    daemon=True,
+                ).start()
+
+            worker, returncode = finished_queue.get()
+            del running[worker]
+            worker.elapsed_time = time.monotonic() - worker.start_time
+            finished.append(worker)
+
+            status, message = worker.read_result(returncode)
+            for task in name_to_tasks[worker.task_name]:
+                task.status = status
+                task.message = message
+
+            # The setup/teardown of each worker are not merged (the run has
+            # its own setup/teardown).
+            log.merge_output_dir(
+                worker.output_dir,
+                show_console_messages=True,
+                skip_task_libnames=("setup", "teardown"),
+            )
+            if returncode != 0 and not any(
+                True for _ in worker.output_dir.glob("*.robolog")
+            ):
+                # The worker didn't even create its log: show its console.
+                context.show_error(message)
+                context.show(worker.console_path.read_text("utf-8", "replace"))
+    finally:
+        for worker in running:
+            if worker.process is not None:
+                worker.process.kill()
+
+    _show_summary(context, finished, name_to_tasks)
+
+
+def _show_summary(
+    context: Context,
+    finished: Sequence[_Worker],
+    name_to_tasks: Dict[str, List[ITask]],
+) -> None:
+    context._show_header([("Parallel run summary", context.KIND_REGULAR)])
+    for worker in finished:
+        task = name_to_tasks[worker.task_name][0]
+        status_kind = context.KIND_ERROR if task.failed else context.KIND_REGULAR
+        context.show(task.name, end="", kind=context.KIND_TASK_NAME)
+        context.show(" status: ", end="")
+        context.show(task.status.value, end="", kind=status_kind)
+        context.show(f" ({worker.elapsed_time:.2f}s)")
+        if task.message:
+            context.show(task.message, kind=status_kind)
+    context._show_header([])
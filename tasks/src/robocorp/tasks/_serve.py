@@ -0,0 +1,475 @@
+"""
+Implements `python -m robocorp.tasks serve`.
+
+The modules are preloaded and the tasks are collected once (with the
+auto-logging already in place) and then each run request is handled in a
+new process forked from the server, so, the run doesn't need to pay for
+starting the interpreter and importing the modules again (and as each run
+is a new process, its state -- i.e.: `session_cache`/`task_cache` -- isn't
+shared with other runs).
+
+Each connection to the (unix domain) socket handles a single request: a json
+object in a line, such as:
+
+    {"task_name": "my_task", "args": {"arg": 1}, "output_dir": "/path/output"}
+
+Besides `task_name` (a string or a list of strings), `args` (the arguments
+to the task, as in `--json-input`) and `output_dir`, the request may also
+have: `additional_arguments` (the arguments to the task in the command line
+format, i.e.: `["--arg=1"]`), `max_log_files`, `max_log_file_size`,
+`log_output_to_stdout`, `no_status_rc`, `console_colors`,
+`teardown_dump_threads_timeout` and `teardown_interrupt_timeout` (as in
+`python -m robocorp.tasks run`).
+
+The server answers with json objects in lines: first with the pid of the
+process running the request and the file where its stdout/stderr is written
+to and then with the returncode of the run when it finishes:
+
+    {"pid": 1234, "console": "/path/output/console.txt"}
+    {"returncode": 0}
+
+Or with `{"error": "<message>"}` if the request is not valid.
+
+The `{"command": "shutdown"}` request stops the server (after the current
+runs finish).
+"""
+
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ._customization._plugin_manager import PluginManager
+
+CONSOLE_FILENAME = "console.txt"
+
+_MAX_REQUEST_SIZE = 10 * 1024 * 1024
+
+# The accepted keys in a run request (besides `command` and `args`) and the
+# types accepted for those.
+_RUN_REQUEST_OPTIONS: Dict[str, tuple] = {
+    "task_name": (str, list),
+    "output_dir": (str,),
+    "additional_arguments": (list,),
+    "max_log_files": (int,),
+    "max_log_file_size": (str,),
+    "log_output_to_stdout": (str,),
+    "no_status_rc": (bool,),
+    "console_colors": (str,),
+    "teardown_dump_threads_timeout": (int, float),
+    "teardown_interrupt_timeout": (int, float),
+}
+
+
+# Modules which are imported lazily when running (the server imports those
+# so that the runs don't need to).
+_RUN_MODULES = (
+    "psutil",
+    "robocorp.log._log_index",
+    "robocorp.log._robo_logger",
+    "robocorp.log._robo_output_impl",
+    "robocorp.log.console",
+    "robocorp.log.pyproject_config",
+    "robocorp.log.redirect",
+    "robocorp.tasks._config",
+    "robocorp.tasks._interrupts",
+    "robocorp.tasks._log_auto_setup",
+    "robocorp.tasks._log_output_setup",
+)
+
+
+class _InvalidRequest(Exception):
+    pass
+
+
+def _send(conn, msg: dict) -> None:
+    try:
+        conn.sendall(json.dumps(msg).encode("utf-8") + b"\n")
+    except OSError:
+        # The client is no longer listening.
+        pass
+
+
+def _read_line(conn) -> bytes:
+    """
+    Reads a line from the socket (without the new line).
+    """
+    buf = b""
+    while b"\n" not in buf:
+        if len(buf) > _MAX_REQUEST_SIZE:
+            raise _InvalidRequest("The request is too big.")
+        received = conn.recv(64 * 1024)
+        if not received:
+            break
+        buf += received
+    return buf.split(b"\n", 1)[0]
+
+
+def _read_request(conn) -> Dict[str, Any]:
+    line = _read_line(conn)
+    try:
+        request = json.loads(line)
+    except Exception as e:
+        raise _InvalidRequest(f"Unable to load the request as json: {e}")
+    if not isinstance(request, dict):
+        raise _InvalidRequest(
+            f"Expected the request to be a json object. Found: {request!r}"
+        )
+    return request
+
+
+def _build_run_kwargs(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns:
+        The arguments to `run` for the given request.
+    """
+    run_kwargs: Dict[str, Any] = {"console_colors": "plain"}
+    for key, value in request.items():
+        if key in ("command", "args"):
+            continue
+        accepted_types = _RUN_REQUEST_OPTIONS.get(key)
+        if accepted_types is None:
+            raise _InvalidRequest(f"Unexpected key in the request: {key!r}")
+        if not isinstance(value, accepted_types) or (
+            isinstance(value, bool) and bool not in accepted_types
+        ):
+            raise _InvalidRequest(
+                f"Unexpected type for {key!r}: {type(value).__name__} ({value!r})"
+            )
+        if isinstance(value, list) and not all(isinstance(v, str) for v in value):
+            raise _InvalidRequest(f"Expected {key!r} to be a list of strings.")
+        run_kwargs[key] = value
+
+    args = request.get("args")
+    if args is not None and not isinstance(args, dict):
+        raise _InvalidRequest(
+            f"Expected 'args' to be a json object. Found: {type(args).__name__}"
+        )
+    if args is not None and "additional_arguments" in run_kwargs:
+        raise _InvalidRequest(
+            "Only one of 'args' or 'additional_arguments' may be given."
+        )
+
+    output_dir = run_kwargs.get("output_dir") or os.environ.get("ROBOT_ARTIFACTS")
+    run_kwargs["output_dir"] = str(Path(output_dir or "./output").absolute())
+    return run_kwargs
+
+
+def _run_in_child(
+    sockets: list,
+    auto_logging,
+    run_kwargs: Dict[str, Any],
+    args: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Runs the request in the forked process (this function never returns).
+
+    Args:
+        sockets: The sockets from the server (which are closed in the child).
+    """
+    import signal
+
+    retcode = 1
+    json_input: Optional[str] = None
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for sock in sockets:
+            sock.close()
+
+        # The `run` sets up the auto-logging again (the modules which were
+        # already imported use the same callbacks).
+        auto_logging.__exit__(None, None, None)
+
+        output_dir = Path(run_kwargs["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        fd = os.open(
+            str(output_dir / CONSOLE_FILENAME),
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+        os.dup2(fd, 1)
+        os.dup2(fd, 2)
+        os.close(fd)
+
+        if args is not None:
+            import tempfile
+
+            fd, json_input = tempfile.mkstemp(suffix=".json", prefix="run_args_")
+            with os.fdopen(fd, "w", encoding="utf-8") as stream:
+                json.dump(args, stream)
+            run_kwargs["json_input"] = json_input
+
+        from ._commands import run
+
+        try:
+            retcode = run(**run_kwargs)
+        except SystemExit as e:
+            if e.code is None:
+                retcode = 0
+            elif isinstance(e.code, int):
+                retcode = e.code
+            else:
+                retcode = 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        if json_input is not None:
+            try:
+                os.remove(json_input)
+            except OSError:
+                pass
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(retcode)
+
+
+def serve_run_requests(
+    pm: PluginManager,
+    path: Path,
+    socket_path: str,
+    glob: Optional[str] = None,
+    exclude: Optional[str] = None,
+    preload_module: Optional[List[str]] = None,
+) -> int:
+    """
+    Collects the tasks and serves the run requests received in the given
+    socket until a `shutdown` request is received (or the process is
+    interrupted/terminated).
+    """
+    import importlib
+    import signal
+    import socket
+
+    from robocorp import log
+
+    from ._collect_tasks import collect_tasks
+    from ._commands import _read_pyproject_config
+    from ._exceptions import RobocorpTasksCollectError
+    from ._task import Context
+
+    context = Context()
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        context.show_error(
+            "Error: `serve` is not available in this platform (it requires "
+            "`os.fork` and unix domain sockets)."
+        )
+        return 1
+
+    p = path.absolute()
+    if not p.exists():
+        context.show_error(f"Path: {path} does not exist")
+        return 1
+
+    config, _log_settings, _pyproject_toml_contents = _read_pyproject_config(context, p)
+
+    # The auto-logging must be in place before the modules are imported.
+    auto_logging = log.setup_auto_logging(config)
+    try:
+        try:
+            for module in preload_module or ():
+                context.show(f"\nPre-loading module: {module}")
+                importlib.import_module(module)
+
+            context.show(f"\nCollecting tasks from: {path}")
+            tasks = list(collect_tasks(pm, p, glob=glob, exclude=exclude))
+            if not tasks:
+                raise RobocorpTasksCollectError(f"Did not find any tasks in: {path}")
+
+            for module in _RUN_MODULES:
+                importlib.import_module(module)
+        except RobocorpTasksCollectError as e:
+            context.show_error(str(e))
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+        context.show(f"Tasks available: {', '.join(task.name for task in tasks)}")
+
+        if os.path.exists(socket_path):
+            # Left over from a previous server.
+            os.remove(socket_path)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(socket_path)
+            listener.listen()
+
+            def on_sigterm(*_args):
+                raise SystemExit(0)
+
+            signal.signal(signal.SIGTERM, on_sigterm)
+
+            context.show(f"Waiting for run requests at: {socket_path}")
+            _accept_requests(
+                context,
+                listener,
+                auto_logging,
+                dict(
+                    path=str(p),
+                    glob=glob,
+                    exclude=exclude,
+                    preload_module=preload_module,
+                    pm=pm,
+                ),
+            )
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.close()
+            try:
+                os.remove(socket_path)
+            except OSError:
+                pass
+    finally:
+        auto_logging.__exit__(None, None, None)
+    return 0
+
+
+def _accept_requests(
+    context, listener, auto_logging, collect_kwargs: Dict[str, Any]
+) -> None:
+    """
+    Args:
+        collect_kwargs: The arguments to `run` to collect the tasks as
+            they were collected in the server.
+    """
+    import select
+    import signal
+    import socket
+
+    # pid -> the connection of the client which requested it.
+    children: Dict[int, socket.socket] = {}
+
+    def reap_children(block: bool) -> None:
+        while children:
+            try:
+                pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = children.pop(pid, None)
+            if conn is not None:
+                _send(conn, {"returncode": os.waitstatus_to_exitcode(status)})
+                conn.close()
+
+    # A SIGCHLD writes to the wakeup socket so that the select returns when
+    # a run finishes.
+    wakeup_read, wakeup_write = socket.socketpair()
+    wakeup_read.setblocking(False)
+    wakeup_write.setblocking(False)
+    previous_wakeup_fd = signal.set_wakeup_fd(wakeup_write.fileno())
+    signal.signal(signal.SIGCHLD, lambda *_args: None)
+    try:
+        while True:
+            readable, _, _ = select.select([listener, wakeup_read], [], [], 1)
+            if wakeup_read in readable:
+                try:
+                    while wakeup_read.recv(1024):
+                        pass
+                except BlockingIOError:
+                    pass
+            reap_children(block=False)
+            if listener not in readable:
+                continue
+
+            conn, _ = listener.accept()
+            try:
+                conn.settimeout(10)
+                request = _read_request(conn)
+                if request.get("command", "run") == "shutdown":
+                    _send(conn, {"ok": True})
+                    conn.close()
+                    context.show("Shutdown requested.")
+                    return
+
+                if request.get("command", "run") != "run":
+                    raise _InvalidRequest(
+                        f"Unexpected command: {request.get('command')!r}"
+                    )
+                run_kwargs = _build_run_kwargs(request)
+                run_kwargs.update(collect_kwargs)
+            except (_InvalidRequest, OSError) as e:
+                _send(conn, {"error": str(e)})
+                conn.close()
+                continue
+
+            conn.settimeout(None)
+            pid = os.fork()
+            if pid == 0:
+                _run_in_child(
+                    [listener, conn, wakeup_read, wakeup_write],
+                    auto_logging,
+                    run_kwargs,
+                    request.get("args"),
+                )
+
+            children[pid] = conn
+            _send(
+                conn,
+                {
+                    "pid": pid,
+                    "console": os.path.join(run_kwargs["output_dir"], CONSOLE_FILENAME),
+                },
+            )
+    finally:
+        reap_children(block=True)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.set_wakeup_fd(previous_wakeup_fd)
+        wakeup_read.close()
+        wakeup_write.close()
+
+
+def send_run_request(
+    socket_path: str,
+    request: Dict[str, Any],
+    on_started: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Sends a request to a server started with `python -m robocorp.tasks serve`
+    and waits for it to finish.
+
+    Args:
+        socket_path: The socket where the server is listening.
+        request: The request (see the module docs for the accepted keys).
+        on_started: Called with the first answer from the server (with the
+            `pid` of the process running the request).
+
+    Returns:
+        The last answer of the server (i.e.: with the `returncode` or an
+        `error`).
+    """
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        buf = b""
+        answer: Dict[str, Any] = {}
+        while True:
+            received = conn.recv(64 * 1024)
+            if not received:
+                break
+            buf += received
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                answer = json.loads(line)
+                if "pid" in answer:
+                    if on_started is not None:
+                        on_started(answer)
+                else:
+                    return answer
+    if not answer:
+        return {"error": "The server closed the connection without an answer."}
+    return answer
@@ -0,0 +1,437 @@
+"""
+Profiles the startup of `python -m robocorp.tasks run` (enabled with
+`--profile-startup`).
+
+The time of each phase until the tasks are collected is recorded along with
+the time to import each module (imported in the main thread while the
+profile is active), including the overhead added by the auto-logging import
+hook (to decide whether the module should be rewritten and to rewrite it
+or load it from its cache).
+
+Note that the per-module times are measured with a finder which is put
+first in `sys.meta_path` (it delegates to the other finders and times the
+`exec_module` of the loader found), so, the times reported include a
+(small) overhead from the profiling itself.
+"""
+
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from ._task import Context
+
+T = TypeVar("T")
+
+# The name of the file written (in the output directory) with the profile.
+STARTUP_PROFILE_FILE_NAME = "startup_profile.json"
+
+# The number of modules shown in the console (all the modules are written
+# in the json file).
+_MAX_MODULES_SHOWN = 20
+
+
+def _get_time_since_process_start() -> Optional[float]:
+    if sys.platform.startswith("linux"):
+        # Note: psutil computes the creation time of the process based on the
+        # boot time (which may be off, i.e.: in containers), so, compare the
+        # start of the process with the uptime (both relative to the boot).
+        try:
+            with open("/proc/self/stat", "rb") as stream:
+                stat = stream.read()
+            with open("/proc/uptime", "rb") as stream:
+                uptime = float(stream.read().split()[0])
+            # The fields after the process name (which may have spaces), where
+            # the 20th is the start time (in clock ticks).
+            start_ticks = int(stat[stat.rindex(b")") + 2 :].split()[19])
+            return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+        except Exception:
+            return None
+
+    try:
+        import psutil
+
+        return max(0.0, time.time() - psutil.Process().create_time())
+    except Exception:
+        return None
+
+
+class _ModuleImportTime:
+    __slots__ = ["name", "time", "self_time", "hook_time", "rewritten"]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # Time to find and execute the module (including its imports).
+        self.time = 0.0
+        # Time without the time to import other modules.
+        self.self_time = 0.0
+        # Time added by the auto-logging import hook (without the time
+        # added to other modules).
+        self.hook_time = 0.0
+        self.rewritten = False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "time": self.time,
+            "self_time": self.self_time,
+            "hook_time": self.hook_time,
+            "rewritten": self.rewritten,
+        }
+
+
+class _ImportTimesFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profile: "StartupProfile") -> None:
+        self._profile = profile
+
+    def find_spec(
+        self,
+        name: str,
+        path: Optional[Sequence[Union[str, bytes]]] = None,
+        target: Optional[types.ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        return self._profile._find_spec(self, name, path, target)
+
+
+class StartupProfile:
+    """
+    Records the time of each startup phase and of each module imported.
+    """
+
+    def __init__(self) -> None:
+        self._initial_time = time.perf_counter()
+        # The time from the process creation until the profile was started
+        # (interpreter startup, importing `robocorp.tasks` and parsing the
+        # arguments).
+        self._process_startup_time = _get_time_since_process_start()
+        self._end_time: Optional[float] = None
+        self._thread_id = threading.get_ident()
+        self._finder: Optional[_ImportTimesFinder] = None
+
+        self.phases: List[Dict[str, Any]] = []
+        self.modules: Dict[str, _ModuleImportTime] = {}
+
+        # The time (and hook time) of the modules imported inside each of the
+        # modules being currently imported.
+        self._stack: List[List[float]] = []
+
+        # The auto-logging import hook (and its stats) once it's setup.
+        self._hook: Any = None
+        self._hook_stats: Any = None
+
+        # Computed when the profile is stopped (so, the modules imported
+        # afterwards aren't accounted for).
+        self._import_hook: Optional[Dict[str, Any]] = None
+        self._import_hook_description = ""
+
+        # The loaders which had their `exec_module` wrapped.
+        self._wrapped_loaders: List[Any] = []
+
+    def start(self) -> None:
+        """
+        Starts tracking the time to import each module.
+        """
+        if self._finder is None:
+            self._finder = _ImportTimesFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def stop(self) -> None:
+        """
+        Stops the profile (can be called multiple times).
+        """
+        if self._end_time is not None:
+            return
+        self._end_time = time.perf_counter()
+        finder = self._finder
+        self._finder = None
+
+        hook_stats = self._hook_stats
+        if hook_stats is not None:
+            self._import_hook = {
+                name: getattr(hook_stats, name) for name in hook_stats.__slots__
+            }
+            self._import_hook["total_time"] = hook_stats.total_time
+            self._import_hook_description = str(hook_stats)
+
+        if finder is not None:
+            try:
+                sys.meta_path.remove(finder)
+            except ValueError:
+                pass
+        for loader in self._wrapped_loaders:
+            try:
+                del loader.exec_module
+            except AttributeError:
+                pass
+        del self._wrapped_loaders[:]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Records the time it takes to run the code inside the context manager
+        as a phase with the given name.
+        """
+        initial_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_phase(name, initial_time)
+
+    @contextmanager
+    def enter_phase(
+        self,
+        name: str,
+        create_context_manager: Callable[..., ContextManager[T]],
+        *args,
+        **kwargs,
+    ) -> Iterator[T]:
+        """
+        Records the time it takes to create and enter a context manager as a
+        phase with the given name.
+        """
+        initial_time = time.perf_counter()
+        with create_context_manager(*args, **kwargs) as value:
+            self._add_phase(name, initial_time)
+            yield value
+
+    def _add_phase(self, name: str, initial_time: float) -> None:
+        self.phases.append(
+            {
+                "name": name,
+                "start": initial_time - self._initial_time,
+                "time": time.perf_counter() - initial_time,
+            }
+        )
+
+        finder = self._finder
+        if finder is not None:
+            # The auto-logging import hook puts itself first in the
+            # `sys.meta_path` when it's setup, so, make sure that the modules
+            # it finds are still tracked.
+            if sys.meta_path[0] is not finder:
+                try:
+                    sys.meta_path.remove(finder)
+                except ValueError:
+                    pass
+                sys.meta_path.insert(0, finder)
+
+            if self._hook is None and "robocorp.log" in sys.modules:
+                from robocorp.log._rewrite_importhook import RewriteHook
+
+                for curr in sys.meta_path:
+                    if isinstance(curr, RewriteHook):
+                        self._hook = curr
+                        self._hook_stats = curr.stats
+                        break
+
+    def _find_spec(
+        self,
+        finder: _ImportTimesFinder,
+        name: str,
+        path: Optional[Sequence[Union[str, bytes]]],
+        target: Optional[types.ModuleType],
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        try:
+            finders = sys.meta_path[sys.meta_path.index(finder) + 1 :]
+        except ValueError:
+            return None
+
+        track = self._finder is finder and threading.get_ident() == self._thread_id
+        hook_stats = self._hook_stats
+        hook_time = hook_stats.find_spec_time if hook_stats is not None else 0.0
+        initial_time = time.perf_counter()
+        spec = None
+        for curr in finders:
+            find_spec = getattr(curr, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                break
+
+        if not track:
+            return spec
+
+        elapsed = time.perf_counter() - initial_time
+        hook_elapsed = 0.0
+        if hook_stats is not None:
+            hook_elapsed = hook_stats.find_spec_time - hook_time
+        if self._stack:
+            parent = self._stack[-1]
+            parent[0] += elapsed
+            parent[1] += hook_elapsed
+
+        if spec is None or name in self.modules:
+            return spec
+
+        module_import_time = _ModuleImportTime(name)
+        module_import_time.time = elapsed
+        module_import_time.self_time = elapsed
+        module_import_time.hook_time = hook_elapsed
+        self.modules[name] = module_import_time
+
+        loader = spec.loader
+        if loader is not None and not isinstance(loader, type):
+            # Builtin/frozen modules are loaded by the class itself (those are
+            # not wrapped, only the time to find those is recorded).
+            module_import_time.rewritten = loader is self._hook
+            if "exec_module" not in getattr(loader, "__dict__", {}):
+                try:
+                    loader.exec_module = self._create_exec_module(loader.exec_module)
+                except (AttributeError, TypeError):
+                    pass
+                else:
+                    self._wrapped_loaders.append(loader)
+        return spec
+
+    def _create_exec_module(
+        self, exec_module: Callable[[types.ModuleType], None]
+    ) -> Callable[[types.ModuleType], None]:
+        def timed_exec_module(module: types.ModuleType) -> None:
+            module_import_time = self.modules.get(module.__name__)
+            if (
+                module_import_time is None
+                or self._finder is None
+                or threading.get_ident() != self._thread_id
+            ):
+                exec_module(module)
+                return
+
+            hook_stats = self._hook_stats
+            hook_time = hook_stats.load_time if hook_stats is not None else 0.0
+            # The time (and hook time) of the modules imported by this one.
+            children = [0.0, 0.0]
+            self._stack.append(children)
+            initial_time = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - initial_time
+                self._stack.pop()
+                hook_elapsed = 0.0
+                if hook_stats is not None:
+                    hook_elapsed = hook_stats.load_time - hook_time
+
+                module_import_time.time += elapsed
+                module_import_time.self_time += elapsed - children[0]
+                # Note: max() as the float arithmetic may end up slightly
+                # below 0 when there's no overhead.
+                module_import_time.hook_time += max(0.0, hook_elapsed - children[1])
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent[0] += elapsed
+                    parent[1] += hook_elapsed
+
+        return timed_exec_module
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            The profile as a dict (which can be saved as json). Note: the
+            profile is stopped if it's still running.
+        """
+        self.stop()
+        assert self._end_time is not None
+
+        return {
+            "process_startup_time": self._process_startup_time,
+            # The time from the start until the end of the profile (which
+            # includes the time outside of the phases).
+            "total_time": self._end_time - self._initial_time,
+            "phases": self.phases,
+            "import_hook": self._import_hook,
+            "modules": [m.to_dict() for m in self.modules.values()],
+        }
+
+    def write(self, output_dir: Path) -> Path:
+        """
+        Writes the profile as json in the given directory.
+
+        Returns:
+            The path of the file written.
+        """
+        target = output_dir / STARTUP_PROFILE_FILE_NAME
+        with target.open("w", encoding="utf-8") as stream:
+            json.dump(self.to_dict(), stream, indent=2)
+        return target
+
+    def show(self, context: Context, written_to: Optional[Path] = None) -> None:
+        """
+        Shows the time of the phases and of the slowest modules to import.
+        """
+        profile = self.to_dict()
+
+        context.show("")
+        context._show_header([("Startup profile", context.KIND_REGULAR)])
+        if profile["process_startup_time"] is not None:
+            context.show(
+                f"{'Process startup (until `run`)':<56} "
+                f"{profile['process_startup_time']:>8.3f}s"
+            )
+        phases_time = 0.0
+        for phase in profile["phases"]:
+            phases_time += phase["time"]
+            context.show(f"{phase['name']:<56} {phase['time']:>8.3f}s")
+        other_time = max(0.0, profile["total_time"] - phases_time)
+        context.show(f"{'Other':<56} {other_time:>8.3f}s")
+        context.show(f"{'Total':<56} {profile['total_time']:>8.3f}s")
+
+        if self._import_hook_description:
+            context.show(f"\n{self._import_hook_description}")
+
+        modules = sorted(self.modules.values(), key=lambda m: m.self_time, reverse=True)
+        context.show(
+            f"\n{len(modules)} modules imported. Slowest modules (in seconds):"
+        )
+        context.show(f"{'Module':<50} {'Self':>8} {'Total':>8} {'Hook':>8}")
+        for m in modules[:_MAX_MODULES_SHOWN]:
+            name = m.name if not m.rewritten else f"{m.name} (rewritten)"
+            context.show(
+                f"{name:<50} {m.self_time:>8.3f} {m.time:>8.3f} {m.hook_time:>8.3f}"
+            )
+        if written_to is not None:
+            context.show(f"\nStartup profile written to: {written_to}")
+        context._show_header([])
+
+
+def profile_phase(profile: Optional[StartupProfile], name: str) -> ContextManager:
+    """
+    Helper to record a phase (does nothing if the profile is None).
+    """
+    if profile is None:
+        return nullcontext()
+    return profile.phase(name)
+
+
+def profile_enter_phase(
+    profile: Optional[StartupProfile],
+    name: str,
+    create_context_manager: Callable[..., ContextManager[T]],
+    *args,
+    **kwargs,
+) -> ContextManager[T]:
+    """
+    Helper to record the time to create and enter a context manager as a
+    phase (just creates the context manager if the profile is None).
+    """
+    if profile is None:
+        return create_context_manager(*args, **kwargs)
+    return profile.enter_phase(name, create_context_manager, *args, **kwargs)
@@ -0,0 +1,405 @@
+"""
+Collects the information on the tasks (as provided by
+`python -m robocorp.tasks list --static`) from the AST of the files, without
+importing those.
+
+Only the files where all the tasks can be fully described from the AST are
+handled statically (i.e.: the tasks are module-level functions decorated just
+with `@task` where the parameters and return are untyped or typed with `str`,
+`int`, `float` or `bool` and the defaults and task options are literals),
+other files (i.e.: which use pydantic models in the signature) are imported
+to collect the tasks (as is done without `--static`).
+
+The result for each file is cached (keyed by the hash of the file contents).
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from ._customization._plugin_manager import PluginManager
+from ._protocols import TasksListTaskTypedDict
+
+CACHE_DIR_ENV_VAR = "ROBOCORP_TASKS_LIST_CACHE_DIR"
+
+# Bump when the contents cached change.
+_CACHE_VERSION = "1"
+
+_SIMPLE_TYPES = ("str", "int", "float", "bool")
+
+
+class _NeedsImport(Exception):
+    """
+    Raised when the tasks in a file can't be described just from the AST.
+    """
+
+
+def get_cache_dir() -> Path:
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir:
+        return Path(cache_dir)
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return Path(base) / "robocorp" / "tasks-list"
+    return Path(os.path.expanduser("~")) / ".cache" / "robocorp" / "tasks-list"
+
+
+def _get_cache_key(contents: bytes) -> str:
+    from robocorp.tasks import __version__
+
+    h = hashlib.sha256(contents)
+    # The docstrings provided may change based on the python version.
+    h.update(f"|{_CACHE_VERSION}|{__version__}|{sys.version_info[:2]}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_cache(cache_key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(get_cache_dir() / f"{cache_key}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_cache(cache_key: str, contents: Dict[str, Any]) -> None:
+    cache_dir = get_cache_dir()
+    target = cache_dir / f"{cache_key}.json"
+    tmp = cache_dir / f"{cache_key}.{os.getpid()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(contents), encoding="utf-8")
+        os.replace(tmp, target)
+    except Exception:
+        # The cache is just an optimization.
+        try:
+            tmp.unlink()
+        except Exception:
+            pass
+
+
+def _clean_doc(doc: str) -> str:
+    """
+    Python 3.13 onwards strips the common leading whitespace of docstrings
+    when compiling (this mimics it so that the `__doc__` is the same).
+    """
+    lines = doc.expandtabs().split("\n")
+    margin = min(
+        (len(line) - len(line.lstrip(" ")) for line in lines[1:] if line.strip(" ")),
+        default=0,
+    )
+    return "\n".join([lines[0].lstrip(" ")] + [line[margin:] for line in lines[1:]])
+
+
+def _get_doc(node: ast.FunctionDef) -> str:
+    doc = ast.get_docstring(node, clean=False)
+    if not doc:
+        return ""
+    if sys.version_info >= (3, 13):
+        doc = _clean_doc(doc)
+    return doc
+
+
+def _literal(node: ast.expr) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except Exception:
+        raise _NeedsImport()
+
+
+def _simple_type(annotation: Optional[ast.expr]) -> Optional[str]:
+    if annotation is None:
+        return None
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        # i.e.: `from __future__ import annotations` or `arg: "int"`.
+        name = annotation.value
+    elif isinstance(annotation, ast.Name):
+        name = annotation.id
+    else:
+        raise _NeedsImport()
+    if name not in _SIMPLE_TYPES:
+        raise _NeedsImport()
+    return name
+
+
+def _build_properties(
+    param_name: Optional[str], type_name: Optional[str], description: str
+) -> Dict[str, Any]:
+    from ._task import _map_python_type_to_user_type
+
+    if type_name is None:
+        param_type_clsname = "string"
+    else:
+        param_type_clsname = _map_python_type_to_user_type[
+            {"str": str, "int": int, "float": float, "bool": bool}[type_name]
+        ]
+    properties = {
+        "type": param_type_clsname,
+        "description": description,
+    }
+    if param_name:
+        properties["title"] = param_name.replace("_", " ").title()
+    return properties
+
+
+def _task_entry(node: ast.FunctionDef, options: Optional[Dict]) -> Dict[str, Any]:
+    """
+    Provides the same info from `list_tasks` (but the `file`) for the given
+    function (the same as what's computed from the function in `Task`).
+    """
+    args = node.args
+    if args.posonlyargs or args.vararg or args.kwarg:
+        raise _NeedsImport()
+
+    doc = _get_doc(node)
+    param_name_to_description: Dict[str, str] = {}
+    returns_description = ""
+    if doc:
+        import docstring_parser
+
+        contents = docstring_parser.parse(doc)
+        for docparam in contents.params:
+            if docparam.description:
+                param_name_to_description[docparam.arg_name] = docparam.description
+        returns = contents.returns
+        if returns and returns.description:
+            returns_description = returns.description
+
+    # Note: the defaults are for the last positional args.
+    defaults: List[Optional[ast.expr]] = [None] * (
+        len(args.args) - len(args.defaults)
+    ) + list(args.defaults)
+    params: List[Tuple[ast.arg, Optional[ast.expr]]] = list(zip(args.args, defaults))
+    params.extend(zip(args.kwonlyargs, args.kw_defaults))
+
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    input_schema: Dict[str, Any] = {
+        "properties": properties,
+        "type": "object",
+    }
+    for arg, default in params:
+        param_properties = _build_properties(
+            arg.arg,
+            _simple_type(arg.annotation),
+            param_name_to_description.get(arg.arg, ""),
+        )
+        properties[arg.arg] = param_properties
+        if default is None:
+            required.append(arg.arg)
+        else:
+            param_properties["default"] = _literal(default)
+    if required:
+        input_schema["required"] = required
+
+    if node.decorator_list:
+        # The first line of the code is the line of the first decorator.
+        line = node.decorator_list[0].lineno
+    else:
+        line = node.lineno
+
+    return {
+        "name": node.name,
+        "line": line,
+        "docs": doc,
+        "input_schema": input_schema,
+        "output_schema": _build_properties(
+            None, _simple_type(node.returns), returns_description
+        ),
+        "managed_params_schema": {},
+        "options": options or None,
+    }
+
+
+def _get_task_options(decorator: ast.expr, is_task_ref) -> Optional[Dict]:
+    """
+    Returns:
+        The options of the task if the decorator is `@task` (or `@task(...)`)
+        or None if it's not a task decorator.
+    """
+    if is_task_ref(decorator):
+        return {}
+    if isinstance(decorator, ast.Call) and is_task_ref(decorator.func):
+        if decorator.args:
+            raise _NeedsImport()
+        options: Dict[str, Any] = {}
+        for keyword in decorator.keywords:
+            if keyword.arg is None:
+                # i.e.: @task(**options)
+                raise _NeedsImport()
+            options[keyword.arg] = _literal(keyword.value)
+        return options
+    return None
+
+
+def collect_task_entries_from_source(source: bytes, filename: str) -> List[Dict]:
+    """
+    Provides the info on the tasks defined in the given source (without
+    the `file`).
+
+    Raises:
+        _NeedsImport: if the tasks can't be collected without importing it.
+    """
+    try:
+        tree = ast.parse(source, filename)
+    except SyntaxError:
+        raise _NeedsImport()
+
+    # Names which reference `robocorp.tasks.task` and `robocorp.tasks`.
+    task_names: Set[str] = set()
+    tasks_module_names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*":
+                    # Names could come from anywhere.
+                    raise _NeedsImport()
+                if node.module == "robocorp.tasks" and alias.name == "task":
+                    task_names.add(alias.asname or alias.name)
+                elif node.module == "robocorp" and alias.name == "tasks":
+                    tasks_module_names.add(alias.asname or alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == "robocorp.tasks":
+                    if alias.asname:
+                        tasks_module_names.add(alias.asname)
+                    else:
+                        tasks_module_names.add("robocorp.tasks")
+
+    if not task_names and not tasks_module_names:
+        return []
+
+    def is_task_ref(node: ast.expr) -> bool:
+        if isinstance(node, ast.Name):
+            return node.id in task_names
+        if isinstance(node, ast.Attribute) and node.attr == "task":
+            return ast.unparse(node.value) in tasks_module_names
+        return False
+
+    entries: List[Dict] = []
+    module_level = set(id(node) for node in tree.body)
+    decorators: Set[int] = set()
+    names_found: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            options_found = [
+                _get_task_options(decorator, is_task_ref)
+                for decorator in node.decorator_list
+            ]
+            if not any(options is not None for options in options_found):
+                continue
+            if (
+                len(options_found) != 1
+                or id(node) not in module_level
+                or isinstance(node, ast.AsyncFunctionDef)
+                or node.name in names_found
+            ):
+                # Other decorators may change the function registered (and
+                # the errors are reported when importing).
+                raise _NeedsImport()
+            names_found.add(node.name)
+            decorator = node.decorator_list[0]
+            decorators.add(id(decorator))
+            if isinstance(decorator, ast.Call):
+                decorators.add(id(decorator.func))
+            entries.append(_task_entry(node, options_found[0]))
+
+    # Any other use of `task` (i.e.: `my_task = task(func)`) requires the import.
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Name, ast.Attribute)) and is_task_ref(node):
+            if id(node) not in decorators:
+                raise _NeedsImport()
+
+    return entries
+
+
+def collect_task_entries(
+    pm: PluginManager,
+    path: Path,
+    glob: Optional[str] = None,
+    exclude: Optional[str] = None,
+) -> Iterator[TasksListTaskTypedDict]:
+    """
+    Provides the same information as `collect_tasks` (as used in `list_tasks`)
+    but without importing the files (if possible).
+    """
+    from ._collect_tasks import _get_root, import_tasks, iter_task_files
+    from ._exceptions import RobocorpTasksCollectError
+
+    path = path.absolute()
+    if path.is_dir():
+        root = _get_root(path, is_dir=True)
+        paths_with_tasks = list(iter_task_files(path, glob, exclude))
+    elif path.is_file():
+        root = _get_root(path, is_dir=False)
+        paths_with_tasks = [path]
+    elif not path.exists():
+        raise RobocorpTasksCollectError(f"Path: {path} does not exist")
+    else:
+        raise RobocorpTasksCollectError(
+            f"Expected {path} to map to a directory or file."
+        )
+
+    file_to_entries: Dict[str, List[Dict]] = {}
+    paths_to_import: List[Path] = []
+    for path_with_task in paths_with_tasks:
+        filename = str(path_with_task.absolute())
+        try:
+            contents = path_with_task.read_bytes()
+        except OSError:
+            paths_to_import.append(path_with_task)
+            continue
+
+        cache_key = _get_cache_key(contents)
+        cached = _read_cache(cache_key)
+        if cached is None:
+            try:
+                cached = {"tasks": collect_task_entries_from_source(contents, filename)}
+            except _NeedsImport:
+                cached = {"needs_import": True}
+            _write_cache(cache_key, cached)
+
+        if cached.get("needs_import"):
+            paths_to_import.append(path_with_task)
+        else:
+            file_to_entries[filename] = cached["tasks"]
+
+    if paths_to_import:
+        from robocorp.tasks import _hooks
+
+        _hooks.before_collect_tasks(path, set())
+        filenames_to_import = set(str(p.absolute()) for p in paths_to_import)
+        for task in import_tasks(pm, root, paths_to_import):
+            if task.filename not in filenames_to_import:
+                continue
+            file_to_entries.setdefault(task.filename, []).append(
+                {
+                    "name": task.name,
+                    "line": task.lineno,
+                    "docs": getattr(task.method, "__doc__") or "",
+                    "input_schema": task.input_schema,
+                    "output_schema": task.output_schema,
+                    "managed_params_schema": task.managed_params_schema,
+                    "options": task.options,
+                }
+            )
+
+    # Provide the tasks in the same order of the files.
+    for path_with_task in paths_with_tasks:
+        filename = str(path_with_task.absolute())
+        for entry in file_to_entries.pop(filename, ()):
+            task_entry: TasksListTaskTypedDict = {
+                "name": entry["name"],
+                "line": entry["line"],
+                "file": filename,
+                "docs": entry["docs"],
+                "input_schema": entry["input_schema"],
+                "output_schema": entry["output_schema"],
+                "managed_params_schema": entry["managed_params_schema"],
+                "options": entry["options"],
+            }
+            yield task_entry
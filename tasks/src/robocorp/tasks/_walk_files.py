@@ -0,0 +1,329 @@
+"""
+Walks a directory (in a single pass) to find the files from where tasks
+should be collected, skipping the directories which are excluded or ignored
+in a `.gitignore`.
+"""
+
+import os
+import re
+import sys
+import time
+from fnmatch import translate
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+
+class CollectTasksStats:
+    """
+    Information on the time it took to find the files with tasks and to
+    import those.
+    """
+
+    __slots__ = [
+        "dirs_walked",
+        "dirs_skipped",
+        "files_matched",
+        "walk_time",
+        "import_time",
+    ]
+
+    def __init__(self) -> None:
+        self.dirs_walked = 0
+        self.dirs_skipped = 0
+        self.files_matched = 0
+        self.walk_time = 0.0
+        self.import_time = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Collected tasks in {self.walk_time + self.import_time:.3f}s "
+            f"(finding files: {self.walk_time:.3f}s, {self.dirs_walked} "
+            f"directories walked, {self.dirs_skipped} skipped, "
+            f"{self.files_matched} files matched; importing: "
+            f"{self.import_time:.3f}s)."
+        )
+
+
+# A rule is (regex, negate, dir_only).
+_GitIgnoreRule = Tuple[Pattern[str], bool, bool]
+
+
+def _translate_path_pattern(pattern: str, anchored: bool) -> str:
+    """
+    Translates a pattern (as used in a `.gitignore`, where `**` matches any
+    number of directories) to a regexp to match a relative path (with `/` as
+    the separator).
+
+    Args:
+        anchored: If False the pattern may match at any level (i.e.: it
+            matches the end of the path).
+    """
+    pattern = pattern.lstrip("/")
+
+    i = 0
+    n = len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            res.append("(?:.*/)?")
+            i += 3
+            continue
+        if (
+            pattern.startswith("**", i)
+            and i + 2 == n
+            and (i == 0 or pattern[i - 1] == "/")
+        ):
+            res.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            res.append("[^/]*")
+        elif c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+            if j == -1:
+                res.append(re.escape(c))
+            else:
+                contents = pattern[i + 1 : j].replace("\\", "\\\\")
+                if contents.startswith("!"):
+                    contents = "^" + contents[1:]
+                res.append(f"[{contents}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        else:
+            res.append(re.escape(c))
+        i += 1
+
+    if not anchored:
+        return "(?:.*/)?" + "".join(res) + r"\Z"
+    return "".join(res) + r"\Z"
+
+
+def parse_gitignore(contents: str) -> List[_GitIgnoreRule]:
+    rules: List[_GitIgnoreRule] = []
+    for line in contents.splitlines():
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            # i.e.: `\#file` or `\!file`
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        try:
+            rules.append(
+                (
+                    # A pattern without a `/` matches at any level.
+                    re.compile(_translate_path_pattern(line, "/" in line)),
+                    negate,
+                    dir_only,
+                )
+            )
+        except re.error:
+            continue
+    return rules
+
+
+class _IgnoreRules:
+    """
+    The rules from the `.gitignore` files found in a directory and its
+    parents (the rules from a `.gitignore` in a deeper directory take
+    precedence).
+    """
+
+    def __init__(
+        self,
+        parent: Optional["_IgnoreRules"],
+        base: str,
+        rules: List[_GitIgnoreRule],
+    ) -> None:
+        self.parent = parent
+        self.base = base
+        self.rules = rules
+        # Most paths don't match any rule: check all at once before
+        # checking which one matches.
+        self._match_any = re.compile(
+            "|".join(f"(?:{regexp.pattern})" for regexp, _, _ in rules)
+        ).match
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        """
+        Args:
+            relative_path: The path relative to the root of the walk.
+        """
+        ignore_rules: Optional[_IgnoreRules] = self
+        while ignore_rules is not None:
+            path = relative_path[len(ignore_rules.base) :].lstrip("/")
+            if ignore_rules._match_any(path):
+                for regexp, negate, dir_only in reversed(ignore_rules.rules):
+                    if dir_only and not is_dir:
+                        continue
+                    if regexp.match(path):
+                        return not negate
+            ignore_rules = ignore_rules.parent
+        return False
+
+
+def _read_gitignore(directory: str) -> List[_GitIgnoreRule]:
+    try:
+        with open(os.path.join(directory, ".gitignore"), "r", encoding="utf-8") as f:
+            return parse_gitignore(f.read())
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def _compile_fnmatch(patterns: Iterable[str]) -> Optional[Callable]:
+    """
+    Returns:
+        The `match` of a regexp which matches any of the given fnmatch-style
+        patterns (or None if no pattern was given).
+    """
+    regexps = [f"(?:{translate(os.path.normcase(p))})" for p in patterns]
+    if not regexps:
+        return None
+    return re.compile("|".join(regexps)).match
+
+
+def _create_glob_matcher(globs: Sequence[str]) -> Callable[[str, str], bool]:
+    """
+    Returns:
+        A function which receives the name and the relative path of a file
+        and returns whether it matches one of the globs (with the same
+        semantics from `Path.rglob`, where the glob is matched against the end
+        of the path).
+    """
+    path_globs = [g for g in globs if "/" in g or "\\" in g or "**" in g]
+    name_match = _compile_fnmatch(g for g in globs if g not in path_globs)
+    path_match = None
+    if path_globs:
+        # Note: `Path.rglob` is case-insensitive on Windows.
+        path_match = re.compile(
+            "|".join(
+                f"(?:{_translate_path_pattern(g.replace(os.sep, '/'), False)})"
+                for g in path_globs
+            ),
+            re.IGNORECASE if sys.platform == "win32" else 0,
+        ).match
+
+    def matches(name: str, relative_path: str) -> bool:
+        if name_match is not None and name_match(os.path.normcase(name)):
+            return True
+        if path_match is not None and path_match(relative_path):
+            return True
+        return False
+
+    return matches
+
+
+def iter_matching_files(
+    root: str,
+    globs: Sequence[str],
+    exclude: Sequence[str] = (),
+    use_gitignore: bool = True,
+    stats: Optional[CollectTasksStats] = None,
+) -> Iterator[str]:
+    """
+    Walks the given directory (depth-first, in the same order as
+    `Path.rglob`) and provides the files matching any of the given globs.
+
+    Directories (or files) whose name (or path relative to the root) matches
+    one of the `exclude` patterns or which are ignored in a `.gitignore` are
+    skipped (and excluded directories are not entered). Symlinks to
+    directories are not followed.
+
+    Returns:
+        An iterator with the paths of the matching files.
+    """
+    matches = _create_glob_matcher(globs)
+    exclude_name = _compile_fnmatch(p for p in exclude if "/" not in p)
+    exclude_path = _compile_fnmatch(p for p in exclude if "/" in p)
+
+    initial_time = time.perf_counter()
+
+    # Stack with the directory, relative path and ignore rules of the parent.
+    stack: List[Tuple[str, str, Optional[_IgnoreRules]]] = [(root, "", None)]
+    try:
+        while stack:
+            directory, relative_dir, ignore_rules = stack.pop()
+            if stats is not None:
+                stats.dirs_walked += 1
+
+            try:
+                with os.scandir(directory) as scandir_iter:
+                    entries = list(scandir_iter)
+            except OSError:
+                continue
+
+            if use_gitignore:
+                for entry in entries:
+                    if entry.name == ".gitignore":
+                        rules = _read_gitignore(directory)
+                        if rules:
+                            ignore_rules = _IgnoreRules(
+                                ignore_rules, relative_dir, rules
+                            )
+                        break
+
+            files_found: List[str] = []
+            subdirs: List[Tuple[str, str, Optional[_IgnoreRules]]] = []
+            for entry in entries:
+                name = entry.name
+                relative_path = f"{relative_dir}/{name}" if relative_dir else name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if (
+                    (exclude_name is not None and exclude_name(os.path.normcase(name)))
+                    or (
+                        exclude_path is not None
+                        and exclude_path(os.path.normcase(relative_path))
+                    )
+                    or (
+                        ignore_rules is not None
+                        and ignore_rules.is_ignored(relative_path, is_dir)
+                    )
+                ):
+                    if is_dir and stats is not None:
+                        stats.dirs_skipped += 1
+                    continue
+
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append((entry.path, relative_path, ignore_rules))
+
+                elif matches(name, relative_path):
+                    files_found.append(entry.path)
+
+            # Reversed so that the first directory is the first to be popped.
+            stack.extend(reversed(subdirs))
+            if files_found:
+                if stats is not None:
+                    stats.files_matched += len(files_found)
+                    stats.walk_time += time.perf_counter() - initial_time
+                yield from files_found
+                initial_time = time.perf_counter()
+    finally:
+        if stats is not None:
+            stats.walk_time += time.perf_counter() - initial_time
@@ -147,3 +147,125 @@ def test_collect_duplicated_tasks(datadir, tmpdir) -> None:
     assert "a task with the name 'main' was already found" in str(
         result.stdout.decode("utf-8")
     )
+
+
+def test_list_tasks_static(datadir, tmpdir) -> None:
+    cache_dir = tmpdir.join("cache")
+    env = {"ROBOCORP_TASKS_LIST_CACHE_DIR": str(cache_dir)}
+    (datadir / "pydantic_tasks.py").write_text(
+        """
+from pydantic import BaseModel
+
+from robocorp.tasks import task
+
+
+class Model(BaseModel):
+    value: int
+
+
+@task
+def task_with_model(model: Model) -> str:
+    return str(model.value)
+"""
+    )
+    (datadir / "tasks_with_options.py").write_text(
+        '''
+from robocorp import tasks
+
+
+@tasks.task(max_retries=2)
+def task_with_options(
+    name: str, count: int = 1, *, ratio: float = 0.5, verbose: bool = False
+) -> int:
+    """
+    Some task.
+
+    Args:
+        name: The name to use.
+        count: How many times.
+
+    Returns:
+        The result.
+    """
+    return count
+'''
+    )
+
+    expected = robocorp_tasks_run(
+        ["list", str(datadir)], returncode=0, cwd=str(tmpdir)
+    ).stdout.decode("utf-8")
+    assert len(json.loads(expected)) == 6
+
+    result = robocorp_tasks_run(
+        ["list", "--static", str(datadir)],
+        returncode=0,
+        cwd=str(tmpdir),
+        additional_env=env,
+    )
+    assert result.stdout.decode("utf-8") == expected
+    # Only the file with pydantic models is imported.
+    assert "some message while collecting." not in result.stderr.decode("utf-8")
+    assert len(cache_dir.listdir()) == 4
+
+    # Now from the cache.
+    result = robocorp_tasks_run(
+        ["list", "--static", str(datadir)],
+        returncode=0,
+        cwd=str(tmpdir),
+        additional_env=env,
+    )
+    assert result.stdout.decode("utf-8") == expected
+
+
+def test_iter_task_files(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp.tasks._collect_tasks import iter_task_files
+    from robocorp.tasks._walk_files import CollectTasksStats
+
+    root = Path(str(tmpdir))
+    for name in [
+        "tasks.py",
+        "my_flow.py",
+        "a/tasks.py",
+        "a/b/my_task.py",
+        "a/b/not_matched.py",
+        ".venv/lib/tasks.py",
+        "node_modules/tasks.py",
+        "output/tasks.py",
+        "ignored/tasks.py",
+        "a/ignored_task.py",
+        "a/kept_ignored_task.py",
+        "c/tasks.py",
+        "c/d/tasks.py",
+    ]:
+        p = root / name
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("")
+    (root / ".gitignore").write_text(
+        "# comment\n/ignored/\n*ignored_task.py\n!kept_*.py\n"
+    )
+    (root / "c" / ".gitignore").write_text("d/\n")
+
+    def found(**kwargs):
+        return [p.relative_to(root).as_posix() for p in iter_task_files(root, **kwargs)]
+
+    stats = CollectTasksStats()
+    # Note: the order is the order from `os.scandir` (as with `Path.rglob`).
+    assert sorted(found(glob="*task*.py|*flow*.py", stats=stats)) == [
+        "a/b/my_task.py",
+        "a/kept_ignored_task.py",
+        "a/tasks.py",
+        "c/tasks.py",
+        "my_flow.py",
+        "tasks.py",
+    ]
+    assert stats.files_matched == 6
+    assert stats.dirs_skipped == 5  # .venv, node_modules, output, ignored, c/d
+    assert "Collected tasks in" in str(stats)
+
+    # Custom excludes (the .gitignore is still used).
+    assert sorted(found(exclude="a|c")) == sorted(
+        [".venv/lib/tasks.py", "node_modules/tasks.py", "output/tasks.py", "tasks.py"]
+    )
+    assert sorted(found(glob="b/*.py")) == ["a/b/my_task.py", "a/b/not_matched.py"]
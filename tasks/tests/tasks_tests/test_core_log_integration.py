@@ -1,6 +1,6 @@
 import io
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 import pytest
 from devutils.fixtures import robocorp_tasks_run
@@ -32,6 +32,7 @@ def test_core_log_integration_error_in_import(datadir, str_regression):
         log_target, show_log_messages=True, show_lines=True
     )
     s = re.sub("""at location(.*)\\.""", "at location <path>.", s)
+    s = re.sub("Collected tasks in .*", "Collected tasks in <time>", s)
     str_regression.check(s)
 
     if False:  # Manually debugging
@@ -98,6 +99,8 @@ default_library_filter_kind = "exclude"
 
 
 def test_core_log_integration_lines(datadir, str_regression) -> None:
+    import re
+
     from robocorp.log._log_formatting import pretty_format_logs_from_log_html
 
     result = robocorp_tasks_run(
@@ -110,11 +113,11 @@ def test_core_log_integration_lines(datadir, str_regression) -> None:
     log_target = datadir / "output" / "log.html"
     assert log_target.exists()
 
-    str_regression.check(
-        pretty_format_logs_from_log_html(
-            log_target, show_log_messages=True, show_lines=True
-        )
+    s = pretty_format_logs_from_log_html(
+        log_target, show_log_messages=True, show_lines=True
     )
+    s = re.sub("Collected tasks in .*", "Collected tasks in <time>", s)
+    str_regression.check(s)
 
 
 @pytest.mark.parametrize(
@@ -238,13 +241,17 @@ def test_receive_at_socket(datadir, server_socket) -> None:
     port = server_socket.port
 
     additional_env: Dict[str, str] = {"ROBOCORP_TASKS_LOG_LISTENER_PORT": str(port)}
-    robocorp_tasks_run(
+    result = robocorp_tasks_run(
         ["run", "--console-color=plain", "simple.py"],
         returncode=0,
         cwd=str(datadir),
         additional_env=additional_env,
     )
 
+    # The counters of the data sent are only shown if messages were dropped.
+    decoded = result.stderr.decode("utf-8", "replace")
+    assert "ROBOCORP_TASKS_LOG_LISTENER_PORT" not in decoded, decoded
+
     data = "".join(server_socket.received_data)
 
     s = io.StringIO(data)
@@ -300,3 +307,65 @@ def test_use_robot_artifacts_env_var_for_output(datadir, tmpdir) -> None:
     assert "Log (html)" in decoded
 
     assert (tmpdir / "output_check" / "log.html").exists()
+
+
+def _receive_all(sock) -> bytes:
+    received = []
+    while True:
+        data = sock.recv(4096)
+        if not data:
+            break
+        received.append(data)
+    return b"".join(received)
+
+
+def test_port_streamer_compression() -> None:
+    import socket
+    import threading
+    import zlib
+
+    from robocorp.tasks._log_output_setup import _PortStreamer
+
+    server, client = socket.socketpair()
+    streamer = _PortStreamer(client, compression="zlib")
+    streamer.start()
+
+    # Read in a thread so that the socket buffer doesn't fill up.
+    received: List[bytes] = []
+    t = threading.Thread(target=lambda: received.append(_receive_all(server)))
+    t.start()
+
+    expected = "".join(f"Message {i}\n" for i in range(10_000))
+    for i in range(10_000):
+        streamer.write(f"Message {i}\n")
+    assert streamer.close(10)
+    client.close()
+    t.join(10)
+    server.close()
+
+    assert zlib.decompress(received[0]).decode("utf-8") == expected
+    assert streamer.queued_bytes == len(expected)
+    assert streamer.sent_bytes == len(received[0])
+    assert streamer.dropped_messages == 0
+
+
+def test_port_streamer_drop() -> None:
+    import socket
+
+    from robocorp.tasks._log_output_setup import _PortStreamer
+
+    server, client = socket.socketpair()
+    streamer = _PortStreamer(client, max_queue_size=100, queue_overflow="drop")
+
+    # The thread isn't started, so, the messages which don't fit are dropped.
+    for i in range(20):
+        streamer.write(f"Message {i:02}\n")
+    streamer.start()
+    assert streamer.close(10)
+    client.close()
+
+    data = _receive_all(server).decode("utf-8")
+    server.close()
+    assert data == "".join(f"Message {i:02}\n" for i in range(9))
+    assert streamer.dropped_messages == 11
+    assert streamer.dropped_bytes == 11 * 11
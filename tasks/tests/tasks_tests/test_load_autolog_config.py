@@ -61,3 +61,114 @@ default_library_filter_kind = "exclude"
 
     config = read_robocorp_auto_log_config(Ctx(), pyproject_info)
     str_regression.check(str(config))
+
+
+def test_load_log_settings(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp.log.pyproject_config import (
+        read_pyproject_toml,
+        read_robocorp_log_settings,
+    )
+
+    target = tmpdir / "pyproject.toml"
+    target.write_text(
+        """
+[tool.robocorp.log]
+
+loop_iterations_log_first = 10
+loop_iterations_log_every = "adaptive"
+resource_sample_interval = 0.5
+""",
+        "utf-8",
+    )
+    pyproject_info = read_pyproject_toml(Path(target))
+    assert pyproject_info is not None
+
+    class Ctx:
+        def show_error(self, error):
+            raise AssertionError(error)
+
+    settings = read_robocorp_log_settings(Ctx(), pyproject_info)
+    assert settings == {
+        "loop_iterations_log_first": 10,
+        "loop_iterations_log_every": "adaptive",
+        "resource_sample_interval": 0.5,
+    }
+
+    target.write_text(
+        """
+[tool.robocorp.log]
+
+loop_iterations_log_every = "all"
+resource_sample_interval = -1
+""",
+        "utf-8",
+    )
+    pyproject_info = read_pyproject_toml(Path(target))
+    assert pyproject_info is not None
+
+    errors = []
+
+    class ErrorsCtx:
+        def show_error(self, error):
+            errors.append(error)
+
+    assert read_robocorp_log_settings(ErrorsCtx(), pyproject_info) == {}
+    assert len(errors) == 2
+
+
+def test_load_autolog_config_rewrite_options(tmpdir) -> None:
+    from pathlib import Path
+
+    from robocorp.log.pyproject_config import (
+        read_pyproject_toml,
+        read_robocorp_auto_log_config,
+    )
+
+    target = tmpdir / "pyproject.toml"
+    target.write_text(
+        """
+[tool.robocorp.log]
+
+rewrite_assigns = false
+rewrite_ifs = false
+rewrite_max_function_depth = 2
+""",
+        "utf-8",
+    )
+    pyproject_info = read_pyproject_toml(Path(target))
+    assert pyproject_info is not None
+
+    class Ctx:
+        def show_error(self, error):
+            raise AssertionError(error)
+
+    config = read_robocorp_auto_log_config(Ctx(), pyproject_info)
+    assert not config.get_rewrite_assigns()
+    assert not config.get_rewrite_ifs()
+    assert config.get_rewrite_loops()
+    assert config.get_rewrite_max_function_depth() == 2
+
+    target.write_text(
+        """
+[tool.robocorp.log]
+
+rewrite_loops = "no"
+rewrite_max_function_depth = 0
+""",
+        "utf-8",
+    )
+    pyproject_info = read_pyproject_toml(Path(target))
+    assert pyproject_info is not None
+
+    errors = []
+
+    class ErrorsCtx:
+        def show_error(self, error):
+            errors.append(error)
+
+    config = read_robocorp_auto_log_config(ErrorsCtx(), pyproject_info)
+    assert len(errors) == 2
+    assert config.get_rewrite_loops()
+    assert config.get_rewrite_max_function_depth() is None
@@ -0,0 +1,72 @@
+import re
+
+
+def test_parallel(datadir, tmpdir) -> None:
+    from devutils.fixtures import robocorp_tasks_run
+    from robocorp.log import iter_decoded_log_format_from_output_dir
+
+    output_dir = tmpdir.join("output")
+    result = robocorp_tasks_run(
+        ["run", "--console-colors=plain", "--parallel=2", "-o", str(output_dir)],
+        returncode=1,
+        cwd=str(datadir),
+    )
+    stdout = result.stdout.decode("utf-8")
+
+    # Each task runs in its own process (and has its own session cache).
+    pids = set()
+    for name in ("first", "second", "third"):
+        found = re.findall(rf"{name}: counter: 1 \(pid: (\d+)\)", stdout)
+        assert len(found) == 1, stdout
+        pids.add(found[0])
+    assert len(pids) == 3
+
+    summary = stdout[stdout.index("Parallel run summary") :]
+    assert re.search(r"first status: PASS \(", summary), stdout
+    assert re.search(r"second status: FAIL \(", summary), stdout
+    assert "Failed in second" in summary
+
+    # The output of the workers is merged into the output of the run.
+    assert output_dir.join("log.html").exists()
+    msgs = list(iter_decoded_log_format_from_output_dir(str(output_dir)))
+    tasks = [
+        (msg["name"], msg["libname"]) for msg in msgs if msg["message_type"] == "ST"
+    ]
+    # The setup/teardown of the workers aren't merged (and the tasks are in
+    # the order in which those finished).
+    assert tasks[0] == ("Collect tasks", "setup")
+    assert tasks[-1] == ("Teardown tasks", "teardown")
+    assert sorted(tasks[1:-1]) == [
+        ("first", "tasks"),
+        ("second", "tasks"),
+        ("third", "tasks"),
+    ]
+    assert [msg["status"] for msg in msgs if msg["message_type"] == "ER"] == ["ERROR"]
+
+    # With --no-status-rc the failure in the task doesn't change the returncode.
+    robocorp_tasks_run(
+        [
+            "run",
+            "--console-colors=plain",
+            "--parallel=2",
+            "--no-status-rc",
+            "-o",
+            str(output_dir),
+        ],
+        returncode=0,
+        cwd=str(datadir),
+    )
+
+
+def test_parallel_worker_env(monkeypatch) -> None:
+    from robocorp.tasks._parallel import create_worker_env
+
+    monkeypatch.setenv("ROBOCORP_TASKS_LOG_LISTENER_PORT", "1234")
+    monkeypatch.setenv("ROBOCORP_TASKS_LOG_LISTENER_COMPRESSION", "zlib")
+    monkeypatch.setenv("RC_TASKS_SKIP_SESSION_SETUP", "1")
+
+    # The log of the workers is streamed to the listener by the parent.
+    env = create_worker_env()
+    assert "ROBOCORP_TASKS_LOG_LISTENER_PORT" not in env
+    assert "ROBOCORP_TASKS_LOG_LISTENER_COMPRESSION" not in env
+    assert env["RC_TASKS_SKIP_SESSION_SETUP"] == "1"
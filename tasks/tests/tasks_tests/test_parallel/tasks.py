@@ -0,0 +1,30 @@
+import os
+
+from robocorp.tasks import session_cache, task
+
+
+@session_cache
+def counter():
+    return [0]
+
+
+def _increment(name: str) -> None:
+    c = counter()
+    c[0] += 1
+    print(f"{name}: counter: {c[0]} (pid: {os.getpid()})")
+
+
+@task
+def first():
+    _increment("first")
+
+
+@task
+def second():
+    _increment("second")
+    raise RuntimeError("Failed in second")
+
+
+@task
+def third():
+    _increment("third")
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires os.fork.")
+def test_serve(datadir, tmpdir) -> None:
+    from robocorp.tasks._serve import send_run_request
+
+    socket_path = str(tmpdir.join("serve.sock"))
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([x for x in sys.path if x])
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "robocorp.tasks",
+            "serve",
+            str(datadir),
+            "--socket",
+            socket_path,
+        ],
+        env=env,
+        cwd=str(tmpdir),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        timeout_at = time.monotonic() + 20
+        while not os.path.exists(socket_path):
+            assert process.poll() is None, process.stdout.read()  # type: ignore
+            assert time.monotonic() < timeout_at, "Server didn't start."
+            time.sleep(0.05)
+
+        pids = []
+        for i, request in enumerate(
+            [
+                {"task_name": "increment", "args": {"value": 2}},
+                {"task_name": "increment", "additional_arguments": ["--value=3"]},
+            ]
+        ):
+            output_dir = tmpdir.join(f"output_{i}")
+            request["output_dir"] = str(output_dir)
+            result = send_run_request(
+                socket_path, request, on_started=lambda a: pids.append(a["pid"])
+            )
+            assert result == {"returncode": 0}
+            assert output_dir.join("log.html").exists()
+            # The session cache isn't shared among runs.
+            value = request.get("args", {}).get("value", 3)
+            console = output_dir.join("console.txt").read_text("utf-8")
+            assert f"Counter: {value} " in console
+
+        assert len(set(pids)) == 2
+        assert process.pid not in pids
+
+        # Failure in the task.
+        result = send_run_request(
+            socket_path,
+            {
+                "task_name": "increment",
+                "args": {"value": 20},
+                "output_dir": str(tmpdir.join("output_error")),
+            },
+        )
+        assert result == {"returncode": 1}
+        console = tmpdir.join("output_error").join("console.txt").read_text("utf-8")
+        assert "Counter too big" in console
+
+        result = send_run_request(socket_path, {"task_name": 1})
+        assert "Unexpected type for 'task_name'" in result["error"]
+
+        assert send_run_request(socket_path, {"command": "shutdown"}) == {"ok": True}
+        assert process.wait(20) == 0
+        assert not os.path.exists(socket_path)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
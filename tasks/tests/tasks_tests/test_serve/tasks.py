@@ -0,0 +1,17 @@
+import os
+
+from robocorp.tasks import session_cache, task
+
+
+@session_cache
+def counter():
+    return [0]
+
+
+@task
+def increment(value: int = 1) -> int:
+    c = counter()
+    c[0] += value
+    print(f"Counter: {c[0]} (pid: {os.getpid()})")
+    assert c[0] < 10, "Counter too big"
+    return c[0]
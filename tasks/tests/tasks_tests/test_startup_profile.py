@@ -0,0 +1,54 @@
+def test_profile_startup(datadir, tmpdir) -> None:
+    import json
+
+    from devutils.fixtures import robocorp_tasks_run
+
+    output_dir = tmpdir.join("output")
+    result = robocorp_tasks_run(
+        [
+            "run",
+            "--console-colors=plain",
+            "--profile-startup",
+            "--preload-module=preload_for_profile",
+            "-o",
+            str(output_dir),
+        ],
+        returncode=0,
+        cwd=str(datadir),
+    )
+    stdout = result.stdout.decode("utf-8")
+    assert "Startup profile" in stdout
+    assert "Slowest modules" in stdout
+
+    profile = json.loads(output_dir.join("startup_profile.json").read_text("utf-8"))
+    assert [phase["name"] for phase in profile["phases"]] == [
+        "Import robocorp.log",
+        "Read pyproject.toml",
+        "Setup auto-logging (import hook)",
+        "Setup log",
+        "Setup log output",
+        "Preload modules",
+        "Collect tasks",
+    ]
+    assert profile["total_time"] >= sum(phase["time"] for phase in profile["phases"])
+    assert profile["import_hook"]["find_spec_calls"] > 0
+
+    name_to_module = {m["name"]: m for m in profile["modules"]}
+    assert "robocorp.log._robo_logger" in name_to_module
+    assert not name_to_module["robocorp.log._robo_logger"]["rewritten"]
+
+    # The modules from the project are rewritten by the import hook.
+    for name in ("preload_for_profile", "tasks"):
+        module = name_to_module[name]
+        assert module["rewritten"]
+        assert module["time"] >= module["self_time"] >= module["hook_time"] >= 0
+
+    # Without the flag nothing is written.
+    output_dir = tmpdir.join("output_no_profile")
+    result = robocorp_tasks_run(
+        ["run", "--console-colors=plain", "-o", str(output_dir)],
+        returncode=0,
+        cwd=str(datadir),
+    )
+    assert "Startup profile" not in result.stdout.decode("utf-8")
+    assert not output_dir.join("startup_profile.json").exists()
@@ -0,0 +1,5 @@
+import time
+
+
+def method():
+    return time.time()
@@ -0,0 +1,6 @@
+from robocorp.tasks import task
+
+
+@task
+def empty_task():
+    pass